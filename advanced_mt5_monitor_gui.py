@@ -15,52 +15,77 @@ import sys
 import re
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Any, Tuple
 import importlib.util
 import queue
 import math
+from concurrent.futures import ThreadPoolExecutor
 
-# Try to import charting libraries
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.backends._backend_tk import NavigationToolbar2Tk
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    from matplotlib.patches import Rectangle
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    plt = None  # type: ignore
-    FigureCanvasTkAgg = None  # type: ignore
-    NavigationToolbar2Tk = None  # type: ignore
-    Figure = None  # type: ignore
-    mdates = None  # type: ignore
-    Rectangle = None  # type: ignore
+STARTUP_CLOCK_START = time.perf_counter()  # Cold-start measurement (module import -> first window)
+
+# Charting libraries are imported when the Charts tab is first opened (load_chart_libraries)
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+FigureCanvasTkAgg = None  # type: ignore
+NavigationToolbar2Tk = None  # type: ignore
+Figure = None  # type: ignore
+mdates = None  # type: ignore
+Rectangle = None  # type: ignore
+
+def load_chart_libraries() -> bool:
+    """Import matplotlib on first use - keeps ~0.5s of imports off the startup path"""
+    global FigureCanvasTkAgg, NavigationToolbar2Tk, Figure, mdates, Rectangle, MATPLOTLIB_AVAILABLE
+    if Figure is not None:
+        return True
+    try:
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.backends._backend_tk import NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        import matplotlib.dates as mdates
+        from matplotlib.patches import Rectangle
+    except ImportError:
+        MATPLOTLIB_AVAILABLE = False
+        return False
+    return True
 
-# Dynamic imports to avoid VS Code warnings
-def dynamic_import(module_name: str, package_name: Optional[str] = None):
-    """Dynamically import modules to avoid static import warnings"""
+# src modules: one module object per process, shared with the connector and adapter
+def import_src_module(module_name: str):
+    """Import ``src.<module_name>`` (None when it cannot be loaded)
+    
+    Always goes through sys.modules, so the monitor, the trading connector and
+    the signal adapter share one module object - and with it one rates cache,
+    one symbol spec cache and one terminal lock. Layouts without the src
+    package (e.g. a bundled EXE) load src/<module_name>.py under its plain name.
+    """
     try:
-        if package_name:
-            spec = importlib.util.find_spec(f"{package_name}.{module_name}")
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                return module
-        
-        spec = importlib.util.find_spec(module_name)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module
-    except (ImportError, ModuleNotFoundError):
+        return importlib.import_module(f"src.{module_name}")
+    except ImportError:
         pass
-    return None
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+    path = os.path.join(src_dir, f"{module_name}.py")
+    if not os.path.exists(path):
+        return None
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)  # Sibling imports of the module fall back to plain names
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        del sys.modules[module_name]
+        return None
+    return module
 
 # Try to import required modules
 try:
-    import MetaTrader5 as mt5
+    try:
+        import MetaTrader5 as mt5
+    except ImportError:
+        if not os.environ.get("MT5_REPLAY"):  # A recorded session can stand in for the terminal
+            raise
+        mt5 = None  # type: ignore
     import pandas as pd
     import numpy as np
     DEPENDENCIES_AVAILABLE = True
@@ -70,12 +95,49 @@ except ImportError as e:
     pd = None  # type: ignore
     np = None  # type: ignore
 
-# Dynamic import of signal processing modules
-sunrise_signal_adapter = dynamic_import("sunrise_signal_adapter", "src")
-if not sunrise_signal_adapter:
-    # Try alternative import paths
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-    sunrise_signal_adapter = dynamic_import("sunrise_signal_adapter")
+# Backtrader signal adapter: imports backtrader and every strategy module, so it is
+# only loaded on demand (initialize_signal_processing with MT5_SIGNAL_ADAPTER=1)
+sunrise_signal_adapter = None
+
+# Priority scheduler for per-candle symbol processing
+candle_scheduler = import_src_module("candle_scheduler")
+
+# Slotted per-symbol state record (SymbolState / EntryState)
+strategy_state = import_src_module("strategy_state")
+
+# Vectorized multi-symbol EMA/ATR batch
+indicator_batch = import_src_module("indicator_batch")
+
+# Compiled entry-filter plans (vectorized filter predicates)
+entry_filters = import_src_module("entry_filters")
+
+# Shared 4-phase entry state machine (same core as the backtrader adapter)
+phase_machine = import_src_module("phase_machine")
+
+# Symbol registry (config/symbols/*.json driven symbol universe)
+symbol_registry = import_src_module("symbol_registry")
+
+# Vectorized Dalio position sizing (shared with sizing scripts / scenario analysis)
+position_sizing = import_src_module("position_sizing")
+
+# Shared MT5 bar cache (delta updates, read-only views)
+mt5_rates_cache = import_src_module("mt5_rates_cache")
+
+# Shared symbol spec cache (symbol_info with TTLs and change detection)
+symbol_spec_cache = import_src_module("symbol_spec_cache")
+
+# Background MT5 link supervisor (health probes, jittered reconnects)
+connection_supervisor = import_src_module("connection_supervisor")
+
+# Optional MT5 API recorder / replayer (MT5_RECORD=<file> or MT5_REPLAY=<file>) behind
+# one terminal lock (symbol workers, supervisor, startup thread); the same terminal
+# object as the connector and the signal adapter
+mt5_terminal_guard = import_src_module("mt5_terminal_guard")
+if mt5_terminal_guard and DEPENDENCIES_AVAILABLE:
+    mt5 = mt5_terminal_guard.shared_terminal(mt5)
+
+# Runtime-switchable candle profiling (GUI button, SIGUSR1/SIGBREAK, profile_candles.flag)
+profiling_hooks = import_src_module("profiling_hooks")
 
 # ==========
 # RAY DALIO ALL-WEATHER PORTFOLIO ALLOCATION SYSTEM
@@ -98,6 +160,10 @@ if not sunrise_signal_adapter:
 #   USDJPY: $50,000 x 12% = $6,000 -> $60.00 risk per trade
 #   AUDUSD: $50,000 x 10% = $5,000 -> $50.00 risk per trade
 # Total: 100% allocation across 8 assets
+#
+# These are the BUILT-IN DEFAULTS. The live allocation table comes from
+# config/symbols/*.json (one file per symbol) and is normalized to 100%
+# automatically, so adding a symbol rescales the others.
 # ==========
 
 ASSET_ALLOCATIONS = {
@@ -167,8 +233,10 @@ VALID_ENTRY_STATES = ['SCANNING', 'ARMED_LONG', 'ARMED_SHORT', 'WINDOW_OPEN']
 # ==========
 # RECONNECTION CONFIGURATION
 # ==========
-MAX_RECONNECT_ATTEMPTS = 3  # Max consecutive reconnect attempts before giving up
-RECONNECT_BACKOFF_SECONDS = 2  # Initial backoff between retries (doubles each attempt)
+MAX_RECONNECT_ATTEMPTS = 3  # Failed reconnect attempts before the link is reported DOWN (retries continue)
+RECONNECT_BACKOFF_SECONDS = 2  # Initial backoff between retries (doubles each attempt, jittered)
+RECONNECT_MAX_BACKOFF_SECONDS = 120  # Backoff ceiling while the link stays DOWN
+CONNECTION_PROBE_SECONDS = 30  # Health probe interval while connected
 
 # ==========
 # DATA FETCHING CONFIGURATION
@@ -181,9 +249,19 @@ CHART_DISPLAY_BARS = 100  # Bars to display in chart view
 # TIMING CONFIGURATION
 # ==========
 CANDLE_CHECK_SLEEP_SECONDS = 5  # Sleep between candle checks in monitor loop
+MONITOR_WORKER_THREADS = 4  # Worker pool size for per-candle symbol processing (1 = sequential)
+CYCLE_TIME_BUDGET_SECONDS = 20  # SCANNING symbols beyond this budget are deferred to the next loop pass
 GUI_UPDATE_INTERVAL_MS = 1000  # GUI refresh interval in milliseconds
+PROFILE_CANDLES = 5  # Candle cycles profiled per "Profile" request (output in logs/profiles/)
 HOURLY_SUMMARY_MINUTES = 60  # Minutes between hourly summary logs
 
+# ==========
+# STARTUP CONFIGURATION
+# ==========
+STARTUP_TARGET_SECONDS = 1.0  # Cold start to first window (logged at startup)
+SIGNAL_ADAPTER_ENV = "MT5_SIGNAL_ADAPTER"  # Set to 1 to load the backtrader signal adapter on connect
+SYMBOL_SPEC_SNAPSHOT_FILE = 'symbol_specs_snapshot.json'  # Last symbol specs (digits before MT5 connects)
+
 class AdvancedMT5TradingMonitorGUI:
     """
     Advanced MT5 Trading Monitor with Strategy Phase Tracking
@@ -202,10 +280,53 @@ class AdvancedMT5TradingMonitorGUI:
         self.root.title(f"Advanced MT5 Monitor v{APP_VERSION} - Strategy Phase Tracker")
         self.root.geometry("1600x1000")
         
+        self._init_monitor_state()
+        
+        # Setup logging
+        self.setup_logging()
+        
+        # Initialize GUI
+        self.setup_gui()
+        
+        # Load strategy configurations (param cache + last symbol specs, no terminal round trips)
+        self.load_symbol_spec_snapshot()
+        self.load_strategy_configurations()
+        
+        # Show the window first; MT5 connects in the background
+        self.root.after_idle(self.report_startup_time)
+        self.connect_mt5_async()
+        
+        # Profiling on demand: SIGUSR1 (SIGBREAK on Windows) or profile_candles.flag
+        if self.profiler is not None:
+            self.profiler.install_signal_handler()
+        
+        # Setup cleanup
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # Start phase update processing
+        self.process_phase_updates()
+    
+    def _init_monitor_state(self):
+        """Monitor state shared by the GUI and headless runs (no Tk widgets)
+        
+        src/live_replay.py builds a headless monitor from this to replay
+        history through the live code path.
+        """
         # Strategy state tracking
-        self.strategy_states = {}  # {symbol: {phase, config, indicators, etc}}
+        self.strategy_states = {}  # {symbol: SymbolState} - mutated by monitor workers only
+        self.state_snapshots = {}  # {symbol: SymbolState} - published copies read by the GUI thread
         self.strategy_configs = {}
         self.chart_data = {}
+        self.symbol_registry = None  # Loaded from config/symbols/ in load_strategy_configurations
+        self.asset_allocations = dict(ASSET_ALLOCATIONS)  # Normalized allocation per symbol
+        self.monitor_executor = None  # Worker pool for per-candle symbol processing
+        self.candle_scheduler = None  # Priority scheduler (WINDOW_OPEN -> ARMED -> IN_TRADE -> SCANNING)
+        self.candle_batch = {}  # {symbol: {'df': closed bars, 'values': batch EMA/ATR}} for current cycle
+        self.filter_plans = {}  # {(symbol, direction): (config, FilterPlan)} - recompiled when config reloads
+        self.phase_machines = {}  # {symbol: (config, PhaseMachine)} - recompiled when config reloads
+        self.profiler = profiling_hooks.RuntimeProfiler() if profiling_hooks else None  # Idle until requested
+        self._tk_thread = threading.current_thread()  # Only thread allowed to touch Tk widgets
+        self.terminal_queue = queue.Queue()  # (entry, level) lines logged by worker threads
         self.window_markers = {}  # Track window levels for charts
         
         # State variables
@@ -238,11 +359,14 @@ class AdvancedMT5TradingMonitorGUI:
         self.config_errors = {}  # {symbol: {'missing_params': [], 'last_retry': datetime, 'error_logged': bool}}
         self.last_config_retry = {}  # {symbol: datetime} - Track last retry time per symbol
         
-        # Reconnection tracking
-        self.reconnect_attempts = 0  # Consecutive failed reconnect attempts
-        self.last_reconnect_time = None  # For backoff calculation
+        # Reconnection: background supervisor started on connect
+        self.connection_supervisor = None
+        self.link_failed_symbols = set()  # Symbols to retry this candle after a link failure
+        self.resync_pending = False  # Reconnect re-sync waiting for the monitor thread
         
         self.data_provider = None
+        self.rates_cache = mt5_rates_cache.shared_rates_cache() if mt5_rates_cache else None
+        self.symbol_specs = symbol_spec_cache.shared_symbol_specs() if symbol_spec_cache else None
         
         # Broker UTC offset for time filter conversion
         self.broker_utc_offset = self.load_utc_offset_from_config()
@@ -252,24 +376,6 @@ class AdvancedMT5TradingMonitorGUI:
         self.stop_event = threading.Event()
         self.phase_update_queue = queue.Queue()
         
-        # Setup logging
-        self.setup_logging()
-        
-        # Initialize GUI
-        self.setup_gui()
-        
-        # Try to initialize MT5 connection
-        self.initialize_mt5_connection()
-        
-        # Load strategy configurations
-        self.load_strategy_configurations()
-        
-        # Setup cleanup
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-        
-        # Start phase update processing
-        self.process_phase_updates()
-        
     def setup_logging(self):
         """Configure logging system"""
         # Configure stream handler with UTF-8 encoding
@@ -396,6 +502,10 @@ class AdvancedMT5TradingMonitorGUI:
         # Window markers tab
         self.create_window_markers_tab()
         
+        # Open on the terminal; the chart (and matplotlib) is built on first visit of its tab
+        self.right_notebook.select(self.terminal_frame)
+        self.right_notebook.bind("<<NotebookTabChanged>>", self.on_right_tab_changed)
+        
     def create_strategy_phases_tab(self):
         """Create the strategy phase tracking tab"""
         phases_frame = ttk.Frame(self.left_notebook)
@@ -462,16 +572,17 @@ class AdvancedMT5TradingMonitorGUI:
         
         ttk.Label(control_frame, text="Chart Symbol:").pack(side=tk.LEFT)
         self.chart_symbol_var = tk.StringVar(value="EURUSD")
-        chart_symbol_combo = ttk.Combobox(control_frame, textvariable=self.chart_symbol_var, 
-                                         values=["EURUSD", "XAUUSD", "GBPUSD", "AUDUSD", "XAGUSD", "USDCHF", "EURJPY", "USDJPY"],
+        self.chart_symbol_combo = ttk.Combobox(control_frame, textvariable=self.chart_symbol_var, 
+                                         values=list(ASSET_ALLOCATIONS.keys()),
                                          state="readonly", width=10)
-        chart_symbol_combo.pack(side=tk.LEFT, padx=(5, 10))
-        chart_symbol_combo.bind("<<ComboboxSelected>>", self.on_chart_symbol_change)
+        self.chart_symbol_combo.pack(side=tk.LEFT, padx=(5, 10))
+        self.chart_symbol_combo.bind("<<ComboboxSelected>>", self.on_chart_symbol_change)
         
         ttk.Button(control_frame, text="Refresh Chart", command=self.refresh_chart).pack(side=tk.LEFT)
         
-        # Chart display
-        self.setup_chart(charts_frame)
+        # Chart display - built by on_right_tab_changed when the tab is first opened
+        self.chart_frame = charts_frame
+        self.fig = None
         
     def create_no_charts_tab(self):
         """Create a tab explaining chart requirements"""
@@ -488,6 +599,7 @@ class AdvancedMT5TradingMonitorGUI:
         """Create the terminal output tab"""
         terminal_frame = ttk.Frame(self.right_notebook)
         self.right_notebook.add(terminal_frame, text=" Terminal Output")
+        self.terminal_frame = terminal_frame
         
         # Terminal display
         self.terminal_text = scrolledtext.ScrolledText(terminal_frame, height=25, font=("Consolas", 9), 
@@ -508,6 +620,8 @@ class AdvancedMT5TradingMonitorGUI:
         
         ttk.Button(terminal_controls, text="Clear Terminal", command=self.clear_terminal).pack(side=tk.LEFT)
         ttk.Button(terminal_controls, text="Save Log", command=self.save_terminal_log).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(terminal_controls, text=f"Profile {PROFILE_CANDLES} Candles",
+                   command=self.request_profiling).pack(side=tk.LEFT, padx=(5, 0))
         
     def create_window_markers_tab(self):
         """Create the window markers tracking tab"""
@@ -528,9 +642,23 @@ class AdvancedMT5TradingMonitorGUI:
         self.markers_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_markers.pack(side=tk.RIGHT, fill=tk.Y)
         
+    def on_right_tab_changed(self, event=None):
+        """Build the chart the first time the Charts tab is opened"""
+        chart_frame = getattr(self, 'chart_frame', None)
+        if chart_frame is None or self.fig is not None:
+            return
+        if self.right_notebook.select() != str(chart_frame):
+            return
+        self.setup_chart(chart_frame)
+        if self.chart_symbol_var.get() in self.chart_data:
+            self.refresh_chart()
+    
     def setup_chart(self, parent):
         """Setup matplotlib chart with standard navigation toolbar"""
-        if not MATPLOTLIB_AVAILABLE or Figure is None or FigureCanvasTkAgg is None:
+        if not load_chart_libraries() or Figure is None or FigureCanvasTkAgg is None:
+            self.chart_frame = None  # Do not retry on every tab change
+            ttk.Label(parent, text="Charts unavailable: matplotlib failed to import",
+                      justify=tk.CENTER, font=("Arial", 11)).pack(expand=True)
             return
             
         # Create figure and axis
@@ -601,92 +729,116 @@ class AdvancedMT5TradingMonitorGUI:
         # 4. Return CWD path as default (for creation/error reporting)
         return cwd_path
 
+    def load_symbol_registry(self):
+        """Load the symbol universe from config/symbols/ (falls back to ASSET_ALLOCATIONS)
+        
+        Returns:
+            list: Enabled symbols in display order
+        """
+        if symbol_registry is None:
+            self.terminal_log("[X] Symbol registry unavailable - using built-in symbol list", "WARNING", critical=True)
+            self.asset_allocations = dict(ASSET_ALLOCATIONS)
+            return list(ASSET_ALLOCATIONS.keys())
+        
+        config_dir = self.get_resource_path(symbol_registry.SYMBOLS_CONFIG_DIR)
+        self.symbol_registry = symbol_registry.SymbolRegistry(
+            project_root=os.path.dirname(os.path.dirname(config_dir)),
+            config_dir=config_dir,
+            default_allocations=ASSET_ALLOCATIONS,
+            logger=self.logger,
+            cache_file=os.path.join(os.getcwd(), symbol_registry.PARAM_CACHE_FILE_NAME),
+        )
+        self.symbol_registry.load()
+        self.asset_allocations = self.symbol_registry.allocations()
+        
+        symbols = self.symbol_registry.symbols()
+        allocation_text = ", ".join(f"{s} {self.asset_allocations.get(s, 0):.1%}" for s in symbols)
+        self.terminal_log(f"[OK] Symbol registry: {len(symbols)} symbols | {allocation_text}", "SUCCESS")
+        return symbols
+    
+    def get_strategy_file_path(self, symbol):
+        """Resolve the strategy file for a symbol (None for params-only symbols)"""
+        if self.symbol_registry and symbol in self.symbol_registry.entries:
+            strategy_rel_path = self.symbol_registry.entries[symbol].strategy_file
+            if not strategy_rel_path:
+                return None
+        else:
+            strategy_rel_path = f"strategies/sunrise_ogle_{symbol.lower()}.py"
+        return self.get_resource_path(strategy_rel_path)
+    
     def load_strategy_configurations(self):
         """Load strategy configuration parameters"""
-        symbols = ["EURUSD", "GBPUSD", "XAUUSD", "AUDUSD", "XAGUSD", "USDCHF", "EURJPY", "USDJPY"]
+        symbols = self.load_symbol_registry()
         
         for symbol in symbols:
-            try:
-                # Get symbol precision from MT5
-                digits = 5  # Default
-                if mt5:
-                    symbol_info = mt5.symbol_info(symbol)  # type: ignore
-                    if symbol_info:
-                        digits = symbol_info.digits
-                
-                # Initialize strategy state - matching original strategy state machine
-                self.strategy_states[symbol] = {
-                    'entry_state': 'SCANNING',  # SCANNING, ARMED_LONG, ARMED_SHORT, WINDOW_OPEN
-                    'phase': 'NORMAL',  # For display compatibility
-                    'armed_direction': None,
-                    'pullback_candle_count': 0,
-                    'signal_trigger_candle': None,  # Store trigger candle data
-                    'last_pullback_candle_high': None,
-                    'last_pullback_candle_low': None,
-                    'window_active': False,
-                    'window_bar_start': None,
-                    'window_expiry_bar': None,
-                    'window_top_limit': None,
-                    'window_bottom_limit': None,
-                    'current_bar': 0,
-                    'breakout_level': None,
-                    'last_update': datetime.now(),
-                    'indicators': {},
-                    'signals': [],
-                    'crossover_data': {},
-                    'digits': digits  # MT5 symbol precision for display formatting
-                }
-                
-                # Load configuration from strategy file (supports bundled EXE)
-                strategy_rel_path = f"strategies/sunrise_ogle_{symbol.lower()}.py"
-                strategy_file = self.get_resource_path(strategy_rel_path)
-                
-                config = self.parse_strategy_config(strategy_file, symbol)
-                
-                # Check for load error first
-                if "error" in config:
-                    self.terminal_log(f"[X] {symbol}: {config['error']}", "ERROR", critical=True)
-                    self.strategy_configs[symbol] = config
-                    continue
-                
-                # CRITICAL: Validate all required parameters are loaded
-                is_valid, missing_params = self.validate_critical_params(symbol, config)
-                
-                if not is_valid:
-                    # CRITICAL ERROR - Missing required parameters
-                    self.terminal_log(f"", "ERROR")  # Empty line for visibility
-                    self.terminal_log(f"[X] CRITICAL: {symbol} missing required parameters!", "ERROR", critical=True)
-                    self.terminal_log(f"   Missing: {missing_params}", "ERROR", critical=True)
-                    self.terminal_log(f"   Trading DISABLED for {symbol} until config is fixed", "ERROR", critical=True)
-                    self.terminal_log(f"   Will retry loading every {CONFIG_RETRY_INTERVAL // 60} minutes", "WARNING", critical=True)
-                    self.terminal_log(f"", "ERROR")  # Empty line for visibility
-                    # Store config anyway but mark as invalid
-                    config['_config_valid'] = False
-                    config['_missing_params'] = missing_params
-                    self.strategy_configs[symbol] = config
-                else:
-                    # All critical params present
-                    config['_config_valid'] = True
-                    self.strategy_configs[symbol] = config
-                    
-                    # Debug log for pullback configuration
-                    pullback_enabled = config.get('LONG_USE_PULLBACK_ENTRY', 'N/A')
-                    pullback_max = config.get('LONG_PULLBACK_MAX_CANDLES', 'N/A')
-                    window_periods = config.get('LONG_ENTRY_WINDOW_PERIODS', 'N/A')
-                    use_time_offset = config.get('USE_WINDOW_TIME_OFFSET', 'N/A')
-                    
-                    self.terminal_log(f"[OK] {symbol}: Configuration VALID | Pullback: {pullback_max} candles, Window: {window_periods} bars, TimeOffset: {use_time_offset}", "SUCCESS")
-                
-            except Exception as e:
-                self.terminal_log(f"[X] {symbol}: Config load error - {str(e)}", "ERROR")
-                self.strategy_configs[symbol] = {"error": str(e)}
-                
-        # Update symbol selector
+            self.load_symbol_config(symbol)
+        if self.symbol_registry is not None:
+            self.symbol_registry.save_cache()  # Unchanged strategy files are not re-parsed next start
+        
+        # Update symbol selectors
         self.symbol_combo['values'] = list(symbols)
+        self.chart_symbol_combo['values'] = list(symbols)
         if symbols:
             self.symbol_combo.set(symbols[0])
             self.on_symbol_config_select(None)
     
+    def load_symbol_config(self, symbol):
+        """Create the symbol's state and load + validate its strategy config"""
+        try:
+            # Get symbol precision from MT5
+            digits = 5  # Default
+            if mt5:
+                symbol_info = self.get_symbol_spec(symbol)
+                if symbol_info:
+                    digits = symbol_info.digits
+            
+            # Initialize strategy state - matching original strategy state machine
+            self.strategy_states[symbol] = strategy_state.SymbolState(digits=digits)
+            self.publish_state(symbol)
+            
+            # Load configuration from strategy file / symbol data file (supports bundled EXE)
+            strategy_file = self.get_strategy_file_path(symbol)
+            
+            config = self.parse_strategy_config(strategy_file, symbol)
+            
+            # Check for load error first
+            if "error" in config:
+                self.terminal_log(f"[X] {symbol}: {config['error']}", "ERROR", critical=True)
+                self.strategy_configs[symbol] = config
+                return
+            
+            # CRITICAL: Validate all required parameters are loaded
+            is_valid, missing_params = self.validate_critical_params(symbol, config)
+            
+            if not is_valid:
+                # CRITICAL ERROR - Missing required parameters
+                self.terminal_log(f"", "ERROR")  # Empty line for visibility
+                self.terminal_log(f"[X] CRITICAL: {symbol} missing required parameters!", "ERROR", critical=True)
+                self.terminal_log(f"   Missing: {missing_params}", "ERROR", critical=True)
+                self.terminal_log(f"   Trading DISABLED for {symbol} until config is fixed", "ERROR", critical=True)
+                self.terminal_log(f"   Will retry loading every {CONFIG_RETRY_INTERVAL // 60} minutes", "WARNING", critical=True)
+                self.terminal_log(f"", "ERROR")  # Empty line for visibility
+                # Store config anyway but mark as invalid
+                config['_config_valid'] = False
+                config['_missing_params'] = missing_params
+                self.strategy_configs[symbol] = config
+            else:
+                # All critical params present
+                config['_config_valid'] = True
+                self.strategy_configs[symbol] = config
+                
+                # Debug log for pullback configuration
+                pullback_enabled = config.get('LONG_USE_PULLBACK_ENTRY', 'N/A')
+                pullback_max = config.get('LONG_PULLBACK_MAX_CANDLES', 'N/A')
+                window_periods = config.get('LONG_ENTRY_WINDOW_PERIODS', 'N/A')
+                use_time_offset = config.get('USE_WINDOW_TIME_OFFSET', 'N/A')
+                
+                self.terminal_log(f"[OK] {symbol}: Configuration VALID | Pullback: {pullback_max} candles, Window: {window_periods} bars, TimeOffset: {use_time_offset}", "SUCCESS")
+            
+        except Exception as e:
+            self.terminal_log(f"[X] {symbol}: Config load error - {str(e)}", "ERROR")
+            self.strategy_configs[symbol] = {"error": str(e)}
+    
     def load_utc_offset_from_config(self):
         """Load UTC offset from config file"""
         try:
@@ -738,132 +890,29 @@ class AdvancedMT5TradingMonitorGUI:
             self.terminal_log(f"[X] Failed to save UTC offset: {str(e)}", "ERROR", critical=True)
             
     def parse_strategy_config(self, file_path, symbol):
-        """Parse strategy configuration from file"""
-        config = {}
+        """Parse strategy configuration from strategy file + symbol data file
         
-        if not os.path.exists(file_path):
-            return {"error": f"Strategy file not found: {file_path}"}
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-                
-        # Parse key configuration parameters with more comprehensive coverage
-        config_params = {
-            # EMA Parameters - Different per asset
-            'ema_fast_length': 'Fast EMA Period',
-            'ema_medium_length': 'Medium EMA Period', 
-            'ema_slow_length': 'Slow EMA Period',
-            'ema_confirm_length': 'Confirmation EMA Period',
-            'ema_filter_price_length': 'Price Filter EMA Period',
-            'ema_exit_length': 'Exit EMA Period',
-            
-            # ATR Risk Management
-            'atr_length': 'ATR Period',
-            'long_atr_sl_multiplier': 'Long Stop Loss ATR Multiplier',
-            'long_atr_tp_multiplier': 'Long Take Profit ATR Multiplier',
-            
-            # ATR Filters
-            'LONG_USE_ATR_FILTER': 'Use ATR Volatility Filter',
-            'LONG_ATR_MIN_THRESHOLD': 'ATR Min Threshold',
-            'LONG_ATR_MAX_THRESHOLD': 'ATR Max Threshold',
-            'LONG_USE_ATR_INCREMENT_FILTER': 'Use ATR Increment Filter',
-            'LONG_ATR_INCREMENT_MIN_THRESHOLD': 'ATR Increment Min',
-            'LONG_ATR_INCREMENT_MAX_THRESHOLD': 'ATR Increment Max',
-            'LONG_USE_ATR_DECREMENT_FILTER': 'Use ATR Decrement Filter',
-            'LONG_ATR_DECREMENT_MIN_THRESHOLD': 'ATR Decrement Min',
-            'LONG_ATR_DECREMENT_MAX_THRESHOLD': 'ATR Decrement Max',
-            
-            # Entry Filters
-            'LONG_USE_EMA_ORDER_CONDITION': 'Use EMA Order Condition',
-            'LONG_USE_PRICE_FILTER_EMA': 'Use Price Filter EMA',
-            'LONG_USE_CANDLE_DIRECTION_FILTER': 'Use Candle Direction Filter',
-            'LONG_USE_ANGLE_FILTER': 'Use EMA Angle Filter',
-            'LONG_MIN_ANGLE': 'Min EMA Angle (degrees)',
-            'LONG_MAX_ANGLE': 'Max EMA Angle (degrees)',
-            'LONG_ANGLE_SCALE_FACTOR': 'Angle Scale Factor',
-            'LONG_USE_EMA_BELOW_PRICE_FILTER': 'Use EMA Below Price Filter',
-            
-            # SHORT ATR Filters
-            'SHORT_USE_ATR_FILTER': 'Short Use ATR Volatility Filter',
-            'SHORT_ATR_MIN_THRESHOLD': 'Short ATR Min Threshold',
-            'SHORT_ATR_MAX_THRESHOLD': 'Short ATR Max Threshold',
-            'SHORT_USE_ATR_INCREMENT_FILTER': 'Short Use ATR Increment Filter',
-            'SHORT_ATR_INCREMENT_MIN_THRESHOLD': 'Short ATR Increment Min',
-            'SHORT_ATR_INCREMENT_MAX_THRESHOLD': 'Short ATR Increment Max',
-            'SHORT_USE_ATR_DECREMENT_FILTER': 'Short Use ATR Decrement Filter',
-            'SHORT_ATR_DECREMENT_MIN_THRESHOLD': 'Short ATR Decrement Min',
-            'SHORT_ATR_DECREMENT_MAX_THRESHOLD': 'Short ATR Decrement Max',
-            
-            # SHORT Entry Filters
-            'SHORT_USE_EMA_ORDER_CONDITION': 'Short Use EMA Order Condition',
-            'SHORT_USE_PRICE_FILTER_EMA': 'Short Use Price Filter EMA',
-            'SHORT_USE_CANDLE_DIRECTION_FILTER': 'Short Use Candle Direction Filter',
-            'SHORT_USE_ANGLE_FILTER': 'Short Use EMA Angle Filter',
-            'SHORT_MIN_ANGLE': 'Short Min EMA Angle (degrees)',
-            'SHORT_MAX_ANGLE': 'Short Max EMA Angle (degrees)',
-            'SHORT_ANGLE_SCALE_FACTOR': 'Short Angle Scale Factor',
-            'SHORT_USE_EMA_ABOVE_PRICE_FILTER': 'Short Use EMA Above Price Filter',
-            
-            # Pullback Entry System
-            'LONG_USE_PULLBACK_ENTRY': 'Use Pullback Entry System',
-            'LONG_PULLBACK_MAX_CANDLES': 'Max Pullback Candles',
-            'LONG_ENTRY_WINDOW_PERIODS': 'Entry Window Periods',
-            'SHORT_USE_PULLBACK_ENTRY': 'Short Use Pullback Entry System',
-            'SHORT_PULLBACK_MAX_CANDLES': 'Short Max Pullback Candles',
-            'SHORT_ENTRY_WINDOW_PERIODS': 'Short Entry Window Periods',
-            
-            'WINDOW_OFFSET_MULTIPLIER': 'Window Offset Multiplier',
-            'USE_WINDOW_TIME_OFFSET': 'Use Window Time Offset',
-            'WINDOW_PRICE_OFFSET_MULTIPLIER': 'Window Price Offset',
-            
-            # Time Range Filter
-            'USE_TIME_RANGE_FILTER': 'Use Time Range Filter',
-            'ENTRY_START_HOUR': 'Entry Start Hour (UTC)',
-            'ENTRY_START_MINUTE': 'Entry Start Minute',
-            'ENTRY_END_HOUR': 'Entry End Hour (UTC)',
-            'ENTRY_END_MINUTE': 'Entry End Minute',
-            
-            # Trading Direction
-            'ENABLE_LONG_TRADES': 'Enable Long Trades',
-            'ENABLE_SHORT_TRADES': 'Enable Short Trades',
-            
-            # Position Sizing
-            'enable_risk_sizing': 'Enable Risk Sizing',
-            'risk_percent': 'Risk Percentage per Trade',
-        }
+        Parameter extraction lives in src/symbol_registry.py; inline params from
+        config/symbols/<SYMBOL>.json override values parsed from the strategy file.
+        """
+        if symbol_registry is None:
+            return {"error": "Symbol registry module not available (src/symbol_registry.py)"}
         
-        for param, description in config_params.items():
-            # Find parameter in file content - check BOTH formats
-            lines = content.split('\n')
-            for line in lines:
-                # Format 1: param = value (top level)
-                # Format 2: param=value, (inside params dict)
-                if (f"{param} =" in line or f"{param}=" in line) and not line.strip().startswith('#'):
-                    try:
-                        # Extract value
-                        if '=' in line:
-                            value_part = line.split('=')[1].split('#')[0].split(',')[0].strip()
-                            # Clean up the value (remove quotes, trailing commas)
-                            if value_part.endswith(','):
-                                value_part = value_part[:-1].strip()
-                            if value_part.startswith('"') and value_part.endswith('"'):
-                                value_part = value_part[1:-1]
-                            elif value_part.startswith("'") and value_part.endswith("'"):
-                                value_part = value_part[1:-1]
-                            config[description] = value_part
-                            # Store with original param name too for easier access
-                            config[param] = value_part
-                            break
-                    except:
-                        continue
+        try:
+            if self.symbol_registry:
+                params = self.symbol_registry.load_params(symbol, strategy_path=file_path)
+            elif file_path and os.path.exists(file_path):
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    params = symbol_registry.parse_strategy_source(f.read())
+            else:
+                return {"error": f"Strategy file not found: {file_path}"}
+        except FileNotFoundError as e:
+            return {"error": str(e)}
         
-        # Store raw config for indicator calculations
+        # Store with both description and original param name for easier access
+        config = symbol_registry.expand_param_descriptions(params)
         config['_symbol'] = symbol
-        config['_raw_content'] = content[:1000]  # First 1000 chars for reference
+        config['_source'] = file_path or 'config/symbols'
                         
         return config
     
@@ -928,8 +977,9 @@ class AdvancedMT5TradingMonitorGUI:
         self.terminal_log(f" {symbol}: Retrying configuration load...", "WARNING", critical=True)
         
         try:
-            strategy_rel_path = f"strategies/sunrise_ogle_{symbol.lower()}.py"
-            strategy_file = self.get_resource_path(strategy_rel_path)
+            strategy_file = self.get_strategy_file_path(symbol)
+            if self.symbol_registry:
+                self.symbol_registry.invalidate(symbol)
             
             config = self.parse_strategy_config(strategy_file, symbol)
             
@@ -953,15 +1003,92 @@ class AdvancedMT5TradingMonitorGUI:
             self.terminal_log(f"[X] {symbol}: Config retry FAILED - {str(e)}", "ERROR", critical=True)
             return False
         
-    def initialize_mt5_connection(self):
-        """Initialize MetaTrader5 connection"""
+    def connect_mt5_async(self):
+        """Connect to MT5 without blocking the window
+        
+        The terminal handshake and one symbol_info per symbol (in parallel) run
+        in a background thread; the connection is then completed on the Tk thread.
+        """
+        if not DEPENDENCIES_AVAILABLE or mt5 is None:
+            self.initialize_mt5_connection()
+            return
+        symbols = list(self.strategy_states)
+        
+        def connect():
+            try:
+                terminal_ready = bool(mt5.initialize())  # type: ignore
+                if terminal_ready:
+                    self.prefetch_symbol_specs(symbols)
+            except Exception as e:
+                self.logger.error(f"Background MT5 connect failed: {e}")
+                terminal_ready = False
+            self.root.after(0, lambda: self.finish_mt5_startup(terminal_ready))  # Thread-safe GUI update
+        
+        self.terminal_log(" Connecting to MT5 in the background...", "NORMAL")
+        threading.Thread(target=connect, name="mt5-connect", daemon=True).start()
+    
+    def finish_mt5_startup(self, terminal_ready):
+        """Tk-thread half of connect_mt5_async"""
+        if self.initialize_mt5_connection(terminal_ready=terminal_ready):
+            self.apply_symbol_digits()
+            self.save_symbol_spec_snapshot()
+    
+    def prefetch_symbol_specs(self, symbols):
+        """Re-read every symbol's spec from the terminal in parallel (snapshot entries included)"""
+        if self.symbol_specs is None or not symbols:
+            return
+        self.symbol_specs.bind(mt5)
+        with ThreadPoolExecutor(max_workers=MONITOR_WORKER_THREADS, thread_name_prefix="spec-prefetch") as pool:
+            list(pool.map(lambda symbol: self.symbol_specs.refresh([symbol]), symbols))
+    
+    def apply_symbol_digits(self):
+        """Update display precision of symbols loaded before the terminal answered"""
+        for symbol, state in self.strategy_states.items():
+            spec = self.get_symbol_spec(symbol)
+            if spec is not None and spec.digits != state.digits:
+                state.digits = spec.digits
+                self.publish_state(symbol)
+    
+    def load_symbol_spec_snapshot(self):
+        """Seed the spec cache with the last session's specs (digits without a terminal round trip)"""
+        path = os.path.join(os.getcwd(), SYMBOL_SPEC_SNAPSHOT_FILE)
+        if self.symbol_specs is None or not os.path.exists(path):
+            return
+        try:
+            self.symbol_specs.load(path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring symbol spec snapshot {path}: {e}")
+    
+    def save_symbol_spec_snapshot(self):
+        if self.symbol_specs is None or not self.symbol_specs.specs():
+            return
+        try:
+            self.symbol_specs.save(os.path.join(os.getcwd(), SYMBOL_SPEC_SNAPSHOT_FILE))
+        except Exception as e:
+            self.logger.warning(f"Could not save symbol spec snapshot: {e}")
+    
+    def report_startup_time(self):
+        """Log the cold-start time once the first window is drawn"""
+        elapsed = time.perf_counter() - STARTUP_CLOCK_START
+        level = "SUCCESS" if elapsed <= STARTUP_TARGET_SECONDS else "WARNING"
+        self.terminal_log(f"[T] Window ready {elapsed * 1000:.0f} ms after start "
+                          f"(target {STARTUP_TARGET_SECONDS * 1000:.0f} ms)", level, critical=True)
+    
+    def initialize_mt5_connection(self, terminal_ready=None):
+        """Initialize MetaTrader5 connection
+        
+        Args:
+            terminal_ready: result of an mt5.initialize() already made off the Tk thread
+        """
         if not DEPENDENCIES_AVAILABLE or mt5 is None:
             self.terminal_log("[X] ERROR: Required dependencies not available", "ERROR")
             return False
             
         try:
             # Initialize MT5
-            if not mt5.initialize():  # type: ignore
+            if terminal_ready is None:
+                terminal_ready = mt5.initialize()  # type: ignore
+            if not terminal_ready:
                 self.terminal_log(f"[X] Failed to initialize MT5: {mt5.last_error()}", "ERROR")  # type: ignore
                 return False
                 
@@ -977,6 +1104,9 @@ class AdvancedMT5TradingMonitorGUI:
             self.connect_button.config(text="Disconnect")
             
             self.terminal_log(f"[OK] Connected to MT5 - Account: {account_info.login}", "SUCCESS")
+            if self.symbol_specs is not None:
+                self.symbol_specs.bind(mt5, account_currency=account_info.currency)
+            self.start_connection_supervisor()
             
             # Initialize signal processing if available
             self.initialize_signal_processing()
@@ -988,9 +1118,23 @@ class AdvancedMT5TradingMonitorGUI:
             return False
             
     def initialize_signal_processing(self):
-        """Initialize signal processing components"""
+        """Initialize signal processing components (opt-in: MT5_SIGNAL_ADAPTER=1)
+        
+        The adapter imports backtrader and every strategy module; the live
+        monitor does not use it, so it stays unloaded by default.
+        """
+        global sunrise_signal_adapter
+        if os.environ.get(SIGNAL_ADAPTER_ENV) != "1":
+            return
         try:
+            if sunrise_signal_adapter is None:
+                sunrise_signal_adapter = import_src_module("sunrise_signal_adapter")
             if sunrise_signal_adapter:
+                # Bars through the monitor's rates cache and terminal (same objects as the adapter's)
+                self.data_provider = sunrise_signal_adapter.MT5DataProvider(self.logger, rates_cache=self.rates_cache)
+                if self.mt5_connected:
+                    self.data_provider.connect()
+                
                 # Try to create signal manager
                 if hasattr(sunrise_signal_adapter, 'MultiSymbolSignalManager'):
                     self.signal_manager = sunrise_signal_adapter.MultiSymbolSignalManager()
@@ -1008,93 +1152,148 @@ class AdvancedMT5TradingMonitorGUI:
         except Exception as e:
             self.terminal_log(f" Signal processing error: {str(e)}", "ERROR")
 
-    def attempt_reconnect(self):
-        """Attempt to re-establish MT5 connection after IPC failure
-        
-        Features:
-        - Retry limit (MAX_RECONNECT_ATTEMPTS) to prevent infinite loops
-        - Exponential backoff between retries
-        - Resets counter on successful reconnection
+    def start_connection_supervisor(self):
+        """Start the background MT5 link supervisor (replaces inline reconnects)
         
-        Returns:
-            bool: True if reconnection successful, False otherwise
+        - Health probe every CONNECTION_PROBE_SECONDS, re-probe at once on a reported failure
+        - Jittered exponential backoff, DOWN after MAX_RECONNECT_ATTEMPTS but never gives up
+        - Positions, bars and symbol specs are re-synced after every reconnect
         """
-        # Check retry limit
-        if self.reconnect_attempts >= MAX_RECONNECT_ATTEMPTS:
-            self.terminal_log(f"[X] Max reconnect attempts ({MAX_RECONNECT_ATTEMPTS}) reached - Manual intervention required", "ERROR", critical=True)
-            self.terminal_log("   Please check MT5 terminal and restart the bot", "ERROR", critical=True)
-            return False
-        
-        self.reconnect_attempts += 1
+        if connection_supervisor is None:
+            return
+        if self.connection_supervisor is None:
+            self.connection_supervisor = connection_supervisor.ConnectionSupervisor(
+                connect_fn=self._reconnect_terminal,
+                probe_fn=self._probe_terminal,
+                disconnect_fn=mt5.shutdown,  # type: ignore
+                on_state_change=self.on_connection_state_change,
+                on_reconnected=self.request_resync,
+                probe_interval=CONNECTION_PROBE_SECONDS,
+                base_backoff=RECONNECT_BACKOFF_SECONDS,
+                max_backoff=RECONNECT_MAX_BACKOFF_SECONDS,
+                down_after=MAX_RECONNECT_ATTEMPTS,
+                logger=self.logger,
+            )
+        self.connection_supervisor.start()
+
+    def _probe_terminal(self):
+        """Health probe: terminal reachable and connected to the trade server"""
+        info = mt5.terminal_info()  # type: ignore
+        return info is not None and bool(getattr(info, 'connected', True))
+
+    def _reconnect_terminal(self):
+        """Reconnect attempt run by the supervisor thread (never on the monitor thread)"""
+        return bool(mt5.initialize()) and mt5.account_info() is not None  # type: ignore
+
+    def connection_available(self):
+        """False while the supervisor is reconnecting / down - callers fail fast"""
+        if self.connection_supervisor is None:
+            return self.mt5_connected
+        return self.connection_supervisor.available
+
+    def report_connection_failure(self, symbol, reason):
+        """Hand a failed terminal call to the supervisor (non-blocking)"""
+        self.link_failed_symbols.add(symbol)
+        if self.connection_supervisor is not None:
+            self.terminal_log(f" {symbol}: {reason} - Link check requested, symbol retried after reconnect",
+                            "WARNING", critical=True)
+            self.connection_supervisor.report_failure(f"{symbol}: {reason}")
+
+    def on_connection_state_change(self, old_state, new_state, reason):
+        """Supervisor callback (supervisor thread): log and update the status label"""
+        available = new_state in (connection_supervisor.CONNECTED, connection_supervisor.DEGRADED)
+        self.mt5_connected = available
+        level = "SUCCESS" if new_state == connection_supervisor.CONNECTED else (
+            "ERROR" if new_state == connection_supervisor.DOWN else "WARNING")
+        self.terminal_log(f" MT5 LINK: {old_state} -> {new_state} ({reason})", level, critical=True)
+        colors = {connection_supervisor.CONNECTED: "green", connection_supervisor.DEGRADED: "orange",
+                  connection_supervisor.RECONNECTING: "orange", connection_supervisor.DOWN: "red"}
+        text = "Connected" if new_state == connection_supervisor.CONNECTED else new_state.title()
+        if self.root is not None:
+            self.root.after(0, lambda: self.connection_status_label.config(text=text,
+                                                                           foreground=colors[new_state]))
+
+    def request_resync(self):
+        """Supervisor hook (supervisor thread, link not yet reported CONNECTED)
         
-        # Calculate backoff with exponential increase
-        backoff = RECONNECT_BACKOFF_SECONDS * (2 ** (self.reconnect_attempts - 1))
+        strategy_states belongs to the monitor thread, so while monitoring the
+        re-sync is left to it: the loop runs it before its next candle cycle.
+        """
+        if self.monitoring_active:
+            self.resync_pending = True
+        else:
+            self.resync_after_reconnect()
+
+    def resync_after_reconnect(self):
+        """Re-sync bars, specs and positions with the (possibly different) server"""
+        if self.rates_cache is not None:
+            self.rates_cache.clear()
+        if self.symbol_specs is not None:
+            self.symbol_specs.refresh()  # Re-read specs, logging any broker spec change
+        
+        positions = mt5.positions_get()  # type: ignore
+        if positions is None:
+            return
+        open_symbols = {}
+        for position in positions:
+            open_symbols.setdefault(position.symbol, position)
+        for symbol, state in list(self.strategy_states.items()):
+            position = open_symbols.get(symbol)
+            if position is not None and state.entry_state != 'IN_TRADE':
+                self.terminal_log(f"🔄 {symbol}: Position #{position.ticket} opened while disconnected - Syncing state to IN_TRADE",
+                                "WARNING", critical=True)
+                state.entry_state = 'IN_TRADE'
+                state.phase = 'IN_TRADE'
+                state.armed_direction = 'LONG' if position.type == 0 else 'SHORT'
+            elif position is None and state.entry_state == 'IN_TRADE':
+                self.terminal_log(f" {symbol}: Position closed while disconnected - Unlocking for new signals",
+                                "INFO", critical=True)
+                self._reset_entry_state(symbol)
+            else:
+                continue
+            self.publish_state(symbol)
+        self.terminal_log(f"[OK] Re-synced after reconnect: {len(positions)} open positions", "SUCCESS", critical=True)
+        if self.root is not None:
+            self.root.after(0, self.update_strategy_displays)
+
+    def fetch_rates(self, symbol, count):
+        """Newest ``count`` M5 bars (forming bar last) through the shared rates cache
         
-        self.terminal_log(f" CONNECTION LOST: Reconnect attempt {self.reconnect_attempts}/{MAX_RECONNECT_ATTEMPTS} (backoff: {backoff}s)", "WARNING", critical=True)
+        Returns a read-only view (or None like copy_rates_from_pos); only the
+        newest bars are transferred from the terminal after the first call.
+        """
+        if self.rates_cache is None:
+            return mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, count)  # type: ignore
+        self.rates_cache.bind(mt5)
+        return self.rates_cache.get_rates(symbol, mt5.TIMEFRAME_M5, count)  # type: ignore
+
+    def get_symbol_spec(self, symbol):
+        """symbol_info-like spec through the shared spec cache (None if unknown)
         
-        try:
-            # Force shutdown of existing connection
-            if mt5:
-                mt5.shutdown()
-            time.sleep(backoff)
-            
-            # Attempt re-initialization
-            if mt5.initialize():
-                self.terminal_log("[OK] Reconnection successful - Resuming monitoring", "SUCCESS", critical=True)
-                self.mt5_connected = True
-                self.reconnect_attempts = 0  # Reset counter on success
-                # Update GUI from main thread
-                self.root.after(0, lambda: self.connection_status_label.config(text="Connected", foreground="green"))
-                return True
-            else:
-                self.terminal_log(f"[X] Reconnection failed: {mt5.last_error()}", "ERROR", critical=True)
-                return False
-        except Exception as e:
-            self.terminal_log(f"[X] Reconnection error: {str(e)}", "ERROR", critical=True)
-            return False
+        Static fields are re-read after hours; tick values of cross-currency
+        symbols after a minute.
+        """
+        if self.symbol_specs is None:
+            return mt5.symbol_info(symbol)  # type: ignore
+        self.symbol_specs.bind(mt5)
+        return self.symbol_specs.get(symbol)
 
     def save_strategy_state(self):
         """ PERSISTENCE: Save current strategy state to JSON file
         
         Features:
         - Atomic write (temp file + rename) to prevent corruption
-        - Deep copy for nested structures
-        - Clears signals list to prevent unbounded growth
+        - SymbolState.to_dict() serializes scalar fields only (no deep copy)
         - Uses configurable filename from STATE_FILE_NAME
         """
         try:
-            import copy
             state_file = os.path.join(os.getcwd(), STATE_FILE_NAME)
             temp_file = state_file + '.tmp'
             serializable_state = {}
             
             for symbol, state in self.strategy_states.items():
-                # Create a DEEP copy to avoid modifying original
-                s_copy = copy.deepcopy(state)
-                
-                # Remove non-serializable objects (DataFrames, etc)
-                keys_to_remove = ['indicators', 'crossover_data', 'signal_trigger_candle']
-                for k in keys_to_remove:
-                    if k in s_copy:
-                        del s_copy[k]
-                
-                # Clear signals list to prevent unbounded growth
-                if 'signals' in s_copy:
-                    s_copy['signals'] = []
-                
-                # Convert datetimes to ISO strings
-                datetime_keys = ['last_update', 'last_candle_time', 'last_pullback_check_candle', 
-                               'last_crossover_check_candle', 'armed_at_candle_time']
-                for k in datetime_keys:
-                    if k in s_copy and isinstance(s_copy[k], datetime):
-                        s_copy[k] = s_copy[k].isoformat()
-                
-                # Handle pandas Timestamp objects
-                for k in datetime_keys:
-                    if k in s_copy and hasattr(s_copy[k], 'isoformat'):
-                        s_copy[k] = s_copy[k].isoformat()
-                    
-                serializable_state[symbol] = s_copy
+                # Persisted scalar fields only (indicators/crossover data are rebuilt on next candle)
+                serializable_state[symbol] = state.to_dict()
             
             # Atomic write: write to temp file then rename
             with open(temp_file, 'w') as f:
@@ -1171,30 +1370,9 @@ class AdvancedMT5TradingMonitorGUI:
                         self.terminal_log(f" {symbol}: Invalid entry_state '{saved_entry_state}' - Resetting to SCANNING", "WARNING")
                         continue  # Skip loading, leave as SCANNING
                     
-                    # Restore critical state variables
-                    target = self.strategy_states[symbol]
-                    
-                    # Copy scalar values
-                    keys_to_restore = [
-                        'entry_state', 'phase', 'armed_direction', 'pullback_candle_count',
-                        'window_active', 'window_bar_start', 'window_expiry_bar',
-                        'window_top_limit', 'window_bottom_limit', 'current_bar',
-                        'candle_sequence_counter', 'last_pullback_candle_high', 'last_pullback_candle_low'
-                    ]
-                    
-                    for k in keys_to_restore:
-                        if k in s_data:
-                            target[k] = s_data[k]
-                            
-                    # Restore datetimes with specific exception handling
-                    datetime_keys = ['last_candle_time', 'last_pullback_check_candle', 
-                                   'last_crossover_check_candle', 'armed_at_candle_time']
-                    for k in datetime_keys:
-                        if k in s_data and s_data[k]:
-                            try:
-                                target[k] = datetime.fromisoformat(s_data[k])
-                            except (ValueError, TypeError):
-                                pass  # Leave as None if parse fails
+                    # Restore critical state variables (scalars + candle timestamps)
+                    self.strategy_states[symbol].restore(s_data)
+                    self.publish_state(symbol)
                         
                     loaded_count += 1
             
@@ -1232,9 +1410,7 @@ class AdvancedMT5TradingMonitorGUI:
                 # 3. Reset internal state
                 for symbol in self.strategy_states:
                     self._reset_entry_state(symbol)
-                
-                # 4. Reset reconnect counter
-                self.reconnect_attempts = 0
+                    self.publish_state(symbol)
                 
                 self.update_strategy_displays()
                 self.terminal_log(" MEMORY WIPED: All strategies reset to SCANNING", "WARNING", critical=True)
@@ -1307,9 +1483,16 @@ class AdvancedMT5TradingMonitorGUI:
         """
         last_summary = time.time()
         last_candle_check = {}  # Track last candle time per symbol
+        check_key = None
+        deferred_symbols = []  # SCANNING symbols deferred by the cycle time budget
         
         while self.monitoring_active and not self.stop_event.is_set():
             try:
+                if self.resync_pending and self.connection_available():
+                    # Reconnected: re-sync before any candle runs against the new session
+                    self.resync_pending = False
+                    self.resync_after_reconnect()
+                
                 current_minute = datetime.now().minute
                 current_second = datetime.now().second
                 
@@ -1318,6 +1501,7 @@ class AdvancedMT5TradingMonitorGUI:
                 # Check in the first 10 seconds after close to catch the new candle
                 is_candle_close_time = (current_minute % 5 == 0) and (current_second <= 10)
                 
+                pending_symbols = []
                 if is_candle_close_time:
                     # Create check key for this minute
                     check_key = f"{datetime.now().strftime('%Y-%m-%d %H:%M')}"
@@ -1328,12 +1512,26 @@ class AdvancedMT5TradingMonitorGUI:
                                         "INFO", critical=True)
                         last_candle_check['last_candle_log'] = check_key
                     
-                    # Monitor each strategy's phase on candle close
-                    for symbol in self.strategy_states.keys():
-                        # Check if we haven't processed this minute yet
-                        if last_candle_check.get(symbol) != check_key:
-                            self.monitor_strategy_phase(symbol)
+                    # Symbols not yet processed for this candle
+                    pending_symbols = [symbol for symbol in list(self.strategy_states.keys())
+                                       if last_candle_check.get(symbol) != check_key]
+                elif deferred_symbols:
+                    # Budget-deferred SCANNING symbols from the last candle close
+                    pending_symbols = [symbol for symbol in deferred_symbols
+                                       if last_candle_check.get(symbol) != check_key]
+                
+                if pending_symbols and not self.connection_available():
+                    # Link reconnecting/down: fail fast, queue this candle until the supervisor is back
+                    deferred_symbols = pending_symbols
+                elif pending_symbols:
+                    # Priority-ordered cycle: WINDOW_OPEN -> ARMED -> IN_TRADE -> SCANNING
+                    report = self.run_candle_cycle(pending_symbols)
+                    # Symbols whose fetch hit a link failure are retried once the supervisor recovers
+                    link_failed, self.link_failed_symbols = self.link_failed_symbols, set()
+                    for symbol in report.processed + report.position_checked:
+                        if symbol not in link_failed:
                             last_candle_check[symbol] = check_key
+                    deferred_symbols = report.deferred + [s for s in pending_symbols if s in link_failed]
                     
                     # PERSISTENCE: Save state after processing candle close
                     self.save_strategy_state()
@@ -1354,6 +1552,147 @@ class AdvancedMT5TradingMonitorGUI:
                 self.terminal_log(f"[X] Monitoring error: {str(e)}", "ERROR")
                 time.sleep(CANDLE_CHECK_SLEEP_SECONDS)
                 
+    def run_candle_cycle(self, symbols):
+        """Process one candle for the given symbols in priority order
+        
+        - WINDOW_OPEN first (may execute a trade), then ARMED, then SCANNING
+        - IN_TRADE symbols only get a cheap position check (no data fetch)
+        - SCANNING work past CYCLE_TIME_BUDGET_SECONDS is deferred (never fetched), never breakouts
+        - Bars are fetched per batch on the worker pool (MONITOR_WORKER_THREADS),
+          then indicators are computed for the whole batch at once
+        
+        Returns:
+            CycleReport: processed / position_checked / deferred symbols
+        """
+        if self.candle_scheduler is None:
+            self.candle_scheduler = candle_scheduler.CandleScheduler(
+                process_fn=self.process_symbol,
+                position_check_fn=self.check_position_still_open,
+                time_budget_seconds=CYCLE_TIME_BUDGET_SECONDS,
+                prepare_fn=self.prepare_candle_batch,
+                fetch_fn=self.fetch_candle_bars,
+                max_workers=MONITOR_WORKER_THREADS,
+                logger=self.logger,
+            )
+        
+        if MONITOR_WORKER_THREADS > 1 and self.monitor_executor is None:
+            self.monitor_executor = ThreadPoolExecutor(max_workers=MONITOR_WORKER_THREADS,
+                                                       thread_name_prefix="symbol-worker")
+        
+        entry_states = {symbol: self.strategy_states[symbol].entry_state
+                        for symbol in symbols if symbol in self.strategy_states}
+        self.candle_batch = {}  # Nothing carried over from the previous candle
+        if self.profiler is not None:
+            self.profiler.begin_cycle(self)
+        try:
+            report = self.candle_scheduler.run_cycle(entry_states, executor=self.monitor_executor)
+        finally:
+            profile_dir = self.profiler.end_cycle() if self.profiler is not None else None
+        if profile_dir:
+            self.terminal_log(f"[OK] Candle profile written to {profile_dir} (collapsed stacks, allocations, summary.json)",
+                              "SUCCESS", critical=True)
+        
+        if report.deferred:
+            self.terminal_log(f"[T] Cycle budget ({CYCLE_TIME_BUDGET_SECONDS}s) reached after {report.elapsed:.1f}s - "
+                            f"deferred {len(report.deferred)} SCANNING symbols: {', '.join(report.deferred)}",
+                            "WARNING", critical=True)
+        return report
+    
+    def fetch_candle_bars(self, symbol):
+        """Closed bars for one full-path symbol (runs on a symbol worker)
+        
+        Returns:
+            DataFrame of closed bars, or None (invalid config, fetch error or
+            too few bars - the per-symbol path then handles retry/logging)
+        """
+        config = self.strategy_configs.get(symbol, {})
+        if config.get('_config_valid') != True or not mt5 or pd is None:
+            return None
+        
+        rates = self.fetch_rates(symbol, BARS_TO_FETCH)
+        if rates is None or len(rates) < MIN_BARS_REQUIRED:
+            return None
+        
+        df = pd.DataFrame(rates)  # type: ignore
+        df['time'] = pd.to_datetime(df['time'], unit='s')  # type: ignore
+        df = df.iloc[:-1].copy()  # Remove forming candle
+        return df if len(df) >= MIN_BARS_REQUIRED else None
+    
+    def prepare_candle_batch(self, frames):
+        """Compute EMAs/ATR for one scheduler batch in ONE vectorized pass
+        
+        The batch's close/high/low arrays (fetched on the workers by
+        fetch_candle_bars) are stacked into symbols x bars matrices and every
+        EMA/ATR is computed by a single recurrence, so the indicator cost of a
+        candle close barely grows with the number of symbols.
+        monitor_strategy_phase consumes the results via self.candle_batch.
+        
+        Args:
+            frames: {symbol: closed-bar DataFrame or None}
+        """
+        batch_results = {}
+        frames = {symbol: df for symbol, df in frames.items() if df is not None}
+        if indicator_batch is not None and frames:
+            batch = indicator_batch.IndicatorBatch()
+            for symbol, df in frames.items():
+                batch.add(symbol, df['close'].values, df['high'].values, df['low'].values,
+                          self.get_indicator_periods(symbol))
+            values = batch.compute()
+            for symbol, df in frames.items():
+                batch_results[symbol] = {'df': df, 'values': values[symbol]}
+        
+        self.candle_batch = batch_results
+    
+    def get_indicator_periods(self, symbol):
+        """EMA/ATR periods for a symbol from its strategy config
+        
+        Returns:
+            dict: {'ema_fast', 'ema_medium', 'ema_slow', 'ema_filter', 'atr'} -> int
+        """
+        config = self.strategy_configs.get(symbol, {})
+        return {
+            'ema_fast': self.extract_numeric_value(config.get('ema_fast_length', 
+                                                   config.get('Fast EMA Period', '18'))),
+            'ema_medium': self.extract_numeric_value(config.get('ema_medium_length', 
+                                                     config.get('Medium EMA Period', '18'))),
+            'ema_slow': self.extract_numeric_value(config.get('ema_slow_length', 
+                                                   config.get('Slow EMA Period', '24'))),
+            'ema_filter': self.extract_numeric_value(config.get('ema_filter_price_length', 
+                                                     config.get('Price Filter EMA Period', '100'))),
+            'atr': self.extract_numeric_value(config.get('atr_length', 
+                                              config.get('ATR Period', '10'))),
+        }
+    
+    def process_symbol(self, symbol):
+        """Full candle processing for one symbol, then publish its GUI snapshot"""
+        try:
+            self.monitor_strategy_phase(symbol)
+        finally:
+            self.publish_state(symbol)
+    
+    def publish_state(self, symbol):
+        """Publish an immutable copy of the symbol state for lock-free GUI reads
+        
+        Dict item assignment is atomic, so the GUI thread always sees either the
+        previous or the new complete snapshot - never a half-updated state.
+        """
+        self.state_snapshots[symbol] = self.strategy_states[symbol].snapshot()
+    
+    def check_position_still_open(self, symbol):
+        """Cheap IN_TRADE check - only queries open positions, no bar fetch
+        
+        Returns:
+            bool: True if the position is still open (skip symbol this candle)
+        """
+        if not mt5:
+            return False
+        positions = mt5.positions_get(symbol=symbol)  # type: ignore
+        if positions is not None and len(positions) > 0:
+            self.terminal_log(f" {symbol}: Position still open (Ticket #{positions[0].ticket}) - Skipping signal detection", 
+                            "DEBUG", critical=False)
+            return True
+        return False
+    
     def monitor_strategy_phase(self, symbol):
         """Monitor individual strategy phase and state"""
         try:
@@ -1385,29 +1724,26 @@ class AdvancedMT5TradingMonitorGUI:
             
             # PERFORMANCE OPTIMIZATION: Skip full data fetch if in WINDOW_OPEN
             # When monitoring breakout window, we only need current price, not full indicator recalculation
-            state = self.strategy_states.get(symbol, {})
-            entry_state = state.get('entry_state', 'SCANNING')
+            state = self.strategy_states[symbol]
+            entry_state = state.entry_state
             
             if entry_state == 'WINDOW_OPEN':
                 # DEBUG: Log entry into fast path
-                window_start = state.get('window_bar_start', 'N/A')
-                window_expiry = state.get('window_expiry_bar', 'N/A')
-                current_bar = state.get('current_bar', 'N/A')
+                window_start = state.window_bar_start
+                window_expiry = state.window_expiry_bar
+                current_bar = state.current_bar
                 self.terminal_log(f" {symbol}: FAST PATH (WINDOW_OPEN) | Bar: {current_bar} | Window: {window_start}-{window_expiry}", 
                                 "DEBUG", critical=True)
                 
                 # Fast path: Fetch more bars for proper chart display (100 bars for charting)
                 # We need enough data to show the chart properly, not just 2-3 bars
-                rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, 101)  # type: ignore
+                rates = self.fetch_rates(symbol, 101)
                 
                 # RECONNECT LOGIC: Handle IPC failures
                 if rates is None:
                     error_code, error_msg = mt5.last_error()
                     if error_code == -10001 or "IPC send failed" in str(error_msg):
-                        self.terminal_log(f" {symbol}: IPC Error detected - Attempting reconnect...", "WARNING", critical=True)
-                        if self.attempt_reconnect():
-                            # Retry fetch once
-                            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, 101)
+                        self.report_connection_failure(symbol, "IPC error")
                 
                 if rates is None or len(rates) < 2:
                     self.terminal_log(f"[X] {symbol}: Fast path failed - no data from MT5", "ERROR", critical=True)
@@ -1433,14 +1769,14 @@ class AdvancedMT5TradingMonitorGUI:
                     current_candle_time = df['time'].iloc[-1]  #  FIX: Use actual timestamp, not df index
                     
                     # Check if this is a new candle (timestamp changed)
-                    if 'last_candle_time' not in state or state['last_candle_time'] != current_candle_time:
-                        state['current_bar'] = state.get('current_bar', 0) + 1
-                        state['last_candle_time'] = current_candle_time
-                        self.terminal_log(f" {symbol}: Bar counter incremented to {state['current_bar']}", 
+                    if state.last_candle_time != current_candle_time:
+                        state.current_bar = state.current_bar + 1
+                        state.last_candle_time = current_candle_time
+                        self.terminal_log(f" {symbol}: Bar counter incremented to {state.current_bar}", 
                                         "DEBUG", critical=True)
                 
                 # Reuse existing indicators (they don't change during window monitoring)
-                indicators = state.get('indicators', {})
+                indicators = state.indicators
                 if not indicators:
                     # Fallback: If no indicators cached, do full fetch (shouldn't happen)
                     self.terminal_log(f" {symbol}: No cached indicators in WINDOW_OPEN, doing full fetch", 
@@ -1452,9 +1788,9 @@ class AdvancedMT5TradingMonitorGUI:
                                     "DEBUG", critical=True)
                     current_phase = self.determine_strategy_phase(symbol, df, indicators)
                     
-                    # Update only price-related indicators
+                    # Update only price-related indicators (new dict - published snapshots stay immutable)
                     if len(df) > 0:
-                        indicators['current_price'] = float(df['close'].iloc[-1])
+                        indicators = dict(indicators, current_price=float(df['close'].iloc[-1]))
                     
                     # Update chart data with recent bars (for proper visualization)
                     self.chart_data[symbol] = {
@@ -1464,31 +1800,37 @@ class AdvancedMT5TradingMonitorGUI:
                     }
                     
                     # AUTO-REFRESH CHART: Update chart if this symbol is currently displayed
-                    if MATPLOTLIB_AVAILABLE and self.chart_symbol_var.get() == symbol:
-                        self.root.after(0, self.refresh_chart)  # Thread-safe GUI update
+                    if MATPLOTLIB_AVAILABLE and self.root is not None:
+                        self.root.after(0, self.refresh_chart_if_selected, symbol)  # Checked on the Tk thread
                     
                     # Update state timestamp
-                    state['indicators'] = indicators
-                    state['last_update'] = datetime.now()
+                    state.indicators = indicators
+                    state.last_update = datetime.now()
                     
                     self.terminal_log(f"[OK] {symbol}: Fast path completed successfully | Phase: {current_phase}", 
                                     "DEBUG", critical=True)
                     return  # Exit early, skip full processing
             
+            # BATCH PATH: Bars + EMA/ATR already computed for this symbol's batch by prepare_candle_batch
+            batch_entry = self.candle_batch.pop(symbol, None)
+            if batch_entry is not None:
+                df = batch_entry['df']
+                indicators = self.calculate_indicators(df, symbol, precomputed=batch_entry['values'])
+                self._finish_full_path(symbol, df, indicators)
+                return
+            
             # Full path: Fetch complete data for indicator calculation (SCANNING, ARMED states)
             # OPTIMIZED: Reduced from 501 to 151 bars
             # Longest EMA is Filter EMA (100) - we fetch 1.5x for stability (150 + 1 forming)
             # This reduces data processing by 70% while maintaining accuracy
-            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, BARS_TO_FETCH)  # type: ignore
+            rates = self.fetch_rates(symbol, BARS_TO_FETCH)
             
             # RECONNECT LOGIC: Handle IPC failures
             if rates is None:
                 error_code, error_msg = mt5.last_error()
                 if error_code == -10001 or "IPC send failed" in str(error_msg):
-                    self.terminal_log(f" {symbol}: IPC Error detected - Attempting reconnect...", "WARNING", critical=True)
-                    if self.attempt_reconnect():
-                        # Retry fetch once
-                        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, BARS_TO_FETCH)
+                    self.report_connection_failure(symbol, "IPC error")
+                    return
             
             if rates is None:
                 error = mt5.last_error()  # type: ignore
@@ -1512,17 +1854,24 @@ class AdvancedMT5TradingMonitorGUI:
             
             # Calculate indicators (only for SCANNING/ARMED states)
             indicators = self.calculate_indicators(df, symbol)
+            self._finish_full_path(symbol, df, indicators)
             
+        except Exception as e:
+            self.terminal_log(f"[X] {symbol} monitoring error: {str(e)}", "ERROR")
+    
+    def _finish_full_path(self, symbol, df, indicators):
+        """Run the state machine on fresh indicators and update state/chart data"""
+        try:
             # Simulate strategy phase logic (simplified)
             current_phase = self.determine_strategy_phase(symbol, df, indicators)
             
             # Update strategy state
             state = self.strategy_states[symbol]
             
-            if state['phase'] != current_phase:
+            if state.phase != current_phase:
                 # Phase changed - log transition with more detail
                 timestamp = datetime.now().strftime("%H:%M:%S")
-                transition_msg = f" {symbol}: {state['phase']} -> {current_phase}"
+                transition_msg = f" {symbol}: {state.phase} -> {current_phase}"
                 
                 # Add context based on phase
                 if current_phase == 'WAITING_PULLBACK':
@@ -1530,473 +1879,97 @@ class AdvancedMT5TradingMonitorGUI:
                 elif current_phase == 'WAITING_BREAKOUT':
                     import random
                     pullback_count = random.randint(1, 3)  # Simulate pullback count
-                    state['pullback_count'] = pullback_count
+                    state.pullback_count = pullback_count
                     transition_msg += f" | Pullback complete ({pullback_count} candles), window opening"
-                    state['window_active'] = True
+                    state.window_active = True
                 elif current_phase == 'NORMAL':
-                    if state['phase'] == 'WAITING_BREAKOUT':
+                    if state.phase == 'WAITING_BREAKOUT':
                         transition_msg += f" | Window expired or breakout occurred"
                     else:
                         transition_msg += f" | Signal invalidated, reset to scanning"
-                    state['window_active'] = False
-                    state['pullback_count'] = 0
+                    state.window_active = False
+                    state.pullback_count = 0
                 
                 # Add price and indicator context
                 current_price = indicators.get('current_price', 0)
                 trend = indicators.get('trend', 'UNKNOWN')
-                digits = state.get('digits', 5)
+                digits = state.digits
                 transition_msg += f" | Price: {current_price:.{digits}f} | Trend: {trend}"
                 
                 self.terminal_log(transition_msg, current_phase.replace('WAITING_', ''))
-                state['phase'] = current_phase
+                state.phase = current_phase
                 
                 # Log to all-assets terminal summary
                 self.log_phase_summary()
                 
             # Update indicators and timestamp
-            state['indicators'] = indicators
-            state['last_update'] = datetime.now()
+            state.indicators = indicators
+            state.last_update = datetime.now()
             
             # Store chart data with optimized history for visualization
             # OPTIMIZED: Reduced from 250 to 100 bars for better chart zoom
-            # 100 bars = 500 minutes = 8.3 hours of M5 data (perfect for intraday view)
-            self.chart_data[symbol] = {
-                'df': df.tail(CHART_DISPLAY_BARS),  # Show last N bars (much better zoom level)
-                'indicators': indicators,
-                'timestamp': datetime.now()
-            }
-            
-        except Exception as e:
-            self.terminal_log(f"[X] {symbol} monitoring error: {str(e)}", "ERROR")
-    
-    # ==========
-    # FILTER VALIDATION FUNCTIONS - Universal for all assets
-    # ==========
-    
-    def _validate_atr_filter(self, symbol, df, direction='LONG'):
-        """Validate ATR volatility filter - UNIVERSAL for all assets
-        
-        Checks:
-        1. ATR range (min/max thresholds)
-        2. ATR increment filter (positive changes)
-        3. ATR decrement filter (negative changes)
-        
-        Returns:
-            bool: True if ATR passes all filters (or filter disabled), False otherwise
-        """
-        if df is None or len(df) < 2 or 'atr' not in df.columns:
-            return True  # Cannot validate, allow to pass
-        
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            
-            # Check if ATR filter enabled
-            filter_key = f'{direction}_USE_ATR_FILTER'
-            filter_enabled = config.get(filter_key, 'False')
-            
-            if not self.extract_bool_value(filter_enabled):
-                return True  # Filter disabled
-            
-            # Get current ATR
-            current_atr = df['atr'].iloc[-1]
-            if pd.isna(current_atr) or current_atr <= 0:
-                return False  # Invalid ATR
-            
-            # Check ATR range
-            min_key = f'{direction}_ATR_MIN_THRESHOLD'
-            max_key = f'{direction}_ATR_MAX_THRESHOLD'
-            min_atr = float(config.get(min_key, 0.0))
-            max_atr = float(config.get(max_key, 999.0))
-            
-            if current_atr < min_atr or current_atr > max_atr:
-                self.terminal_log(
-                    f"[X] {symbol} {direction}: ATR {current_atr:.6f} outside range [{min_atr:.6f}, {max_atr:.6f}]", 
-                    "WARNING", critical=True
-                )
-                return False
-            
-            # Check ATR increment/decrement filters
-            # CRITICAL FIX: Calculate change from SIGNAL DETECTION, not previous bar
-            # Matches strategy logic: self.entry_atr_increment = current_atr - self.signal_detection_atr
-            
-            state = self.strategy_states.get(symbol, {})
-            signal_atr = state.get('signal_detection_atr')
-            
-            atr_change = 0.0
-            has_valid_change = False
-            
-            if signal_atr is not None and signal_atr > 0:
-                # Correct calculation: Change since signal detection (Phase 1)
-                atr_change = current_atr - signal_atr
-                has_valid_change = True
-            elif len(df) >= 2:
-                # Fallback: 1-bar change (only if signal ATR missing, e.g. after restart)
-                prev_atr = df['atr'].iloc[-2]
-                if not pd.isna(prev_atr) and prev_atr > 0:
-                    atr_change = current_atr - prev_atr
-                    has_valid_change = True
-                    self.terminal_log(f" {symbol}: Using 1-bar ATR change (Signal ATR missing)", "DEBUG")
-            
-            if has_valid_change:
-                # Increment filter (positive changes)
-                incr_key = f'{direction}_USE_ATR_INCREMENT_FILTER'
-                if self.extract_bool_value(config.get(incr_key, 'False')) and atr_change >= 0:
-                    min_incr = float(config.get(f'{direction}_ATR_INCREMENT_MIN_THRESHOLD', 0.0))
-                    max_incr = float(config.get(f'{direction}_ATR_INCREMENT_MAX_THRESHOLD', 999.0))
-                    
-                    if atr_change < min_incr or atr_change > max_incr:
-                        self.terminal_log(
-                            f"[X] {symbol} {direction}: ATR increment {atr_change:+.6f} outside range [{min_incr:.6f}, {max_incr:.6f}]", 
-                            "WARNING", critical=True
-                        )
-                        return False
-                    else:
-                        self.terminal_log(f"[OK] {symbol} {direction}: ATR increment {atr_change:+.6f} OK [{min_incr:.6f}, {max_incr:.6f}]", "INFO")
-                
-                # Decrement filter (negative changes)
-                decr_key = f'{direction}_USE_ATR_DECREMENT_FILTER'
-                if self.extract_bool_value(config.get(decr_key, 'False')) and atr_change < 0:
-                    min_decr = float(config.get(f'{direction}_ATR_DECREMENT_MIN_THRESHOLD', -999.0))
-                    max_decr = float(config.get(f'{direction}_ATR_DECREMENT_MAX_THRESHOLD', 0.0))
-                    
-                    if atr_change < min_decr or atr_change > max_decr:
-                        self.terminal_log(
-                            f"[X] {symbol} {direction}: ATR decrement {atr_change:+.6f} outside range [{min_decr:.6f}, {max_decr:.6f}]", 
-                            "WARNING", critical=True
-                        )
-                        return False
-                    else:
-                        self.terminal_log(f"[OK] {symbol} {direction}: ATR decrement {atr_change:+.6f} OK [{min_decr:.6f}, {max_decr:.6f}]", "INFO")
-            
-            return True
-            
-        except Exception as e:
-            self.terminal_log(f" {symbol}: ATR filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade (Originals would not trade on error)
-    
-    def _validate_angle_filter(self, symbol, df, direction='LONG'):
-        """Validate EMA angle filter - UNIVERSAL for all assets
-        
-        Calculates EMA slope angle and checks against min/max thresholds.
-        Uses asset-specific scale factor (10.0 for metals, 10000.0 for forex).
-        
-        Returns:
-            bool: True if angle passes filter (or filter disabled), False otherwise
-        """
-        if df is None or len(df) < 5:
-            return True  # Not enough data, allow to pass
-        
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            
-            # Check if angle filter enabled
-            filter_key = f'{direction}_USE_ANGLE_FILTER'
-            if not self.extract_bool_value(config.get(filter_key, 'False')):
-                return True  # Filter disabled
-            
-            # Calculate EMA confirm (1-period = close price)
-            confirm_period = 1
-            ema_confirm_series = df['close'].ewm(span=confirm_period, adjust=False).mean()
-            
-            if len(ema_confirm_series) < 4:
-                return True  # Not enough data
-            
-            # Get scale factor (asset-specific)
-            scale_factor = float(config.get(f'{direction}_ANGLE_SCALE_FACTOR', 10000.0))
-            
-            # Calculate angle over 1 bar (matching Backtrader original)
-            # Original: (ema_confirm[0] - ema_confirm[-1]) * scale_factor
-            current = ema_confirm_series.iloc[-1]
-            previous = ema_confirm_series.iloc[-2]  # Fixed: was -4 (lookback=3), now -2 (1 bar back)
-            
-            rise = (current - previous) * scale_factor  # Fixed: removed division by lookback
-            angle = math.atan(rise) * (180.0 / math.pi)  # rise/run where run=1
-            
-            # Get angle thresholds
-            min_angle = float(config.get(f'{direction}_MIN_ANGLE', -999.0))
-            max_angle = float(config.get(f'{direction}_MAX_ANGLE', 999.0))
-            
-            # Check range
-            if angle < min_angle or angle > max_angle:
-                self.terminal_log(
-                    f"[X] {symbol} {direction}: Angle {angle:.2f}° outside range [{min_angle:.1f}°, {max_angle:.1f}°]", 
-                    "WARNING", critical=True
-                )
-                return False
-            
-            # Log angle value when passing (v1.2.1 enhancement)
-            self.terminal_log(
-                f"   📐 {symbol}: Angle={angle:.2f}° (range [{min_angle:.1f}°, {max_angle:.1f}°]) → ✅ PASS", 
-                "INFO", critical=True
-            )
-            return True
-            
-        except Exception as e:
-            self.terminal_log(f" {symbol}: Angle filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade
-    
-    def _validate_price_filter(self, symbol, df, direction='LONG'):
-        """Validate price vs filter EMA - UNIVERSAL for all assets
-        
-        Checks if current price is on the correct side of filter EMA.
-        LONG: close > filter_EMA (uptrend)
-        SHORT: close < filter_EMA (downtrend)
-        
-        Returns:
-            bool: True if price passes filter (or filter disabled), False otherwise
-        """
-        if df is None or len(df) < 2:
-            return True  # Not enough data, allow to pass
-        
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            
-            # Check if price filter enabled
-            filter_key = f'{direction}_USE_PRICE_FILTER_EMA'
-            if not self.extract_bool_value(config.get(filter_key, 'False')):
-                return True  # Filter disabled
-            
-            # Get filter EMA period
-            filter_period = self.extract_numeric_value(
-                config.get('ema_filter_price_length', 
-                          config.get('Price Filter EMA Period', '70'))
-            )
-            
-            # Calculate filter EMA
-            if len(df) < filter_period:
-                return True  # Not enough data for filter EMA
-            
-            filter_ema = df['close'].ewm(span=filter_period, adjust=False).mean().iloc[-1]
-            current_close = df['close'].iloc[-1]
-            
-            # Validate based on direction
-            if direction == 'LONG':
-                if current_close <= filter_ema:
-                    self.terminal_log(
-                        f"[X] {symbol} LONG: Price {current_close:.5f} <= Filter EMA({filter_period}) {filter_ema:.5f}", 
-                        "WARNING", critical=True
-                    )
-                    return False
-            elif direction == 'SHORT':
-                if current_close >= filter_ema:
-                    self.terminal_log(
-                        f"[X] {symbol} SHORT: Price {current_close:.5f} >= Filter EMA({filter_period}) {filter_ema:.5f}", 
-                        "WARNING", critical=True
-                    )
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            self.terminal_log(f" {symbol}: Price filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade
-    
-    def _validate_candle_direction(self, symbol, df, direction='LONG'):
-        """Validate previous candle direction - UNIVERSAL for all assets
-        
-        Checks if previous closed candle matches required direction.
-        LONG: previous candle must be bullish (close > open)
-        SHORT: previous candle must be bearish (close < open)
-        
-        Returns:
-            bool: True if candle passes filter (or filter disabled), False otherwise
-        """
-        if df is None or len(df) < 2:
-            return True  # Not enough data, allow to pass
-        
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            
-            # Check if candle direction filter enabled
-            filter_key = f'{direction}_USE_CANDLE_DIRECTION_FILTER'
-            if not self.extract_bool_value(config.get(filter_key, 'False')):
-                return True  # Filter disabled
-            
-            # Get previous candle (Signal Candle)
-            # df already has forming candle removed, so iloc[-1] is the last closed candle
-            prev_close = df['close'].iloc[-1]
-            prev_open = df['open'].iloc[-1]
-            
-            # Validate based on direction
-            if direction == 'LONG':
-                if prev_close <= prev_open:
-                    self.terminal_log(
-                        f"[X] {symbol} LONG: Previous candle not bullish (C:{prev_close:.5f} <= O:{prev_open:.5f})", 
-                        "WARNING", critical=True
-                    )
-                    return False
-            elif direction == 'SHORT':
-                if prev_close >= prev_open:
-                    self.terminal_log(
-                        f"[X] {symbol} SHORT: Previous candle not bearish (C:{prev_close:.5f} >= O:{prev_open:.5f})", 
-                        "WARNING", critical=True
-                    )
-                    return False
-            
-            return True
+            # 100 bars = 500 minutes = 8.3 hours of M5 data (perfect for intraday view)
+            self.chart_data[symbol] = {
+                'df': df.tail(CHART_DISPLAY_BARS),  # Show last N bars (much better zoom level)
+                'indicators': indicators,
+                'timestamp': datetime.now()
+            }
             
         except Exception as e:
-            self.terminal_log(f" {symbol}: Candle direction filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade
+            self.terminal_log(f"[X] {symbol} monitoring error: {str(e)}", "ERROR")
     
-    def _validate_ema_ordering(self, symbol, ema_confirm, ema_fast, ema_medium, ema_slow, direction='LONG'):
-        """Validate EMA ordering - UNIVERSAL for all assets
-        
-        Checks if EMAs are in proper order.
-        LONG: confirm > fast > medium > slow (all EMAs ascending)
-        SHORT: confirm < fast < medium < slow (all EMAs descending)
+    # ==========
+    # FILTER VALIDATION - Compiled filter plans, universal for all assets
+    # ==========
+    
+    def get_filter_plan(self, symbol, direction):
+        """Compiled entry-filter plan for a symbol/direction
         
-        Returns:
-            bool: True if ordering passes filter (or filter disabled), False otherwise
+        Config values are parsed once; the plan is recompiled only when the
+        symbol's config object is replaced (initial load / retry_load_config).
         """
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            
-            # Check if EMA ordering filter enabled
-            filter_key = f'{direction}_USE_EMA_ORDER_CONDITION'
-            if not self.extract_bool_value(config.get(filter_key, 'False')):
-                return True  # Filter disabled
-            
-            # Validate based on direction
-            if direction == 'LONG':
-                # Match original strategy: Confirm > Fast AND Confirm > Medium AND Confirm > Slow
-                # (Not strict stacking like Confirm > Fast > Medium > Slow)
-                if not (ema_confirm > ema_fast and ema_confirm > ema_medium and ema_confirm > ema_slow):
-                    self.terminal_log(
-                        f"[X] {symbol} LONG: EMA ordering failed (Confirm not above all others)", 
-                        "WARNING", critical=True
-                    )
-                    return False
-                else:
-                    self.terminal_log(f"[OK] {symbol} LONG: EMA ordering OK", "INFO")
-            elif direction == 'SHORT':
-                # Match original strategy: Confirm < Fast AND Confirm < Medium AND Confirm < Slow
-                if not (ema_confirm < ema_fast and ema_confirm < ema_medium and ema_confirm < ema_slow):
-                    self.terminal_log(
-                        f"[X] {symbol} SHORT: EMA ordering failed (Confirm not below all others)", 
-                        "WARNING", critical=True
-                    )
-                    return False
-                else:
-                    self.terminal_log(f"[OK] {symbol} SHORT: EMA ordering OK", "INFO")
-            
-            return True
-            
-        except Exception as e:
-            self.terminal_log(f" {symbol}: EMA ordering filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade
+        config = self.strategy_configs.get(symbol, {})
+        cached = self.filter_plans.get((symbol, direction))
+        if cached is None or cached[0] is not config:
+            cached = (config, entry_filters.FilterPlan(config, direction))
+            self.filter_plans[(symbol, direction)] = cached
+        return cached[1]
     
-    def _validate_ema_position_filter(self, symbol, df, ema_fast, ema_medium, ema_slow, direction='LONG'):
-        """Validate EMA position relative to price - UNIVERSAL for all assets
+    def _evaluate_entry_filters(self, symbol, df, direction, filters, emas=None, atr=None):
+        """Evaluate the compiled filter plan on the last closed candle of df
         
-        Checks if EMAs are on the correct side of price.
-        LONG: Price > Fast, Medium, Slow EMAs
-        SHORT: Price < Fast, Medium, Slow EMAs
+        Args:
+            filters: entry_filters bitmask selecting which filters to check
+            emas: optional {'ema_fast', 'ema_medium', 'ema_slow'} series aligned with df;
+                computed from the strategy periods (recursive EMA) when omitted
+            atr: current ATR; ATR filters are skipped when unavailable
         
         Returns:
-            bool: True if position passes filter (or filter disabled), False otherwise
-        """
-        if df is None or len(df) < 1:
-            return True  # Not enough data, allow to pass
-            
-        try:
-            config = self.strategy_configs.get(symbol, {})
-            current_close = df['close'].iloc[-1]
-            
-            # Validate based on direction
-            if direction == 'LONG':
-                # Check if filter enabled
-                if not self.extract_bool_value(config.get('LONG_USE_EMA_BELOW_PRICE_FILTER', 'False')):
-                    return True
-                    
-                # Check if Price is ABOVE all EMAs
-                if current_close > ema_fast and current_close > ema_medium and current_close > ema_slow:
-                    self.terminal_log(f"[OK] {symbol} LONG: Price {current_close:.5f} > All EMAs", "INFO")
-                    return True
-                else:
-                    self.terminal_log(
-                        f"[X] {symbol} LONG: Price {current_close:.5f} not above all EMAs (F:{ema_fast:.5f}, M:{ema_medium:.5f}, S:{ema_slow:.5f})", 
-                        "WARNING", critical=True
-                    )
-                    return False
-                    
-            elif direction == 'SHORT':
-                # Check if filter enabled
-                if not self.extract_bool_value(config.get('SHORT_USE_EMA_ABOVE_PRICE_FILTER', 'False')):
-                    return True
-                    
-                # Check if Price is BELOW all EMAs
-                if current_close < ema_fast and current_close < ema_medium and current_close < ema_slow:
-                    self.terminal_log(f"[OK] {symbol} SHORT: Price {current_close:.5f} < All EMAs", "INFO")
-                    return True
-                else:
-                    self.terminal_log(
-                        f"[X] {symbol} SHORT: Price {current_close:.5f} not below all EMAs (F:{ema_fast:.5f}, M:{ema_medium:.5f}, S:{ema_slow:.5f})", 
-                        "WARNING", critical=True
-                    )
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            self.terminal_log(f" {symbol}: EMA position filter error: {str(e)}", "WARNING")
-            return False  #  FIX: On error, BLOCK trade
-
-    def _validate_time_filter(self, symbol, current_dt, direction):
-        """Validate if current time is within allowed trading hours (UTC)
-        
-        Logic Layer:
-        - Takes Broker Time (current_dt)
-        - Converts to UTC by subtracting broker_utc_offset
-        - Compares against Strategy UTC hours
+            int: rejection bits (0 = all selected filters passed or disabled)
         """
-        config = self.strategy_configs.get(symbol, {})
-        
-        # Check if time filter is enabled
-        use_time_filter = config.get('Use Time Range Filter', 'False')
-        if isinstance(use_time_filter, str):
-            use_time_filter = use_time_filter.lower() in ('true', '1', 'yes')
-            
-        if not use_time_filter:
-            return True
-            
         try:
-            # 1. Get Broker Offset (Logic Layer)
-            utc_offset = getattr(self, 'broker_utc_offset', 1)
-            
-            # 2. Convert Broker Time to UTC (Strategy_Time_UTC = Broker_Time - Selected_Offset)
-            # current_dt is the time from the broker (e.g. Market Watch time)
-            strategy_time_utc = current_dt - timedelta(hours=utc_offset)
-            
-            # 3. Get allowed hours (UTC)
-            start_hour = int(config.get('Entry Start Hour (UTC)', 0))
-            start_min = int(config.get('Entry Start Minute', 0))
-            end_hour = int(config.get('Entry End Hour (UTC)', 0))
-            end_min = int(config.get('Entry End Minute', 0))
-            
-            # 4. Convert everything to minutes for easier comparison
-            current_minutes = strategy_time_utc.hour * 60 + strategy_time_utc.minute
-            start_minutes = start_hour * 60 + start_min
-            end_minutes = end_hour * 60 + end_min
-            
-            # Handle overnight ranges (e.g. 22:00 to 02:00)
-            if start_minutes > end_minutes:
-                # Overnight: Allowed if AFTER start OR BEFORE end
-                is_allowed = current_minutes >= start_minutes or current_minutes <= end_minutes
-            else:
-                # Normal: Allowed if AFTER start AND BEFORE end
-                is_allowed = start_minutes <= current_minutes <= end_minutes
-                
-            if not is_allowed:
-                self.terminal_log(f"[T] {symbol}: Outside trading hours (UTC). Current UTC: {strategy_time_utc.strftime('%H:%M')} | Allowed: {start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d}", 
-                                "WARNING", critical=False)
-                return False
-                
-            return True
+            plan = self.get_filter_plan(symbol, direction)
+            if atr is None:
+                filters &= ~(entry_filters.FILTER_ATR | entry_filters.FILTER_ATR_CHANGE)
+            needed = plan.enabled & filters
+            if not needed or df is None or len(df) < 1:
+                return 0
+            
+            needs_emas = needed & (entry_filters.FILTER_EMA_ORDER | entry_filters.FILTER_EMA_POSITION)
+            inputs = plan.build_inputs(
+                df['open'].values, df['close'].values, atr=atr,
+                times=df['time'].values if needed & entry_filters.FILTER_TIME else None,
+                utc_offset_hours=getattr(self, 'broker_utc_offset', 1),
+                ema_periods=self.get_indicator_periods(symbol) if needs_emas and not emas else None)
+            if emas:
+                inputs.update({name: series.values for name, series in emas.items()})
+            inputs['signal_atr'] = self.strategy_states[symbol].signal_detection_atr
+            return plan.evaluate_last(inputs, filters)[1]
             
         except Exception as e:
-            self.terminal_log(f"[X] Time filter error: {str(e)}", "ERROR", critical=True)
-            return True # Fail safe: allow trade if filter fails
+            self.terminal_log(f"[X] {symbol}: Entry filter error: {str(e)}", "ERROR", critical=True)
+            # On error BLOCK the trade - except the time filter, which fails safe
+            return filters & ~entry_filters.FILTER_TIME
     
     def check_crossover_at_candle(self, symbol, df, candle_idx, config):
         """Check for EMA crossover at a specific candle index.
@@ -2092,8 +2065,8 @@ class AdvancedMT5TradingMonitorGUI:
             current_closed_candle_time = df['time'].iloc[-1] if len(df) >= 1 else None
             
             # Check if we've already processed this closed candle for crossovers
-            state = self.strategy_states.get(symbol, {})
-            last_processed_candle = state.get('last_crossover_check_candle', None)
+            state = self.strategy_states[symbol]
+            last_processed_candle = state.last_crossover_check_candle
             
             if current_closed_candle_time == last_processed_candle:
                 # Already processed this closed candle - skip to avoid duplicate signals
@@ -2104,7 +2077,7 @@ class AdvancedMT5TradingMonitorGUI:
             #                 "INFO", critical=False)
             
             # Mark this candle as processed
-            state['last_crossover_check_candle'] = current_closed_candle_time
+            state.last_crossover_check_candle = current_closed_candle_time
             
             # CRITICAL: df already contains ONLY closed candles (forming removed at line 747)
             # Use df directly, don't remove another candle!
@@ -2238,77 +2211,27 @@ class AdvancedMT5TradingMonitorGUI:
             # CRITICAL: VALIDATE ALL FILTERS BEFORE STORING CROSSOVER
             # ==========
             
-            # Get current datetime for time filter
-            if len(df_closed) > 0:
-                current_dt = df_closed['time'].iloc[-1] if isinstance(df_closed['time'].iloc[-1], datetime) else datetime.now()
-            else:
-                current_dt = datetime.now()
-            
-            # CRITICAL FIX: Add ATR to df_closed for filter validation
-            # The indicators dict has ATR but df_closed doesn't have it as a column
-            if indicators and 'atr' in indicators and len(df_closed) > 0:
-                df_closed = df_closed.copy()  # Avoid modifying original
-                df_closed['atr'] = indicators['atr']  # Add as scalar (broadcasts to all rows)
-            
             # Validate BULLISH crossovers (LONG direction)
             if bullish_crossover and not crossover_is_stale:
                 self.terminal_log(f" {symbol}: Bullish crossover detected - validating ALL filters...", 
                                 "INFO", critical=True)
                 
-                all_filters_passed = True
-                
-                # 1. ATR Filter
-                atr_passed = self._validate_atr_filter(symbol, df_closed, 'LONG')
-                self.terminal_log(f"    {symbol}: ATR filter -> {'[OK] PASS' if atr_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not atr_passed:
-                    all_filters_passed = False
-                
-                # 2. Angle Filter
-                angle_passed = self._validate_angle_filter(symbol, df_closed, 'LONG')
-                self.terminal_log(f"    {symbol}: Angle filter -> {'[OK] PASS' if angle_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not angle_passed:
-                    all_filters_passed = False
-                
-                # 3. Price Filter
-                price_passed = self._validate_price_filter(symbol, df_closed, 'LONG')
-                self.terminal_log(f"    {symbol}: Price filter -> {'[OK] PASS' if price_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not price_passed:
-                    all_filters_passed = False
-                
-                # 4. Candle Direction
-                candle_passed = self._validate_candle_direction(symbol, df_closed, 'LONG')
-                self.terminal_log(f"    {symbol}: Candle Direction -> {'[OK] PASS' if candle_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not candle_passed:
-                    all_filters_passed = False
-                
-                # 5. EMA Ordering
-                ema_order_passed = self._validate_ema_ordering(symbol, confirm_ema, fast_ema, medium_ema, slow_ema, 'LONG')
-                self.terminal_log(f"    {symbol}: EMA Ordering -> {'[OK] PASS' if ema_order_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not ema_order_passed:
-                    all_filters_passed = False
-                
-                # 6. EMA Position (new filter)
-                ema_position_passed = self._validate_ema_position_filter(symbol, df_closed, fast_ema, medium_ema, slow_ema, 'LONG')
-                self.terminal_log(f"    {symbol}: EMA Position -> {'[OK] PASS' if ema_position_passed else '[X] FAIL'}", 
-                                "DEBUG", critical=True)
-                if not ema_position_passed:
-                    all_filters_passed = False
-                
                 # NOTE: Time filter is NOT checked here (matches original strategy)
                 # Time filter is only validated at BREAKOUT/ENTRY execution (Phase 4)
+                rejected = self._evaluate_entry_filters(
+                    symbol, df_closed, 'LONG', entry_filters.CROSSOVER_FILTERS,
+                    emas={'ema_fast': ema_fast_series, 'ema_medium': ema_medium_series,
+                          'ema_slow': ema_slow_series},
+                    atr=indicators.get('atr') if indicators else None)
                 
                 # Final decision
-                if all_filters_passed:
+                if not rejected:
                     self.terminal_log(f"[OK] {symbol}: LONG crossover PASSED ALL FILTERS - Ready to ARM", 
                                     "SUCCESS", critical=True)
                 else:
                     bullish_crossover = False
-                    self.terminal_log(f"[X] {symbol}: LONG crossover REJECTED - One or more filters failed", 
+                    failed = ', '.join(entry_filters.describe_rejections(rejected))
+                    self.terminal_log(f"[X] {symbol}: LONG crossover REJECTED - Failed filters: {failed}", 
                                     "WARNING", critical=True)
             
             # ==========
@@ -2330,7 +2253,7 @@ class AdvancedMT5TradingMonitorGUI:
                     bullish_crossover = False
                     bearish_crossover = False
                 
-                self.strategy_states[symbol]['crossover_data'] = {
+                self.strategy_states[symbol].crossover_data = {
                     'bullish_crossover': bullish_crossover,
                     'bearish_crossover': bearish_crossover,
                     'candle_time': current_closed_candle_time
@@ -2339,32 +2262,30 @@ class AdvancedMT5TradingMonitorGUI:
         except Exception as e:
             self.terminal_log(f"[X] Crossover detection error for {symbol}: {str(e)}", "ERROR", critical=True)
     
-    def calculate_indicators(self, df, symbol):
-        """Calculate technical indicators using actual strategy parameters"""
+    def calculate_indicators(self, df, symbol, precomputed=None):
+        """Calculate technical indicators using actual strategy parameters
+        
+        Args:
+            precomputed: optional {'ema_fast', 'ema_medium', 'ema_slow', 'ema_filter', 'atr'}
+                values from the per-candle IndicatorBatch (skips per-symbol ewm/rolling work)
+        """
         indicators = {}
         
         try:
             # Get strategy-specific parameters
             config = self.strategy_configs.get(symbol, {})
             
-            # Debug: log the config keys (remove after testing)
-            # self.terminal_log(f" {symbol} config keys: {list(config.keys())}", "NORMAL")
-            
             # Extract EMA periods from config (using correct parameter names from strategy)
-            fast_period = self.extract_numeric_value(config.get('ema_fast_length', 
-                                                    config.get('Fast EMA Period', '18')))
-            medium_period = self.extract_numeric_value(config.get('ema_medium_length', 
-                                                      config.get('Medium EMA Period', '18')))  
-            slow_period = self.extract_numeric_value(config.get('ema_slow_length', 
-                                                    config.get('Slow EMA Period', '24')))
+            periods = self.get_indicator_periods(symbol)
+            fast_period = periods['ema_fast']
+            medium_period = periods['ema_medium']
+            slow_period = periods['ema_slow']
             
             # WARNING: Check for redundant EMA periods
             if fast_period == medium_period:
                 self.terminal_log(f" {symbol}: Fast EMA ({fast_period}) equals Medium EMA ({medium_period}) - Trend Cloud ineffective", "WARNING")
-            filter_period = self.extract_numeric_value(config.get('ema_filter_price_length', 
-                                                      config.get('Price Filter EMA Period', '100')))
-            atr_period = self.extract_numeric_value(config.get('atr_length', 
-                                                  config.get('ATR Period', '10')))
+            filter_period = periods['ema_filter']
+            atr_period = periods['atr']
             
             # self.terminal_log(f" {symbol} periods - Fast: {fast_period}, Medium: {medium_period}, Slow: {slow_period}, Filter: {filter_period}, ATR: {atr_period}", "NORMAL")
             
@@ -2375,10 +2296,16 @@ class AdvancedMT5TradingMonitorGUI:
             
             # Calculate EMAs with actual periods
             # CRITICAL FIX: Use adjust=False to match standard EMA formula (MT5/backtrader)
-            indicators['ema_fast'] = df['close'].ewm(span=fast_period, adjust=False).mean().iloc[-1]
-            indicators['ema_medium'] = df['close'].ewm(span=medium_period, adjust=False).mean().iloc[-1]
-            indicators['ema_slow'] = df['close'].ewm(span=slow_period, adjust=False).mean().iloc[-1]
-            indicators['ema_filter'] = df['close'].ewm(span=filter_period, adjust=False).mean().iloc[-1]
+            if precomputed:
+                indicators['ema_fast'] = precomputed['ema_fast']
+                indicators['ema_medium'] = precomputed['ema_medium']
+                indicators['ema_slow'] = precomputed['ema_slow']
+                indicators['ema_filter'] = precomputed['ema_filter']
+            else:
+                indicators['ema_fast'] = df['close'].ewm(span=fast_period, adjust=False).mean().iloc[-1]
+                indicators['ema_medium'] = df['close'].ewm(span=medium_period, adjust=False).mean().iloc[-1]
+                indicators['ema_slow'] = df['close'].ewm(span=slow_period, adjust=False).mean().iloc[-1]
+                indicators['ema_filter'] = df['close'].ewm(span=filter_period, adjust=False).mean().iloc[-1]
             
             # Store periods for display
             indicators['ema_fast_period'] = fast_period
@@ -2400,15 +2327,24 @@ class AdvancedMT5TradingMonitorGUI:
             
             # ATR calculation
             if len(df) > 1 and np is not None and pd is not None:
-                high_low = df['high'] - df['low']
-                high_close = np.abs(df['high'] - df['close'].shift())  # type: ignore
-                low_close = np.abs(df['low'] - df['close'].shift())  # type: ignore
-                ranges = pd.concat([high_low, high_close, low_close], axis=1)  # type: ignore
-                true_range = np.max(ranges, axis=1)  # type: ignore
-                atr_value = true_range.rolling(atr_period).mean().iloc[-1]
+                def compute_true_range():
+                    high_low = df['high'] - df['low']
+                    high_close = np.abs(df['high'] - df['close'].shift())  # type: ignore
+                    low_close = np.abs(df['low'] - df['close'].shift())  # type: ignore
+                    ranges = pd.concat([high_low, high_close, low_close], axis=1)  # type: ignore
+                    return np.max(ranges, axis=1)  # type: ignore
+                
+                if precomputed and 'atr' in precomputed:
+                    atr_value = precomputed['atr']
+                    true_range = None
+                else:
+                    true_range = compute_true_range()
+                    atr_value = true_range.rolling(atr_period).mean().iloc[-1]
                 
                 # Validate ATR value
                 if pd.isna(atr_value) or atr_value <= 0:
+                    if true_range is None:
+                        true_range = compute_true_range()
                     # Calculate simple average if rolling window incomplete
                     atr_value = true_range.tail(min(atr_period, len(true_range))).mean()
                     if pd.isna(atr_value) or atr_value <= 0:
@@ -2455,14 +2391,8 @@ class AdvancedMT5TradingMonitorGUI:
             else:
                 indicators['trend'] = 'SIDEWAYS'
                 
-            # EMA array for charting
-            # CRITICAL FIX: Use adjust=False to match standard EMA formula (like MT5/backtrader)
-            # adjust=True (pandas default) uses weighted average that changes with history
-            # adjust=False uses recursive formula: EMA = alpha * Price + (1-alpha) * EMA_prev
-            indicators['ema_fast_array'] = df['close'].ewm(span=fast_period, adjust=False).mean()
-            indicators['ema_medium_array'] = df['close'].ewm(span=medium_period, adjust=False).mean()
-            indicators['ema_slow_array'] = df['close'].ewm(span=slow_period, adjust=False).mean()
-            indicators['ema_filter_array'] = df['close'].ewm(span=filter_period, adjust=False).mean()
+            # NOTE: Only SCALAR values are kept in state indicators.
+            # EMA history for charting is derived from the bar cache (chart_data[symbol]['df']).
             
             # Add confirm EMA for crossover detection
             # EMA(1) with adjust=False is essentially the close price itself
@@ -2581,194 +2511,39 @@ class AdvancedMT5TradingMonitorGUI:
     
     def _reset_entry_state(self, symbol):
         """Reset strategy state to SCANNING (matching original strategy)"""
-        state = self.strategy_states[symbol]
-        state['entry_state'] = 'SCANNING'
-        state['phase'] = 'NORMAL'
-        state['armed_direction'] = None
-        state['pullback_candle_count'] = 0
-        state['signal_trigger_candle'] = None
-        state['last_pullback_candle_high'] = None
-        state['last_pullback_candle_low'] = None
-        state['window_active'] = False
-        state['window_bar_start'] = None
-        state['window_expiry_bar'] = None
-        state['window_top_limit'] = None
-        state['window_bottom_limit'] = None
+        self.strategy_states[symbol].reset_entry()
     
-    def _phase3_open_breakout_window(self, symbol, armed_direction, config, current_bar):
-        """PHASE 3: Open the two-sided breakout window after pullback confirmation
+    def get_phase_machine(self, symbol):
+        """Shared entry state machine for a symbol (src/phase_machine.py)
         
-        Implements true volatility expansion channel with:
-        - Optional time offset controlled by use_window_time_offset parameter
-        - Two-sided channel with success and failure boundaries
-        
-        NOTE: All critical parameters MUST be present (validated at startup)
+        Config values are parsed once; recompiled when the symbol's config
+        object is replaced (initial load / retry_load_config).
         """
-        state = self.strategy_states[symbol]
-        
-        # 1. Implement Optional Time Offset
-        # CRITICAL: No defaults - these were validated at startup
-        window_start_bar = current_bar
-        use_time_offset = config.get('USE_WINDOW_TIME_OFFSET')
-        
-        # Paranoid check - should never happen if validation is working
-        if use_time_offset is None:
-            self.terminal_log(f"[X] CRITICAL BUG: {symbol} USE_WINDOW_TIME_OFFSET is None - this should have been caught at startup!", "ERROR", critical=True)
-            return
-        
-        if isinstance(use_time_offset, str):
-            use_time_offset = use_time_offset.lower() in ('true', '1', 'yes')
-        
-        if use_time_offset:
-            window_offset_multiplier = config.get('WINDOW_OFFSET_MULTIPLIER')
-            if window_offset_multiplier is None:
-                self.terminal_log(f"[X] CRITICAL BUG: {symbol} WINDOW_OFFSET_MULTIPLIER is None!", "ERROR", critical=True)
-                return
-            window_offset_multiplier = float(window_offset_multiplier)
-            time_offset = int(state['pullback_candle_count'] * window_offset_multiplier)
-            window_start_bar = current_bar + time_offset
-        
-        state['window_bar_start'] = window_start_bar
-        
-        # 2. Set Window Duration
-        # CRITICAL: No defaults - validated at startup
-        if armed_direction == 'LONG':
-            window_periods = config.get('LONG_ENTRY_WINDOW_PERIODS')
-            if window_periods is None:
-                self.terminal_log(f"[X] CRITICAL BUG: {symbol} LONG_ENTRY_WINDOW_PERIODS is None!", "ERROR", critical=True)
-                return
-            window_periods = int(window_periods)
-        else:
-            window_periods = config.get('SHORT_ENTRY_WINDOW_PERIODS')
-            if window_periods is None:
-                self.terminal_log(f"[X] CRITICAL BUG: {symbol} SHORT_ENTRY_WINDOW_PERIODS is None!", "ERROR", critical=True)
-                return
-            window_periods = int(window_periods)
-        
-        state['window_expiry_bar'] = window_start_bar + window_periods
-        
-        # 3. Calculate the Two-Sided Price Channel
-        # CRITICAL: No defaults - validated at startup
-        last_high = state['last_pullback_candle_high']
-        last_low = state['last_pullback_candle_low']
-        candle_range = last_high - last_low
-        price_offset_multiplier = config.get('WINDOW_PRICE_OFFSET_MULTIPLIER')
-        if price_offset_multiplier is None:
-            self.terminal_log(f"[X] CRITICAL BUG: {symbol} WINDOW_PRICE_OFFSET_MULTIPLIER is None!", "ERROR", critical=True)
-            return
-        price_offset_multiplier = float(price_offset_multiplier)
-        price_offset = candle_range * price_offset_multiplier
-        
-        state['window_top_limit'] = last_high + price_offset
-        state['window_bottom_limit'] = last_low - price_offset
-        
-        # 4. Final State Transition
-        state['entry_state'] = 'WINDOW_OPEN'
-        state['phase'] = 'WAITING_BREAKOUT'
-        state['window_active'] = True
-        
-        digits = state.get('digits', 5)
-        self.terminal_log(f" {symbol}: Window OPENED ({armed_direction}) | Top: {state['window_top_limit']:.{digits}f} | Bottom: {state['window_bottom_limit']:.{digits}f} | Duration: {window_periods} bars", 
-                        "SUCCESS", critical=True)
+        config = self.strategy_configs.get(symbol, {})
+        cached = self.phase_machines.get(symbol)
+        if cached is None or cached[0] is not config:
+            cached = (config, phase_machine.PhaseMachine(config))
+            self.phase_machines[symbol] = cached
+        return cached[1]
     
-    def _phase4_monitor_window(self, symbol, df, armed_direction, current_bar, current_dt, config):
-        """PHASE 4: Monitor window for breakout
-        
-        Returns:
-            'PENDING' - Window not yet active (time offset)
-            'SUCCESS' - Breakout detected
-            'EXPIRED' - Window timeout
-            'FAILURE' - Failure boundary broken
-            None - Still monitoring
-        """
-        state = self.strategy_states[symbol]
-        digits = state.get('digits', 5)
-        
-        # DEBUG: Show entry into phase4 monitoring
-        self.terminal_log(f" PHASE4: {symbol} | Direction={armed_direction} | Bar={current_bar} | DF_len={len(df)}", 
-                        "DEBUG", critical=True)
-        
-        # Check window active (time offset)
-        if current_bar < state['window_bar_start']:
-            self.terminal_log(f" {symbol}: Window PENDING (bar {current_bar} < start {state['window_bar_start']})", 
-                            "DEBUG", critical=True)
-            return 'PENDING'
-        
-        # Check window expiry (matches original Line 1414: if current_bar > self.window_expiry_bar)
-        if current_bar > state['window_expiry_bar']:
-            self.terminal_log(f" {symbol}: Window EXPIRED (bar {current_bar} > expiry {state['window_expiry_bar']})", 
-                            "WARNING", critical=True)
-            return 'EXPIRED'
-        
-        # Get current price data
-        if len(df) < 1:
-            self.terminal_log(f"[X] {symbol}: No price data in DF!", "ERROR", critical=True)
-            return None
-        
-        current_high = df['high'].iloc[-1]
-        current_low = df['low'].iloc[-1]
-        current_close = df['close'].iloc[-1]
-        
-        # DEBUG: Show current price vs boundaries
-        self.terminal_log(f" {symbol}: Price | High={current_high:.{digits}f} Low={current_low:.{digits}f} Close={current_close:.{digits}f}", 
-                        "DEBUG", critical=True)
-        
-        # Monitor breakouts (matches original Lines 1429-1447)
-        if armed_direction == 'LONG':
-            # DEBUG: Log window boundaries and current price
-            digits = state.get('digits', 5)
-            self.terminal_log(f" LONG WINDOW CHECK: {symbol} | High={current_high:.{digits}f} Low={current_low:.{digits}f} | " +
-                            f"Top_Limit={state['window_top_limit']:.{digits}f} Bottom_Limit={state['window_bottom_limit']:.{digits}f}", 
-                            "DEBUG", critical=True)
-            
-            # SUCCESS: Price breaks above top limit (original Line 1429: current_high >= self.window_top_limit)
-            if current_high >= state['window_top_limit']:
-                # Final time check before success
-                if not self._is_in_trading_time_range(current_dt, config):
-                    self.terminal_log(f"[T] {symbol}: Breakout detected but outside trading hours", 
-                                    "WARNING", critical=True)
-                    self._reset_entry_state(symbol)
-                    return 'EXPIRED'
-                return 'SUCCESS'
-            
-            # FAILURE: Price breaks below bottom limit (original Line 1435: current_low <= self.window_bottom_limit)
-            elif current_low <= state['window_bottom_limit']:
-                self.terminal_log(f"[X] {symbol}: LONG FAILURE - Price {current_low:.{digits}f} broke BELOW bottom limit {state['window_bottom_limit']:.{digits}f}", 
-                                "WARNING", critical=True)
-                return 'FAILURE'
-        
-        else:  # SHORT
-            # DEBUG: Log window boundaries and current price
-            self.terminal_log(f" SHORT WINDOW CHECK: {symbol} | High={current_high:.{digits}f} Low={current_low:.{digits}f} | " +
-                            f"Top_Limit={state['window_top_limit']:.{digits}f} Bottom_Limit={state['window_bottom_limit']:.{digits}f}", 
-                            "DEBUG", critical=True)
-            
-            # SUCCESS: Price breaks below bottom limit (original Line 1445: current_low <= self.window_bottom_limit)
-            if current_low <= state['window_bottom_limit']:
-                # Final time check before success
-                if not self._is_in_trading_time_range(current_dt, config):
-                    self.terminal_log(f"[T] {symbol}: Breakout detected but outside trading hours", 
-                                    "WARNING", critical=True)
-                    self._reset_entry_state(symbol)
-                    return 'EXPIRED'
-                return 'SUCCESS'
-            
-            # FAILURE: Price breaks above top limit (original Line 1451: current_high >= self.window_top_limit)
-            elif current_high >= state['window_top_limit']:
-                self.terminal_log(f"[X] {symbol}: SHORT FAILURE - Price {current_high:.{digits}f} broke ABOVE top limit {state['window_top_limit']:.{digits}f}", 
-                                "WARNING", critical=True)
-                return 'FAILURE'
-        
-        # DEBUG: No breakout detected, still monitoring
-        self.terminal_log(f" {symbol}: Window monitoring - No breakout yet (within boundaries)", 
-                        "DEBUG", critical=True)
-        return None  # Still monitoring
+    def _phase_bar(self, row, bullish_cross=False, bearish_cross=False, atr=None):
+        """Closed-candle snapshot for the phase machine (row: DataFrame row)"""
+        bar_time = row['time']
+        utc_minutes = None
+        if hasattr(bar_time, 'hour'):
+            # Broker time -> UTC minute of day (trading hours are UTC)
+            utc_offset = getattr(self, 'broker_utc_offset', 1)
+            utc_minutes = ((bar_time.hour - utc_offset) % 24) * 60 + bar_time.minute
+        return phase_machine.Bar(bar_time, float(row['open']), float(row['high']), float(row['low']),
+                                 float(row['close']), utc_minutes, bullish_cross, bearish_cross, atr)
         
     def determine_strategy_phase(self, symbol, df, indicators):
-        """4-PHASE STATE MACHINE - Exact copy of original strategy logic
+        """4-PHASE STATE MACHINE - Live driver of the shared phase machine
         
         States: SCANNING -> ARMED_LONG/SHORT -> WINDOW_OPEN -> Entry/Reset
-        Matches: sunrise_ogle_*.py state machine exactly
+        Transitions come from src/phase_machine.py (same core as backtests);
+        this method adds MT5 position sync, candle gap handling, filters,
+        order execution and logging.
         """
         # Type guard for pandas (required for operation)
         if pd is None or mt5 is None:
@@ -2776,7 +2551,7 @@ class AdvancedMT5TradingMonitorGUI:
             return 'ERROR'
         
         current_state = self.strategy_states[symbol]
-        entry_state = current_state['entry_state']
+        entry_state = current_state.entry_state
         config = self.strategy_configs.get(symbol, {})
         
         # ==========
@@ -2789,9 +2564,9 @@ class AdvancedMT5TradingMonitorGUI:
                 # Found open position but state doesn't reflect it
                 self.terminal_log(f"🔄 {symbol}: Detected ORPHAN POSITION (Ticket #{positions[0].ticket}) - Syncing state to IN_TRADE", 
                                 "WARNING", critical=True)
-                current_state['entry_state'] = 'IN_TRADE'
-                current_state['phase'] = 'IN_TRADE'
-                current_state['armed_direction'] = 'LONG' if positions[0].type == 0 else 'SHORT'
+                current_state.entry_state = 'IN_TRADE'
+                current_state.phase = 'IN_TRADE'
+                current_state.armed_direction = 'LONG' if positions[0].type == 0 else 'SHORT'
                 entry_state = 'IN_TRADE'
                 return 'IN_TRADE'
         
@@ -2803,10 +2578,9 @@ class AdvancedMT5TradingMonitorGUI:
                             "ERROR", critical=True)
             self._reset_entry_state(symbol)
             entry_state = 'SCANNING'
-            current_state['entry_state'] = 'SCANNING'
+            current_state.entry_state = 'SCANNING'
             # Clear any bearish crossover data
-            if 'crossover_data' in current_state:
-                current_state['crossover_data']['bearish_crossover'] = False
+            current_state.crossover_data = dict(current_state.crossover_data, bearish_crossover=False)
         
         # CRITICAL FIX: Check for open positions BEFORE any processing
         # If position exists and we're in IN_TRADE state, check if it's still open
@@ -2825,22 +2599,13 @@ class AdvancedMT5TradingMonitorGUI:
                                 "DEBUG", critical=False)
                 return 'IN_TRADE'
         
-        # Get SHORT enabled status
-        short_enabled = config.get('ENABLE_SHORT_TRADES', 'False')
-        if isinstance(short_enabled, str):
-            short_enabled = short_enabled.lower() in ('true', '1', 'yes')
+        machine = self.get_phase_machine(symbol)
         
         # Bar counter - only increment on NEW CANDLE (matches original strategy Line 1393: current_bar = len(self))
-        # Track candle timestamp to detect new candles
         if len(df) > 0:
-            current_candle_time = df['time'].iloc[-1]
-            
-            # Check if this is a new candle (timestamp changed)
-            if 'last_candle_time' not in current_state or current_state['last_candle_time'] != current_candle_time:
-                current_state['current_bar'] += 1
-                current_state['last_candle_time'] = current_candle_time
+            machine.new_bar(current_state, df['time'].iloc[-1])
         
-        current_bar = current_state['current_bar']
+        current_bar = current_state.current_bar
         
         # Get current time for time filter
         if len(df) > 0:
@@ -2853,25 +2618,25 @@ class AdvancedMT5TradingMonitorGUI:
         # TIME FILTER - ONLY FOR TRADE EXECUTION
         # ==========
         # CRITICAL FIX: Time filter is checked ONLY at breakout execution
-        # inside _phase4_monitor_window(), NOT here. Window monitoring and 
+        # inside PhaseMachine.monitor_window(), NOT here. Window monitoring and 
         # state progression must continue 24/7. Only the final trade execution
         # respects trading hours (checked at line 1293 and 1304).
         
         try:
             # DIAGNOSTIC: Log state machine processing
             if entry_state in ['ARMED_LONG', 'ARMED_SHORT']:
-                pullback_count = current_state.get('pullback_candle_count', 0)
+                pullback_count = current_state.pullback_candle_count
                 self.terminal_log(f" STATE: {symbol} processing | state={entry_state} | pullback_count={pullback_count} | df_len={len(df)}", 
                                 "DEBUG", critical=True)
             elif entry_state == 'WINDOW_OPEN':
                 # CRITICAL: Add diagnostic logging for WINDOW_OPEN phase
-                window_active = current_state.get('window_active', False)
-                armed_direction = current_state.get('armed_direction', 'Unknown')
+                window_active = current_state.window_active
+                armed_direction = current_state.armed_direction
                 self.terminal_log(f" WINDOW: {symbol} monitoring | state={entry_state} | direction={armed_direction} | active={window_active} | df_len={len(df)}", 
                                 "DEBUG", critical=True)
             
             # Get crossover data
-            crossover_data = current_state.get('crossover_data', {})
+            crossover_data = current_state.crossover_data
             bullish_cross = crossover_data.get('bullish_crossover', False)
             bearish_cross = crossover_data.get('bearish_crossover', False)
             
@@ -2882,39 +2647,25 @@ class AdvancedMT5TradingMonitorGUI:
             # - ARMED_LONG + bearish crossover + RED candle = INVALIDATE
             # - ARMED_SHORT + bullish crossover + GREEN candle = INVALIDATE
             # ==========
-            if entry_state in ['ARMED_LONG', 'ARMED_SHORT']:
-                opposing_signal = False
+            if entry_state in ['ARMED_LONG', 'ARMED_SHORT'] and len(df) >= 1:
+                last_bar = self._phase_bar(df.iloc[-1], bullish_cross, bearish_cross)
+                invalidated = machine.check_invalidation(current_state, last_bar)
                 
-                # Get last closed candle color
-                last_closed_bearish = False
-                last_closed_bullish = False
-                if len(df) >= 1:
-                    last_row = df.iloc[-1]
-                    last_closed_bearish = last_row['close'] < last_row['open']
-                    last_closed_bullish = last_row['close'] > last_row['open']
-                
-                # ARMED_LONG: Reset if bearish crossover + RED candle
-                if entry_state == 'ARMED_LONG' and bearish_cross and last_closed_bearish:
-                    opposing_signal = True
-                    self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION - Bearish crossover + RED candle in ARMED_LONG", 
-                                    "WARNING", critical=True)
-                
-                # ARMED_SHORT: Reset if bullish crossover + GREEN candle
-                elif entry_state == 'ARMED_SHORT' and bullish_cross and last_closed_bullish:
-                    opposing_signal = True
-                    self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION - Bullish crossover + GREEN candle in ARMED_SHORT", 
-                                    "WARNING", critical=True)
+                if invalidated:
+                    if invalidated.direction == 'LONG':
+                        self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION - Bearish crossover + RED candle in ARMED_LONG", 
+                                        "WARNING", critical=True)
+                    else:
+                        self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION - Bullish crossover + GREEN candle in ARMED_SHORT", 
+                                        "WARNING", critical=True)
+                    entry_state = 'SCANNING'
                 
                 # Log when crossover detected but candle color doesn't match (no invalidation)
                 elif bearish_cross or bullish_cross:
                     cross_type = "Bearish" if bearish_cross else "Bullish"
-                    candle_color = "RED" if last_closed_bearish else "GREEN"
+                    candle_color = "RED" if last_bar.is_bearish else "GREEN"
                     self.terminal_log(f"🔍 {symbol}: {cross_type} crossover detected but last candle is {candle_color} - No invalidation", 
                                     "INFO", critical=True)
-                
-                if opposing_signal:
-                    self._reset_entry_state(symbol)
-                    entry_state = 'SCANNING'
             
             # ==========
             # STATE MACHINE ROUTER
@@ -2923,97 +2674,37 @@ class AdvancedMT5TradingMonitorGUI:
             # ---------------------------------------------------------------
             # PHASE 1: SCANNING -> ARMED (Signal Detection)
             # ---------------------------------------------------------------
-            if entry_state == 'SCANNING':
-                signal_direction = None
-                
-                # Check for LONG signal
-                if bullish_cross:
-                    signal_direction = 'LONG'
+            if entry_state == 'SCANNING' and len(df) >= 1:
+                last_bar = self._phase_bar(df.iloc[-1], bullish_cross, bearish_cross, indicators.get('atr'))
+                # Trigger candle is the PREVIOUS closed candle (Backtrader stores close[-1])
+                prev_bar = self._phase_bar(df.iloc[-2]) if len(df) >= 2 else None
+                transition = machine.scan(current_state, last_bar, prev_bar)
                 
-                # Check for SHORT signal (only if enabled)
-                elif bearish_cross and short_enabled:
-                    signal_direction = 'SHORT'
-                
-                # Transition to ARMED if signal detected
-                if signal_direction:
-                    # CRITICAL: Check if pullback system is enabled for this direction
-                    use_pullback = False
-                    if signal_direction == 'LONG':
-                        use_pullback_str = str(config.get('LONG_USE_PULLBACK_ENTRY', 'True')).strip()
-                        use_pullback = use_pullback_str.lower() in ['true', '1', 'yes']
-                    elif signal_direction == 'SHORT':
-                        use_pullback_str = str(config.get('SHORT_USE_PULLBACK_ENTRY', 'True')).strip()
-                        use_pullback = use_pullback_str.lower() in ['true', '1', 'yes']
-                    
-                    # Get current price for context
-                    current_price = df['close'].iloc[-1] if len(df) > 0 else 0
-                    digits = current_state.get('digits', 5)
+                if transition:
+                    signal_direction = transition.direction
+                    current_price = last_bar.close
+                    digits = current_state.digits
                     
-                    # CRITICAL FIX: Clear crossover flags after consuming them FIRST
+                    # CRITICAL FIX: Clear crossover flags after consuming them
                     # This prevents re-arming on the same crossover signal repeatedly
-                    current_state['crossover_data'] = {
+                    current_state.crossover_data = {
                         'bullish_crossover': False,
                         'bearish_crossover': False,
                         'candle_time': crossover_data.get('candle_time', current_dt)
                     }
                     
-                    if use_pullback:
+                    if transition.kind == phase_machine.TRANSITION_ARMED:
                         # PULLBACK MODE: Use 3-phase system (ARMED -> WINDOW_OPEN -> ENTRY)
-                        current_state['entry_state'] = f"ARMED_{signal_direction}"
-                        current_state['phase'] = 'WAITING_PULLBACK'
-                        current_state['armed_direction'] = signal_direction
-                        current_state['pullback_candle_count'] = 0
-                        
-                        # Store signal detection ATR for increment/decrement filters (Matches strategy logic)
-                        if 'atr' in indicators and indicators['atr'] is not None:
-                            # indicators['atr'] is a scalar float from calculate_indicators
-                            current_state['signal_detection_atr'] = float(indicators['atr'])
-                        else:
-                            current_state['signal_detection_atr'] = None
-                        
-                        # Store trigger candle (using PREVIOUS closed candle to match Backtrader logic)
-                        # Backtrader stores close[-1] (Bar -1) as trigger candle
-                        # df.iloc[-1] is Bar 0. df.iloc[-2] is Bar -1.
-                        if len(df) >= 2:
-                            idx = -2
-                            arming_candle_time = df['time'].iloc[idx]
-                            
-                            current_state['signal_trigger_candle'] = {
-                                'open': float(df['open'].iloc[idx]),
-                                'close': float(df['close'].iloc[idx]),
-                                'high': float(df['high'].iloc[idx]),
-                                'low': float(df['low'].iloc[idx]),
-                                'datetime': arming_candle_time,
-                                'is_bullish': df['close'].iloc[idx] > df['open'].iloc[idx],
-                                'is_bearish': df['close'].iloc[idx] < df['open'].iloc[idx]
-                            }
-                            
-                            # CRITICAL FIX: Mark CURRENT last closed candle as already processed
-                            # The crossover is detected on the current closed candle (index -1)
-                            # We must mark it to prevent checking the arming candle itself for pullbacks
-                            # FIX: Use 'time' column, NOT df.index (which is RangeIndex 0-499)
-                            current_last_candle_time = df['time'].iloc[-1]
-                            current_state['last_pullback_check_candle'] = current_last_candle_time
-                        
-                        # Get pullback requirements
-                        if signal_direction == 'LONG':
-                            max_candles = int(config.get('LONG_PULLBACK_MAX_CANDLES', 2))
-                            pullback_type = "BEARISH (Red)"
-                        else:
-                            max_candles = int(config.get('SHORT_PULLBACK_MAX_CANDLES', 2))
-                            pullback_type = "BULLISH (Green)"
+                        max_candles = transition.info['pullback_max']
+                        pullback_type = "BEARISH (Red)" if signal_direction == 'LONG' else "BULLISH (Green)"
                         
                         self.terminal_log(f" {symbol}: {signal_direction} CROSSOVER - State: SCANNING -> ARMED_{signal_direction} | Price: {current_price:.{digits}f}", 
                                         "SUCCESS", critical=True)
                         self.terminal_log(f" {symbol}: PULLBACK MODE - Monitoring for {max_candles} {pullback_type} pullback candles...", 
                                         "INFO", critical=True)
-                        entry_state = f"ARMED_{signal_direction}"
-                        
-                        # INITIALIZE CANDLE SEQUENCE TRACKER - Ensures we never miss candles
-                        current_state['candle_sequence_counter'] = 0
-                        current_state['armed_at_candle_time'] = df['time'].iloc[-1]
-                        self.terminal_log(f" {symbol}: Candle sequence tracker initialized at {current_state['armed_at_candle_time']}", 
+                        self.terminal_log(f" {symbol}: Candle sequence tracker initialized at {current_state.armed_at_candle_time}", 
                                         "INFO", critical=True)
+                        entry_state = f"ARMED_{signal_direction}"
                     else:
                         # STANDARD MODE: Enter immediately on crossover (no pullback wait)
                         self.terminal_log(f" {symbol}: {signal_direction} CROSSOVER - STANDARD MODE (No pullback) | Price: {current_price:.{digits}f}", 
@@ -3021,32 +2712,30 @@ class AdvancedMT5TradingMonitorGUI:
                         self.terminal_log(f" {symbol}: Entering immediately (pullback system disabled)", 
                                         "INFO", critical=True)
                         
-                        # Execute entry directly
+                        # Execute entry directly (locks state to IN_TRADE on success)
                         entry_success = self._execute_entry(symbol, signal_direction, df, current_dt, config)
                         
                         if entry_success:
                             self.terminal_log(f"[OK] {symbol}: STANDARD ENTRY executed at {current_price:.{digits}f}", 
                                             "SUCCESS", critical=True)
+                            entry_state = 'IN_TRADE'
                         else:
                             self.terminal_log(f"[X] {symbol}: STANDARD ENTRY failed - Reset to SCANNING", 
                                             "ERROR", critical=True)
-                        
-                        # Reset state to SCANNING after entry attempt
-                        self._reset_entry_state(symbol)
-                        entry_state = 'SCANNING'
+                            entry_state = 'SCANNING'
             
             # ---------------------------------------------------------------
             # PHASE 2: ARMED -> WINDOW_OPEN (Pullback Confirmation)
             # ---------------------------------------------------------------
             elif entry_state in ['ARMED_LONG', 'ARMED_SHORT']:
-                armed_direction = current_state['armed_direction']
+                armed_direction = current_state.armed_direction
                 
                 # DIAGNOSTIC: Log entry into ARMED pullback checking
                 self.terminal_log(f" DEBUG: {symbol} entered ARMED pullback check | armed_direction={armed_direction} | df_len={len(df)}", 
                                 "DEBUG", critical=True)
                 
                 # Safety check: If SHORT armed but disabled, reset
-                if armed_direction == 'SHORT' and not short_enabled:
+                if armed_direction == 'SHORT' and not machine.config.short_enabled:
                     self.terminal_log(f" {symbol}: SHORT armed but disabled - Reset", 
                                     "WARNING", critical=True)
                     self._reset_entry_state(symbol)
@@ -3073,7 +2762,7 @@ class AdvancedMT5TradingMonitorGUI:
                     last_closed_candle_time = df['time'].iloc[-1] if len(df) > 0 else None
                     
                     # DIAGNOSTIC: Log the candle being checked
-                    last_checked = current_state.get('last_pullback_check_candle', 'NONE')
+                    last_checked = current_state.last_pullback_check_candle
                     self.terminal_log(f" DEBUG: {symbol} pullback candle check | last_closed={last_closed_candle_time} | last_checked={last_checked} | Same? {last_closed_candle_time == last_checked}", 
                                     "DEBUG", critical=True)
                     
@@ -3131,27 +2820,20 @@ class AdvancedMT5TradingMonitorGUI:
                                                 "WARNING", critical=True)
                     
                     # Check if we've already processed this closed candle
-                    if 'last_pullback_check_candle' in current_state and current_state['last_pullback_check_candle'] == last_closed_candle_time and len(candles_to_check) <= 1:
+                    if current_state.last_pullback_check_candle == last_closed_candle_time and len(candles_to_check) <= 1:
                         # Already processed this closed candle, waiting for next candle to close
                         pullback_type = "Bearish" if armed_direction == 'LONG' else "Bullish"
-                        current_count = current_state.get('pullback_candle_count', 0)
+                        current_count = current_state.pullback_candle_count
                         # Reduce spam - only log once per minute
                         import time
                         now = time.time()
-                        if not hasattr(current_state, '_last_forming_log') or (now - current_state.get('_last_forming_log', 0)) > 60:
+                        if (now - current_state.last_forming_log) > 60:
                             self.terminal_log(f">> WAITING: {symbol} {armed_direction} waiting for next {pullback_type} candle | count={current_count}/2", 
                                             "INFO", critical=False)
-                            current_state['_last_forming_log'] = now
+                            current_state.last_forming_log = now
                     elif len(candles_to_check) > 0:
                         # NEW CLOSED CANDLE(S) - Check for pullback
-                        # Get max pullback requirement for logging
-                        max_candles = 2  # Default
-                        if armed_direction == 'LONG':
-                            max_candles = int(config.get('LONG_PULLBACK_MAX_CANDLES', 2))
-                            pullback_type = "BEARISH (Red)"
-                        else:
-                            max_candles = int(config.get('SHORT_PULLBACK_MAX_CANDLES', 2))
-                            pullback_type = "BULLISH (Green)"
+                        max_candles = machine.config.pullback_max[armed_direction]
                         
                         # PROCESS ALL CANDLES IN SEQUENCE (handles gaps)
                         for idx, candle_row in candles_to_check.iterrows():
@@ -3160,14 +2842,10 @@ class AdvancedMT5TradingMonitorGUI:
                             current_high = candle_row['high']
                             current_low = candle_row['low']
                             current_close = candle_row['close']
-                            current_count = current_state.get('pullback_candle_count', 0)
-                            
-                            # SEQUENCE COUNTER: Track total candles checked since ARMED
-                            seq_counter = current_state.get('candle_sequence_counter', 0)
-                            seq_counter += 1
-                            current_state['candle_sequence_counter'] = seq_counter
+                            current_count = current_state.pullback_candle_count
                             
-                            # LOG EVERY CANDLE CHECKED IN ARMED STATE
+                            # LOG EVERY CANDLE CHECKED IN ARMED STATE (sequence counter advanced by the machine)
+                            seq_counter = current_state.candle_sequence_counter + 1
                             candle_time_str = candle_time.strftime("%Y-%m-%d %H:%M:%S") if hasattr(candle_time, 'strftime') else str(candle_time)
                             self.terminal_log(f" CHECKING CANDLE #{seq_counter}: {symbol} {armed_direction} | Time: {candle_time_str} | O:{current_open:.5f} H:{current_high:.5f} L:{current_low:.5f} C:{current_close:.5f} | Pullback: {current_count}/{max_candles}", 
                                             "INFO", critical=True)
@@ -3175,100 +2853,65 @@ class AdvancedMT5TradingMonitorGUI:
                             # =====================================================
                             # GLOBAL INVALIDATION CHECK (v1.2.3 - FIXED)
                             # Check for opposing crossover BEFORE processing pullback
-                            # Matches Backtrader original: lines 1304-1331
-                            # In Backtrader: prev_bear = self.data.close[-1] < self.data.open[-1]
-                            # This refers to the CURRENT candle being processed, NOT the previous one
+                            # Uses the CURRENT candle's color (df.iloc[-1] == Backtrader data[0])
                             # =====================================================
                             candle_position = df.index.get_loc(idx) if idx in df.index else None
+                            bullish_at, bearish_at = (False, False)
                             if candle_position is not None:
-                                bullish_cross, bearish_cross = self.check_crossover_at_candle(symbol, df, candle_position, config)
-                                
-                                # Check CURRENT candle color for Global Invalidation rule
-                                # In Backtrader: prev_bear = self.data.close[-1] < self.data.open[-1]
-                                # The -1 index refers to the most recently CLOSED candle (current in our loop)
-                                current_candle_bearish = current_close < current_open  # Already have these values
-                                current_candle_bullish = current_close > current_open
-                                
-                                # ARMED_LONG: Invalidate if bearish crossover + current candle is red
-                                if armed_direction == 'LONG' and bearish_cross and current_candle_bearish:
+                                bullish_at, bearish_at = self.check_crossover_at_candle(symbol, df, candle_position, config)
+                            candle_bar = self._phase_bar(candle_row, bullish_at, bearish_at)
+                            
+                            invalidated = machine.check_invalidation(current_state, candle_bar)
+                            if invalidated:
+                                if invalidated.direction == 'LONG':
                                     self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION at {candle_time_str} - Bearish crossover + RED candle during ARMED_LONG", 
                                                     "WARNING", critical=True)
-                                    self._reset_entry_state(symbol)
-                                    return 'SCANNING'
-                                
-                                # ARMED_SHORT: Invalidate if bullish crossover + current candle is green
-                                elif armed_direction == 'SHORT' and bullish_cross and current_candle_bullish:
+                                else:
                                     self.terminal_log(f"⛔ {symbol}: GLOBAL INVALIDATION at {candle_time_str} - Bullish crossover + GREEN candle during ARMED_SHORT", 
                                                     "WARNING", critical=True)
-                                    self._reset_entry_state(symbol)
-                                    return 'SCANNING'
-                                
-                                # Log when crossover detected but candle color doesn't match (no invalidation)
-                                elif bearish_cross or bullish_cross:
-                                    cross_type = "Bearish" if bearish_cross else "Bullish"
-                                    candle_color = "RED" if current_candle_bearish else "GREEN"
-                                    self.terminal_log(f"🔍 {symbol}: {cross_type} crossover at {candle_time_str} but candle is {candle_color} - No invalidation", 
-                                                    "INFO", critical=True)
+                                return 'SCANNING'
+                            elif bearish_at or bullish_at:
+                                cross_type = "Bearish" if bearish_at else "Bullish"
+                                candle_color = "RED" if candle_bar.is_bearish else "GREEN"
+                                self.terminal_log(f"🔍 {symbol}: {cross_type} crossover at {candle_time_str} but candle is {candle_color} - No invalidation", 
+                                                "INFO", critical=True)
                             # =====================================================
                             
-                            is_pullback_candle = False
-                            
-                            if armed_direction == 'LONG':
-                                # LONG pullback = bearish candle (close < open)
-                                is_pullback_candle = current_close < current_open
-                            elif armed_direction == 'SHORT':
-                                # SHORT pullback = bullish candle (close > open)
-                                is_pullback_candle = current_close > current_open
-                            
-                            # Mark this closed candle as processed
-                            current_state['last_pullback_check_candle'] = candle_time
+                            transition = machine.confirm_pullback(current_state, candle_bar, current_bar)
                             
-                            if is_pullback_candle:
-                                # Increment pullback count
-                                current_state['pullback_candle_count'] += 1
-                                
-                                # DEBUG: Show candle details
-                                candle_color = "BEARISH (Red)" if current_close < current_open else "BULLISH (Green)"
-                                self.terminal_log(f">> PULLBACK CANDLE: {symbol} {armed_direction} #{current_state['pullback_candle_count']}/{max_candles} | {candle_color} | O:{current_open:.5f} H:{current_high:.5f} L:{current_low:.5f} C:{current_close:.5f}", 
-                                                "INFO", critical=True)
-                                
-                                # Check if pullback complete
-                                if current_state['pullback_candle_count'] >= max_candles:
-                                    # Store last pullback candle data for window calculation
-                                    current_state['last_pullback_candle_high'] = float(current_high)
-                                    current_state['last_pullback_candle_low'] = float(current_low)
-                                    
-                                    # Transition to WINDOW_OPEN
-                                    self._phase3_open_breakout_window(symbol, armed_direction, config, current_bar)
-                                    
-                                    # Update BOTH local variable AND state dictionary
-                                    current_state['entry_state'] = 'WINDOW_OPEN'
-                                    current_state['phase'] = 'WAITING_BREAKOUT'
-                                    entry_state = 'WINDOW_OPEN'
-                                    
-                                    self.terminal_log(f"[OK] {symbol}: Pullback CONFIRMED ({current_state['pullback_candle_count']}/{max_candles}) - Window OPENING", 
-                                                    "SUCCESS", critical=True)
-                                    break  # Exit loop - window is open, stop checking more candles
-                                else:
-                                    # Still waiting for more pullback candles - SHOW THIS!
-                                    candle_type = "Bearish" if armed_direction == 'LONG' else "Bullish"
-                                    self.terminal_log(f" {symbol}: {candle_type} pullback #{current_state['pullback_candle_count']}/{max_candles} detected (need {max_candles - current_state['pullback_candle_count']} more)", 
-                                                    "INFO", critical=True)
-                            else:
+                            if transition.kind in (phase_machine.TRANSITION_PULLBACK_FAILED, phase_machine.TRANSITION_RESET):
                                 # INVALID PULLBACK (Wrong color) -> RESET (Matches Original)
                                 self.terminal_log(f"[T] {symbol}: Pullback failed (wrong candle color) - Resetting to SCANNING", "NORMAL")
-                                self._reset_entry_state(symbol)
                                 return 'SCANNING'
+                            
+                            candle_color = "BEARISH (Red)" if candle_bar.is_bearish else "BULLISH (Green)"
+                            self.terminal_log(f">> PULLBACK CANDLE: {symbol} {armed_direction} #{current_state.pullback_candle_count}/{max_candles} | {candle_color} | O:{current_open:.5f} H:{current_high:.5f} L:{current_low:.5f} C:{current_close:.5f}", 
+                                            "INFO", critical=True)
+                            
+                            if transition.kind == phase_machine.TRANSITION_WINDOW_OPEN:
+                                digits = current_state.digits
+                                window_periods = current_state.window_expiry_bar - current_state.window_bar_start
+                                self.terminal_log(f" {symbol}: Window OPENED ({armed_direction}) | Top: {current_state.window_top_limit:.{digits}f} | Bottom: {current_state.window_bottom_limit:.{digits}f} | Duration: {window_periods} bars", 
+                                                "SUCCESS", critical=True)
+                                self.terminal_log(f"[OK] {symbol}: Pullback CONFIRMED ({current_state.pullback_candle_count}/{max_candles}) - Window OPENING", 
+                                                "SUCCESS", critical=True)
+                                entry_state = 'WINDOW_OPEN'
+                                break  # Exit loop - window is open, stop checking more candles
+                            else:
+                                # Still waiting for more pullback candles - SHOW THIS!
+                                candle_type = "Bearish" if armed_direction == 'LONG' else "Bullish"
+                                self.terminal_log(f" {symbol}: {candle_type} pullback #{current_state.pullback_candle_count}/{max_candles} detected (need {max_candles - current_state.pullback_candle_count} more)", 
+                                                "INFO", critical=True)
                         
                         # Summary after processing all candles
                         if len(candles_to_check) > 1:
-                            final_count = current_state.get('pullback_candle_count', 0)
+                            final_count = current_state.pullback_candle_count
                             self.terminal_log(f"[OK] {symbol}: Processed {len(candles_to_check)} candles | Final pullback count: {final_count}/{max_candles}", 
                                             "INFO", critical=True)
                         
                         # POST-PROCESSING VALIDATION: Verify sequence integrity
                         if len(candles_to_check) > 0:
-                            last_processed = current_state.get('last_pullback_check_candle', None)
+                            last_processed = current_state.last_pullback_check_candle
                             if isinstance(last_processed, pd.Timestamp) and isinstance(last_closed_candle_time, pd.Timestamp):
                                 if last_processed == last_closed_candle_time:
                                     self.terminal_log(f"[OK] {symbol}: Sequence validation PASSED - Latest candle processed", "INFO", critical=True)
@@ -3276,131 +2919,87 @@ class AdvancedMT5TradingMonitorGUI:
                                     self.terminal_log(f" {symbol}: Sequence validation WARNING - Last processed: {last_processed}, Expected: {last_closed_candle_time}", 
                                                     "WARNING", critical=True)
                                     # Force sync to latest
-                                    current_state['last_pullback_check_candle'] = last_closed_candle_time
+                                    current_state.last_pullback_check_candle = last_closed_candle_time
                                     self.terminal_log(f" {symbol}: Force synced last_pullback_check_candle to {last_closed_candle_time}", "INFO", critical=True)            # ---------------------------------------------------------------
             # PHASE 3: WINDOW_OPEN (Monitor for Breakout)
             # ---------------------------------------------------------------
             elif entry_state == 'WINDOW_OPEN':
-                armed_direction = current_state['armed_direction']
+                armed_direction = current_state.armed_direction
                 
                 # DEBUG: Entry into window monitoring
                 self.terminal_log(f" {symbol}: WINDOW_OPEN phase | Direction={armed_direction} | Bar={current_bar} | DF_len={len(df)}", 
                                 "DEBUG", critical=True)
                 
-                breakout_status = self._phase4_monitor_window(symbol, df, armed_direction, current_bar, current_dt, config)
+                if len(df) < 1:
+                    self.terminal_log(f"[X] {symbol}: No price data in DF!", "ERROR", critical=True)
+                    return entry_state
+                
+                window_bar = self._phase_bar(df.iloc[-1])
+                digits = current_state.digits
+                transition = machine.monitor_window(current_state, window_bar, current_bar)
                 
                 # DEBUG: Breakout status result
-                self.terminal_log(f" {symbol}: Window check result = {breakout_status}", 
+                self.terminal_log(f" {symbol}: Window check result = {transition.kind if transition else None}", 
                                 "DEBUG", critical=True)
                 
-                if breakout_status == 'SUCCESS':
-                    # Get current close price for trade execution (matches backtrader behavior)
-                    trade_executed = False  # Initialize variable
-                    
-                    if len(df) < 1:
-                        self.terminal_log(f"[X] {symbol}: BREAKOUT detected but no price data available!", 
-                                        "ERROR", critical=True)
-                        self._reset_entry_state(symbol)
-                        entry_state = 'SCANNING'
+                if transition is None:
+                    if current_bar < current_state.window_bar_start:
+                        self.terminal_log(f" {symbol}: Window PENDING (bar {current_bar} < start {current_state.window_bar_start})", 
+                                        "DEBUG", critical=True)
                     else:
-                        current_close = float(df['close'].iloc[-1])
-                        digits = current_state.get('digits', 5)
-                        
-                        self.terminal_log(f"[OK] {symbol}: BREAKOUT detected - Validating entry conditions...", 
-                                        "INFO", critical=True)
-                        
-                        # 1. RE-CALCULATE INDICATORS for fresh validation (Angle, Price vs EMA, etc.)
-                        # Cached indicators are from window open time, we need CURRENT values
-                        fresh_indicators = self.calculate_indicators(df, symbol)
-                        
-                        # 2. VALIDATE ALL ENTRY FILTERS (matches original _validate_all_entry_filters)
-                        # The original Backtrader re-validates these filters at breakout time:
-                        # - EMA Order Condition
-                        # - Price Filter EMA
-                        # - EMA Position Filter (EMAs below/above price)
-                        # - Angle Filter
-                        all_filters_passed = True
-                        
-                        # Add ATR to df for validation functions
-                        df_validation = df.copy()
-                        if 'atr' in fresh_indicators:
-                            df_validation['atr'] = fresh_indicators['atr']
-                        
-                        # Get fresh EMA values for validation
-                        fresh_fast = fresh_indicators.get('ema_fast', 0)
-                        fresh_medium = fresh_indicators.get('ema_medium', 0)
-                        fresh_slow = fresh_indicators.get('ema_slow', 0)
-                        fresh_confirm = fresh_indicators.get('ema_confirm', 0)
-                        
-                        # 1. EMA Ordering - Basic trend structure must hold (matches original)
-                        if all_filters_passed and not self._validate_ema_ordering(symbol, fresh_confirm, fresh_fast, fresh_medium, fresh_slow, armed_direction):
-                            self.terminal_log(f"[X] {symbol}: Entry blocked by EMA Ordering (Trend Broken)", "WARNING", critical=True)
-                            all_filters_passed = False
-                        
-                        # 2. Price Filter (Trend Alignment) - matches original
-                        if all_filters_passed and not self._validate_price_filter(symbol, df_validation, armed_direction):
-                            self.terminal_log(f"[X] {symbol}: Entry blocked by Price Filter (Trend Reversal)", "WARNING", critical=True)
-                            all_filters_passed = False
-                        
-                        # 3. EMA Position Filter (EMAs below/above price) - matches original
-                        if all_filters_passed:
-                            ema_position_passed = self._validate_ema_position_filter(symbol, df_validation, fresh_fast, fresh_medium, fresh_slow, armed_direction)
-                            if not ema_position_passed:
-                                self.terminal_log(f"[X] {symbol}: Entry blocked by EMA Position Filter", "WARNING", critical=True)
-                                all_filters_passed = False
-                        
-                        # 4. Angle Filter - matches original _validate_all_entry_filters
-                        if all_filters_passed and not self._validate_angle_filter(symbol, df_validation, armed_direction):
-                            self.terminal_log(f"[X] {symbol}: Entry blocked by Angle Filter at breakout", "WARNING", critical=True)
-                            all_filters_passed = False
-                            
-                        # 3. VALIDATE TRIGGER CANDLE (Original Signal)
-                        # Ensure the original signal candle is still valid (e.g. body size, direction)
-                        trigger_candle = current_state.get('signal_trigger_candle')
-                        if all_filters_passed and trigger_candle:
-                            # Check candle direction filter against ORIGINAL trigger candle
-                            use_candle_filter = config.get(f'{armed_direction}_USE_CANDLE_DIRECTION_FILTER', 'False')
-                            if use_candle_filter in ('True', True, 1, '1'):
-                                is_valid_direction = False
-                                if armed_direction == 'LONG':
-                                    is_valid_direction = trigger_candle['is_bullish']
-                                else:
-                                    is_valid_direction = trigger_candle['is_bearish']
-                                    
-                                if not is_valid_direction:
-                                    self.terminal_log(f"[X] {symbol}: Entry blocked - Original trigger candle direction invalid", "WARNING", critical=True)
-                                    all_filters_passed = False
-                        
-                        if not all_filters_passed:
-                            self.terminal_log(f"[!] {symbol}: ENTRY ABORTED - Filters failed at breakout time", "WARNING", critical=True)
-                            self._reset_entry_state(symbol)
-                            entry_state = 'SCANNING'
-                            return entry_state
-
-                        self.terminal_log(f"[OK] {symbol}: All entry filters PASSED. Price: {current_close:.{digits}f}", 
-                                        "SUCCESS", critical=True)
-                        
-                        # CRITICAL: Validate time filter before entry (matches original strategy Line 1381)
-                        current_dt = df['time'].iloc[-1] if len(df) > 0 else datetime.now()
-                        time_filter_passed = self._validate_time_filter(symbol, current_dt, armed_direction)
-                        
-                        if not time_filter_passed:
+                        self.terminal_log(f" {symbol}: Window monitoring - No breakout yet (within boundaries)", 
+                                        "DEBUG", critical=True)
+                
+                elif transition.kind == phase_machine.TRANSITION_BREAKOUT:
+                    # Current close price for trade execution (matches backtrader behavior)
+                    current_close = window_bar.close
+                    
+                    self.terminal_log(f"[OK] {symbol}: BREAKOUT detected - Validating entry conditions...", 
+                                    "INFO", critical=True)
+                    
+                    # VALIDATE ALL ENTRY FILTERS on CURRENT bars (matches original _validate_all_entry_filters)
+                    # The original Backtrader re-validates these filters at breakout time:
+                    # - EMA Order Condition
+                    # - Price Filter EMA
+                    # - EMA Position Filter (EMAs below/above price)
+                    # - Angle Filter
+                    # plus the time filter before entry (matches original strategy Line 1381)
+                    rejected = self._evaluate_entry_filters(
+                        symbol, df, armed_direction,
+                        entry_filters.BREAKOUT_FILTER_MASK | entry_filters.FILTER_TIME)
+                    for bit in entry_filters.BREAKOUT_FILTERS:
+                        if rejected & bit:
+                            self.terminal_log(f"[X] {symbol}: Entry blocked by {entry_filters.FILTER_NAMES[bit]} filter at breakout", 
+                                            "WARNING", critical=True)
+                            break
+                    
+                    # Machine checks filters, the ORIGINAL trigger candle, then trading hours
+                    decision = machine.confirm_breakout(current_state, window_bar,
+                                                        rejected & ~entry_filters.FILTER_TIME,
+                                                        not rejected & entry_filters.FILTER_TIME)
+                    
+                    if decision.kind == phase_machine.TRANSITION_BREAKOUT_REJECTED:
+                        reason = decision.info['reason']
+                        if reason == 'trigger_candle':
+                            self.terminal_log(f"[X] {symbol}: Entry blocked - Original trigger candle direction invalid", "WARNING", critical=True)
+                        if reason == 'time':
                             self.terminal_log(f" {symbol}: ENTRY BLOCKED - Breakout detected outside trading hours", 
                                             "WARNING", critical=True)
-                            self._reset_entry_state(symbol)
-                            entry_state = 'SCANNING'
-                            trade_executed = False
                         else:
-                            # Execute trade in MT5 at close price (backtrader behavior)
-                            entry_price = current_close
-                            trade_executed = self.execute_trade(symbol, armed_direction, entry_price, config)
+                            self.terminal_log(f"[!] {symbol}: ENTRY ABORTED - Filters failed at breakout time", "WARNING", critical=True)
+                        return 'SCANNING'
+                    
+                    self.terminal_log(f"[OK] {symbol}: All entry filters PASSED. Price: {current_close:.{digits}f}", 
+                                    "SUCCESS", critical=True)
+                    
+                    # Execute trade in MT5 at close price (backtrader behavior)
+                    trade_executed = self.execute_trade(symbol, armed_direction, current_close, config)
                     
                     if trade_executed:
                         self.terminal_log(f" {symbol}: Trade executed successfully!", "SUCCESS", critical=True)
                         # CRITICAL FIX: DO NOT reset state immediately after trade execution
                         # Set to IN_TRADE state to prevent duplicate entries while position is open
-                        current_state['entry_state'] = 'IN_TRADE'
-                        current_state['phase'] = 'TRADE_ACTIVE'
+                        machine.enter(current_state)
                         entry_state = 'IN_TRADE'
                         self.terminal_log(f" {symbol}: State locked - Will not accept new signals until position closes", 
                                         "INFO", critical=True)
@@ -3409,39 +3008,27 @@ class AdvancedMT5TradingMonitorGUI:
                         # Only reset if trade failed
                         self._reset_entry_state(symbol)
                         entry_state = 'SCANNING'
+                
+                elif transition.kind == phase_machine.TRANSITION_OUTSIDE_HOURS:
+                    self.terminal_log(f"[T] {symbol}: Breakout detected but outside trading hours - Resetting to SCANNING", 
+                                    "WARNING", critical=True)
+                    entry_state = 'SCANNING'
                     
-                elif breakout_status == 'EXPIRED':
-                    self.terminal_log(f" {symbol}: Window EXPIRED - Returning to pullback search", 
+                elif transition.kind == phase_machine.TRANSITION_WINDOW_EXPIRED:
+                    # Back to ARMED to search for more pullback (matches original Lines 1191-1198)
+                    self.terminal_log(f" {symbol}: Window EXPIRED (bar {current_bar}) - Returning to pullback search", 
                                     "WARNING", critical=True)
-                    # Return to ARMED state to search for more pullback (matches original Lines 1191-1198)
-                    current_state['entry_state'] = f"ARMED_{armed_direction}"
-                    current_state['phase'] = 'WAITING_PULLBACK'
-                    current_state['window_active'] = False
-                    current_state['pullback_candle_count'] = 0  # Reset pullback count
-                    # Clear window variables (matches original: window_top_limit, window_bottom_limit, window_expiry_bar = None)
-                    current_state['window_bar_start'] = None
-                    current_state['window_expiry_bar'] = None
-                    current_state['window_top_limit'] = None
-                    current_state['window_bottom_limit'] = None
                     entry_state = f"ARMED_{armed_direction}"
                     
-                elif breakout_status == 'FAILURE':
-                    self.terminal_log(f"[X] {symbol}: Failure boundary broken - Returning to pullback search", 
+                elif transition.kind == phase_machine.TRANSITION_WINDOW_FAILURE:
+                    # Back to ARMED (matches original Lines 1216-1221)
+                    boundary = "BELOW bottom" if armed_direction == 'LONG' else "ABOVE top"
+                    self.terminal_log(f"[X] {symbol}: {armed_direction} FAILURE - Price {transition.info['price']:.{digits}f} broke {boundary} limit {transition.info['boundary']:.{digits}f} - Returning to pullback search", 
                                     "WARNING", critical=True)
-                    # Return to ARMED state (matches original Lines 1216-1221)
-                    current_state['entry_state'] = f"ARMED_{armed_direction}"
-                    current_state['phase'] = 'WAITING_PULLBACK'
-                    current_state['window_active'] = False
-                    current_state['pullback_candle_count'] = 0  # Reset pullback count
-                    # Clear window variables (matches original: window_top_limit, window_bottom_limit, window_expiry_bar = None)
-                    current_state['window_bar_start'] = None
-                    current_state['window_expiry_bar'] = None
-                    current_state['window_top_limit'] = None
-                    current_state['window_bottom_limit'] = None
                     entry_state = f"ARMED_{armed_direction}"
             
             # Update last update time
-            current_state['last_update'] = datetime.now()
+            current_state.last_update = datetime.now()
             
         except Exception as e:
             self.terminal_log(f"[X] Phase determination error: {str(e)}", "ERROR", critical=True)
@@ -3463,14 +3050,14 @@ class AdvancedMT5TradingMonitorGUI:
             self.phases_tree.delete(item)
             
         # Add current strategy states
-        for symbol, state in self.strategy_states.items():
+        for symbol, state in self.state_snapshots.items():
             # Get display-friendly values
-            entry_state = state.get('entry_state', 'SCANNING')
-            phase_display = state.get('phase', 'NORMAL')
-            armed_dir = state.get('armed_direction', None)
+            entry_state = state.entry_state
+            phase_display = state.phase
+            armed_dir = state.armed_direction
             direction_display = armed_dir if armed_dir else 'None'
-            pullback_count = state.get('pullback_candle_count', 0)
-            window_active = state.get('window_active', False)
+            pullback_count = state.pullback_candle_count
+            window_active = state.window_active
             
             values = (
                 symbol,
@@ -3478,7 +3065,7 @@ class AdvancedMT5TradingMonitorGUI:
                 direction_display,
                 pullback_count,
                 'Yes' if window_active else 'No',
-                state['last_update'].strftime("%H:%M:%S")
+                state.last_update.strftime("%H:%M:%S")
             )
             
             item = self.phases_tree.insert("", tk.END, values=values)
@@ -3494,10 +3081,10 @@ class AdvancedMT5TradingMonitorGUI:
     def update_indicators_display(self):
         """Update the indicators display for selected symbol"""
         symbol = self.symbol_var.get()
-        if not symbol or symbol not in self.strategy_states:
+        if not symbol or symbol not in self.state_snapshots:
             return
             
-        indicators = self.strategy_states[symbol].get('indicators', {})
+        indicators = self.state_snapshots[symbol].indicators
         config = self.strategy_configs.get(symbol, {})
         
         if not indicators:
@@ -3510,8 +3097,8 @@ class AdvancedMT5TradingMonitorGUI:
             display_text += f" CURRENT MARKET DATA\n"
             
             # Get symbol precision for dynamic formatting
-            state = self.strategy_states.get(symbol, {})
-            digits = state.get('digits', 5)  # Default to 5 if not found
+            state = self.state_snapshots[symbol]
+            digits = state.digits  # Default to 5 if not found
             
             # Safe formatting for price
             current_price = indicators.get('current_price', 'N/A')
@@ -3669,13 +3256,13 @@ class AdvancedMT5TradingMonitorGUI:
             display_text += "\n"
             
             # Strategy state info
-            state = self.strategy_states[symbol]
+            state = self.state_snapshots[symbol]
             display_text += f" CURRENT STRATEGY STATE\n"
-            display_text += f"Phase: {state['phase']}\n"
-            display_text += f"Armed Direction: {state.get('armed_direction', 'None')}\n"
-            display_text += f"Pullback Count: {state.get('pullback_count', 0)}\n"
-            display_text += f"Window Active: {state.get('window_active', False)}\n"
-            display_text += f"Last Update: {state['last_update'].strftime('%H:%M:%S')}\n"
+            display_text += f"Phase: {state.phase}\n"
+            display_text += f"Armed Direction: {state.armed_direction}\n"
+            display_text += f"Pullback Count: {state.pullback_count}\n"
+            display_text += f"Window Active: {state.window_active}\n"
+            display_text += f"Last Update: {state.last_update.strftime('%H:%M:%S')}\n"
             
         except Exception as e:
             display_text += f"Error displaying indicators: {str(e)}\n"
@@ -3691,18 +3278,18 @@ class AdvancedMT5TradingMonitorGUI:
             self.markers_tree.delete(item)
             
         # Add window markers for strategies in WINDOW_OPEN state
-        for symbol, state in self.strategy_states.items():
-            entry_state = state.get('entry_state', 'SCANNING')
+        for symbol, state in self.state_snapshots.items():
+            entry_state = state.entry_state
             
-            if entry_state == 'WINDOW_OPEN' and state.get('window_active', False):
-                armed_direction = state.get('armed_direction', 'Unknown')
-                window_start = state.get('window_bar_start', 'None')
-                window_end = state.get('window_expiry_bar', 'None')
+            if entry_state == 'WINDOW_OPEN' and state.window_active:
+                armed_direction = state.armed_direction
+                window_start = state.window_bar_start
+                window_end = state.window_expiry_bar
                 
                 # Show breakout levels (top/bottom limits)
-                window_top = state.get('window_top_limit')
-                window_bottom = state.get('window_bottom_limit')
-                digits = state.get('digits', 5)  # Get symbol precision
+                window_top = state.window_top_limit
+                window_bottom = state.window_bottom_limit
+                digits = state.digits  # Get symbol precision
                 
                 if armed_direction == 'LONG':
                     # LONG breakout = price breaks above top limit
@@ -3722,10 +3309,15 @@ class AdvancedMT5TradingMonitorGUI:
                 
                 self.markers_tree.insert("", tk.END, values=values)
                 
+    def refresh_chart_if_selected(self, symbol):
+        """Refresh the chart after new data for symbol, if it is the one displayed"""
+        if self.chart_symbol_var.get() == symbol:
+            self.refresh_chart()
+            
     def refresh_chart(self):
         """Refresh the current chart with candlesticks"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
+        if not MATPLOTLIB_AVAILABLE or getattr(self, 'fig', None) is None:
+            return  # Chart not built until its tab is opened
             
         symbol = self.chart_symbol_var.get()
         if symbol not in self.chart_data:
@@ -3813,30 +3405,30 @@ class AdvancedMT5TradingMonitorGUI:
                            color='purple', alpha=0.7, linewidth=1.5, linestyle='-')
             
             # Mark current phase
-            state = self.strategy_states[symbol]
+            state = self.state_snapshots[symbol]
             phase_colors = {
                 'NORMAL': 'lightgray',
                 'WAITING_PULLBACK': 'yellow',
                 'WAITING_BREAKOUT': 'orange'
             }
-            phase_color = phase_colors.get(state['phase'], 'lightgray')
+            phase_color = phase_colors.get(state.phase, 'lightgray')
             
             # Add phase indicator as background
             current_price = indicators.get('current_price', df_local['close'].iloc[-1])
             self.ax.axhspan(current_price * 0.9999, current_price * 1.0001, 
                           color=phase_color, alpha=0.3, 
-                          label=f'Phase: {state["phase"]}')
+                          label=f'Phase: {state.phase}')
             
             # Mark pullback phase with special indicators
-            if state['phase'] == 'WAITING_PULLBACK':
-                pullback_count = state.get('pullback_candle_count', 0)
+            if state.phase == 'WAITING_PULLBACK':
+                pullback_count = state.pullback_candle_count
                 self.ax.text(0.02, 0.98, f'Pullback Count: {pullback_count}', 
                            transform=self.ax.transAxes, fontsize=10, 
                            bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
                            verticalalignment='top')
                            
-            elif state['phase'] == 'WAITING_BREAKOUT':
-                breakout_level = state.get('breakout_level', current_price)
+            elif state.phase == 'WAITING_BREAKOUT':
+                breakout_level = state.breakout_level
                 if breakout_level:
                     self.ax.axhline(y=breakout_level, color='red', linestyle='--', 
                                   alpha=0.8, label=f'Breakout Level: {breakout_level:.5f}')
@@ -3900,7 +3492,7 @@ class AdvancedMT5TradingMonitorGUI:
                            verticalalignment='bottom', horizontalalignment='right')
             
             # Formatting
-            self.ax.set_title(f'{symbol} - Live Candlestick Chart with ATR SL/TP (Phase: {state["phase"]})')
+            self.ax.set_title(f'{symbol} - Live Candlestick Chart with ATR SL/TP (Phase: {state.phase})')
             self.ax.set_xlabel('Time (UTC)')
             self.ax.set_ylabel('Price')
             self.ax.legend(loc='upper left', fontsize=7, ncol=2)
@@ -3919,7 +3511,7 @@ class AdvancedMT5TradingMonitorGUI:
             self.fig.tight_layout()
             self.canvas.draw()
             
-            self.terminal_log(f" Candlestick chart refreshed for {symbol} (Phase: {state['phase']})", "NORMAL")
+            self.terminal_log(f" Candlestick chart refreshed for {symbol} (Phase: {state.phase})", "NORMAL")
             
         except Exception as e:
             self.terminal_log(f"[X] Chart refresh error: {str(e)}", "ERROR")
@@ -3972,6 +3564,7 @@ class AdvancedMT5TradingMonitorGUI:
     def process_phase_updates(self):
         """Process phase updates from the monitoring thread"""
         try:
+            self.drain_terminal_queue()
             while not self.phase_update_queue.empty():
                 update = self.phase_update_queue.get_nowait()
                 # Process update
@@ -3995,19 +3588,19 @@ class AdvancedMT5TradingMonitorGUI:
             # Group by phase for better overview
             phases = {'NORMAL': [], 'WAITING_PULLBACK': [], 'WAITING_BREAKOUT': []}
             
-            for symbol, state in self.strategy_states.items():
-                phase = state['phase']
-                price = state.get('indicators', {}).get('current_price', 0)
-                trend = state.get('indicators', {}).get('trend', 'N/A')
+            for symbol, state in self.state_snapshots.items():
+                phase = state.phase
+                price = state.indicators.get('current_price', 0)
+                trend = state.indicators.get('trend', 'N/A')
                 
                 if phase in phases:
                     phases[phase].append({
                         'symbol': symbol,
                         'price': price,
                         'trend': trend,
-                        'pullback_count': state.get('pullback_count', 0),
-                        'window_active': state.get('window_active', False),
-                        'last_update': state.get('last_update', datetime.now())
+                        'pullback_count': state.pullback_count,
+                        'window_active': state.window_active,
+                        'last_update': state.last_update
                     })
             
             # Display each phase group
@@ -4112,6 +3705,22 @@ class AdvancedMT5TradingMonitorGUI:
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         log_entry = f"[{timestamp}] {message}\n"
         
+        # Tk is not thread-safe: worker lines are queued and written by process_phase_updates
+        if threading.current_thread() is self._tk_thread:
+            self._append_terminal(log_entry, level)
+        else:
+            self.terminal_queue.put((log_entry, level))
+            
+        # Log to file
+        if level == "ERROR":
+            self.logger.error(message)
+        elif level == "SUCCESS":
+            self.logger.info(f"SUCCESS: {message}")
+        else:
+            self.logger.info(message)
+            
+    def _append_terminal(self, log_entry, level):
+        """Write one entry to the terminal widget (Tk thread only)"""
         # Add to terminal display
         self.terminal_text.insert(tk.END, log_entry, level)
         
@@ -4123,19 +3732,31 @@ class AdvancedMT5TradingMonitorGUI:
         if len(lines) > 1000:
             self.terminal_text.delete(1.0, f"{len(lines)-1000}.0")
             
-        # Log to file
-        if level == "ERROR":
-            self.logger.error(message)
-        elif level == "SUCCESS":
-            self.logger.info(f"SUCCESS: {message}")
-        else:
-            self.logger.info(message)
+    def drain_terminal_queue(self):
+        """Write the lines queued by worker threads to the terminal widget (Tk thread only)"""
+        while True:
+            try:
+                log_entry, level = self.terminal_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._append_terminal(log_entry, level)
             
     def clear_terminal(self):
         """Clear terminal display"""
         self.terminal_text.delete(1.0, tk.END)
         self.terminal_log("Terminal cleared", "NORMAL")
         
+    def request_profiling(self):
+        """Profile monitor_strategy_phase / execute_trade for the next PROFILE_CANDLES candles"""
+        if self.profiler is None:
+            self.terminal_log("[X] Profiling unavailable (src/profiling_hooks.py not found)", "ERROR", critical=True)
+            return
+        if self.profiler.active:
+            self.terminal_log("[i] Profiling already running", "INFO", critical=True)
+            return
+        self.profiler.request(PROFILE_CANDLES)
+        self.terminal_log(f"[i] Profiling requested for the next {PROFILE_CANDLES} candles", "INFO", critical=True)
+    
     def save_terminal_log(self):
         """Save terminal log to file"""
         filename = f"terminal_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -4224,7 +3845,7 @@ class AdvancedMT5TradingMonitorGUI:
             return False
         
         current_state = self.strategy_states[symbol]
-        digits = current_state.get('digits', 5)
+        digits = current_state.digits
         
         # Get entry price (current close)
         entry_price = float(df['close'].iloc[-1])
@@ -4245,8 +3866,7 @@ class AdvancedMT5TradingMonitorGUI:
             self.terminal_log(f"[OK] {symbol}: STANDARD {direction} trade executed successfully!", 
                             "SUCCESS", critical=True)
             # Lock state to prevent duplicate entries
-            current_state['entry_state'] = 'IN_TRADE'
-            current_state['phase'] = 'TRADE_ACTIVE'
+            self.get_phase_machine(symbol).enter(current_state)
             self.terminal_log(f" {symbol}: State locked - No new signals until position closes", 
                             "INFO", critical=True)
             return True
@@ -4269,8 +3889,8 @@ class AdvancedMT5TradingMonitorGUI:
             return False
             
         try:
-            # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)  # type: ignore
+            # Get symbol info (cached spec - also provides the filling mode below)
+            symbol_info = self.get_symbol_spec(symbol)
             if symbol_info is None:
                 self.terminal_log(f"[X] {symbol}: Symbol not found in MT5", "ERROR", critical=True)
                 return False
@@ -4279,6 +3899,8 @@ class AdvancedMT5TradingMonitorGUI:
                 if not mt5.symbol_select(symbol, True):  # type: ignore
                     self.terminal_log(f"[X] {symbol}: Failed to select symbol", "ERROR", critical=True)
                     return False
+                if self.symbol_specs is not None:
+                    self.symbol_specs.invalidate(symbol)  # Re-read as visible next time
             
             # Get account info for risk calculation
             account_info = mt5.account_info()  # type: ignore
@@ -4306,7 +3928,7 @@ class AdvancedMT5TradingMonitorGUI:
             balance = account_info.balance
             
             # Get asset-specific allocation (default 16% if symbol not in allocations)
-            allocation_percent = ASSET_ALLOCATIONS.get(symbol, 0.16)
+            allocation_percent = self.asset_allocations.get(symbol, 0.16)
             allocated_capital = balance * allocation_percent
             
             # Get risk percentage (configurable per strategy, default 1%)
@@ -4335,12 +3957,12 @@ class AdvancedMT5TradingMonitorGUI:
             )
             
             # Get ATR for stop loss calculation from indicators
-            current_state = self.strategy_states.get(symbol, {})
-            indicators = current_state.get('indicators', {})
+            current_state = self.strategy_states[symbol]
+            indicators = current_state.indicators
             atr = indicators.get('atr', None)
             
             # Log ATR retrieval for debugging
-            self.terminal_log(f" {symbol}: ATR Check | Value={atr} | Has_indicators={bool(indicators)} | State_keys={list(current_state.keys())}", 
+            self.terminal_log(f" {symbol}: ATR Check | Value={atr} | Has_indicators={bool(indicators)} | State={current_state!r}", 
                             "INFO", critical=True)
             
             if atr is None or atr <= 0 or (isinstance(atr, float) and (pd.isna(atr) if pd else False)):
@@ -4365,42 +3987,21 @@ class AdvancedMT5TradingMonitorGUI:
             self.terminal_log(f" {symbol}: SL_Distance={sl_distance:.5f} (ATR {atr:.5f} x {atr_sl_multiplier})", 
                             "INFO", critical=True)
             
-            # Calculate lot size based on risk
-            # For commodities (XAUUSD, XAGUSD): 1 lot = contract_size units (e.g., 100 oz)
-            # For forex (EURUSD, etc.): 1 lot = 100,000 units
-            # Formula: lot_size = risk_amount / (sl_distance_in_price x pip_value_per_lot)
+            # Calculate lot size based on risk (shared vectorized sizing engine)
+            # Formula: lot_size = risk_amount / (sl_distance_in_points x value_per_point)
+            # value_per_point = tick_value x (point / tick_size) from the broker spec
+            sizing = position_sizing.size_positions(balance, atr, atr_sl_multiplier, allocation_percent,
+                                                    risk_percent, position_sizing.SpecArrays([symbol], [symbol_info]))
             
             point = symbol_info.point
             contract_size = symbol_info.trade_contract_size  # 100 for XAUUSD, 100000 for EURUSD/GBPUSD
             tick_value = symbol_info.trade_tick_value  # Value per tick in account currency
             tick_size = symbol_info.trade_tick_size
+            value_per_point = float(sizing.value_per_point[0])
+            sl_distance_in_points = float(sizing.sl_points[0])
+            lot_size = float(sizing.raw_lots[0])
             
-            # CRITICAL FIX: Use MT5's tick_value directly (it's correct per broker contract specs)
-            # The formula is: lot_size = risk / (sl_distance_points x tick_value_per_tick x ticks_per_point)
-            # Simplified: lot_size = risk / (sl_distance_in_points x value_per_point)
-            
-            # Calculate value per point from MT5 symbol info
-            # tick_value = value change per tick in account currency
-            # tick_size = minimum price change (tick)
-            # point = minimum price representation (usually same as tick_size)
-            
-            if tick_size > 0 and point > 0:
-                # Value per point = tick_value x (point / tick_size)
-                # For most symbols: point == tick_size, so value_per_point = tick_value
-                value_per_point = tick_value * (point / tick_size)
-            else:
-                # Fallback if tick data is invalid
-                value_per_point = tick_value if tick_value > 0 else 0.01
-            
-            # Calculate SL distance in points (not pips!)
-            # point = minimum price unit (e.g., 0.00001 for EURUSD, 0.01 for XAUUSD, 0.001 for XAGUSD)
-            sl_distance_in_points = sl_distance / point
-            
-            # Calculate lot size using broker-specific values
-            # Formula: lot_size = risk_amount / (sl_distance_in_points x value_per_point)
-            if value_per_point > 0 and sl_distance_in_points > 0:
-                lot_size = risk_amount / (sl_distance_in_points * value_per_point)
-            else:
+            if not sizing.valid[0]:
                 self.terminal_log(f"[X] {symbol}: Invalid calculation values - value_per_point={value_per_point}, sl_distance_in_points={sl_distance_in_points}", "ERROR", critical=True)
                 return False
             
@@ -4452,11 +4053,8 @@ class AdvancedMT5TradingMonitorGUI:
             lot_max = symbol_info.volume_max
             lot_step = symbol_info.volume_step
             
-            # Round to valid lot step
-            lot_size = round(lot_size / lot_step) * lot_step
-            
-            # Apply broker's min/max limits (removed 0.1 cap!)
-            lot_size = max(lot_min, min(lot_size, lot_max))
+            # Rounded to valid lot step, clamped to broker's min/max limits (removed 0.1 cap!)
+            lot_size = float(sizing.lots[0])
             
             # Log final volume after limits
             self.terminal_log(f"   Final Volume: {lot_size:.6f} lots (min={lot_min}, max={lot_max}, step={lot_step})", "DEBUG", critical=True)
@@ -4479,10 +4077,7 @@ class AdvancedMT5TradingMonitorGUI:
             
             # CRITICAL FIX: Detect broker's supported filling mode
             # Error 10030 = INVALID_FILL occurs when using unsupported filling mode
-            symbol_info = mt5.symbol_info(symbol)  # type: ignore
-            if symbol_info is None:
-                self.terminal_log(f"[X] {symbol}: Cannot get symbol info", "ERROR", critical=True)
-                return False
+            # (filling_mode is a static field of the cached spec fetched above)
             
             # Determine filling mode based on broker's support
             # filling_mode flags: 1=FOK, 2=IOC, 4=RETURN (can be combined)
@@ -4547,6 +4142,8 @@ class AdvancedMT5TradingMonitorGUI:
     
     def disconnect_mt5(self):
         """Disconnect from MT5"""
+        if self.connection_supervisor is not None:
+            self.connection_supervisor.stop()  # Manual disconnect - no automatic reconnect
         if mt5:
             mt5.shutdown()  # type: ignore
         self.mt5_connected = False
@@ -4563,6 +4160,13 @@ class AdvancedMT5TradingMonitorGUI:
                 
             if self.mt5_connected:
                 self.disconnect_mt5()
+            
+            if self.monitor_executor is not None:
+                self.monitor_executor.shutdown(wait=False)
+                self.monitor_executor = None
+            
+            if self.profiler is not None and self.profiler.active:
+                self.profiler.stop()  # Keep what a running session collected
                 
             self.terminal_log(" Application closing...", "NORMAL")
             
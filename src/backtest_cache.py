@@ -0,0 +1,307 @@
+"""
+Backtest Cache - Content-Addressed Backtest Results
+===================================================
+Caches backtest results under a key hashed from
+
+    - the data slice (rates array bytes, or the CSV lines inside the date range)
+    - the strategy source (strategies/sunrise_ogle_*.py file contents)
+    - the parameter set (canonical JSON)
+
+so re-running an unchanged backtest is a file read. Results (trade list,
+equity curve, summary metrics) are stored as one NumPy ``.npz`` file per
+key; the cache directory is kept under a disk budget with least-recently-
+used eviction (file mtime is the access time, shared by sweep processes).
+
+Usage:
+    cache = BacktestCache()
+    key = cache_key(data_fingerprint_csv(csv_path, FROMDATE, TODATE),
+                    source_fingerprint(strategy_path), params)
+    result = cache.get_or_compute(key, lambda: run_backtest(...))
+
+    # 8-asset portfolio: only symbols whose data/source/params changed rerun
+    # (src/phase_backtest.py builds the jobs and run_fn for the strategies)
+    results = run_portfolio(jobs, run_fn, cache)
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==========
+# CACHE CONFIGURATION
+# ==========
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, 'cache', 'backtests')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # Disk budget before LRU eviction
+CACHE_FORMAT_VERSION = 1               # Bump when the stored layout changes
+CACHE_SUFFIX = '.npz'
+
+TRADE_DTYPE = np.dtype([('entry_time', 'M8[s]'), ('exit_time', 'M8[s]'), ('direction', 'i1'),
+                        ('entry_price', 'f8'), ('exit_price', 'f8'), ('pnl', 'f8')])
+
+
+# ==========
+# KEYS
+# ==========
+
+def _digest(*chunks: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def data_fingerprint(rates: np.ndarray) -> str:
+    """Hash of an in-memory bar array (MT5 rates / structured or plain ndarray)"""
+    rates = np.ascontiguousarray(rates)
+    return _digest(str(rates.dtype).encode(), str(rates.shape).encode(), rates.tobytes())
+
+
+def data_fingerprint_csv(path: str, fromdate: Optional[str] = None, todate: Optional[str] = None) -> str:
+    """Hash of the backtest CSV lines inside [fromdate, todate] (YYYY-MM-DD, inclusive)
+
+    Lines start with the YYYYMMDD date column (GenericCSVData layout), so the
+    range is selected by string comparison without parsing the file.
+    """
+    low = fromdate.replace('-', '') if fromdate else None
+    high = todate.replace('-', '') if todate else None
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        h.update(header)
+        for line in f:
+            day = line[:8].decode('ascii', 'replace')
+            if (low and day < low) or (high and day > high):
+                continue
+            h.update(line)
+    return h.hexdigest()
+
+
+def source_fingerprint(path: str) -> str:
+    """Hash of a strategy source file (any edit invalidates its results)"""
+    with open(path, 'rb') as f:
+        return _digest(f.read())
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Order-independent hash of a parameter set"""
+    return _digest(json.dumps(params, sort_keys=True, default=str, separators=(',', ':')).encode())
+
+
+def cache_key(data_hash: str, source_hash: str, params: Dict[str, Any]) -> str:
+    return _digest(f"v{CACHE_FORMAT_VERSION}|{data_hash}|{source_hash}|{params_fingerprint(params)}".encode())
+
+
+# ==========
+# RESULT RECORD
+# ==========
+
+class BacktestResult:
+    """Trade list, equity curve and summary metrics of one backtest"""
+
+    __slots__ = ('trades', 'equity_times', 'equity_values', 'metrics')
+
+    def __init__(self, trades: np.ndarray, equity_times: np.ndarray, equity_values: np.ndarray,
+                 metrics: Optional[Dict[str, Any]] = None):
+        self.trades = trades
+        self.equity_times = equity_times
+        self.equity_values = equity_values
+        self.metrics = metrics or {}
+
+    @classmethod
+    def from_trade_reports(cls, trade_reports: Iterable[Dict], starting_cash: float,
+                           equity=None) -> 'BacktestResult':
+        """Build from SunriseOgle.trade_reports (entry_time / exit_time / direction / pnl dicts)
+
+        Open trades (no exit yet) are skipped. Without ``equity`` (an
+        EquityBuffer of per-bar broker values) the equity curve steps at exits.
+        """
+        closed = [t for t in trade_reports if t.get('exit_time') is not None]
+        trades = np.zeros(len(closed), dtype=TRADE_DTYPE)
+        for i, trade in enumerate(closed):
+            trades[i] = (np.datetime64(trade['entry_time'], 's'), np.datetime64(trade['exit_time'], 's'),
+                         -1 if trade.get('direction') == 'SHORT' else 1,
+                         trade.get('entry_price', np.nan) or np.nan, trade.get('exit_price', np.nan) or np.nan,
+                         trade.get('pnl', 0.0))
+        order = np.argsort(trades['exit_time'], kind='stable')
+        trades = trades[order]
+        metrics = summary_metrics(trades['pnl'], starting_cash)
+        if equity is not None and len(equity):
+            metrics.update(equity.metrics(metrics['gross_profit'], metrics['gross_loss']))
+            return cls(trades, equity.times.astype('M8[s]'), equity.values.copy(), metrics)
+        equity_values = starting_cash + np.cumsum(trades['pnl'])
+        return cls(trades, trades['exit_time'].copy(), equity_values, metrics)
+
+    def __eq__(self, other):
+        return (isinstance(other, BacktestResult) and self.trades.dtype == other.trades.dtype
+                and all(np.array_equal(self.trades[name], other.trades[name], equal_nan=self.trades[name].dtype.kind == 'f')
+                        for name in self.trades.dtype.names)
+                and np.array_equal(self.equity_times, other.equity_times)
+                and np.array_equal(self.equity_values, other.equity_values) and self.metrics == other.metrics)
+
+
+def summary_metrics(pnl: np.ndarray, starting_cash: float) -> Dict[str, float]:
+    """Trade-based summary (matches the strategies' end-of-run report fields)"""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+    equity = starting_cash + np.concatenate([[0.0], np.cumsum(pnl)])
+    peak = np.maximum.accumulate(equity)
+    drawdown = peak - equity
+    gross_loss = float(-losses.sum())
+    return {
+        'trades': int(len(pnl)),
+        'wins': int(len(wins)),
+        'losses': int(len(losses)),
+        'win_rate': float(len(wins) / len(pnl)) if len(pnl) else 0.0,
+        'net_pnl': float(pnl.sum()),
+        'gross_profit': float(wins.sum()),
+        'gross_loss': gross_loss,
+        'profit_factor': float(wins.sum() / gross_loss) if gross_loss > 0 else float('inf') if len(wins) else 0.0,
+        'max_drawdown': float(drawdown.max()),
+        'max_drawdown_pct': float((drawdown / peak).max() * 100.0),
+        'final_value': float(equity[-1]),
+    }
+
+
+# ==========
+# CACHE
+# ==========
+
+class BacktestCache:
+    """Content-addressed on-disk result store with LRU eviction by total size
+
+    Args:
+        cache_dir: directory holding one ``<key>.npz`` per result
+        max_bytes: disk budget; least recently used results are evicted beyond it
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 logger: Optional[logging.Logger] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[BacktestResult]:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                result = BacktestResult(stored['trades'], stored['equity_times'], stored['equity_values'],
+                                        json.loads(stored['metrics'].tobytes().decode('utf-8')))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Backtest cache entry {key} unreadable ({e}) - discarding")
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: BacktestResult):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        metrics = np.frombuffer(json.dumps(result.metrics, sort_keys=True).encode('utf-8'), dtype=np.uint8)
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(f, trades=result.trades, equity_times=result.equity_times,
+                                equity_values=result.equity_values, metrics=metrics)
+        os.replace(temp_path, path)  # Atomic: readers never see a partial file
+        self.evict()
+
+    def get_or_compute(self, key: str, compute_fn: Callable[[], BacktestResult]) -> BacktestResult:
+        result = self.get(key)
+        if result is None:
+            result = compute_fn()
+            self.put(key, result)
+        return result
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(last_used, size, path) of every stored result, least recently used first"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Remove least recently used results until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def run_portfolio(jobs: Dict[str, Dict[str, Any]], run_fn: Callable[[str, Dict[str, Any]], BacktestResult],
+                  cache: BacktestCache, logger: Optional[logging.Logger] = None) -> Dict[str, BacktestResult]:
+    """Backtest every symbol, recomputing only symbols whose inputs changed
+
+    Each job: {'data_hash' or 'rates' or 'data' (+ 'fromdate' / 'todate'),
+    'strategy' (source path), 'params'}; ``run_fn(symbol, job)`` runs the backtest.
+    """
+    logger = logger or logging.getLogger(__name__)
+    results = {}
+    for symbol, job in jobs.items():
+        if job.get('data_hash'):
+            data_hash = job['data_hash']
+        elif job.get('rates') is not None:
+            data_hash = data_fingerprint(job['rates'])
+        else:
+            data_hash = data_fingerprint_csv(job['data'], job.get('fromdate'), job.get('todate'))
+        key = cache_key(data_hash, source_fingerprint(job['strategy']), job.get('params', {}))
+
+        started = datetime.now()
+        result = cache.get(key)
+        if result is None:
+            result = run_fn(symbol, job)
+            cache.put(key, result)
+            logger.info(f"{symbol}: backtest computed in {(datetime.now() - started).total_seconds():.1f}s")
+        else:
+            logger.info(f"{symbol}: backtest cache hit ({key})")
+        results[symbol] = result
+    return results
@@ -0,0 +1,222 @@
+"""
+Backtrader Phase Adapter - Drive the Shared Phase Machine from Backtrader
+=========================================================================
+Feeds a running backtrader strategy's data and indicator lines into
+src/phase_machine.py so backtests use the SAME entry state machine and
+entry filters (src/entry_filters.py) as the live monitor.
+
+No backtrader import: the adapter duck-types the SunriseOgle line names
+
+    strategy.data.{open,high,low,close,datetime}
+    strategy.ema_confirm / ema_fast / ema_medium / ema_slow
+    strategy.ema_filter_price / strategy.atr / strategy.position
+
+Strategy files stay read-only (docs/STRATEGY_FILES_POLICY.md); a subclass or
+wrapper strategy calls the adapter from ``next()``. ``phase_driven`` builds
+one that runs the shared machine beside the strategy's own logic (the
+strategy still places and manages its orders), writes the ARMED /
+WINDOW_OPEN / ENTRY events for src/live_replay.py and can record the
+per-bar equity curve into an EquityRecorder (src/equity_buffer.py) and the
+trade report into a TradeRecordSink (src/trade_report_sink.py):
+
+    strategy = phase_driven(SunriseOgle, registry.load_params('EURUSD'),
+                            events_path='temp_reports/EURUSD_events.csv')
+    cerebro.addstrategy(strategy)
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from src.entry_filters import (BREAKOUT_FILTER_MASK, CROSSOVER_FILTERS, FILTER_TIME, FilterPlan)
+    from src.equity_buffer import EquityRecorder
+    from src.phase_machine import TRANSITION_ENTRY_SIGNAL, Bar, PhaseMachine, Transition
+    from src.strategy_state import EntryState, SymbolState
+    from src.trade_report_sink import DEFAULT_PIP_SIZE, DEFAULT_REPORT_DIR, TradeRecordSink
+except ImportError:  # Loaded with src/ itself on sys.path
+    from entry_filters import (BREAKOUT_FILTER_MASK, CROSSOVER_FILTERS, FILTER_TIME, FilterPlan)
+    from equity_buffer import EquityRecorder
+    from phase_machine import TRANSITION_ENTRY_SIGNAL, Bar, PhaseMachine, Transition
+    from strategy_state import EntryState, SymbolState
+    from trade_report_sink import DEFAULT_PIP_SIZE, DEFAULT_REPORT_DIR, TradeRecordSink
+
+TREND_LINES = ('ema_fast', 'ema_medium', 'ema_slow')
+
+
+def _crossed(confirm, line, above: bool) -> bool:
+    """Pine crossover / crossunder on the current bar (matches SunriseOgle._cross_*)"""
+    try:
+        current_a, current_b = float(confirm[0]), float(line[0])
+        previous_a, previous_b = float(confirm[-1]), float(line[-1])
+    except (IndexError, ValueError, TypeError):
+        return False
+    if above:
+        return current_a > current_b and previous_a <= previous_b
+    return current_a < current_b and previous_a >= previous_b
+
+
+class BacktraderPhaseAdapter:
+    """Shared phase machine bound to one backtrader strategy instance
+
+    Args:
+        strategy: running backtrader strategy exposing the SunriseOgle lines
+        config: strategy config dict (e.g. SymbolRegistry.load_params(symbol))
+        utc_offset_hours: offset of the data feed's timestamps from UTC
+        record: keep every transition in ``self.transitions`` (parity reports)
+    """
+
+    def __init__(self, strategy, config: Dict, utc_offset_hours: float = 0,
+                 state: Optional[SymbolState] = None, record: bool = True):
+        self.strategy = strategy
+        self.machine = PhaseMachine(config)
+        self.plans = {'LONG': FilterPlan(config, 'LONG'), 'SHORT': FilterPlan(config, 'SHORT')}
+        self.state = state or SymbolState()
+        self.utc_offset_minutes = int(round(utc_offset_hours * 60))
+        self.record = record
+        self.transitions: List[Transition] = []
+
+    # ----- line access -----
+
+    def _bar_time(self, ago: int = 0) -> datetime:
+        return self.strategy.data.datetime.datetime(ago)
+
+    def _utc_minutes(self, bar_time: datetime) -> int:
+        return (bar_time.hour * 60 + bar_time.minute - self.utc_offset_minutes) % 1440
+
+    def bar(self, ago: int = 0, bullish_cross: bool = False, bearish_cross: bool = False) -> Bar:
+        data = self.strategy.data
+        bar_time = self._bar_time(ago)
+        atr = float(self.strategy.atr[ago]) if ago == 0 else None
+        return Bar(bar_time, float(data.open[ago]), float(data.high[ago]), float(data.low[ago]),
+                   float(data.close[ago]), self._utc_minutes(bar_time), bullish_cross, bearish_cross, atr)
+
+    def filter_inputs(self) -> Dict[str, list]:
+        """Two-bar (previous, current) filter inputs from the strategy lines"""
+        s = self.strategy
+
+        def pair(line):
+            return [float(line[-1]), float(line[0])]
+
+        return {
+            'open': pair(s.data.open), 'close': pair(s.data.close), 'atr': pair(s.atr),
+            'ema_confirm': pair(s.ema_confirm), 'ema_fast': pair(s.ema_fast),
+            'ema_medium': pair(s.ema_medium), 'ema_slow': pair(s.ema_slow),
+            'ema_filter': pair(s.ema_filter_price),
+            'utc_minutes': [self._utc_minutes(self._bar_time(-1)), self._utc_minutes(self._bar_time(0))],
+            'signal_atr': self.state.signal_detection_atr,
+        }
+
+    def _evaluate(self, direction: str, filters: int) -> int:
+        inputs = {name: value if name == 'signal_atr' else _as_array(value)
+                  for name, value in self.filter_inputs().items()}
+        return self.plans[direction].evaluate_last(inputs, filters, offset=len(self.strategy) - 2)[1]
+
+    def _breakout_check(self, state: SymbolState, bar: Bar):
+        rejected = self._evaluate(state.armed_direction, BREAKOUT_FILTER_MASK | FILTER_TIME)
+        return rejected & ~FILTER_TIME, not rejected & FILTER_TIME
+
+    # ----- driving -----
+
+    def next(self) -> List[Transition]:
+        """Advance the machine by the strategy's current bar
+
+        Crossovers mirror the live monitor: the bullish crossover must pass the
+        LONG entry filters, the bearish crossover is kept raw (invalidation).
+        """
+        if len(self.strategy) < 2:
+            return []
+        if self.state.entry_state == EntryState.IN_TRADE and not self.strategy.position:
+            self.state.reset_entry()  # Position closed by SL/TP
+
+        s = self.strategy
+        bullish = any(_crossed(s.ema_confirm, getattr(s, name), True) for name in TREND_LINES)
+        bearish = any(_crossed(s.ema_confirm, getattr(s, name), False) for name in TREND_LINES)
+        if bullish:
+            bullish = not self._evaluate('LONG', CROSSOVER_FILTERS)
+
+        transitions = self.machine.step(self.state, self.bar(0, bullish, bearish), self.bar(-1),
+                                        self._breakout_check)
+        if self.record:
+            self.transitions.extend(transitions)
+        return transitions
+
+    def entered(self):
+        """Order placed for the last ENTRY_SIGNAL - lock until the position closes"""
+        self.machine.enter(self.state)
+
+    def abort(self):
+        """Order for the last ENTRY_SIGNAL was not placed - back to SCANNING"""
+        self.state.reset_entry()
+
+
+def phase_driven(strategy_class, config: Dict, utc_offset_hours: float = 0,
+                 events_path: Optional[str] = None, record_equity: bool = False,
+                 report_formats: Optional[Iterable[str]] = None, report_dir: str = DEFAULT_REPORT_DIR):
+    """Subclass of a SunriseOgle strategy class that drives the shared phase machine
+
+    ``next()`` runs the strategy's own logic, then the adapter (``self.phase``)
+    on the same bar. An ENTRY_SIGNAL locks the machine IN_TRADE; it is back to
+    SCANNING on the next bar unless the strategy holds a position by then.
+    ``stop()`` writes the recorded events to ``events_path`` (events CSV of
+    src/live_replay.py). With ``record_equity`` the broker value of every bar
+    goes into ``self.equity`` (EquityRecorder) for BacktestResult.
+
+    With ``report_formats`` the strategy's trade report hooks
+    (``_init_trade_reporting`` / ``_record_trade_entry`` / ``_record_trade_exit``
+    / ``_close_trade_reporting``) fill ``self.trade_sink`` instead of writing
+    and flushing the text report on every trade; the files are written once
+    at the end of the run.
+    """
+    class PhaseDriven(strategy_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.phase = BacktraderPhaseAdapter(self, config, utc_offset_hours)
+            self.equity = EquityRecorder(self) if record_equity else None
+
+        def next(self):
+            super().next()
+            if self.equity is not None:
+                self.equity.next()
+            for transition in self.phase.next():
+                if transition.kind == TRANSITION_ENTRY_SIGNAL:
+                    self.phase.entered()
+
+        if report_formats is not None:
+            def _init_trade_reporting(self):
+                self.trade_reports = []
+                self.trade_report_file = None
+                data_filename = getattr(self, '_data_filename', None)  # "EURUSD_5m_5Yea.csv" -> "EURUSD"
+                asset = data_filename.split('_')[0].replace('.csv', '') if isinstance(data_filename, str) else ''
+                self.trade_sink = TradeRecordSink(asset or 'UNKNOWN', report_dir, formats=report_formats,
+                                                  pip_size=getattr(self.p, 'forex_pip_value', None) or DEFAULT_PIP_SIZE)
+
+            def _record_trade_entry(self, signal_direction, dt, entry_price, position_size, current_atr):
+                self.trade_sink.record_entry(dt, signal_direction, entry_price, getattr(self, 'stop_level', None),
+                                             getattr(self, 'take_level', None), current_atr,
+                                             pullback_state=str(getattr(self, 'pullback_state', 'NORMAL')))
+
+            def _record_trade_exit(self, dt, exit_price, pnl, exit_reason):
+                self.trade_sink.record_exit(dt, exit_price, pnl, exit_reason)
+
+            def _close_trade_reporting(self):
+                self.trade_sink.close()
+
+        def stop(self):
+            super().stop()
+            if events_path:
+                try:
+                    from src.live_replay import events_from_transitions, write_events_csv
+                except ImportError:  # Loaded with src/ itself on sys.path
+                    from live_replay import events_from_transitions, write_events_csv
+                write_events_csv(events_from_transitions(self.phase.transitions), events_path)
+
+    PhaseDriven.__name__ = PhaseDriven.__qualname__ = f"PhaseDriven{strategy_class.__name__}"
+    return PhaseDriven
+
+
+def _as_array(values):
+    try:
+        import numpy as np
+        return np.asarray(values, dtype=float)
+    except ImportError:  # pragma: no cover - numpy is a core dependency
+        return values
@@ -0,0 +1,225 @@
+"""
+Candle Scheduler - Priority-Ordered Per-Candle Symbol Processing
+================================================================
+Orders the per-candle work by urgency so a symbol about to trade never
+waits behind symbols doing a full indicator recomputation:
+
+    1. WINDOW_OPEN   - breakout window active, may execute a trade
+    2. ARMED_*       - counting pullback candles
+    3. IN_TRADE      - cheap position check only (no data fetch)
+    4. SCANNING      - full fetch + indicators + crossover detection
+
+A cycle time budget applies to SCANNING symbols only: once it is spent,
+remaining SCANNING symbols are DEFERRED to the next loop iteration instead
+of delaying the cycle. WINDOW_OPEN / ARMED symbols are never deferred.
+
+With the optional ``fetch_fn`` / ``prepare_fn`` hooks, ARMED and SCANNING
+symbols are processed in batches - the whole ARMED tier, then SCANNING
+symbols ``max_workers`` at a time:
+
+    fetch_fn(symbol)  on the workers, only for the symbols of the batch
+    prepare_fn({symbol: fetched})  once per batch (vectorized indicators)
+    process_fn(symbol)  on the workers
+
+The budget is checked before each SCANNING batch, so a deferred symbol is
+never fetched and ARMED symbols never wait behind SCANNING fetches.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+# ==========
+# SCHEDULER CONFIGURATION
+# ==========
+PRIORITY_WINDOW_OPEN = 0
+PRIORITY_ARMED = 1
+PRIORITY_IN_TRADE = 2
+PRIORITY_SCANNING = 3
+
+STATE_PRIORITIES = {
+    'WINDOW_OPEN': PRIORITY_WINDOW_OPEN,
+    'ARMED_LONG': PRIORITY_ARMED,
+    'ARMED_SHORT': PRIORITY_ARMED,
+    'IN_TRADE': PRIORITY_IN_TRADE,
+    'SCANNING': PRIORITY_SCANNING,
+}
+
+DEFAULT_CYCLE_TIME_BUDGET_SECONDS = 20.0  # SCANNING work after this is deferred
+
+
+class CycleReport:
+    """Outcome of one scheduled cycle"""
+
+    __slots__ = ('processed', 'position_checked', 'deferred', 'elapsed', 'symbol_seconds')
+
+    def __init__(self):
+        self.processed: List[str] = []         # Full monitor_strategy_phase runs
+        self.position_checked: List[str] = []  # IN_TRADE symbols still holding a position
+        self.deferred: List[str] = []          # SCANNING symbols pushed to next iteration
+        self.elapsed = 0.0
+        self.symbol_seconds: Dict[str, float] = {}
+
+
+class CandleScheduler:
+    """Runs one candle's worth of symbol work in priority order
+
+    Args:
+        process_fn: full per-symbol processing, ``process_fn(symbol)``
+        position_check_fn: cheap IN_TRADE check, returns True while the
+            position is still open (symbol is then skipped). False means the
+            position closed and the symbol gets full processing this cycle.
+        time_budget_seconds: budget after which SCANNING symbols are deferred
+        fetch_fn: optional per-symbol fetch, ``fetch_fn(symbol)``, run on the
+            workers right before the symbol's batch is processed
+        prepare_fn: optional batch hook, ``prepare_fn({symbol: fetched})``,
+            called once per ARMED / SCANNING batch after its fetches
+        max_workers: worker count of the executor given to ``run_cycle``;
+            at most this many symbols are submitted at a time, and SCANNING
+            batches hold this many symbols
+        clock: monotonic clock (injectable for tests)
+    """
+
+    def __init__(self, process_fn: Callable[[str], None],
+                 position_check_fn: Callable[[str], bool],
+                 time_budget_seconds: float = DEFAULT_CYCLE_TIME_BUDGET_SECONDS,
+                 prepare_fn: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 fetch_fn: Optional[Callable[[str], Any]] = None,
+                 max_workers: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        self.process_fn = process_fn
+        self.position_check_fn = position_check_fn
+        self.prepare_fn = prepare_fn
+        self.fetch_fn = fetch_fn
+        self.time_budget_seconds = time_budget_seconds
+        self.max_workers = max(1, int(max_workers))
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def priority(entry_state: str) -> int:
+        return STATE_PRIORITIES.get(entry_state, PRIORITY_SCANNING)
+
+    def order(self, entry_states: Dict[str, str]) -> List[str]:
+        """Symbols sorted by urgency, insertion order kept within a tier"""
+        ranked = sorted(enumerate(entry_states.items()),
+                        key=lambda item: (self.priority(item[1][1]), item[0]))
+        return [symbol for _, (symbol, _) in ranked]
+
+    def run_cycle(self, entry_states: Dict[str, str], executor=None) -> CycleReport:
+        """Process symbols by priority, deferring SCANNING work past the budget
+
+        Args:
+            entry_states: {symbol: entry_state} for symbols due this candle
+            executor: optional ThreadPoolExecutor; submissions stay in
+                priority order with at most ``max_workers`` in flight
+        """
+        report = CycleReport()
+        start = self.clock()
+
+        work = []
+        for symbol in self.order(entry_states):
+            if self.priority(entry_states[symbol]) == PRIORITY_IN_TRADE:
+                try:
+                    if self.position_check_fn(symbol):
+                        report.position_checked.append(symbol)
+                        continue
+                except Exception as e:
+                    self.logger.error(f"{symbol}: position check failed: {e}")
+                # Position closed - full processing with SCANNING priority
+                work.append((PRIORITY_SCANNING, symbol))
+            else:
+                work.append((self.priority(entry_states[symbol]), symbol))
+        work.sort(key=lambda item: item[0])
+
+        def over_budget():
+            return (self.clock() - start) >= self.time_budget_seconds
+
+        def timed(symbol):
+            t0 = self.clock()
+            try:
+                self.process_fn(symbol)
+            finally:
+                report.symbol_seconds[symbol] = self.clock() - t0
+
+        urgent = [item for item in work if item[0] == PRIORITY_WINDOW_OPEN]
+        remaining = [item for item in work if item[0] != PRIORITY_WINDOW_OPEN]
+
+        self._run_work(urgent, timed, executor, report, over_budget)
+        if self.fetch_fn is None and self.prepare_fn is None:
+            self._run_work(remaining, timed, executor, report, over_budget)
+        else:
+            self._run_batches(remaining, timed, executor, report, over_budget)
+
+        report.elapsed = self.clock() - start
+        return report
+
+    def _run_work(self, work, timed, executor, report: CycleReport, over_budget):
+        """Run (priority, symbol) items in order; SCANNING items past budget are deferred"""
+        if executor is None:
+            for index, (priority, symbol) in enumerate(work):
+                if priority >= PRIORITY_SCANNING and over_budget():
+                    report.deferred.extend(s for _, s in work[index:])
+                    break
+                try:
+                    timed(symbol)
+                except Exception as e:
+                    self.logger.error(f"{symbol}: processing failed: {e}")
+                report.processed.append(symbol)
+            return
+
+        in_flight = {}
+        for index, (priority, symbol) in enumerate(work):
+            while len(in_flight) >= self.max_workers:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(future, in_flight.pop(future), report)
+            if priority >= PRIORITY_SCANNING and over_budget():
+                report.deferred.extend(s for _, s in work[index:])
+                break
+            in_flight[executor.submit(timed, symbol)] = symbol
+        for future in list(in_flight):
+            self._collect(future, in_flight.pop(future), report)
+
+    def _run_batches(self, work, timed, executor, report: CycleReport, over_budget):
+        """ARMED tier as one batch, SCANNING in batches of max_workers: fetch, prepare, process"""
+        armed = [item for item in work if item[0] < PRIORITY_SCANNING]
+        scanning = [item for item in work if item[0] >= PRIORITY_SCANNING]
+        batches = [armed] if armed else []
+        batches += [scanning[i:i + self.max_workers] for i in range(0, len(scanning), self.max_workers)]
+
+        for index, batch in enumerate(batches):
+            if batch[0][0] >= PRIORITY_SCANNING and over_budget():
+                report.deferred.extend(symbol for rest in batches[index:] for _, symbol in rest)
+                return
+            fetched = self._fetch([symbol for _, symbol in batch], executor)
+            if self.prepare_fn is not None:
+                try:
+                    self.prepare_fn(fetched)
+                except Exception as e:
+                    self.logger.error(f"Batch prepare failed: {e}")
+            self._run_work(batch, timed, executor, report, lambda: False)
+
+    def _fetch(self, symbols: List[str], executor) -> Dict[str, Any]:
+        """fetch_fn results of one batch, fetched on the workers (None on failure)"""
+        if self.fetch_fn is None:
+            return dict.fromkeys(symbols)
+
+        def fetch(symbol):
+            try:
+                return self.fetch_fn(symbol)
+            except Exception as e:
+                self.logger.error(f"{symbol}: fetch failed: {e}")
+                return None
+
+        results = executor.map(fetch, symbols) if executor is not None else map(fetch, symbols)
+        return dict(zip(symbols, results))
+
+    def _collect(self, future, symbol: str, report: CycleReport):
+        try:
+            future.result()
+        except Exception as e:
+            self.logger.error(f"{symbol}: processing failed: {e}")
+        report.processed.append(symbol)
@@ -0,0 +1,260 @@
+"""
+Connection Supervisor - Background MT5 Link Health and Reconnects
+=================================================================
+Replaces inline ``mt5.shutdown(); time.sleep(backoff); mt5.initialize()``
+reconnects on the monitoring thread (which stalled every symbol and gave up
+for good after MAX_RECONNECT_ATTEMPTS) with a background state machine:
+
+    CONNECTED --probe fails / report_failure()--> DEGRADED
+    DEGRADED  --probe ok--> CONNECTED   (transient blip, no reconnect)
+    DEGRADED  --probe fails--> RECONNECTING
+    RECONNECTING --connect ok--> on_reconnected re-syncs --> CONNECTED --> queued retries run
+    RECONNECTING --``down_after`` failed attempts--> DOWN (keeps retrying at max backoff)
+
+- Reconnect attempts use exponential backoff with jitter, so several
+  terminals / processes do not hammer the server in lock-step
+- Health probes run every ``probe_interval`` seconds while connected
+- Callers never block: ``available`` / ``check()`` fail fast while the link
+  is down, and ``run_when_connected()`` queues work until it is back
+- The re-sync hook finishes before CONNECTED is announced, so callers that
+  wait for ``available`` never run against half re-synced state. It runs on
+  the supervisor thread: hooks that touch state owned by another thread
+  should hand the work to that thread
+
+Usage:
+    supervisor = ConnectionSupervisor(connect_fn, probe_fn, disconnect_fn=mt5.shutdown,
+                                      on_reconnected=resync)
+    supervisor.start()
+    if rates is None:
+        supervisor.report_failure("copy_rates failed")
+"""
+
+import logging
+import random
+import threading
+from typing import Callable, List, Optional
+
+# ==========
+# SUPERVISOR CONFIGURATION
+# ==========
+CONNECTED = 'CONNECTED'
+DEGRADED = 'DEGRADED'
+RECONNECTING = 'RECONNECTING'
+DOWN = 'DOWN'
+
+DEFAULT_PROBE_INTERVAL = 30.0   # Seconds between health probes while connected
+DEFAULT_BASE_BACKOFF = 2.0      # First reconnect delay (doubles per failed attempt)
+DEFAULT_MAX_BACKOFF = 120.0     # Reconnect delay ceiling
+DEFAULT_JITTER = 0.25           # +/- fraction applied to each backoff delay
+DEFAULT_DOWN_AFTER = 3          # Failed attempts before the link is reported DOWN
+
+
+class ConnectionUnavailable(RuntimeError):
+    """Raised by ConnectionSupervisor.check() while the link is reconnecting or down"""
+
+
+class ConnectionSupervisor:
+    """Background health probes and jittered-backoff reconnects for one terminal link
+
+    Args:
+        connect_fn: re-establishes the link, returns True on success
+        probe_fn: cheap health check, returns True while the link is usable
+        disconnect_fn: tears down a broken link before each reconnect (optional)
+        on_state_change: ``(old_state, new_state, reason)`` callback
+        on_reconnected: re-sync hook (positions, bars, specs) run after a
+            reconnect, before the link is reported CONNECTED again
+    """
+
+    def __init__(self, connect_fn: Callable[[], bool], probe_fn: Callable[[], bool],
+                 disconnect_fn: Optional[Callable[[], None]] = None,
+                 on_state_change: Optional[Callable[[str, str, str], None]] = None,
+                 on_reconnected: Optional[Callable[[], None]] = None,
+                 probe_interval: float = DEFAULT_PROBE_INTERVAL,
+                 base_backoff: float = DEFAULT_BASE_BACKOFF,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 jitter: float = DEFAULT_JITTER,
+                 down_after: int = DEFAULT_DOWN_AFTER,
+                 rng: Optional[random.Random] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.connect_fn = connect_fn
+        self.probe_fn = probe_fn
+        self.disconnect_fn = disconnect_fn
+        self.on_state_change = on_state_change
+        self.on_reconnected = on_reconnected
+        self.probe_interval = probe_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.down_after = down_after
+        self.rng = rng or random.Random()
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.attempts = 0      # Failed reconnect attempts in the current outage
+        self.reconnects = 0    # Successful reconnects since start
+        self._state = CONNECTED
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending: List[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+
+    # ==========
+    # CALLER API (never blocks on the terminal)
+    # ==========
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """True while terminal calls are worth attempting (CONNECTED or DEGRADED)"""
+        return self._state in (CONNECTED, DEGRADED)
+
+    def check(self):
+        """Fail fast with ConnectionUnavailable while reconnecting or down"""
+        if not self.available:
+            raise ConnectionUnavailable(f"MT5 link {self._state}")
+
+    def report_failure(self, reason: str = ''):
+        """A terminal call failed (e.g. IPC error); the supervisor re-probes at once
+
+        Only the first failure of a healthy link wakes the supervisor: failures
+        reported while it is already degraded, reconnecting or down must not
+        cut the reconnect backoff short.
+        """
+        if self._transition((CONNECTED,), DEGRADED, reason or 'call failed'):
+            self._wake.set()
+
+    def run_when_connected(self, fn: Callable[[], None]) -> bool:
+        """Run ``fn`` now if the link is up, else queue it for after the reconnect
+
+        Returns:
+            bool: True if ``fn`` ran immediately
+        """
+        with self._condition:
+            if not self.available:
+                self._pending.append(fn)
+                return False
+        fn()
+        return True
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the link is available (for callers that prefer waiting)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.available, timeout)
+
+    # ==========
+    # STATE MACHINE
+    # ==========
+    def _transition(self, from_states, new_state: str, reason: str) -> bool:
+        with self._condition:
+            old_state = self._state
+            if old_state not in from_states or old_state == new_state:
+                return False
+            self._state = new_state
+            self._condition.notify_all()
+        self.logger.info(f"MT5 link {old_state} -> {new_state} ({reason})")
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(old_state, new_state, reason)
+            except Exception as e:
+                self.logger.error(f"State change callback failed: {e}")
+        return True
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential delay for the given failed attempt (1-based) with +/- jitter"""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** max(attempt - 1, 0)))
+        return delay * (1.0 + self.jitter * self.rng.uniform(-1.0, 1.0))
+
+    def _probe(self) -> bool:
+        try:
+            return bool(self.probe_fn())
+        except Exception as e:
+            self.logger.warning(f"Health probe failed: {e}")
+            return False
+
+    def _reconnect(self) -> bool:
+        if self.disconnect_fn is not None:
+            try:
+                self.disconnect_fn()
+            except Exception:
+                pass  # Link already broken
+        try:
+            return bool(self.connect_fn())
+        except Exception as e:
+            self.logger.warning(f"Reconnect attempt failed: {e}")
+            return False
+
+    def _resync(self):
+        if self.on_reconnected is not None:
+            try:
+                self.on_reconnected()
+            except Exception as e:
+                self.logger.error(f"Re-sync after reconnect failed: {e}")
+
+    def _run_pending(self):
+        with self._condition:
+            pending, self._pending = self._pending, []
+        for fn in pending:
+            try:
+                fn()
+            except Exception as e:
+                self.logger.error(f"Queued retry failed: {e}")
+
+    def step(self) -> float:
+        """Run one state-machine step; returns seconds until the next step is due"""
+        state = self._state
+        if state in (CONNECTED, DEGRADED):
+            if self._probe():
+                self._transition((DEGRADED,), CONNECTED, 'probe ok')
+                return self.probe_interval
+            if state == CONNECTED:
+                self._transition((CONNECTED,), DEGRADED, 'probe failed')
+            else:
+                self._transition((DEGRADED,), RECONNECTING, 'probe failed again')
+            return 0.0
+
+        if self._reconnect():
+            self.attempts = 0
+            self.reconnects += 1
+            self._resync()  # Still RECONNECTING / DOWN: callers keep failing fast until it is done
+            self._transition((RECONNECTING, DOWN), CONNECTED, 'reconnected')
+            self._run_pending()
+            return self.probe_interval
+
+        self.attempts += 1
+        if self.attempts >= self.down_after:
+            self._transition((RECONNECTING,), DOWN, f"{self.attempts} failed attempts")
+        delay = self.backoff_delay(self.attempts)
+        self.logger.warning(f"Reconnect attempt {self.attempts} failed - next in {delay:.1f}s")
+        return delay
+
+    # ==========
+    # BACKGROUND THREAD
+    # ==========
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()  # Failures reported from here on cut the next wait short
+            try:
+                delay = self.step()
+            except Exception as e:
+                self.logger.error(f"Connection supervisor error: {e}")
+                delay = self.probe_interval
+            self._wake.wait(delay)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mt5-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop supervising (manual disconnect / shutdown); queued retries are dropped"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        with self._condition:
+            self._pending.clear()
@@ -0,0 +1,299 @@
+"""
+Engine Loop - Bar-Close Driven asyncio Trading Loop
+===================================================
+Replaces the ``while running: process every symbol; time.sleep(interval)``
+polling loop of SunriseMT5Trader:
+
+- The loop sleeps until the next bar close (+ a small settle delay), so
+  reaction time is bounded by the delay, not by a polling interval, and
+  idle CPU is zero between candles
+- Market-session state is cached per symbol and re-queried only once its
+  session boundary (e.g. weekend open/close) has passed
+- Each open symbol runs as an independent task with its own timeout; the
+  blocking work runs in worker threads (``asyncio.to_thread``). The terminal
+  itself must be wrapped by src/mt5_terminal_guard.py: workers overlap in
+  their own work, never inside an MT5 call
+- A symbol whose previous run is still busy after a timeout is skipped, not
+  stacked. Worker threads cannot be cancelled, so a timed-out run finishes
+  in the background; ``in_current_cycle()`` tells it that its cycle has
+  ended and its results (e.g. queued signals) must be dropped
+- ``on_cycle`` (order execution) runs on one execution thread, in cycle
+  order: blocking order calls or a confirmation prompt never stall the loop
+  or the next bar
+- ``stop()`` is thread-safe (signal handlers) and wakes the loop at once
+- ``request_symbols()`` is thread-safe too: symbols that missed their bar
+  (e.g. during an outage) re-run as an extra cycle on the engine's own
+  workers, never concurrently on the caller's thread
+
+Usage:
+    engine = EngineLoop(symbols, process_fn, session_fn=connection.market_session)
+    asyncio.run(engine.run())
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ==========
+# LOOP CONFIGURATION
+# ==========
+DEFAULT_TIMEFRAME_SECONDS = 300      # M5 bars
+DEFAULT_BAR_CLOSE_DELAY = 2.0        # Seconds after the boundary before fetching (bar settles)
+DEFAULT_SYMBOL_TIMEOUT = 20.0        # Per-symbol processing timeout
+SESSION_RETRY_SECONDS = 60.0         # Re-query delay when the session lookup failed
+EXECUTION_DRAIN_TIMEOUT = 30.0       # Seconds run() waits for pending executions on shutdown
+
+# Cycle number of the symbol worker running in this context (copied into the thread by to_thread)
+CURRENT_CYCLE: contextvars.ContextVar = contextvars.ContextVar('engine_cycle', default=None)
+
+
+def seconds_to_next_bar_close(now: float, timeframe_seconds: int = DEFAULT_TIMEFRAME_SECONDS,
+                              delay: float = DEFAULT_BAR_CLOSE_DELAY) -> float:
+    """Seconds from epoch time ``now`` until the next bar boundary + delay
+
+    Broker offsets are whole hours, so M1-H1 boundaries line up in any timezone.
+    """
+    elapsed = (now - delay) % timeframe_seconds
+    return timeframe_seconds - elapsed
+
+
+def weekly_fx_session(server_time: datetime) -> Tuple[bool, float]:
+    """(is_open, seconds until the state can change) for a 24/5 market in server time
+
+    Closed Saturday/Sunday (same rule as MT5Connection.is_market_open).
+    """
+    midnight = server_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    weekday = server_time.weekday()
+    if weekday >= 5:
+        boundary = midnight + timedelta(days=7 - weekday)  # Monday 00:00
+        return False, (boundary - server_time).total_seconds()
+    boundary = midnight + timedelta(days=5 - weekday)  # Saturday 00:00
+    return True, (boundary - server_time).total_seconds()
+
+
+class SessionCache:
+    """Per-symbol market-open flags valid until their next session boundary"""
+
+    def __init__(self, session_fn: Callable[[str], Tuple[bool, float]], clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        self.session_fn = session_fn
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+        self._sessions: Dict[str, Tuple[bool, float]] = {}
+        self.lookups = 0
+
+    def is_open(self, symbol: str) -> bool:
+        now = self.clock()
+        cached = self._sessions.get(symbol)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        self.lookups += 1
+        try:
+            is_open, valid_for = self.session_fn(symbol)
+        except Exception as e:
+            self.logger.error(f"{symbol}: session lookup failed: {e}")
+            is_open, valid_for = False, SESSION_RETRY_SECONDS
+        self._sessions[symbol] = (is_open, now + max(valid_for, 0.0))
+        return is_open
+
+    def invalidate(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(symbol, None)
+
+
+class CycleResult:
+    """Outcome of one bar-close cycle"""
+
+    __slots__ = ('processed', 'closed', 'timed_out', 'failed', 'skipped_busy', 'symbol_seconds', 'started', 'cycle')
+
+    def __init__(self, started: float, cycle: int = 0):
+        self.cycle = cycle                 # Cycle number (see EngineLoop.worker_cycle)
+        self.processed: List[str] = []
+        self.closed: List[str] = []        # Market session closed
+        self.timed_out: List[str] = []
+        self.failed: List[str] = []
+        self.skipped_busy: List[str] = []  # Previous run still in its worker thread
+        self.symbol_seconds: Dict[str, float] = {}
+        self.started = started
+
+
+class EngineLoop:
+    """Runs ``process_fn(symbol)`` for every open symbol at each bar close
+
+    Args:
+        symbols: symbols to trade
+        process_fn: blocking per-symbol work (runs in a worker thread)
+        session_fn: ``symbol -> (is_open, seconds_valid)``; None = always open
+        timeframe_seconds / bar_close_delay: bar-close timer
+        symbol_timeout: seconds before a symbol task is abandoned for this cycle
+        wall_clock: epoch-seconds clock for bar boundaries (tests inject a fake)
+        on_cycle: ``on_cycle(result)`` after each cycle, on the execution thread
+            (not awaited by the cycle; ``drain()`` waits for it)
+    """
+
+    def __init__(self, symbols: List[str], process_fn: Callable[[str], None],
+                 session_fn: Optional[Callable[[str], Tuple[bool, float]]] = None,
+                 timeframe_seconds: int = DEFAULT_TIMEFRAME_SECONDS,
+                 bar_close_delay: float = DEFAULT_BAR_CLOSE_DELAY,
+                 symbol_timeout: float = DEFAULT_SYMBOL_TIMEOUT,
+                 wall_clock: Callable[[], float] = time.time,
+                 on_cycle: Optional[Callable[[CycleResult], None]] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.symbols = list(symbols)
+        self.process_fn = process_fn
+        self.timeframe_seconds = timeframe_seconds
+        self.bar_close_delay = bar_close_delay
+        self.symbol_timeout = symbol_timeout
+        self.wall_clock = wall_clock
+        self.on_cycle = on_cycle
+        self.logger = logger or logging.getLogger(__name__)
+        self.sessions = SessionCache(session_fn or (lambda symbol: (True, float('inf'))), logger=self.logger)
+        self.cycles = 0
+        self._open_cycle: Optional[int] = None  # Cycle still collecting symbol results
+        self._busy = set()
+        self._execution: Optional[ThreadPoolExecutor] = None  # One thread, created on first cycle
+        self._executions = set()  # asyncio futures of on_cycle calls still running
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_event: Optional[asyncio.Event] = None  # Set by stop() and request_symbols()
+        self._stop_requested = False
+        self._requested = set()  # Symbols for an extra cycle (mutated on the loop thread once running)
+
+    def stop(self):
+        """Request shutdown; safe to call from signal handlers and other threads"""
+        self._stop_requested = True
+        self._wake()
+
+    def request_symbols(self, symbols):
+        """Run an extra cycle for ``symbols`` as soon as the loop is free; thread-safe"""
+        symbols = [symbol for symbol in symbols if symbol in self.symbols]
+        if not symbols:
+            return
+        if self._loop is None:
+            self._requested.update(symbols)  # Picked up when run() starts
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._request, symbols)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _request(self, symbols: List[str]):
+        self._requested.update(symbols)
+        self._wake_event.set()
+
+    def _wake(self):
+        if self._loop is not None and self._wake_event is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake_event.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    @staticmethod
+    def worker_cycle() -> Optional[int]:
+        """Cycle number of the calling symbol worker (None outside the engine's workers)"""
+        return CURRENT_CYCLE.get()
+
+    def in_current_cycle(self) -> bool:
+        """False in a symbol worker that outlived its cycle (timed out, cycle since closed)
+
+        Calls from outside the engine's workers (e.g. a reconnect resync) are
+        always current. Check it under the same lock the results are queued with.
+        """
+        cycle = CURRENT_CYCLE.get()
+        return cycle is None or cycle == self._open_cycle
+
+    async def _run_symbol(self, symbol: str, result: CycleResult, cycle: int):
+        started = time.perf_counter()
+        self._busy.add(symbol)
+        CURRENT_CYCLE.set(cycle)  # Task-local context, copied into the worker thread
+        worker = asyncio.ensure_future(asyncio.to_thread(self.process_fn, symbol))
+        worker.add_done_callback(lambda _: self._busy.discard(symbol))
+        try:
+            await asyncio.wait_for(asyncio.shield(worker), self.symbol_timeout)
+            result.processed.append(symbol)
+        except asyncio.TimeoutError:
+            result.timed_out.append(symbol)
+            self.logger.warning(f"{symbol}: processing exceeded {self.symbol_timeout:.0f}s - skipped this bar")
+        except Exception as e:
+            result.failed.append(symbol)
+            self.logger.error(f"Error processing {symbol}: {e}")
+        finally:
+            result.symbol_seconds[symbol] = time.perf_counter() - started
+
+    async def run_cycle(self, symbols: Optional[List[str]] = None) -> CycleResult:
+        """Process every open symbol (or only ``symbols``) concurrently, one task per symbol"""
+        cycle = self.cycles + 1
+        result = CycleResult(self.wall_clock(), cycle)
+        self._open_cycle = cycle
+        tasks = []
+        for symbol in (self.symbols if symbols is None else symbols):
+            if not self.sessions.is_open(symbol):
+                result.closed.append(symbol)
+            elif symbol in self._busy:
+                result.skipped_busy.append(symbol)
+            else:
+                tasks.append(self._run_symbol(symbol, result, cycle))
+        if tasks:
+            await asyncio.gather(*tasks)
+        self._open_cycle = None  # Timed-out workers still running now belong to a closed cycle
+        self.cycles = cycle
+        if self.on_cycle is not None:
+            self._dispatch(result)
+        return result
+
+    def _dispatch(self, result: CycleResult):
+        """Hand the cycle to on_cycle on the execution thread (queued behind earlier cycles)"""
+        if self._execution is None:
+            self._execution = ThreadPoolExecutor(max_workers=1, thread_name_prefix='engine-exec')
+        future = asyncio.get_running_loop().run_in_executor(self._execution, self.on_cycle, result)
+        self._executions.add(future)
+        future.add_done_callback(self._execution_done)
+
+    def _execution_done(self, future):
+        self._executions.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Cycle execution failed: {future.exception()}")
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for on_cycle calls still running; False if some outlived the timeout"""
+        if self._executions:
+            await asyncio.wait(set(self._executions), timeout=timeout)
+        return not self._executions
+
+    async def run(self, max_cycles: Optional[int] = None):
+        """Sleep until each bar close and run a cycle, until stop() or max_cycles
+
+        Requested symbols run as an extra cycle between bar closes; a bar-close
+        cycle already covers them.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        if self._stop_requested:
+            return
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                requested, self._requested = self._requested, set()
+                if not requested:
+                    delay = seconds_to_next_bar_close(self.wall_clock(), self.timeframe_seconds, self.bar_close_delay)
+                    try:
+                        await asyncio.wait_for(self._wake_event.wait(), delay)
+                        self._wake_event.clear()
+                        if self._stop_requested:
+                            break
+                        continue  # Woken for requested symbols
+                    except asyncio.TimeoutError:
+                        self._requested.clear()  # Bar close: the full cycle re-runs them anyway
+                await self.run_cycle(sorted(requested) if requested else None)
+                if self._stop_requested:
+                    break
+        finally:
+            if not await self.drain(EXECUTION_DRAIN_TIMEOUT):
+                self.logger.warning(f"Order execution still running after {EXECUTION_DRAIN_TIMEOUT:.0f}s - not awaited")
+            if self._execution is not None:
+                self._execution.shutdown(wait=False)
+                self._execution = None
@@ -0,0 +1,334 @@
+"""
+Entry Filters - Compiled Filter Plan Evaluated as Boolean Masks
+===============================================================
+Compiles a symbol's enabled entry filters ONCE per (config, direction) into
+a plan of vectorized predicates over indicator arrays:
+
+- Config values are parsed at compile time, not on every check
+- ``evaluate(inputs, start, stop)`` returns a pass mask and a per-filter
+  rejection bitmap for any range of bars in one call
+- Live trading evaluates the last closed bar (``evaluate_last``);
+  backtests / analysis evaluate years of bars at once
+
+Predicates match the live monitor semantics (sunrise_ogle_*.py originals):
+
+    ATR          ATR valid and within [MIN, MAX] threshold
+    ATR_CHANGE   ATR change since signal detection (1-bar change fallback)
+                 within the increment / decrement ranges
+    ANGLE        atan((close - prev_close) * scale) within [MIN, MAX] degrees
+    PRICE        close above (LONG) / below (SHORT) the filter EMA
+    CANDLE       signal candle bullish (LONG) / bearish (SHORT)
+    EMA_ORDER    confirm EMA above (LONG) / below (SHORT) fast, medium, slow
+    EMA_POSITION close above (LONG) / below (SHORT) fast, medium, slow
+    TIME         bar time (UTC) inside the entry window, overnight supported
+
+Bars without enough history for a filter pass it (same as the per-check
+validators). A filter whose config cannot be parsed rejects every bar,
+except TIME which fails safe to allow.
+"""
+
+import logging
+import re
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+try:
+    from src.indicator_batch import ema_matrix
+except ImportError:  # Loaded with src/ itself on sys.path
+    from indicator_batch import ema_matrix
+
+# ==========
+# FILTER BITS
+# ==========
+FILTER_ATR = 1 << 0
+FILTER_ATR_CHANGE = 1 << 1
+FILTER_ANGLE = 1 << 2
+FILTER_PRICE = 1 << 3
+FILTER_CANDLE = 1 << 4
+FILTER_EMA_ORDER = 1 << 5
+FILTER_EMA_POSITION = 1 << 6
+FILTER_TIME = 1 << 7
+
+FILTER_NAMES = {
+    FILTER_ATR: 'ATR',
+    FILTER_ATR_CHANGE: 'ATR Change',
+    FILTER_ANGLE: 'Angle',
+    FILTER_PRICE: 'Price',
+    FILTER_CANDLE: 'Candle Direction',
+    FILTER_EMA_ORDER: 'EMA Ordering',
+    FILTER_EMA_POSITION: 'EMA Position',
+    FILTER_TIME: 'Time',
+}
+
+ALL_FILTERS = 0xFF
+# Checked when a crossover is detected (time filter only applies at entry)
+CROSSOVER_FILTERS = ALL_FILTERS & ~FILTER_TIME
+# Re-validated at breakout time, in this order (matches _validate_all_entry_filters)
+BREAKOUT_FILTERS = (FILTER_EMA_ORDER, FILTER_PRICE, FILTER_EMA_POSITION, FILTER_ANGLE)
+BREAKOUT_FILTER_MASK = FILTER_EMA_ORDER | FILTER_PRICE | FILTER_EMA_POSITION | FILTER_ANGLE
+
+DEFAULT_PRICE_FILTER_PERIOD = 70
+DEFAULT_ANGLE_SCALE_FACTOR = 10000.0
+
+
+def _as_bool(value, truthy=('true', '1', 'yes', 'on')) -> bool:
+    """Config flag -> bool (same rules as the GUI _extract_value)"""
+    if isinstance(value, str):
+        return value.lower() in truthy
+    return bool(value)
+
+
+def _as_int(value, default: int) -> int:
+    """First number in a config value -> int (same rules as extract_numeric_value)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = re.search(r'(\d+(?:\.\d+)?)', str(value)) if value is not None else None
+    return int(float(match.group(1))) if match else default
+
+
+def describe_rejections(bits: int) -> List[str]:
+    """Names of the filters set in a rejection bitmap value"""
+    return [name for bit, name in FILTER_NAMES.items() if int(bits) & bit]
+
+
+def minutes_of_day(times, utc_offset_hours: float = 0) -> np.ndarray:
+    """Broker bar times -> UTC minute of day (Strategy_Time_UTC = Broker_Time - offset)"""
+    stamps = np.asarray(times, dtype='datetime64[m]')
+    stamps = stamps - np.timedelta64(int(round(utc_offset_hours * 60)), 'm')
+    return (stamps - stamps.astype('datetime64[D]')).astype(np.int64)
+
+
+def _shifted(values: np.ndarray, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(values[start:stop], values[start-1:stop-1]) with NaN before the first bar"""
+    current = values[start:stop]
+    previous = np.empty_like(current)
+    if start > 0:
+        previous[:] = values[start - 1:stop - 1]
+    elif len(current):
+        previous[0] = np.nan
+        previous[1:] = values[:stop - 1]
+    return current, previous
+
+
+class FilterPlan:
+    """Enabled entry filters of one symbol + direction, compiled from its config
+
+    Usage:
+        plan = FilterPlan(config, 'LONG')
+        inputs = plan.build_inputs(open_, close, atr=atr, times=times)
+        passed, rejected = plan.evaluate(inputs)          # every bar
+        ok, bits = plan.evaluate_last(inputs)             # live: last closed bar
+
+    Inputs (1-D arrays, only those needed by enabled filters):
+        'open', 'close', 'atr', 'ema_confirm', 'ema_fast', 'ema_medium',
+        'ema_slow', 'ema_filter' (period ``filter_period``), 'utc_minutes',
+        optional 'signal_atr' (scalar or array; ATR at signal detection)
+    """
+
+    def __init__(self, config: Mapping, direction: str = 'LONG',
+                 logger: Optional[logging.Logger] = None):
+        self.direction = direction
+        self.logger = logger or logging.getLogger(__name__)
+        self.enabled = 0
+        self.broken = 0  # Enabled filters whose thresholds failed to parse (reject all)
+        self._compile(config or {})
+
+    # ----- compilation -----
+
+    def _compile(self, config: Mapping):
+        d = self.direction
+        get = config.get
+
+        if _as_bool(get(f'{d}_USE_ATR_FILTER', 'False')):
+            self.enabled |= FILTER_ATR
+            try:
+                self.atr_min = float(get(f'{d}_ATR_MIN_THRESHOLD', 0.0))
+                self.atr_max = float(get(f'{d}_ATR_MAX_THRESHOLD', 999.0))
+            except (TypeError, ValueError) as e:
+                self._mark_broken(FILTER_ATR, e)
+            # Change checks only run inside the ATR filter
+            self.use_increment = _as_bool(get(f'{d}_USE_ATR_INCREMENT_FILTER', 'False'))
+            self.use_decrement = _as_bool(get(f'{d}_USE_ATR_DECREMENT_FILTER', 'False'))
+            if self.use_increment or self.use_decrement:
+                self.enabled |= FILTER_ATR_CHANGE
+                try:
+                    self.increment_min = float(get(f'{d}_ATR_INCREMENT_MIN_THRESHOLD', 0.0))
+                    self.increment_max = float(get(f'{d}_ATR_INCREMENT_MAX_THRESHOLD', 999.0))
+                    self.decrement_min = float(get(f'{d}_ATR_DECREMENT_MIN_THRESHOLD', -999.0))
+                    self.decrement_max = float(get(f'{d}_ATR_DECREMENT_MAX_THRESHOLD', 0.0))
+                except (TypeError, ValueError) as e:
+                    self._mark_broken(FILTER_ATR_CHANGE, e)
+
+        if _as_bool(get(f'{d}_USE_ANGLE_FILTER', 'False')):
+            self.enabled |= FILTER_ANGLE
+            try:
+                self.angle_scale = float(get(f'{d}_ANGLE_SCALE_FACTOR', DEFAULT_ANGLE_SCALE_FACTOR))
+                self.angle_min = float(get(f'{d}_MIN_ANGLE', -999.0))
+                self.angle_max = float(get(f'{d}_MAX_ANGLE', 999.0))
+            except (TypeError, ValueError) as e:
+                self._mark_broken(FILTER_ANGLE, e)
+
+        self.filter_period = _as_int(get('ema_filter_price_length',
+                                         get('Price Filter EMA Period', DEFAULT_PRICE_FILTER_PERIOD)), 18)
+        if _as_bool(get(f'{d}_USE_PRICE_FILTER_EMA', 'False')):
+            self.enabled |= FILTER_PRICE
+
+        if _as_bool(get(f'{d}_USE_CANDLE_DIRECTION_FILTER', 'False')):
+            self.enabled |= FILTER_CANDLE
+
+        if _as_bool(get(f'{d}_USE_EMA_ORDER_CONDITION', 'False')):
+            self.enabled |= FILTER_EMA_ORDER
+
+        position_key = 'LONG_USE_EMA_BELOW_PRICE_FILTER' if d == 'LONG' else 'SHORT_USE_EMA_ABOVE_PRICE_FILTER'
+        if _as_bool(get(position_key, 'False')):
+            self.enabled |= FILTER_EMA_POSITION
+
+        if _as_bool(get('Use Time Range Filter', 'False'), truthy=('true', '1', 'yes')):
+            try:
+                start = int(get('Entry Start Hour (UTC)', 0)) * 60 + int(get('Entry Start Minute', 0))
+                end = int(get('Entry End Hour (UTC)', 0)) * 60 + int(get('Entry End Minute', 0))
+                self.time_start, self.time_end = start, end
+                self.enabled |= FILTER_TIME
+            except (TypeError, ValueError) as e:
+                # Fail safe: time filter allows the trade when misconfigured
+                self.logger.warning(f"{d}: time filter disabled, bad config: {e}")
+
+    def _mark_broken(self, bit: int, error: Exception):
+        self.broken |= bit
+        self.logger.warning(f"{self.direction}: {FILTER_NAMES[bit]} filter config invalid ({error}) - blocking entries")
+
+    # ----- inputs -----
+
+    def build_inputs(self, open_, close, atr=None, times=None, utc_offset_hours: float = 0,
+                     ema_periods: Optional[Dict[str, int]] = None, adjust: bool = False) -> Dict[str, np.ndarray]:
+        """Input arrays for evaluate() from raw bars
+
+        Args:
+            ema_periods: {'ema_fast', 'ema_medium', 'ema_slow'} periods for the
+                ordering / position filters (confirm EMA is the close)
+            adjust: EMA form for those three (True = pandas default, as in
+                crossover detection); the price filter EMA is always recursive
+        """
+        close = np.asarray(close, dtype=np.float64)
+        inputs = {'open': np.asarray(open_, dtype=np.float64), 'close': close, 'ema_confirm': close}
+        if atr is not None:
+            inputs['atr'] = np.broadcast_to(np.asarray(atr, dtype=np.float64), close.shape)
+        if times is not None:
+            inputs['utc_minutes'] = minutes_of_day(times, utc_offset_hours)
+        if len(close) and self.enabled & FILTER_PRICE:
+            inputs['ema_filter'] = ema_matrix(close[None, :], [self.filter_period])[0]
+        if len(close) and ema_periods:
+            names = [name for name in ('ema_fast', 'ema_medium', 'ema_slow') if name in ema_periods]
+            emas = ema_matrix(np.repeat(close[None, :], len(names), axis=0),
+                              [ema_periods[name] for name in names], adjust=adjust)
+            inputs.update(zip(names, emas))
+        return inputs
+
+    # ----- evaluation -----
+
+    def evaluate(self, inputs: Mapping, start: int = 0, stop: Optional[int] = None,
+                 filters: int = ALL_FILTERS, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate enabled filters on bars [start, stop)
+
+        Args:
+            filters: bitmask restricting which filters run (default all enabled)
+            offset: bars of history preceding inputs[0] (short trailing windows,
+                e.g. the last two bars of a running backtest)
+
+        Returns:
+            (pass_mask: bool array, rejections: uint16 bitmap array), one entry per bar
+        """
+        close = np.asarray(inputs['close'], dtype=np.float64)
+        stop = len(close) if stop is None else stop
+        count = max(stop - start, 0)
+        rejected = np.zeros(count, dtype=np.uint16)
+        active = self.enabled & filters
+        if not count or not active:
+            return np.ones(count, dtype=bool), rejected
+
+        rejected |= np.uint16(self.broken & active)
+        active &= ~self.broken
+        history = np.arange(start + 1, stop + 1) + offset  # Bars available at each evaluated bar
+        long = self.direction == 'LONG'
+        cur_close, prev_close = _shifted(close, start, stop)
+
+        def reject(bit, mask):
+            rejected[mask] |= np.uint16(bit)
+
+        if active & (FILTER_ATR | FILTER_ATR_CHANGE):
+            atr = np.asarray(inputs['atr'], dtype=np.float64)
+            cur_atr, prev_atr = _shifted(atr, start, stop)
+            checked = history >= 2
+            with np.errstate(invalid='ignore'):
+                if active & FILTER_ATR:
+                    invalid = np.isnan(cur_atr) | (cur_atr <= 0)
+                    outside = (cur_atr < self.atr_min) | (cur_atr > self.atr_max)
+                    reject(FILTER_ATR, checked & (invalid | outside))
+                if active & FILTER_ATR_CHANGE:
+                    signal = inputs.get('signal_atr')
+                    signal = np.full(count, np.nan) if signal is None else \
+                        np.broadcast_to(np.asarray(signal, dtype=np.float64), atr.shape)[start:stop]
+                    use_signal = signal > 0
+                    change = np.where(use_signal, cur_atr - signal, cur_atr - prev_atr)
+                    valid = checked & (use_signal | (prev_atr > 0))
+                    bad = np.zeros(count, dtype=bool)
+                    if self.use_increment:
+                        bad |= (change >= 0) & ((change < self.increment_min) | (change > self.increment_max))
+                    if self.use_decrement:
+                        bad |= (change < 0) & ((change < self.decrement_min) | (change > self.decrement_max))
+                    reject(FILTER_ATR_CHANGE, valid & bad)
+
+        if active & FILTER_ANGLE:
+            angle = np.degrees(np.arctan((cur_close - prev_close) * self.angle_scale))
+            with np.errstate(invalid='ignore'):
+                reject(FILTER_ANGLE, (history >= 5) & ((angle < self.angle_min) | (angle > self.angle_max)))
+
+        if active & FILTER_PRICE:
+            ema_filter = np.asarray(inputs['ema_filter'], dtype=np.float64)[start:stop]
+            checked = (history >= 2) & (history >= self.filter_period)
+            wrong_side = ~(cur_close > ema_filter) if long else ~(cur_close < ema_filter)
+            reject(FILTER_PRICE, checked & wrong_side)
+
+        if active & FILTER_CANDLE:
+            cur_open = np.asarray(inputs['open'], dtype=np.float64)[start:stop]
+            wrong_side = ~(cur_close > cur_open) if long else ~(cur_close < cur_open)
+            reject(FILTER_CANDLE, (history >= 2) & wrong_side)
+
+        if active & (FILTER_EMA_ORDER | FILTER_EMA_POSITION):
+            fast, medium, slow = (np.asarray(inputs[name], dtype=np.float64)[start:stop]
+                                  for name in ('ema_fast', 'ema_medium', 'ema_slow'))
+            if active & FILTER_EMA_ORDER:
+                confirm = np.asarray(inputs['ema_confirm'], dtype=np.float64)[start:stop]
+                reject(FILTER_EMA_ORDER, ~self._beyond_all(confirm, fast, medium, slow, long))
+            if active & FILTER_EMA_POSITION:
+                reject(FILTER_EMA_POSITION, ~self._beyond_all(cur_close, fast, medium, slow, long))
+
+        if active & FILTER_TIME:
+            minutes = np.asarray(inputs['utc_minutes'])[start:stop]
+            if self.time_start > self.time_end:
+                allowed = (minutes >= self.time_start) | (minutes <= self.time_end)
+            else:
+                allowed = (minutes >= self.time_start) & (minutes <= self.time_end)
+            reject(FILTER_TIME, ~allowed)
+
+        return rejected == 0, rejected
+
+    def evaluate_last(self, inputs: Mapping, filters: int = ALL_FILTERS,
+                      offset: int = 0) -> Tuple[bool, int]:
+        """Live check of the last closed bar -> (passed, rejection bits)"""
+        length = len(inputs['close'])
+        passed, rejected = self.evaluate(inputs, max(length - 1, 0), length, filters, offset)
+        if not len(passed):
+            return True, 0
+        return bool(passed[0]), int(rejected[0])
+
+    @staticmethod
+    def _beyond_all(value, fast, medium, slow, long: bool) -> np.ndarray:
+        if long:
+            return (value > fast) & (value > medium) & (value > slow)
+        return (value < fast) & (value < medium) & (value < slow)
+
+    def __repr__(self):
+        enabled = ', '.join(describe_rejections(self.enabled)) or 'none'
+        return f"FilterPlan({self.direction}: {enabled})"
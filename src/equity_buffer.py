@@ -0,0 +1,144 @@
+"""
+Equity Buffer - Preallocated Equity Curve Recording
+===================================================
+Replaces the per-bar ``_portfolio_values.append(broker.get_value())`` /
+``_timestamps.append(datetime)`` lists of the SunriseOgle strategies with
+contiguous NumPy buffers:
+
+- values are float64, timestamps int64 epoch seconds (no boxed objects per bar)
+- capacity is preallocated from the data length and doubles if exceeded
+- drawdown, Sharpe and profit factor are computed vectorized at the end of
+  the run (same formulas as SunriseOgle.stop())
+
+Usage (inside a backtrader strategy):
+    def start(self):
+        self.equity = EquityRecorder(self)
+    def next(self):
+        self.equity.next()
+    def stop(self):
+        metrics = self.equity.metrics(self.gross_profit, self.gross_loss)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# ==========
+# METRIC CONFIGURATION
+# ==========
+PERIODS_PER_YEAR_M5 = 252 * 24 * 12  # 5-minute periods per year (SunriseOgle Sharpe annualization)
+DEFAULT_CAPACITY = 4096
+BT_EPOCH_ORDINAL = 719163.0          # backtrader date number (proleptic ordinal) of 1970-01-01
+SECONDS_PER_DAY = 86400.0
+
+
+class EquityBuffer:
+    """Growable float64 value / int64 epoch-seconds buffer pair"""
+
+    __slots__ = ('_values', '_times', '_size')
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        capacity = max(int(capacity), 1)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self._size]
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:self._size]
+
+    def reserve(self, capacity: int):
+        if capacity <= len(self._values):
+            return
+        values = np.empty(capacity, dtype=np.float64)
+        times = np.empty(capacity, dtype=np.int64)
+        values[:self._size] = self._values[:self._size]
+        times[:self._size] = self._times[:self._size]
+        self._values, self._times = values, times
+
+    def append(self, value: float, epoch_seconds: int):
+        if self._size == len(self._values):
+            self.reserve(2 * len(self._values))
+        self._values[self._size] = value
+        self._times[self._size] = epoch_seconds
+        self._size += 1
+
+    def clear(self):
+        self._size = 0
+
+    def metrics(self, gross_profit: float = 0.0, gross_loss: float = 0.0,
+                periods_per_year: int = PERIODS_PER_YEAR_M5) -> Dict[str, float]:
+        return equity_metrics(self.values, gross_profit, gross_loss, periods_per_year)
+
+
+def equity_metrics(values: np.ndarray, gross_profit: float = 0.0, gross_loss: float = 0.0,
+                   periods_per_year: int = PERIODS_PER_YEAR_M5) -> Dict[str, float]:
+    """Max drawdown %, annualized Sharpe and profit factor of a per-bar equity curve
+
+    Mirrors SunriseOgle.stop(): drawdown measured from the running peak
+    (needs > 1 point), Sharpe from simple bar returns (needs > 10 points).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    max_drawdown_pct = 0.0
+    if len(values) > 1:
+        peak = np.maximum.accumulate(values)
+        max_drawdown_pct = float(((peak - values) / peak).max() * 100.0)
+
+    sharpe_ratio = 0.0
+    if len(values) > 10:
+        returns = np.diff(values) / values[:-1]
+        std_return = returns.std()
+        if std_return > 0:
+            sharpe_ratio = float(returns.mean() * periods_per_year / (std_return * np.sqrt(periods_per_year)))
+
+    profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else float('inf')
+    return {
+        'max_drawdown_pct': max_drawdown_pct,
+        'sharpe_ratio': sharpe_ratio,
+        'profit_factor': profit_factor,
+        'starting_value': float(values[0]) if len(values) else 0.0,
+        'final_value': float(values[-1]) if len(values) else 0.0,
+    }
+
+
+def bt_num_to_epoch(num: float) -> int:
+    """backtrader datetime line float (days since 0001-01-01) -> epoch seconds"""
+    return int(round((num - BT_EPOCH_ORDINAL) * SECONDS_PER_DAY))
+
+
+class EquityRecorder:
+    """Records ``broker.get_value()`` every bar of a backtrader strategy
+
+    Reads the raw float of the datetime line instead of building a datetime
+    per bar; capacity comes from the preloaded data length when available.
+    """
+
+    __slots__ = ('strategy', 'buffer')
+
+    def __init__(self, strategy, capacity: Optional[int] = None):
+        self.strategy = strategy
+        if capacity is None:
+            try:
+                capacity = strategy.data.buflen()
+            except (AttributeError, TypeError):
+                capacity = DEFAULT_CAPACITY
+        self.buffer = EquityBuffer(capacity)
+
+    def next(self):
+        strategy = self.strategy
+        self.buffer.append(strategy.broker.get_value(), bt_num_to_epoch(strategy.data.datetime[0]))
+
+    def metrics(self, gross_profit: float = 0.0, gross_loss: float = 0.0,
+                periods_per_year: int = PERIODS_PER_YEAR_M5) -> Dict[str, float]:
+        return self.buffer.metrics(gross_profit, gross_loss, periods_per_year)
@@ -0,0 +1,213 @@
+"""
+Indicator Batch - Vectorized Multi-Symbol EMA/ATR
+=================================================
+Computes the live-monitor indicators for EVERY symbol in one pass:
+
+- Close/high/low arrays of all symbols are right-aligned into 2D matrices
+  (symbols x bars, left-padded with NaN when a symbol has fewer bars)
+- Every distinct (symbol, EMA period) pair becomes one row of a single
+  recurrence that runs over the bar axis and is vectorized across rows.
+  Outputs of one symbol that use the same period share a row; different
+  symbols always get their own rows, even for the same period.
+- ATR uses the same true range / rolling-mean definition as
+  AdvancedMT5TradingMonitorGUI.calculate_indicators, vectorized via cumsum
+  with per-row windows.
+
+Values match pandas ``ewm(span=n, adjust=False).mean()`` and
+``true_range.rolling(n).mean()`` so batch and per-symbol results are
+interchangeable.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Indicator names produced per symbol (period keys -> output names)
+EMA_OUTPUTS = ('ema_fast', 'ema_medium', 'ema_slow', 'ema_filter')
+
+
+def stack_right_aligned(arrays: Sequence[np.ndarray], length: Optional[int] = None) -> np.ndarray:
+    """Stack 1-D arrays into a (rows x length) float64 matrix aligned on the last bar
+
+    Shorter arrays are left-padded with NaN; longer ones keep their last ``length`` values.
+    """
+    if length is None:
+        length = max((len(a) for a in arrays), default=0)
+    matrix = np.full((len(arrays), length), np.nan, dtype=np.float64)
+    if length == 0:
+        return matrix
+    for row, values in enumerate(arrays):
+        values = np.asarray(values, dtype=np.float64)[-length:]
+        if len(values):
+            matrix[row, length - len(values):] = values
+    return matrix
+
+
+def ema_matrix(values: np.ndarray, spans: Sequence[float], adjust: bool = False) -> np.ndarray:
+    """EMA of every row with its own span, one recurrence across the row axis
+
+    Args:
+        values: (rows x bars) matrix, leading NaN allowed (padding)
+        spans: span per row (alpha = 2 / (span + 1))
+        adjust: False -> recursive EMA (MT5/backtrader, calculate_indicators);
+                True  -> pandas default weighted form (detect_ema_crossovers)
+
+    Returns:
+        (rows x bars) matrix of EMA values (NaN where no data yet)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows, bars = values.shape
+    alpha = 2.0 / (np.asarray(spans, dtype=np.float64) + 1.0)
+    decay = 1.0 - alpha
+    out = np.empty_like(values)
+    if bars == 0:
+        return out
+
+    if not adjust:
+        prev = values[:, 0].copy()
+        out[:, 0] = prev
+        for t in range(1, bars):
+            x = values[:, t]
+            step = alpha * x + decay * prev
+            # Rows still in NaN padding start at their first valid value
+            prev = np.where(np.isnan(prev), x, step)
+            out[:, t] = prev
+        return out
+
+    # adjust=True: y_t = sum(w_i x_{t-i}) / sum(w_i), w_i = (1-alpha)^i
+    numerator = np.zeros(rows)
+    denominator = np.zeros(rows)
+    for t in range(bars):
+        x = values[:, t]
+        valid = ~np.isnan(x)
+        numerator = np.where(valid, x + decay * numerator, numerator)
+        denominator = np.where(valid, 1.0 + decay * denominator, denominator)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:, t] = np.where(denominator > 0, numerator / denominator, np.nan)
+    return out
+
+
+def true_range_matrix(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range per bar; first bar (no previous close) is high - low"""
+    prev_close = np.empty_like(close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = close[:, :-1]
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    with np.errstate(invalid='ignore'):
+        true_range = np.nanmax(np.where(np.isnan(ranges), -np.inf, ranges), axis=0)
+    true_range[np.isneginf(true_range)] = np.nan
+    return true_range
+
+
+def rolling_mean_matrix(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """Trailing rolling mean with a per-row window (NaN until the window is full)"""
+    values = np.asarray(values, dtype=np.float64)
+    rows, bars = values.shape
+    windows = np.asarray(windows, dtype=np.int64).reshape(rows, 1)
+    filled = np.where(np.isnan(values), 0.0, values)
+    counts = np.cumsum(~np.isnan(values), axis=1)
+    csum = np.concatenate([np.zeros((rows, 1)), np.cumsum(filled, axis=1)], axis=1)
+    ccount = np.concatenate([np.zeros((rows, 1), dtype=counts.dtype), counts], axis=1)
+
+    end = np.arange(1, bars + 1).reshape(1, bars)
+    start = np.clip(end - windows, 0, None)
+    window_sum = csum[np.arange(rows)[:, None], end] - csum[np.arange(rows)[:, None], start]
+    window_count = ccount[np.arange(rows)[:, None], end] - ccount[np.arange(rows)[:, None], start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = window_sum / windows
+    mean[(window_count < windows) | (end < windows)] = np.nan
+    return mean
+
+
+class IndicatorBatch:
+    """Batch EMA/ATR for many symbols sharing one candle close
+
+    Usage:
+        batch = IndicatorBatch()
+        batch.add('EURUSD', close, high, low, {'ema_fast': 18, ..., 'atr': 10})
+        results = batch.compute()   # {symbol: {'ema_fast': float, ..., 'atr': float}}
+    """
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self._close: List[np.ndarray] = []
+        self._high: List[np.ndarray] = []
+        self._low: List[np.ndarray] = []
+        self._periods: List[Dict[str, int]] = []
+
+    def add(self, symbol: str, close, high, low, periods: Dict[str, int]):
+        """Register one symbol's bars (closed candles only) and periods
+
+        periods keys: any of EMA_OUTPUTS plus 'atr'
+        """
+        self.symbols.append(symbol)
+        self._close.append(np.asarray(close, dtype=np.float64))
+        self._high.append(np.asarray(high, dtype=np.float64))
+        self._low.append(np.asarray(low, dtype=np.float64))
+        self._periods.append(dict(periods))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def ema_rows(self) -> Tuple[List[Tuple[int, int]], Dict[Tuple[int, str], int]]:
+        """Unique (symbol_row, period) pairs and the row each output reads from"""
+        rows: List[Tuple[int, int]] = []
+        row_index: Dict[Tuple[int, int], int] = {}
+        output_row: Dict[Tuple[int, str], int] = {}
+        for symbol_row, periods in enumerate(self._periods):
+            for name in EMA_OUTPUTS:
+                if name not in periods:
+                    continue
+                key = (symbol_row, int(periods[name]))
+                if key not in row_index:
+                    row_index[key] = len(rows)
+                    rows.append(key)
+                output_row[(symbol_row, name)] = row_index[key]
+        return rows, output_row
+
+    def compute(self, full: bool = False) -> Dict[str, Dict[str, object]]:
+        """Compute all EMAs and ATRs in one vectorized pass
+
+        Args:
+            full: also return full '<name>_series' arrays (aligned to each
+                symbol's own bars) for analysis / filter plans
+
+        Returns:
+            {symbol: {'ema_fast': float, ..., 'atr': float, ...}}
+        """
+        results: Dict[str, Dict[str, object]] = {symbol: {} for symbol in self.symbols}
+        if not self.symbols:
+            return results
+
+        lengths = [len(c) for c in self._close]
+        close = stack_right_aligned(self._close)
+        bars = close.shape[1]
+
+        # EMAs: one recurrence over all unique (symbol, period) rows
+        rows, output_row = self.ema_rows()
+        if rows:
+            source = close[[symbol_row for symbol_row, _ in rows]]
+            spans = [period for _, period in rows]
+            emas = ema_matrix(source, spans, adjust=False)
+            for (symbol_row, name), row in output_row.items():
+                symbol = self.symbols[symbol_row]
+                results[symbol][name] = float(emas[row, -1])
+                if full:
+                    results[symbol][f'{name}_series'] = emas[row, bars - lengths[symbol_row]:]
+
+        # ATR: true range + per-symbol rolling window
+        atr_rows = [i for i, periods in enumerate(self._periods) if 'atr' in periods]
+        if atr_rows:
+            high = stack_right_aligned([self._high[i] for i in atr_rows], bars)
+            low = stack_right_aligned([self._low[i] for i in atr_rows], bars)
+            true_range = true_range_matrix(high, low, close[atr_rows])
+            atr = rolling_mean_matrix(true_range, [int(self._periods[i]['atr']) for i in atr_rows])
+            for row, symbol_row in enumerate(atr_rows):
+                symbol = self.symbols[symbol_row]
+                results[symbol]['atr'] = float(atr[row, -1])
+                if full:
+                    offset = bars - lengths[symbol_row]
+                    results[symbol]['atr_series'] = atr[row, offset:]
+                    results[symbol]['true_range_series'] = true_range[row, offset:]
+
+        return results
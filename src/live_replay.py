@@ -0,0 +1,669 @@
+"""
+Live Replay - Headless Historical Replay of the Live Monitor
+============================================================
+Feeds historical M5 bars through the LIVE code path of
+advanced_mt5_monitor_gui.py (candle scheduler -> indicator batch ->
+crossover detection -> determine_strategy_phase -> execute_trade) with no
+Tk window and MetaTrader5 replaced by ``ReplayMT5``, then diffs every
+ARMED / WINDOW_OPEN / ENTRY event against the backtrader reference:
+
+    - ENTRY events from a sunrise_ogle_*.py trade report (temp_reports/*.txt)
+    - ARMED / WINDOW_OPEN events from an events CSV written by a backtest
+      driven through src/backtrader_phase_adapter.py (trade reports only
+      record entries)
+
+Usage:
+    python src/live_replay.py --symbol EURUSD --data data/EURUSD_5m_5Yea.csv \\
+        --from 2024-01-01 --report temp_reports/EURUSD_trades_20250101_120000.txt
+
+Speed: the live path only sees the last BARS_TO_FETCH bars plus the symbol
+state, so once two runs are both SCANNING with no open position on the same
+bar they stay identical. ``replay_symbols`` splits each symbol's history into
+chunks, replays chunks in parallel processes with an overlap, and stitches
+them at such a sync bar - years of M5 data per symbol replay in minutes.
+"""
+
+import csv
+import importlib
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from src.candle_scheduler import CandleScheduler
+    from src.phase_machine import TRANSITION_ARMED, TRANSITION_ENTRY_SIGNAL, TRANSITION_WINDOW_OPEN
+except ImportError:  # Loaded with src/ itself on sys.path
+    from candle_scheduler import CandleScheduler
+    from phase_machine import TRANSITION_ARMED, TRANSITION_ENTRY_SIGNAL, TRANSITION_WINDOW_OPEN
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONITOR_MODULE = 'advanced_mt5_monitor_gui'
+MONITOR_CLASS = 'AdvancedMT5TradingMonitorGUI'
+
+# ==========
+# EVENTS
+# ==========
+EVENT_ARMED = TRANSITION_ARMED
+EVENT_WINDOW_OPEN = TRANSITION_WINDOW_OPEN
+EVENT_ENTRY = 'ENTRY'
+EVENT_KINDS = (EVENT_ARMED, EVENT_WINDOW_OPEN, EVENT_ENTRY)
+
+# MT5 structured rates layout (copy_rates_from_pos)
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+                        ('real_volume', '<u8')])
+
+EPOCH = datetime(1970, 1, 1)
+
+DEFAULT_OVERLAP_BARS = 2016  # One week of M5 bars for chunks to re-synchronize
+
+
+def bar_datetime(seconds: int) -> datetime:
+    """MT5 bar time (seconds, broker time) -> naive datetime, as pd.to_datetime(unit='s')"""
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+class ReplayEvent:
+    """One state-machine event on a closed bar"""
+
+    __slots__ = ('kind', 'direction', 'time', 'price')
+
+    def __init__(self, kind: str, direction: Optional[str], time: datetime, price: Optional[float] = None):
+        self.kind = kind
+        self.direction = direction
+        self.time = time
+        self.price = price
+
+    def __eq__(self, other):
+        return (isinstance(other, ReplayEvent) and self.kind == other.kind
+                and self.direction == other.direction and self.time == other.time)
+
+    def __repr__(self):
+        return f"ReplayEvent({self.kind}, {self.direction}, {self.time})"
+
+
+# ==========
+# DATA AND REFERENCE LOADING
+# ==========
+
+def load_rates_csv(path: str, fromdate: Optional[str] = None, todate: Optional[str] = None) -> np.ndarray:
+    """Backtest CSV (Date YYYYMMDD, Time HH:MM:SS, O, H, L, C, Volume) -> MT5 rates array
+
+    Same column layout as the GenericCSVData feed in sunrise_ogle_*.py.
+    """
+    import pandas as pd
+
+    frame = pd.read_csv(path)
+    stamps = pd.to_datetime(frame.iloc[:, 0].astype(str) + ' ' + frame.iloc[:, 1].astype(str),
+                            format='%Y%m%d %H:%M:%S')
+    mask = np.ones(len(frame), dtype=bool)
+    if fromdate:
+        mask &= (stamps >= pd.Timestamp(fromdate)).values
+    if todate:
+        mask &= (stamps < pd.Timestamp(todate) + pd.Timedelta(days=1)).values
+
+    rates = np.zeros(int(mask.sum()), dtype=RATES_DTYPE)
+    rates['time'] = stamps.values[mask].astype('datetime64[s]').astype(np.int64)
+    for position, name in enumerate(('open', 'high', 'low', 'close'), start=2):
+        rates[name] = frame.iloc[:, position].values[mask]
+    if frame.shape[1] > 6:
+        rates['tick_volume'] = frame.iloc[:, 6].values[mask]
+    return rates
+
+
+def parse_trade_report(path: str) -> List[ReplayEvent]:
+    """ENTRY events from a sunrise_ogle_*.py trade report (ENTRY #n / Time: / Direction:)"""
+    events = []
+    in_entry, entry_time = False, None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(('ENTRY #', 'EXIT #')):
+                in_entry, entry_time = line.startswith('ENTRY #'), None
+            elif in_entry and line.startswith('Time:'):
+                entry_time = datetime.strptime(line[5:].strip(), '%Y-%m-%d %H:%M:%S')
+            elif in_entry and entry_time is not None and line.startswith('Direction:'):
+                events.append(ReplayEvent(EVENT_ENTRY, line[10:].strip(), entry_time))
+                in_entry = False
+    return events
+
+
+def events_from_transitions(transitions: Iterable) -> List[ReplayEvent]:
+    """Phase-machine transitions (e.g. BacktraderPhaseAdapter.transitions) -> replay events"""
+    kinds = {TRANSITION_ARMED: EVENT_ARMED, TRANSITION_WINDOW_OPEN: EVENT_WINDOW_OPEN,
+             TRANSITION_ENTRY_SIGNAL: EVENT_ENTRY}
+    return [ReplayEvent(kinds[t.kind], t.direction, t.time, t.info.get('price'))
+            for t in transitions if t.kind in kinds]
+
+
+def write_events_csv(events: Iterable[ReplayEvent], path: str):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['kind', 'direction', 'time', 'price'])
+        for event in events:
+            writer.writerow([event.kind, event.direction or '', event.time.strftime('%Y-%m-%d %H:%M:%S'),
+                             '' if event.price is None else repr(float(event.price))])
+
+
+def read_events_csv(path: str) -> List[ReplayEvent]:
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return [ReplayEvent(row['kind'], row['direction'] or None,
+                            datetime.strptime(row['time'], '%Y-%m-%d %H:%M:%S'),
+                            float(row['price']) if row.get('price') else None)
+                for row in csv.DictReader(f)]
+
+
+# ==========
+# PARITY DIFF
+# ==========
+
+class ParityReport:
+    """Live replay vs backtrader reference, per event kind"""
+
+    __slots__ = ('matched', 'missing', 'extra', 'kinds')
+
+    def __init__(self, kinds: Sequence[str]):
+        self.kinds = tuple(kinds)
+        self.matched: Dict[str, int] = {kind: 0 for kind in kinds}
+        self.missing: List[ReplayEvent] = []  # In the reference, not in the live replay
+        self.extra: List[ReplayEvent] = []    # In the live replay, not in the reference
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.extra
+
+    def summary(self) -> str:
+        lines = []
+        for kind in self.kinds:
+            missing = sum(1 for e in self.missing if e.kind == kind)
+            extra = sum(1 for e in self.extra if e.kind == kind)
+            status = "[OK]" if not (missing or extra) else "[X]"
+            lines.append(f"{status} {kind}: {self.matched[kind]} matched | {missing} missing | {extra} extra")
+        for label, events in (("MISSING (backtest only)", self.missing), ("EXTRA (live only)", self.extra)):
+            for event in events[:20]:
+                lines.append(f"   {label}: {event.kind} {event.direction} @ {event.time}")
+            if len(events) > 20:
+                lines.append(f"   {label}: ... {len(events) - 20} more")
+        return "\n".join(lines)
+
+
+def diff_events(live: Sequence[ReplayEvent], reference: Sequence[ReplayEvent],
+                kinds: Optional[Sequence[str]] = None,
+                tolerance: timedelta = timedelta(0)) -> ParityReport:
+    """Match events by kind, direction and bar time (within ``tolerance``)
+
+    Only kinds present in the reference are compared unless ``kinds`` is given.
+    """
+    if kinds is None:
+        kinds = [kind for kind in EVENT_KINDS if any(e.kind == kind for e in reference)]
+    report = ParityReport(kinds)
+
+    for kind in kinds:
+        for direction in sorted({e.direction for e in live if e.kind == kind} |
+                                {e.direction for e in reference if e.kind == kind}, key=str):
+            lhs = sorted((e for e in live if e.kind == kind and e.direction == direction), key=lambda e: e.time)
+            rhs = sorted((e for e in reference if e.kind == kind and e.direction == direction), key=lambda e: e.time)
+            i = j = 0
+            while i < len(lhs) and j < len(rhs):
+                delta = lhs[i].time - rhs[j].time
+                if abs(delta) <= tolerance:
+                    report.matched[kind] += 1
+                    i += 1
+                    j += 1
+                elif delta < timedelta(0):
+                    report.extra.append(lhs[i])
+                    i += 1
+                else:
+                    report.missing.append(rhs[j])
+                    j += 1
+            report.extra.extend(lhs[i:])
+            report.missing.extend(rhs[j:])
+
+    report.missing.sort(key=lambda e: e.time)
+    report.extra.sort(key=lambda e: e.time)
+    return report
+
+
+# ==========
+# MT5 STUB
+# ==========
+
+class ReplayMT5:
+    """MetaTrader5 stand-in over historical rates, advanced bar by bar
+
+    ``set_cursor(symbol, index)`` makes ``rates[index]`` the forming candle;
+    open positions are closed at SL / TP on each newly closed bar (SL first
+    when one bar touches both, as the backtests assume).
+    """
+
+    TIMEFRAME_M5 = 5
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    TRADE_ACTION_DEAL = 1
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+    TRADE_RETCODE_DONE = 10009
+
+    def __init__(self, rates: Dict[str, np.ndarray], balance: float = 50000.0,
+                 symbol_specs: Optional[Dict[str, Dict]] = None):
+        self.rates = rates
+        self.cursors = {symbol: 0 for symbol in rates}
+        self.balance = balance
+        self.symbol_specs = symbol_specs or {}
+        self.open_positions: Dict[str, SimpleNamespace] = {}
+        self.orders: List[SimpleNamespace] = []
+        self.closed_trades: List[SimpleNamespace] = []
+        self._ticket = 0
+
+    # ----- replay control -----
+
+    def set_cursor(self, symbol: str, index: int):
+        """Make rates[index] the forming bar; settle positions on the bar that just closed"""
+        self.cursors[symbol] = index
+        position = self.open_positions.get(symbol)
+        if position is None or index - 1 <= position.open_index:
+            return
+        bar = self.rates[symbol][index - 1]
+        long = position.type == self.ORDER_TYPE_BUY
+        stop_hit = bar['low'] <= position.sl if long else bar['high'] >= position.sl
+        target_hit = bar['high'] >= position.tp if long else bar['low'] <= position.tp
+        if stop_hit or target_hit:
+            exit_price = position.sl if stop_hit else position.tp
+            sign = 1 if long else -1
+            pnl = sign * (exit_price - position.price_open) * position.volume * position.contract_size
+            self.balance += pnl
+            del self.open_positions[symbol]
+            self.closed_trades.append(SimpleNamespace(
+                symbol=symbol, ticket=position.ticket, direction='LONG' if long else 'SHORT',
+                entry_time=position.entry_time, entry_price=position.price_open,
+                exit_time=bar_datetime(bar['time']), exit_price=exit_price,
+                exit_reason='SL' if stop_hit else 'TP', pnl=pnl))
+
+    def closed_bar_time(self, symbol: str) -> datetime:
+        return bar_datetime(self.rates[symbol][self.cursors[symbol] - 1]['time'])
+
+    # ----- MetaTrader5 API subset used by the monitor -----
+
+    def initialize(self, *args, **kwargs):
+        return True
+
+    def shutdown(self):
+        return None
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        rates = self.rates.get(symbol)
+        if rates is None:
+            return None
+        stop = self.cursors[symbol] + 1 - start_pos
+        return rates[max(stop - count, 0):stop]
+
+    def symbol_info(self, symbol):
+        if symbol not in self.rates:
+            return None
+        upper = symbol.upper()
+        digits = 2 if upper.startswith('XAU') else 3 if ('JPY' in upper or upper.startswith('XAG')) else 5
+        contract_size = 100 if upper.startswith('XAU') else 5000 if upper.startswith('XAG') else 100000
+        point = 10 ** -digits
+        spec = dict(name=symbol, visible=True, digits=digits, point=point, trade_tick_size=point,
+                    trade_contract_size=contract_size, trade_tick_value=contract_size * point,
+                    volume_min=0.01, volume_max=100.0, volume_step=0.01, filling_mode=3)
+        spec.update(self.symbol_specs.get(symbol, {}))
+        return SimpleNamespace(**spec)
+
+    def symbol_select(self, symbol, enable=True):
+        return symbol in self.rates
+
+    def account_info(self):
+        return SimpleNamespace(balance=self.balance, equity=self.balance, currency='USD')
+
+    def positions_get(self, symbol=None, **kwargs):
+        if symbol is None:
+            return tuple(self.open_positions.values())
+        position = self.open_positions.get(symbol)
+        return (position,) if position is not None else ()
+
+    def order_send(self, request):
+        symbol = request['symbol']
+        if symbol in self.open_positions:
+            return SimpleNamespace(retcode=10019, comment='Position already open', order=0, deal=0,
+                                   volume=0.0, price=0.0)
+        self._ticket += 1
+        info = self.symbol_info(symbol)
+        position = SimpleNamespace(
+            ticket=self._ticket, symbol=symbol, type=request['type'], volume=request['volume'],
+            price_open=request['price'], sl=request['sl'], tp=request['tp'],
+            contract_size=info.trade_contract_size, open_index=self.cursors[symbol] - 1,
+            entry_time=self.closed_bar_time(symbol))
+        self.open_positions[symbol] = position
+        self.orders.append(position)
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, comment='Request executed',
+                               order=self._ticket, deal=self._ticket, volume=request['volume'],
+                               price=request['price'])
+
+
+# ==========
+# HEADLESS MONITOR
+# ==========
+
+def load_monitor_module():
+    """Import advanced_mt5_monitor_gui without creating any Tk window"""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    return importlib.import_module(MONITOR_MODULE)
+
+
+def headless_monitor_class(module):
+    """Live monitor subclass without Tk: same state machine, filters and order path"""
+    base = getattr(module, MONITOR_CLASS)
+
+    class HeadlessMonitor(base):
+        def __init__(self, logger=None, capture_log: bool = False):
+            self.root = None
+            self.logger = logger or logging.getLogger(__name__)
+            self._init_monitor_state()
+            self.bot_startup_time = datetime.min  # Historical crossovers are never stale
+            self.mt5_connected = True
+            self.log_lines = [] if capture_log else None
+
+        def terminal_log(self, message, level="NORMAL", critical=False):
+            if self.log_lines is not None:
+                self.log_lines.append((level, message))
+
+        def publish_state(self, symbol):
+            pass  # No GUI thread reading snapshots
+
+    return HeadlessMonitor
+
+
+class TextBuffer:
+    """Line-based stand-in for the terminal Text widget (insert / see / get / delete)
+
+    Lets headless runs keep the monitor's real terminal_log, including its
+    1000-line trimming.
+    """
+
+    def __init__(self):
+        self.lines = ['']
+
+    def insert(self, index, text, *tags):
+        parts = text.split('\n')
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+
+    def see(self, index):
+        pass
+
+    def get(self, start, end):
+        return '\n'.join(self.lines) + '\n'
+
+    def delete(self, start, end):
+        del self.lines[:int(float(end)) - 1]
+
+    def __len__(self):
+        return len(self.lines)
+
+
+@contextmanager
+def patched_globals(module, **values):
+    """Temporarily replace module globals (the monitor resolves mt5/pd/np at call time)"""
+    saved = {name: getattr(module, name) for name in values}
+    try:
+        for name, value in values.items():
+            setattr(module, name, value)
+        yield module
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+class ReplayResult:
+    """Events and fills produced by one symbol's replay"""
+
+    __slots__ = ('symbol', 'events', 'closed_trades', 'bars', 'seconds', 'log_lines',
+                 'bar_times', 'flat', 'unsynced')
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.events: List[ReplayEvent] = []
+        self.closed_trades: List[SimpleNamespace] = []
+        self.bars = 0
+        self.seconds = 0.0
+        self.log_lines = None
+        self.bar_times = np.zeros(0, dtype=np.int64)  # Closed bar time of each replayed cycle
+        self.flat = np.zeros(0, dtype=bool)           # SCANNING, no position, no signal ATR after the cycle
+        self.unsynced: List[datetime] = []            # Chunk boundaries stitched without a sync bar
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.seconds if self.seconds > 0 else 0.0
+
+
+class LiveReplay:
+    """Replay one symbol's history through the live monitor
+
+    Args:
+        symbol: symbol as configured in config/symbols
+        rates: MT5 rates array (``load_rates_csv``)
+        utc_offset: broker UTC offset override (default: config/broker_timezone.json)
+        config_overrides: values merged into the loaded strategy config
+        capture_log: keep every terminal_log line in the result (slow, for debugging)
+        broker_factory: ``(rates_by_symbol, balance, symbol_specs) -> stub`` replacing
+            ReplayMT5 (e.g. a paper_broker.PaperBroker with an execution model)
+    """
+
+    def __init__(self, symbol: str, rates: np.ndarray, utc_offset: Optional[float] = None,
+                 config_overrides: Optional[Dict] = None, balance: float = 50000.0,
+                 symbol_specs: Optional[Dict[str, Dict]] = None, capture_log: bool = False,
+                 module=None, logger=None, broker_factory=None):
+        self.symbol = symbol
+        self.rates = rates
+        self.utc_offset = utc_offset
+        self.config_overrides = config_overrides or {}
+        self.balance = balance
+        self.symbol_specs = symbol_specs
+        self.capture_log = capture_log
+        self.module = module
+        self.logger = logger or logging.getLogger(__name__)
+        self.broker_factory = broker_factory or ReplayMT5
+
+    def run(self, start: int = 0, stop: Optional[int] = None, progress_every: int = 0) -> ReplayResult:
+        """Replay forming-bar cursors [start, stop) (at least BARS_TO_FETCH bars of history)"""
+        import pandas as pd
+
+        module = self.module or load_monitor_module()
+        stub = self.broker_factory({self.symbol: self.rates}, self.balance, self.symbol_specs)
+        result = ReplayResult(self.symbol)
+
+        with patched_globals(module, mt5=stub, pd=pd, np=np):
+            monitor = headless_monitor_class(module)(logger=self.logger, capture_log=self.capture_log)
+            if self.utc_offset is not None:
+                monitor.broker_utc_offset = self.utc_offset
+            monitor.load_symbol_registry()
+            monitor.load_symbol_config(self.symbol)
+            config = monitor.strategy_configs.get(self.symbol, {})
+            if config.get('_config_valid') != True:
+                raise ValueError(f"{self.symbol}: strategy config invalid - "
+                                 f"{config.get('error') or config.get('_missing_params')}")
+            if self.config_overrides:
+                monitor.strategy_configs[self.symbol] = dict(config, **self.config_overrides)
+
+            scheduler = CandleScheduler(process_fn=monitor.monitor_strategy_phase,
+                                        position_check_fn=monitor.check_position_still_open,
+                                        time_budget_seconds=float('inf'),
+                                        prepare_fn=monitor.prepare_candle_batch,
+                                        fetch_fn=monitor.fetch_candle_bars, logger=self.logger)
+
+            first = max(start, module.BARS_TO_FETCH)
+            stop = len(self.rates) if stop is None else min(stop, len(self.rates))
+            result.bar_times = self.rates['time'][first - 1:stop - 1].astype(np.int64)
+            result.flat = np.zeros(len(result.bar_times), dtype=bool)
+
+            clock = time.perf_counter()
+            for cursor in range(first, stop):
+                stub.set_cursor(self.symbol, cursor)
+                state = monitor.strategy_states[self.symbol]
+                entry_state, armed_at = state.entry_state, state.armed_at_candle_time
+                window_start, orders = state.window_bar_start, len(stub.orders)
+
+                scheduler.run_cycle({self.symbol: state.entry_state})
+                state = monitor.strategy_states[self.symbol]
+                self._collect(result, stub, state, entry_state, armed_at, window_start, orders)
+                result.flat[cursor - first] = (state.entry_state == 'SCANNING'
+                                               and self.symbol not in stub.open_positions
+                                               and state.signal_detection_atr is None)
+
+                result.bars += 1
+                if progress_every and result.bars % progress_every == 0:
+                    self.logger.info(f"{self.symbol}: {result.bars} bars replayed "
+                                     f"({result.bars / (time.perf_counter() - clock):.0f} bars/s)")
+            result.seconds = time.perf_counter() - clock
+
+        result.closed_trades = list(stub.closed_trades)
+        result.log_lines = monitor.log_lines
+        return result
+
+    def _collect(self, result: ReplayResult, stub: ReplayMT5, state, entry_state, armed_at,
+                 window_start, orders):
+        """Events from the state change of one cycle"""
+        bar_time = stub.closed_bar_time(self.symbol)
+        if state.armed_at_candle_time is not None and state.armed_at_candle_time != armed_at:
+            result.events.append(ReplayEvent(EVENT_ARMED, state.armed_direction, bar_time))
+        if state.entry_state == 'WINDOW_OPEN' and (entry_state != 'WINDOW_OPEN'
+                                                  or state.window_bar_start != window_start):
+            result.events.append(ReplayEvent(EVENT_WINDOW_OPEN, state.armed_direction, bar_time))
+        for order in stub.orders[orders:]:
+            direction = 'LONG' if order.type == ReplayMT5.ORDER_TYPE_BUY else 'SHORT'
+            result.events.append(ReplayEvent(EVENT_ENTRY, direction, bar_time, order.price_open))
+
+
+def _replay_segment(job: Dict) -> ReplayResult:
+    return LiveReplay(job['symbol'], job['rates'], utc_offset=job.get('utc_offset'),
+                      config_overrides=job.get('config_overrides')).run(job['start'])
+
+
+def stitch_results(parts: Sequence[ReplayResult]) -> ReplayResult:
+    """Join overlapping chunk results at the first bar where both runs are flat SCANNING
+
+    From such a bar on the live path is a pure function of the bars, so the
+    later chunk continues exactly where the earlier one would have. Flat also
+    requires no ATR at signal detection: it feeds the ATR increment filter of
+    the next entry, so a run still carrying one is not synced. A boundary
+    without a sync bar inside the overlap is recorded in ``unsynced``.
+    """
+    merged = parts[0]
+    for part in parts[1:]:
+        both = np.intersect1d(merged.bar_times[merged.flat], part.bar_times[part.flat])
+        if len(both):
+            cut = bar_datetime(both[0])
+        else:
+            cut = bar_datetime(part.bar_times[0]) if len(part.bar_times) else datetime.max
+            merged.unsynced.append(cut)
+        joined = ReplayResult(merged.symbol)
+        joined.events = ([e for e in merged.events if e.time <= cut]
+                         + [e for e in part.events if e.time > cut])
+        joined.closed_trades = ([t for t in merged.closed_trades if t.entry_time <= cut]
+                                + [t for t in part.closed_trades if t.entry_time > cut])
+        cut_seconds = int((cut - EPOCH).total_seconds()) if cut != datetime.max else np.iinfo(np.int64).max
+        keep, tail = merged.bar_times <= cut_seconds, part.bar_times > cut_seconds
+        joined.bar_times = np.concatenate([merged.bar_times[keep], part.bar_times[tail]])
+        joined.flat = np.concatenate([merged.flat[keep], part.flat[tail]])
+        joined.bars = len(joined.bar_times)
+        joined.seconds = merged.seconds + part.seconds
+        joined.unsynced = merged.unsynced + part.unsynced
+        merged = joined
+    return merged
+
+
+def replay_symbols(jobs: Sequence[Dict], processes: Optional[int] = None, chunks: int = 1,
+                   overlap_bars: int = DEFAULT_OVERLAP_BARS) -> Dict[str, ReplayResult]:
+    """Replay several symbols, each split into ``chunks`` parallel segments
+
+    Each job: {'symbol', 'rates' (or 'data' CSV path with optional 'fromdate' /
+    'todate'), optional 'utc_offset', 'config_overrides'}. ``seconds`` of a
+    result is CPU time summed over its chunks.
+    """
+    warmup = load_monitor_module().BARS_TO_FETCH
+    segments, owners = [], []
+    for job in jobs:
+        rates = job.get('rates')
+        if rates is None:
+            rates = load_rates_csv(job['data'], job.get('fromdate'), job.get('todate'))
+        bounds = np.linspace(warmup, len(rates), max(chunks, 1) + 1).astype(int)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            begin = lo - warmup
+            segment = dict(job, rates=rates[begin:min(hi + overlap_bars, len(rates))], start=warmup)
+            segment.pop('data', None)
+            segments.append(segment)
+            owners.append(job['symbol'])
+
+    if processes == 1 or len(segments) <= 1:
+        parts = [_replay_segment(segment) for segment in segments]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_replay_segment, segments))
+
+    results = {}
+    for job in jobs:
+        results[job['symbol']] = stitch_results([part for part, owner in zip(parts, owners)
+                                                 if owner == job['symbol']])
+    return results
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay history through the live monitor and diff against backtests")
+    parser.add_argument('--symbol', required=True)
+    parser.add_argument('--data', required=True, help="backtest CSV (same file as the strategy's DATA_FILENAME)")
+    parser.add_argument('--from', dest='fromdate')
+    parser.add_argument('--to', dest='todate')
+    parser.add_argument('--utc-offset', type=float, default=None)
+    parser.add_argument('--report', help="backtrader trade report (ENTRY events)")
+    parser.add_argument('--events', help="backtrader events CSV (ARMED / WINDOW_OPEN / ENTRY)")
+    parser.add_argument('--tolerance-bars', type=int, default=0)
+    parser.add_argument('--export', help="write the live replay events to this CSV")
+    parser.add_argument('--chunks', type=int, default=os.cpu_count() or 1,
+                        help="history segments replayed in parallel (default: CPU count)")
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    job = {'symbol': args.symbol, 'data': args.data, 'fromdate': args.fromdate, 'todate': args.todate,
+           'utc_offset': args.utc_offset}
+    result = replay_symbols([job], processes=args.processes, chunks=args.chunks)[args.symbol]
+    print(f"{args.symbol}: {result.bars} bars in {time.perf_counter() - started:.1f}s "
+          f"({result.bars_per_second:.0f} bars/s per process) | {len(result.events)} events | "
+          f"{len(result.closed_trades)} closed trades")
+    for boundary in result.unsynced:
+        print(f"   [!] Chunk boundary {boundary} stitched without a sync bar - raise the overlap")
+    if args.export:
+        write_events_csv(result.events, args.export)
+
+    reference = []
+    if args.report:
+        reference += parse_trade_report(args.report)
+    if args.events:
+        reference += read_events_csv(args.events)
+    if not reference:
+        return 0
+    report = diff_events(result.events, reference, tolerance=timedelta(minutes=5 * args.tolerance_bars))
+    print(report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Micro Benchmarks - Timing Harness with Baseline Regression Checks
+=================================================================
+Small, dependency-free harness for the hot-path benchmark suite
+(testing/benchmark_hot_path.py):
+
+- Each call is timed on its own with perf_counter_ns. An optional untimed
+  ``setup`` runs before every call, so stateful functions (the phase machine,
+  crossover detection) start from the same state each time.
+- GC is disabled while sampling. Calls run until ``min_time`` has elapsed and
+  ``min_calls`` samples exist, so results are reported from the same number
+  of samples on every run.
+- Reported per benchmark: ops/s, mean / p50 / p99 latency (microseconds),
+  and the peak memory allocated by one call (tracemalloc, separate pass).
+- Results are compared against a stored JSON baseline. A benchmark regresses
+  when its p50 (or its allocation peak) grows by more than ``threshold``
+  above a small absolute noise floor.
+
+Usage:
+    results = run_suite([Benchmark('calc', fn, setup=reset)], min_time=0.5)
+    print(format_table(results, baseline))
+    regressions = compare(results, load_baseline(path)['results'], threshold=0.25)
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# ==========
+# HARNESS CONFIGURATION
+# ==========
+DEFAULT_MIN_TIME = 0.5          # Seconds of sampling per benchmark
+DEFAULT_MIN_CALLS = 30          # Samples per benchmark, however slow the call
+DEFAULT_MAX_CALLS = 200000      # Cap for very fast calls
+DEFAULT_WARMUP = 3              # Untimed calls before sampling
+ALLOC_CALLS = 5                 # Calls traced for the allocation peak (median is reported)
+DEFAULT_THRESHOLD = 0.25        # Fail when p50 / alloc peak grows by more than 25%
+MIN_TIME_DELTA_US = 2.0         # Ignore p50 changes smaller than this (timer noise)
+MIN_ALLOC_DELTA_KB = 4.0        # Ignore allocation changes smaller than this
+
+
+class Benchmark:
+    """One named call to measure (``setup`` runs untimed before every call)"""
+
+    __slots__ = ('name', 'fn', 'setup')
+
+    def __init__(self, name: str, fn: Callable[[], object], setup: Optional[Callable[[], object]] = None):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+
+    def __repr__(self):
+        return f"Benchmark({self.name})"
+
+
+class BenchResult:
+    """Timing and allocation statistics of one benchmark"""
+
+    __slots__ = ('name', 'calls', 'ops_per_sec', 'mean_us', 'p50_us', 'p99_us', 'alloc_kb')
+
+    def __init__(self, name: str, calls: int, ops_per_sec: float, mean_us: float, p50_us: float,
+                 p99_us: float, alloc_kb: Optional[float] = None):
+        self.name = name
+        self.calls = calls
+        self.ops_per_sec = ops_per_sec
+        self.mean_us = mean_us
+        self.p50_us = p50_us
+        self.p99_us = p99_us
+        self.alloc_kb = alloc_kb
+
+    def to_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'BenchResult':
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def __repr__(self):
+        return f"BenchResult({self.name}, p50={self.p50_us:.1f}us, {self.ops_per_sec:.0f} ops/s)"
+
+
+class Regression:
+    """A metric that grew beyond the threshold relative to the baseline"""
+
+    __slots__ = ('name', 'metric', 'baseline', 'current')
+
+    def __init__(self, name: str, metric: str, baseline: float, current: float):
+        self.name = name
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+    def __str__(self):
+        return (f"{self.name}: {self.metric} {self.baseline:.2f} -> {self.current:.2f} "
+                f"(+{(self.ratio - 1) * 100:.0f}%)")
+
+
+def _allocation_peak_kb(bench: Benchmark, calls: int) -> float:
+    """Median peak of memory allocated during one call"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    peaks = []
+    try:
+        for _ in range(calls):
+            if bench.setup is not None:
+                bench.setup()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            bench.fn()
+            peaks.append(max(tracemalloc.get_traced_memory()[1] - before, 0))
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return float(np.median(peaks)) / 1024.0
+
+
+def measure(bench: Benchmark, min_time: float = DEFAULT_MIN_TIME, min_calls: int = DEFAULT_MIN_CALLS,
+            max_calls: int = DEFAULT_MAX_CALLS, warmup: int = DEFAULT_WARMUP,
+            alloc_calls: int = ALLOC_CALLS) -> BenchResult:
+    """Time ``bench`` call by call and trace its allocation peak"""
+    fn, setup = bench.fn, bench.setup
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    samples = []
+    clock = time.perf_counter_ns
+    budget = int(min_time * 1e9)
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        spent = 0
+        while (spent < budget or len(samples) < min_calls) and len(samples) < max_calls:
+            if setup is not None:
+                setup()
+            started = clock()
+            fn()
+            elapsed = clock() - started
+            samples.append(elapsed)
+            spent += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    times_us = np.asarray(samples, dtype=np.float64) / 1000.0
+    mean_us = float(times_us.mean())
+    return BenchResult(bench.name, len(samples), 1e6 / mean_us if mean_us > 0 else float('inf'), mean_us,
+                       float(np.percentile(times_us, 50)), float(np.percentile(times_us, 99)),
+                       _allocation_peak_kb(bench, alloc_calls) if alloc_calls else None)
+
+
+def run_suite(benchmarks: Iterable[Benchmark], only: Optional[Iterable[str]] = None,
+              progress: Optional[Callable[[BenchResult], None]] = None, **options) -> List[BenchResult]:
+    """Measure every benchmark (``only``: substrings selecting benchmarks by name)"""
+    only = list(only or [])
+    results = []
+    for bench in benchmarks:
+        if only and not any(part in bench.name for part in only):
+            continue
+        result = measure(bench, **options)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def compare(results: Iterable[BenchResult], baseline: Dict[str, Dict], threshold: float = DEFAULT_THRESHOLD,
+            check_allocations: bool = True) -> List[Regression]:
+    """Regressions of ``results`` against baseline result dicts (new benchmarks are skipped)"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if not base:
+            continue
+        base_p50 = base.get('p50_us')
+        if base_p50 and result.p50_us > base_p50 * (1 + threshold) and result.p50_us - base_p50 > MIN_TIME_DELTA_US:
+            regressions.append(Regression(result.name, 'p50_us', base_p50, result.p50_us))
+        base_alloc = base.get('alloc_kb')
+        if (check_allocations and base_alloc is not None and result.alloc_kb is not None
+                and result.alloc_kb > base_alloc * (1 + threshold)
+                and result.alloc_kb - base_alloc > MIN_ALLOC_DELTA_KB):
+            regressions.append(Regression(result.name, 'alloc_kb', base_alloc, result.alloc_kb))
+    return regressions
+
+
+# ==========
+# BASELINE FILES
+# ==========
+
+def load_baseline(path: str) -> Optional[Dict]:
+    """Baseline written by save_baseline(), or None when there is none yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Iterable[BenchResult], merge: bool = True):
+    """Write results as the new baseline (merged into the existing one unless ``merge`` is False)"""
+    existing = load_baseline(path) if merge else None
+    stored = dict(existing['results']) if existing else {}
+    stored.update({result.name: result.to_dict() for result in results})
+    data = {'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0], 'machine': platform.platform(), 'results': stored}
+    temp_file = path + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(temp_file, path)
+
+
+def format_table(results: Iterable[BenchResult], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    """Fixed-width report; the last column is the p50 change against the baseline"""
+    results = list(results)
+    width = max([len(r.name) for r in results] + [9])
+    lines = [f"{'benchmark':<{width}}  {'ops/s':>10}  {'p50 us':>10}  {'p99 us':>10}  {'alloc KB':>9}  {'vs base':>8}",
+             '-' * (width + 58)]
+    for r in results:
+        base = (baseline or {}).get(r.name) or {}
+        change = f"{(r.p50_us / base['p50_us'] - 1) * 100:+.0f}%" if base.get('p50_us') else 'new'
+        alloc = f"{r.alloc_kb:.1f}" if r.alloc_kb is not None else '-'
+        lines.append(f"{r.name:<{width}}  {r.ops_per_sec:>10.0f}  {r.p50_us:>10.1f}  {r.p99_us:>10.1f}  "
+                     f"{alloc:>9}  {change:>8}")
+    return '\n'.join(lines)
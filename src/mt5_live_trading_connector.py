@@ -30,7 +30,14 @@ Test extensively on demo accounts. Never risk more than you can afford to lose.
 Past performance does not guarantee future results.
 """
 
-import MetaTrader5 as mt5
+import os
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    if not os.environ.get("MT5_REPLAY"):  # A recorded session can stand in for the terminal
+        raise
+    mt5 = None
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -42,7 +49,26 @@ import sys
 from typing import Dict, Optional, Tuple, List
 import threading
 import signal
-import os
+import asyncio
+
+try:
+    from src.mt5_rates_cache import shared_rates_cache
+    from src.engine_loop import EngineLoop, weekly_fx_session
+    from src.risk_gate import Candidate, MarketSnapshot, RiskGate
+    from src.symbol_spec_cache import shared_symbol_specs
+    from src.connection_supervisor import ConnectionSupervisor
+    from src.mt5_terminal_guard import shared_terminal
+except ImportError:  # Loaded with src/ itself on sys.path
+    from mt5_rates_cache import shared_rates_cache
+    from engine_loop import EngineLoop, weekly_fx_session
+    from risk_gate import Candidate, MarketSnapshot, RiskGate
+    from symbol_spec_cache import shared_symbol_specs
+    from connection_supervisor import ConnectionSupervisor
+    from mt5_terminal_guard import shared_terminal
+
+# MT5_RECORD=<file> records every terminal call; MT5_REPLAY=<file> serves a recorded session
+# One terminal call in flight at a time: engine symbol workers and the supervisor share it
+mt5 = shared_terminal(mt5)
 
 # Add strategies directory to path for importing our strategies
 BASE_DIR = Path(__file__).resolve().parent
@@ -109,7 +135,10 @@ MT5_TIMEOUT = 60000                      # Connection timeout in milliseconds
 # === TRADING SETTINGS ===
 SYMBOLS_TO_TRADE = ['EURUSD']            # Start with single symbol for testing
 DEFAULT_TIMEFRAME = mt5.TIMEFRAME_M5     # 5-minute timeframe
-SIGNAL_CHECK_INTERVAL = 30               # Check for signals every 30 seconds
+TIMEFRAME_SECONDS = 300                  # Bar length of DEFAULT_TIMEFRAME (bar-close timer)
+SIGNAL_CHECK_INTERVAL = 30               # Legacy polling interval (engine loop now runs at bar close)
+BAR_CLOSE_DELAY = 2.0                    # Seconds after each bar close before processing
+SYMBOL_TIMEOUT = 20.0                    # Per-symbol processing timeout per bar
 MAX_SPREAD_PIPS = 3                      # Maximum allowed spread in pips
 
 # === LOGGING SETTINGS ===
@@ -265,6 +294,11 @@ class MT5Connection:
             self.logger.info(f"Account Balance: {self.account_info.balance}")
             self.logger.info(f"Account Currency: {self.account_info.currency}")
             
+            # Re-read cached symbol specs from the (possibly different) server
+            symbol_specs = shared_symbol_specs()
+            symbol_specs.bind(mt5, account_currency=self.account_info.currency)
+            symbol_specs.refresh()
+            
             # Safety check for demo account
             if DEMO_MODE_ONLY and self.account_info.trade_mode != mt5.ACCOUNT_TRADE_MODE_DEMO:
                 self.logger.error("SAFETY: Demo mode enforced but connected to real account!")
@@ -313,6 +347,18 @@ class MT5Connection:
         except Exception as e:
             self.logger.error(f"Error checking market status for {symbol}: {e}")
             return False
+    
+    def market_session(self, symbol: str) -> Tuple[bool, float]:
+        """(is_open, seconds until the session state can change) - cached by the engine loop"""
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            raise RuntimeError(f"symbol_info unavailable: {mt5.last_error()}")
+        if not symbol_info.visible and not mt5.symbol_select(symbol, True):
+            raise RuntimeError(f"symbol_select failed: {mt5.last_error()}")
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            raise RuntimeError(f"no tick: {mt5.last_error()}")
+        return weekly_fx_session(datetime.utcfromtimestamp(tick.time))  # Tick time is server time
 
 class PositionManager:
     """Manages positions and risk for live trading"""
@@ -321,6 +367,9 @@ class PositionManager:
         self.logger = logger
         self.daily_trades = 0
         self.last_trade_date = None
+        self.risk_gate = RiskGate(max_daily_trades=MAX_DAILY_TRADES, max_spread_pips=MAX_SPREAD_PIPS,
+                                  max_position_size=MAX_POSITION_SIZE, default_risk_fraction=MAX_RISK_PER_TRADE)
+        self.symbol_specs = shared_symbol_specs()
         
     def reset_daily_counter(self):
         """Reset daily trade counter"""
@@ -330,66 +379,29 @@ class PositionManager:
             self.last_trade_date = current_date
             self.logger.info("Daily trade counter reset")
     
+    def pre_trade_check(self, candidates: List[Candidate]) -> List:
+        """Spread, exposure, daily-limit and sizing checks for all candidates on one market snapshot"""
+        self.reset_daily_counter()
+        self.symbol_specs.bind(mt5)
+        snapshot = MarketSnapshot.capture(mt5, [c.symbol for c in candidates], spec_fn=self.symbol_specs.get)
+        return self.risk_gate.evaluate(candidates, snapshot, self.daily_trades)
+    
     def can_open_position(self, symbol: str) -> Tuple[bool, str]:
         """Check if we can open a new position"""
-        self.reset_daily_counter()
-        
-        # Check daily trade limit
-        if self.daily_trades >= MAX_DAILY_TRADES:
-            return False, f"Daily trade limit reached: {self.daily_trades}/{MAX_DAILY_TRADES}"
-        
-        # Check existing positions
-        positions = mt5.positions_get(symbol=symbol)
-        if positions is not None and len(positions) > 0:
-            return False, f"Position already exists for {symbol}"
-        
-        # Check spread
-        tick = mt5.symbol_info_tick(symbol)
-        if tick is None:
-            return False, f"Cannot get tick data for {symbol}"
-        
-        symbol_info = mt5.symbol_info(symbol)
-        spread_pips = (tick.ask - tick.bid) / symbol_info.point / 10
-        
-        if spread_pips > MAX_SPREAD_PIPS:
-            return False, f"Spread too high: {spread_pips:.1f} pips > {MAX_SPREAD_PIPS}"
-        
-        return True, "OK"
+        decision = self.pre_trade_check([Candidate(symbol)])[0]
+        return decision.accepted, "OK" if decision.accepted else "; ".join(decision.reasons)
     
     def calculate_position_size(self, symbol: str, risk_amount: float, stop_loss_pips: float) -> float:
-        """Calculate position size based on risk management"""
+        """Calculate position size based on risk management (same sizing as the batch risk gate)"""
         try:
-            symbol_info = mt5.symbol_info(symbol)
-            account_info = mt5.account_info()
-            
-            if symbol_info is None or account_info is None:
+            self.symbol_specs.bind(mt5)
+            symbol_info = self.symbol_specs.get(symbol)
+            if symbol_info is None:
                 return 0.0
             
-            # Calculate pip value for 1 lot
-            if symbol.endswith('JPY'):
-                pip_value = symbol_info.trade_contract_size * 0.01
-            else:
-                pip_value = symbol_info.trade_contract_size * 0.0001
-            
-            # Convert pip value to account currency if needed
-            if account_info.currency != 'USD':
-                # Simplified conversion - in real implementation, use proper currency conversion
-                pass
-            
-            # Calculate lot size
-            lot_size = risk_amount / (stop_loss_pips * pip_value)
-            
-            # Apply maximum position size limit
-            lot_size = min(lot_size, MAX_POSITION_SIZE)
-            
-            # Round to broker's lot step
-            lot_step = symbol_info.volume_step
-            lot_size = round(lot_size / lot_step) * lot_step
-            
-            # Ensure minimum lot size
-            lot_size = max(lot_size, symbol_info.volume_min)
-            
-            return lot_size
+            lots = self.risk_gate.size_lots([symbol], np.array([risk_amount], dtype=float),
+                                            np.array([stop_loss_pips], dtype=float), [symbol_info])
+            return 0.0 if np.isnan(lots[0]) else float(lots[0])
             
         except Exception as e:
             self.logger.error(f"Error calculating position size: {e}")
@@ -408,6 +420,17 @@ class SunriseMT5Trader:
         self.position_manager = PositionManager(self.logger)
         self.running = False
         self.strategies = {}
+        self.rates_cache = shared_rates_cache()  # Same bar cache as the monitor / signal adapter
+        self.rates_cache.bind(mt5)
+        self.engine = None  # EngineLoop while trading
+        self.pending_signals = []  # (cycle, symbol, signal) queued by symbol tasks during a bar
+        self._pending_lock = threading.Lock()
+        self.supervisor = ConnectionSupervisor(connect_fn=self.mt5_connection.connect,
+                                               probe_fn=self.probe_connection,
+                                               disconnect_fn=mt5.shutdown,
+                                               on_reconnected=self.resync_after_reconnect,
+                                               logger=self.logger.logger)
+        self.retry_symbols = set()  # Symbols that missed the current bar while the link was down
         
         # Emergency stop flag
         self.emergency_stop = False
@@ -420,7 +443,10 @@ class SunriseMT5Trader:
         """Handle shutdown signals"""
         self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         self.emergency_stop = True
-        self.stop()
+        if self.engine is not None:
+            self.engine.stop()  # Wakes the loop; start_trading then calls stop()
+        else:
+            self.stop()
     
     def initialize(self) -> bool:
         """Initialize the trading system"""
@@ -452,41 +478,60 @@ class SunriseMT5Trader:
             return
         
         self.running = True
-        self.logger.info("🎯 Starting live trading loop...")
-        
+        self.supervisor.start()  # Background health probes / reconnects
+        self.logger.info("🎯 Starting live trading loop (bar-close driven)...")
+        
+        # One task per symbol at every bar close; market sessions re-checked only at boundaries
+        self.engine = EngineLoop(SYMBOLS_TO_TRADE, self.process_symbol,
+                                 session_fn=self.mt5_connection.market_session,
+                                 timeframe_seconds=TIMEFRAME_SECONDS,
+                                 bar_close_delay=BAR_CLOSE_DELAY,
+                                 symbol_timeout=SYMBOL_TIMEOUT,
+                                 on_cycle=self.execute_pending_signals,
+                                 logger=self.logger.logger)
         try:
-            while self.running and not self.emergency_stop:
-                # Check each symbol
-                for symbol in SYMBOLS_TO_TRADE:
-                    if self.emergency_stop:
-                        break
-                    
-                    try:
-                        self.process_symbol(symbol)
-                    except Exception as e:
-                        self.logger.error(f"Error processing {symbol}: {e}")
-                
-                # Wait before next check
-                if not self.emergency_stop:
-                    time.sleep(SIGNAL_CHECK_INTERVAL)
-                    
+            asyncio.run(self.engine.run())
         except KeyboardInterrupt:
             self.logger.info("Trading interrupted by user")
         except Exception as e:
             self.logger.error(f"Trading loop error: {e}")
         finally:
+            self.engine = None
             self.stop()
     
+    def probe_connection(self) -> bool:
+        """Supervisor health probe: terminal reachable and connected to the trade server"""
+        info = mt5.terminal_info()
+        return info is not None and bool(info.connected)
+    
+    def resync_after_reconnect(self):
+        """Supervisor hook: drop cached bars and re-run symbols that missed their bar
+        
+        Runs on the supervisor thread before the link is reported CONNECTED, so
+        the missed symbols are handed to the engine once it is: they re-run on
+        the engine's workers, never next to a cycle on this thread.
+        """
+        self.rates_cache.clear()
+        engine = self.engine
+        if engine is None or not self.retry_symbols:
+            return
+        missed, self.retry_symbols = self.retry_symbols, set()
+        self.logger.info(f"Re-processing bars missed during the outage: {', '.join(sorted(missed))}")
+        self.supervisor.run_when_connected(lambda: engine.request_symbols(missed))
+    
     def process_symbol(self, symbol: str):
-        """Process trading signals for a specific symbol"""
-        # Check if market is open
-        if not self.mt5_connection.is_market_open(symbol):
+        """Process trading signals for a specific symbol (market session checked by the engine loop)"""
+        if not self.supervisor.available:
+            self.retry_symbols.add(symbol)  # Fail fast; retried by the supervisor after reconnect
             return
         
         # Get latest data
-        rates = mt5.copy_rates_from_pos(symbol, DEFAULT_TIMEFRAME, 0, 100)
+        rates = self.rates_cache.get_rates(symbol, DEFAULT_TIMEFRAME, 100)
         if rates is None or len(rates) == 0:
             self.logger.warning(f"No data available for {symbol}")
+            if rates is None:
+                self.retry_symbols.add(symbol)
+                self.supervisor.report_failure(f"{symbol}: copy_rates failed: {mt5.last_error()}")
             return
         
         # TODO: Generate signals from strategy
@@ -494,7 +539,7 @@ class SunriseMT5Trader:
         signal = self.generate_signal(symbol, rates)
         
         if signal:
-            self.execute_signal(symbol, signal)
+            self.queue_signal(symbol, signal)
     
     def generate_signal(self, symbol: str, rates) -> Optional[Dict]:
         """Generate trading signal from strategy"""
@@ -502,26 +547,70 @@ class SunriseMT5Trader:
         # For now, return None (no signals)
         return None
     
-    def execute_signal(self, symbol: str, signal: Dict):
-        """Execute a trading signal"""
-        try:
-            # Check if we can open position
-            can_trade, reason = self.position_manager.can_open_position(symbol)
-            if not can_trade:
-                self.logger.info(f"Cannot trade {symbol}: {reason}")
+    def queue_signal(self, symbol: str, signal: Dict):
+        """Collect a signal; all signals of a bar are risk-checked together at the end of the cycle
+        
+        Signals from a symbol run that timed out and finished after its cycle
+        ended are dropped - they were computed on a bar that is already gone.
+        """
+        with self._pending_lock:
+            if self.engine is not None and not self.engine.in_current_cycle():
+                self.logger.warning(f"{symbol}: signal from a timed-out run arrived after its bar - dropped")
                 return
-            
-            # Manual confirmation if enabled
-            if ENABLE_TRADE_CONFIRMATION:
-                if not self.confirm_trade(symbol, signal):
-                    self.logger.info(f"Trade cancelled by user for {symbol}")
-                    return
-            
-            # Execute the trade
-            self.place_order(symbol, signal)
-            
+            self.pending_signals.append((EngineLoop.worker_cycle(), symbol, signal))
+    
+    def execute_pending_signals(self, cycle_result=None):
+        """EngineLoop on_cycle hook: execute the signals queued during this bar
+        
+        Runs on the engine's execution thread, so order calls and the manual
+        confirmation prompt never block the loop. Signals of later bars
+        (queued while an earlier execution was still waiting) are left for
+        their own cycle.
+        """
+        last = cycle_result.cycle if cycle_result is not None else None
+        due, later = [], []
+        with self._pending_lock:
+            for item in self.pending_signals:
+                (due if last is None or item[0] is None or item[0] <= last else later).append(item)
+            self.pending_signals = later
+        if due:
+            self.execute_signals([(symbol, signal) for _, symbol, signal in due])
+    
+    def execute_signals(self, signals: List[Tuple[str, Dict]]):
+        """Execute trading signals after one batched pre-trade check"""
+        try:
+            candidates = [Candidate(symbol, signal.get('direction', 'LONG'), signal.get('stop_loss_pips'),
+                                    signal.get('risk_amount'), payload=signal)
+                          for symbol, signal in signals]
+            decisions = self.position_manager.pre_trade_check(candidates)
         except Exception as e:
-            self.logger.error(f"Error executing signal for {symbol}: {e}")
+            self.logger.error(f"Pre-trade check failed for {[s for s, _ in signals]}: {e}")
+            return
+        
+        for decision in decisions:
+            symbol, signal = decision.symbol, decision.candidate.payload
+            try:
+                if not decision.accepted:
+                    self.logger.info(f"Cannot trade {symbol}: {'; '.join(decision.reasons)}")
+                    continue
+                if decision.lot_size is not None:
+                    signal = dict(signal, volume=decision.lot_size)
+                
+                # Manual confirmation if enabled
+                if ENABLE_TRADE_CONFIRMATION:
+                    if not self.confirm_trade(symbol, signal):
+                        self.logger.info(f"Trade cancelled by user for {symbol}")
+                        continue
+                
+                # Execute the trade
+                self.place_order(symbol, signal)
+                
+            except Exception as e:
+                self.logger.error(f"Error executing signal for {symbol}: {e}")
+    
+    def execute_signal(self, symbol: str, signal: Dict):
+        """Execute a trading signal"""
+        self.execute_signals([(symbol, signal)])
     
     def confirm_trade(self, symbol: str, signal: Dict) -> bool:
         """Request manual confirmation for trade"""
@@ -569,7 +658,8 @@ class SunriseMT5Trader:
         # Close any open positions if needed (implement as safety feature)
         # self.close_all_positions()
         
-        # Disconnect from MT5
+        # Disconnect from MT5 (no automatic reconnect after a requested stop)
+        self.supervisor.stop()
         self.mt5_connection.disconnect()
         
         self.logger.info("✅ Trading system stopped safely")
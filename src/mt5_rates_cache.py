@@ -0,0 +1,192 @@
+"""
+MT5 Rates Cache - Shared Bar Cache with Delta Updates
+=====================================================
+One cache of MT5 bars per (symbol, timeframe), shared by the live monitor,
+the signal adapter's MT5DataProvider and the trading connector:
+
+- The first request for a key fetches the full window (a miss)
+- Later requests fetch only a small window at the head of the history and
+  splice it over the cached tail (the forming bar is replaced in place).
+  The window grows until it overlaps the cached bars, and falls back to a
+  full fetch when the history no longer lines up (gap, rewind, new server).
+- Results are read-only zero-copy views into the cached structured array.
+  A view stays valid until the next fetch of the same key, so callers that
+  keep bars across fetches must copy them.
+
+``copy_rates_from_pos(symbol, timeframe, 0, n)`` is used for the delta
+window: it addresses the newest bars directly, without converting broker
+server time to the UTC datetimes that ``copy_rates_from`` expects.
+
+Usage:
+    cache = shared_rates_cache()
+    cache.bind(mt5)
+    rates = cache.get_rates('EURUSD', mt5.TIMEFRAME_M5, 151)
+    batch = cache.get_rates_many(['EURUSD', 'GBPUSD'], mt5.TIMEFRAME_M5, 151)
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# ==========
+# CACHE CONFIGURATION
+# ==========
+DELTA_WINDOW_BARS = 3     # Head window fetched per update (forming bar + 2 closed bars)
+DELTA_GROWTH = 4          # Window growth factor when the head window does not overlap
+CAPACITY_FACTOR = 2       # Buffer capacity as a multiple of the largest request
+
+
+class CacheStats:
+    """Counters for cache effectiveness"""
+
+    __slots__ = ('hits', 'misses', 'delta_fetches', 'bars_fetched')
+
+    def __init__(self):
+        self.hits = 0            # Requests served without a full fetch
+        self.misses = 0          # Full-window fetches
+        self.delta_fetches = 0   # Head-window fetches (one per hit unless max_age applies)
+        self.bars_fetched = 0    # Bars transferred from the terminal
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Series:
+    """Contiguous bar buffer for one (symbol, timeframe)"""
+
+    __slots__ = ('rows', 'size', 'fetched_at')
+
+    def __init__(self, rates: np.ndarray, capacity: int):
+        self.rows = np.empty(max(capacity, len(rates)), dtype=rates.dtype)
+        self.rows[:len(rates)] = rates
+        self.size = len(rates)
+        self.fetched_at = time.monotonic()
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.rows['time'][:self.size]
+
+    def splice(self, fresh: np.ndarray, position: int):
+        """Write ``fresh`` over the buffer from ``position`` on, compacting when full"""
+        end = position + len(fresh)
+        if end > len(self.rows):
+            keep = len(self.rows) // 2
+            shift = position - keep if position > keep else 0
+            self.rows[:position - shift] = self.rows[shift:position]
+            position -= shift
+            end = position + len(fresh)
+            if end > len(self.rows):
+                grown = np.empty(end * 2, dtype=self.rows.dtype)
+                grown[:position] = self.rows[:position]
+                self.rows = grown
+        self.rows[position:end] = fresh
+        self.size = end
+        self.fetched_at = time.monotonic()
+
+    def view(self, count: int) -> np.ndarray:
+        view = self.rows[max(self.size - count, 0):self.size]
+        view.flags.writeable = False
+        return view
+
+
+class RatesCache:
+    """Per-(symbol, timeframe) bar cache on top of an MT5 terminal module
+
+    Args:
+        terminal: MetaTrader5 module (or a compatible stub); can be bound later
+        max_age_seconds: serve cached bars without any terminal call when the
+            key was fetched less than this many seconds ago (0 = always delta fetch)
+    """
+
+    def __init__(self, terminal=None, max_age_seconds: float = 0.0, logger: Optional[logging.Logger] = None):
+        self.terminal = terminal
+        self.max_age_seconds = max_age_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = CacheStats()
+        self._series: Dict[Tuple[str, int], _Series] = {}
+
+    def bind(self, terminal):
+        """Use ``terminal`` for fetches; switching terminals drops the cached bars"""
+        if terminal is not self.terminal:
+            self.terminal = terminal
+            self.clear()
+
+    def clear(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._series.clear()
+        else:
+            for key in [key for key in self._series if key[0] == symbol]:
+                del self._series[key]
+
+    def _fetch(self, symbol: str, timeframe: int, count: int) -> Optional[np.ndarray]:
+        rates = self.terminal.copy_rates_from_pos(symbol, timeframe, 0, count)
+        if rates is not None:
+            self.stats.bars_fetched += len(rates)
+        return rates
+
+    def _full(self, key, count: int) -> Optional[np.ndarray]:
+        self.stats.misses += 1
+        rates = self._fetch(key[0], key[1], count)
+        if rates is None or len(rates) == 0:
+            self._series.pop(key, None)
+            return rates
+        series = _Series(rates, count * CAPACITY_FACTOR)
+        self._series[key] = series
+        return series.view(count)
+
+    def get_rates(self, symbol: str, timeframe: int, count: int) -> Optional[np.ndarray]:
+        """Newest ``count`` bars (forming bar last), like copy_rates_from_pos(symbol, timeframe, 0, count)
+
+        Returns None when the terminal returns None (check terminal.last_error()).
+        """
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is None or series.size < count:
+            return self._full(key, count)
+
+        if self.max_age_seconds and time.monotonic() - series.fetched_at < self.max_age_seconds:
+            self.stats.hits += 1
+            return series.view(count)
+
+        window = DELTA_WINDOW_BARS
+        while True:
+            self.stats.delta_fetches += 1
+            fresh = self._fetch(symbol, timeframe, window)
+            if fresh is None:
+                return None
+            if len(fresh) == 0:
+                return self._full(key, count)
+            times = series.times
+            position = int(np.searchsorted(times, fresh['time'][0]))
+            if position < series.size and times[position] == fresh['time'][0]:
+                break  # Head window overlaps the cached bars
+            if fresh['time'][0] < times[0] or position < series.size or window >= count:
+                return self._full(key, count)  # History no longer lines up
+            window = min(window * DELTA_GROWTH, count)
+
+        series.splice(fresh, position)
+        if series.size < count:
+            return self._full(key, count)
+        self.stats.hits += 1
+        return series.view(count)
+
+    def get_rates_many(self, symbols: Iterable[str], timeframe: int, count: int) -> Dict[str, Optional[np.ndarray]]:
+        """get_rates for every symbol; keeps the symbols' order"""
+        return {symbol: self.get_rates(symbol, timeframe, count) for symbol in symbols}
+
+
+_SHARED_CACHE: Optional[RatesCache] = None
+
+
+def shared_rates_cache() -> RatesCache:
+    """Process-wide cache used by the monitor, the adapter and the connector
+
+    Shared only when every consumer imports this module as ``src.mt5_rates_cache``
+    and binds the terminal from ``mt5_terminal_guard.shared_terminal``.
+    """
+    global _SHARED_CACHE
+    if _SHARED_CACHE is None:
+        _SHARED_CACHE = RatesCache()
+    return _SHARED_CACHE
@@ -0,0 +1,354 @@
+"""
+MT5 Recorder - Record and Replay of MetaTrader5 API Traffic
+===========================================================
+Wraps the ``mt5`` module used by the live monitor and the trading connector:
+
+- MT5Recorder passes every call through to the real terminal and appends
+  (function, arguments, result, wall time, call duration) to a session file.
+  Results keep their shape: rates stay numpy structured arrays, and
+  AccountInfo / SymbolInfo / Tick / TradePosition stay namedtuples.
+- MT5Replayer serves the recorded responses back without a terminal (no
+  MetaTrader5 package needed), at full speed or with the recorded latency.
+  Responses are matched by function and exact arguments, in recorded order
+  per call, so threads interleaving differently still replay the same
+  broker behaviour (IPC failures, gaps, rejected orders, stale positions).
+  A call is never answered with a response recorded for other arguments.
+
+Session files are a gzip stream of pickle frames: one header (constants and
+metadata), then one frame per call. Frames are written as calls happen, so a
+crashed session is readable up to its last flushed frame.
+
+Enable it without code changes through the environment:
+
+    MT5_RECORD=logs/session_2025-11-20.mt5rec  python advanced_mt5_monitor_gui.py
+    MT5_REPLAY=logs/session_2025-11-20.mt5rec  python advanced_mt5_monitor_gui.py
+
+or directly:
+
+    mt5 = MT5Recorder(mt5, 'session.mt5rec')     # ... trade ..., then mt5.close()
+    mt5 = MT5Replayer('session.mt5rec')
+    print(mt5.profile())                          # Per-function call counts and latency
+
+Only the broker side is replayed: wall-clock driven code (candle timing,
+session windows) still reads the local clock.
+"""
+
+import builtins
+import collections
+import gzip
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# ==========
+# SESSION CONFIGURATION
+# ==========
+SESSION_FORMAT = 'mt5-session'
+SESSION_VERSION = 1
+RECORD_ENV = 'MT5_RECORD'           # Path to record the session to
+REPLAY_ENV = 'MT5_REPLAY'           # Path of a session to replay instead of the terminal
+FLUSH_EVERY = 50                    # Frames between flushes of the session file
+COMPRESS_LEVEL = 6
+
+
+class ReplayMismatch(LookupError):
+    """Strict replay asked for a call the session did not record"""
+
+
+# ==========
+# RESULT ENCODING
+# ==========
+# Frames hold only builtins and numpy arrays, so reading a session needs
+# neither MetaTrader5 nor this module under the same import path.
+_STRUCT = '__mt5_struct__'
+_ERROR = '__mt5_error__'
+_struct_types: Dict[tuple, type] = {}
+
+
+def _encode(value):
+    """Terminal results -> picklable values without the MetaTrader5 types"""
+    if isinstance(value, tuple):
+        fields = getattr(value, '_fields', None)
+        if fields is not None:
+            return (_STRUCT, type(value).__name__, tuple(fields), tuple(_encode(v) for v in value))
+        return tuple(_encode(v) for v in value)
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value):
+    """Inverse of _encode: structs come back as namedtuples of the same name and fields"""
+    if isinstance(value, tuple):
+        if len(value) == 4 and value[0] == _STRUCT:
+            _, name, fields, values = value
+            cls = _struct_types.get((name, fields))
+            if cls is None:
+                cls = _struct_types[(name, fields)] = collections.namedtuple(name, fields)
+            return cls(*(_decode(v) for v in values))
+        return tuple(_decode(v) for v in value)
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def _is_error(result) -> bool:
+    return isinstance(result, tuple) and len(result) == 3 and result[0] == _ERROR
+
+
+def _recorded_exception(result) -> Exception:
+    """Re-create an exception the terminal raised while recording"""
+    _, type_name, message = result
+    cls = getattr(builtins, type_name, None)
+    if not (isinstance(cls, type) and issubclass(cls, Exception)):
+        cls = RuntimeError
+    return cls(f"[replayed {type_name}] {message}")
+
+
+def call_key(name: str, args: tuple, kwargs: dict) -> str:
+    """Stable identity of a call (same function, same arguments)"""
+    return repr((name, args, tuple(sorted(kwargs.items()))))
+
+
+def module_constants(module) -> Dict[str, Any]:
+    """Upper-case scalar attributes of the terminal module (TIMEFRAME_M5, ORDER_TYPE_BUY, ...)"""
+    constants = {}
+    for name in dir(module):
+        if name.isupper():
+            value = getattr(module, name, None)
+            if isinstance(value, (int, float, str)):
+                constants[name] = value
+    return constants
+
+
+def read_session(path: str):
+    """(header, calls) of a session file; a truncated tail is ignored"""
+    calls = []
+    with gzip.open(path, 'rb') as fh:
+        header = pickle.load(fh)
+        if not isinstance(header, dict) or header.get('format') != SESSION_FORMAT:
+            raise ValueError(f"{path} is not an MT5 session file")
+        while True:
+            try:
+                calls.append(pickle.load(fh))
+            except EOFError:
+                break
+            except (pickle.UnpicklingError, OSError, ValueError):  # Crashed mid-frame
+                break
+    return header, calls
+
+
+def _profile(calls) -> Dict[str, Dict[str, float]]:
+    stats: Dict[str, Dict[str, float]] = {}
+    for call in calls:
+        entry = stats.setdefault(call['name'], {'calls': 0, 'total_s': 0.0, 'max_ms': 0.0, 'errors': 0})
+        entry['calls'] += 1
+        entry['total_s'] += call['duration']
+        entry['max_ms'] = max(entry['max_ms'], call['duration'] * 1000.0)
+        entry['errors'] += _is_error(call['result'])
+    for entry in stats.values():
+        entry['mean_ms'] = entry['total_s'] * 1000.0 / entry['calls']
+    return dict(sorted(stats.items(), key=lambda item: -item[1]['total_s']))
+
+
+class MT5Recorder:
+    """Pass-through ``mt5`` module that records every function call
+
+    Args:
+        terminal: the MetaTrader5 module (or anything with the same API)
+        path: session file to write (parent directories are created)
+    """
+
+    def __init__(self, terminal, path: str, logger: Optional[logging.Logger] = None):
+        self.terminal = terminal
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.calls = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._wrappers: Dict[str, Callable] = {}
+        self._unflushed = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = gzip.open(path, 'wb', compresslevel=COMPRESS_LEVEL)
+        pickle.dump({'format': SESSION_FORMAT, 'version': SESSION_VERSION, 'started': self.started,
+                     'module': getattr(terminal, '__name__', type(terminal).__name__),
+                     'constants': module_constants(terminal)}, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('terminal', '_wrappers'):
+            raise AttributeError(name)
+        attr = getattr(self.terminal, name)
+        if not callable(attr):
+            return attr
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._wrap(name, attr)
+        return wrapper
+
+    def _wrap(self, name: str, fn: Callable) -> Callable:
+        def recorded(*args, **kwargs):
+            wall = time.time()
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._write(name, args, kwargs, (_ERROR, type(e).__name__, str(e)), wall,
+                            time.perf_counter() - started)
+                raise
+            self._write(name, args, kwargs, result, wall, time.perf_counter() - started)
+            return result
+
+        recorded.__name__ = name
+        return recorded
+
+    def _write(self, name, args, kwargs, result, wall, duration):
+        frame = {'name': name, 'args': _encode(args), 'kwargs': _encode(kwargs),
+                 'result': result if _is_error(result) else _encode(result), 't': wall - self.started, 'duration': duration,
+                 'thread': threading.current_thread().name}
+        try:
+            data = pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)  # A failed frame never reaches the file
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self.logger.warning(f"MT5 recorder: {name} result not recordable ({e})")
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(data)
+            self.calls += 1
+            self._unflushed += 1
+            if self._unflushed >= FLUSH_EVERY:
+                self._file.flush()
+                self._unflushed = 0
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        """Finish the session file (the terminal itself is left as it is)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.logger.info(f"MT5 session recorded: {self.calls} calls -> {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MT5Replayer:
+    """``mt5`` module stand-in serving the responses of a recorded session
+
+    Args:
+        path: session file written by MT5Recorder
+        strict: raise ReplayMismatch for calls the session cannot answer
+            (default: repeat the last response to the same arguments, or
+            return None for arguments never recorded)
+        latency: sleep each call's recorded duration (default: full speed)
+    """
+
+    def __init__(self, path: str, strict: bool = False, latency: bool = False,
+                 sleep: Callable[[float], None] = time.sleep, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.strict = strict
+        self.latency = latency
+        self.sleep = sleep
+        self.logger = logger or logging.getLogger(__name__)
+        self.header, self.recorded = read_session(path)
+        self.constants = self.header['constants']
+        self.stats = {'exact': 0, 'repeated': 0, 'missing': 0}
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, collections.deque] = collections.defaultdict(collections.deque)
+        self._names = set()
+        self._last: Dict[str, int] = {}  # Call key -> index of its last served response
+        for i, call in enumerate(self.recorded):
+            self._by_key[call_key(call['name'], call['args'], call['kwargs'])].append(i)
+            self._names.add(call['name'])
+        self._wrappers: Dict[str, Callable] = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('constants', '_wrappers', '_names'):
+            raise AttributeError(name)
+        if name in self.constants:
+            return self.constants[name]
+        if name not in self._names and self.strict:
+            raise AttributeError(f"MT5 session has no calls to {name}")
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._wrap(name)
+        return wrapper
+
+    def _wrap(self, name: str) -> Callable:
+        def replayed(*args, **kwargs):
+            key = call_key(name, _encode(args), _encode(kwargs))
+            with self._lock:
+                queue = self._by_key.get(key)
+                if queue:
+                    i, outcome = queue.popleft(), 'exact'
+                else:
+                    i, outcome = self._last.get(key), 'repeated'
+                if i is None:
+                    self.stats['missing'] += 1
+                    if self.strict:
+                        raise ReplayMismatch(f"MT5 session has no response for {name}{args}")
+                    return None
+                if self.strict and outcome == 'repeated':
+                    raise ReplayMismatch(f"MT5 session ran out of {name}{args} responses")
+                self.stats[outcome] += 1
+                self._last[key] = i
+                call = self.recorded[i]
+            if self.latency and call['duration'] > 0:
+                self.sleep(call['duration'])
+            result = call['result']
+            if _is_error(result):
+                raise _recorded_exception(result)
+            return _decode(result)
+
+        replayed.__name__ = name
+        return replayed
+
+    @property
+    def remaining(self) -> int:
+        """Recorded calls not served yet"""
+        return sum(len(queue) for queue in self._by_key.values())
+
+    def profile(self) -> Dict[str, Dict[str, float]]:
+        """Per-function calls, errors, total / mean / max latency as recorded on the live terminal"""
+        return _profile(self.recorded)
+
+    def close(self):
+        return None
+
+
+def terminal_from_env(terminal, environ=None, logger: Optional[logging.Logger] = None):
+    """The ``mt5`` module to use: a replayer (MT5_REPLAY), a recorder (MT5_RECORD) or ``terminal``"""
+    environ = os.environ if environ is None else environ
+    logger = logger or logging.getLogger(__name__)
+    replay_path = environ.get(REPLAY_ENV)
+    if replay_path:
+        logger.info(f"MT5 replay: serving recorded session {replay_path}")
+        return MT5Replayer(replay_path, logger=logger)
+    record_path = environ.get(RECORD_ENV)
+    if record_path and terminal is not None:
+        if isinstance(terminal, MT5Recorder):
+            return terminal
+        import atexit
+        recorder = MT5Recorder(terminal, record_path, logger=logger)
+        atexit.register(recorder.close)
+        logger.info(f"MT5 record: writing session to {record_path}")
+        return recorder
+    return terminal
@@ -0,0 +1,102 @@
+"""
+MT5 Terminal Guard - One Terminal Call at a Time
+================================================
+The MetaTrader5 Python package talks to a single terminal over one IPC pipe
+and is not documented as thread-safe. The monitor calls it from the symbol
+worker pool, the engine loop's worker threads, the connection supervisor and
+the startup thread, so every call goes through one process-wide lock:
+
+    mt5 = serialized(mt5)          # Same module API, one call in flight
+
+- Functions (copy_rates_from_pos, symbol_info, order_send, ...) run under
+  TERMINAL_LOCK; the lock is re-entrant, so wrapped code may call back in.
+- Constants (TIMEFRAME_M5, ORDER_TYPE_BUY, ...) pass straight through.
+- Wrapping is idempotent and works on recorders/replayers and test stubs too.
+
+Only the terminal call itself is held under the lock: indicator maths and
+phase logic of the workers still run in parallel.
+
+The monitor, the trading connector and the signal adapter all take their
+terminal from ``shared_terminal(mt5)``: one recorder / replayer (MT5_RECORD /
+MT5_REPLAY) behind one lock, and one object for the shared rates and spec
+caches to bind (binding a different terminal drops their entries).
+"""
+
+import functools
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    from src.mt5_recorder import terminal_from_env
+except ImportError:  # Loaded with src/ itself on sys.path
+    from mt5_recorder import terminal_from_env
+
+# ==========
+# LOCK CONFIGURATION
+# ==========
+TERMINAL_LOCK = threading.RLock()   # Shared by every wrapped terminal in the process
+
+_SHARED_TERMINAL = None
+_SHARED_LOCK = threading.Lock()
+
+
+class SerializedTerminal:
+    """``mt5`` module proxy that runs every terminal function under one lock"""
+
+    __slots__ = ('_terminal', '_lock', '_wrapped')
+
+    def __init__(self, terminal, lock: Optional[Any] = None):
+        self._terminal = terminal
+        self._lock = lock if lock is not None else TERMINAL_LOCK
+        self._wrapped: Dict[str, Any] = {}
+
+    @property
+    def unwrapped(self):
+        """The terminal module (or stub) behind the lock"""
+        return self._terminal
+
+    @property
+    def lock(self):
+        return self._lock
+
+    def __getattr__(self, name: str):
+        value = getattr(self._terminal, name)
+        if not callable(value):
+            return value
+        wrapped = self._wrapped.get(name)
+        if wrapped is None or wrapped.__wrapped__ != value:
+            lock = self._lock
+
+            @functools.wraps(value)
+            def call(*args, **kwargs):
+                with lock:
+                    return value(*args, **kwargs)
+
+            self._wrapped[name] = wrapped = call
+        return wrapped
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"SerializedTerminal({self._terminal!r})"
+
+
+def serialized(terminal, lock: Optional[Any] = None):
+    """Wrap a terminal once; None and already wrapped terminals are returned as is"""
+    if terminal is None or isinstance(terminal, SerializedTerminal):
+        return terminal
+    return SerializedTerminal(terminal, lock)
+
+
+def shared_terminal(terminal):
+    """Process-wide ``mt5``: ``terminal`` behind the env recorder / replayer, serialized
+
+    Built once, on the first call that has a terminal (or a session to
+    replay); later calls return the same object whatever they pass in.
+    """
+    global _SHARED_TERMINAL
+    with _SHARED_LOCK:
+        if _SHARED_TERMINAL is None:
+            _SHARED_TERMINAL = serialized(terminal_from_env(terminal))
+        return _SHARED_TERMINAL
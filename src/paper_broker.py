@@ -0,0 +1,394 @@
+"""
+Paper Broker - Simulated MT5 Execution with Latency, Spread and Slippage
+=======================================================================
+MetaTrader5 stand-ins that take orders from the unchanged live code path
+(``order_send`` / ``positions_get`` / ``account_info`` as used by
+execute_trade and determine_strategy_phase) without touching a real account:
+
+- ``PaperBroker`` - accelerated over history (extends live_replay.ReplayMT5).
+  An order is filled ``latency`` into the forming bar on an O-H-L-C path
+  through the bar, at ask/bid with the sampled spread plus adverse
+  slippage. SL/TP trigger intra-bar along the same path from the fill on,
+  whichever level the path reaches first; stops slip, targets fill at the
+  limit price, gaps through a level fill at the gap price.
+- ``LivePaperBroker`` - real time next to live data: market data comes from
+  the real terminal, orders wait ``latency`` and fill on the next real tick,
+  ``poll()`` checks SL/TP against live ticks.
+
+Each execution parameter is a distribution (``ExecutionModel``):
+
+    model = ExecutionModel(latency_ms=('lognormal', 120, 0.5), spread_points=None,
+                           slippage_points=('exponential', 2), seed=7)
+
+``latency_sweep`` replays a symbol through the live monitor once per latency
+to measure how execution speed changes P&L before a change ships.
+"""
+
+import logging
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from src.live_replay import LiveReplay, ReplayMT5, bar_datetime
+except ImportError:  # Loaded with src/ itself on sys.path
+    from live_replay import LiveReplay, ReplayMT5, bar_datetime
+
+# ==========
+# EXECUTION DEFAULTS
+# ==========
+DEFAULT_LATENCY_MS = 150.0       # Order round-trip to the broker
+DEFAULT_SLIPPAGE_POINTS = 0.0    # Adverse slippage on market / stop fills
+DEFAULT_BAR_SECONDS = 300        # Fallback bar length when rates have a single bar
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_POSITION_EXISTS = 10019
+
+DistributionSpec = Union[None, float, Tuple, Callable[[np.random.Generator], float]]
+
+
+def distribution(spec: DistributionSpec) -> Optional[Callable[[np.random.Generator], float]]:
+    """Sampler from a spec: number (constant), (kind, *params) tuple, callable(rng) or None
+
+    Kinds: ``normal`` (mean, std), ``lognormal`` (median, sigma), ``uniform``
+    (low, high), ``exponential`` (mean).
+    """
+    if spec is None or callable(spec):
+        return spec
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda rng: value
+    kind, *params = spec
+    if kind == 'normal':
+        return lambda rng: rng.normal(params[0], params[1])
+    if kind == 'lognormal':
+        return lambda rng: params[0] * rng.lognormal(0.0, params[1])
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == 'exponential':
+        return lambda rng: rng.exponential(params[0])
+    raise ValueError(f"Unknown distribution kind: {kind}")
+
+
+class ExecutionModel:
+    """Latency / spread / slippage distributions (spread None = recorded or live spread)"""
+
+    def __init__(self, latency_ms: DistributionSpec = DEFAULT_LATENCY_MS,
+                 spread_points: DistributionSpec = None,
+                 slippage_points: DistributionSpec = DEFAULT_SLIPPAGE_POINTS,
+                 seed: Optional[int] = None):
+        self.latency_ms = distribution(latency_ms)
+        self.spread_points = distribution(spread_points)
+        self.slippage_points = distribution(slippage_points)
+        self.rng = np.random.default_rng(seed)
+
+    def latency(self) -> float:
+        """Seconds between order_send and the fill"""
+        return max(self.latency_ms(self.rng), 0.0) / 1000.0 if self.latency_ms else 0.0
+
+    def spread(self, recorded_points: float) -> float:
+        return max(self.spread_points(self.rng), 0.0) if self.spread_points else float(recorded_points)
+
+    def slippage(self) -> float:
+        """Adverse slippage in points (negative = price improvement)"""
+        return self.slippage_points(self.rng) if self.slippage_points else 0.0
+
+
+def intrabar_path(bar) -> np.ndarray:
+    """Bid path through a bar: O-L-H-C for up bars, O-H-L-C for down bars"""
+    if bar['close'] >= bar['open']:
+        return np.array([bar['open'], bar['low'], bar['high'], bar['close']], dtype=np.float64)
+    return np.array([bar['open'], bar['high'], bar['low'], bar['close']], dtype=np.float64)
+
+
+def price_on_path(path: np.ndarray, fraction: float) -> float:
+    """Price ``fraction`` (0..1) of the way through the bar along the path"""
+    position = min(max(fraction, 0.0), 1.0) * (len(path) - 1)
+    leg = min(int(position), len(path) - 2)
+    return float(path[leg] + (path[leg + 1] - path[leg]) * (position - leg))
+
+
+def first_touch(path: np.ndarray, start: float, long: bool, sl: float, tp: float,
+                spread: float) -> Optional[Tuple[str, float, float]]:
+    """(reason, trigger price, fraction) of the first SL/TP touch on the path after ``start``
+
+    Longs close on the bid path, shorts on the ask (bid + spread). A level
+    already crossed at ``start`` (gap) triggers at the current price.
+    """
+    offset = 0.0 if long else spread
+    legs = len(path) - 1
+    position = min(max(start, 0.0), 1.0) * legs
+    leg = min(int(position), legs - 1)
+    price = price_on_path(path, start) + offset
+    points = [(price, start)] + [(path[i] + offset, i / legs) for i in range(leg + 1, legs + 1)]
+
+    def crossed(level_price, level, above):
+        return level is not None and level > 0 and (level_price >= level if above else level_price <= level)
+
+    for (a, fa), (b, fb) in zip(points[:-1], points[1:]):
+        for reason, level, above in (('SL', sl, not long), ('TP', tp, long)):
+            if crossed(a, level, above):
+                return reason, a, fa  # Gap through the level
+        hits = []
+        for reason, level, above in (('SL', sl, not long), ('TP', tp, long)):
+            if crossed(b, level, above):
+                fraction = fa + (fb - fa) * ((level - a) / (b - a) if b != a else 0.0)
+                hits.append((fraction, reason, level))
+        if hits:
+            fraction, reason, level = min(hits)
+            return reason, level, fraction
+    return None
+
+
+class PaperBroker(ReplayMT5):
+    """Accelerated paper trading over historical bars (``set_cursor`` drives time)
+
+    Args:
+        rates: symbol -> MT5 rates array
+        execution: latency / spread / slippage model (default: 150 ms, recorded spread)
+    """
+
+    def __init__(self, rates: Dict[str, np.ndarray], balance: float = 50000.0,
+                 symbol_specs: Optional[Dict[str, Dict]] = None, execution: Optional[ExecutionModel] = None):
+        super().__init__(rates, balance, symbol_specs)
+        self.execution = execution or ExecutionModel()
+        self.fills: List[SimpleNamespace] = []  # One per entry: requested vs filled price, latency
+
+    def bar_seconds(self, symbol: str) -> float:
+        times = self.rates[symbol]['time']
+        return float(times[1] - times[0]) if len(times) > 1 else DEFAULT_BAR_SECONDS
+
+    # ----- shared account logic -----
+
+    def _quote(self, symbol: str, bid: float, spread_points: float) -> Tuple[float, float]:
+        spread = spread_points * self.symbol_info(symbol).point
+        return bid, bid + spread
+
+    def _pnl(self, position, exit_price: float) -> float:
+        info = self.symbol_info(position.symbol)
+        sign = 1 if position.type == self.ORDER_TYPE_BUY else -1
+        ticks = (exit_price - position.price_open) / info.trade_tick_size
+        return sign * ticks * info.trade_tick_value * position.volume
+
+    def _open(self, request, bid: float, ask: float, when, latency: float, **extra):
+        symbol = request['symbol']
+        if symbol in self.open_positions:
+            return SimpleNamespace(retcode=TRADE_RETCODE_POSITION_EXISTS, comment='Position already open',
+                                   order=0, deal=0, volume=0.0, price=0.0)
+        if request.get('type') not in (self.ORDER_TYPE_BUY, self.ORDER_TYPE_SELL):
+            return SimpleNamespace(retcode=TRADE_RETCODE_INVALID, comment='Only market orders are simulated',
+                                   order=0, deal=0, volume=0.0, price=0.0)
+        info = self.symbol_info(symbol)
+        long = request['type'] == self.ORDER_TYPE_BUY
+        slip = self.execution.slippage() * info.point
+        price = round(ask + slip if long else bid - slip, info.digits)
+        self._ticket += 1
+        position = SimpleNamespace(
+            ticket=self._ticket, symbol=symbol, type=request['type'], volume=request['volume'],
+            price_open=price, sl=request.get('sl', 0.0), tp=request.get('tp', 0.0),
+            contract_size=info.trade_contract_size, entry_time=when, **extra)
+        self.open_positions[symbol] = position
+        self.orders.append(position)
+        self.fills.append(SimpleNamespace(symbol=symbol, ticket=self._ticket, requested=request.get('price'),
+                                          filled=price, latency=latency, time=when))
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, comment='Request executed',
+                               order=self._ticket, deal=self._ticket, volume=request['volume'], price=price)
+
+    def _close(self, symbol: str, exit_price: float, reason: str, when):
+        position = self.open_positions.pop(symbol)
+        pnl = self._pnl(position, exit_price)
+        self.balance += pnl
+        self.closed_trades.append(SimpleNamespace(
+            symbol=symbol, ticket=position.ticket,
+            direction='LONG' if position.type == self.ORDER_TYPE_BUY else 'SHORT',
+            entry_time=position.entry_time, entry_price=position.price_open,
+            exit_time=when, exit_price=exit_price, exit_reason=reason, pnl=pnl))
+
+    def _close_request(self, request, bid: float, ask: float, when):
+        """TRADE_ACTION_DEAL with ``position`` = ticket closes that position at market"""
+        symbol = request['symbol']
+        position = self.open_positions.get(symbol)
+        if position is None or position.ticket != request['position']:
+            return SimpleNamespace(retcode=TRADE_RETCODE_INVALID, comment='Position not found',
+                                   order=0, deal=0, volume=0.0, price=0.0)
+        slip = self.execution.slippage() * self.symbol_info(symbol).point
+        price = bid - slip if position.type == self.ORDER_TYPE_BUY else ask + slip
+        self._close(symbol, price, 'CLOSE', when)
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, comment='Request executed',
+                               order=position.ticket, deal=position.ticket, volume=position.volume, price=price)
+
+    # ----- replay time -----
+
+    def _bar_quote(self, symbol: str, index: int, fraction: float) -> Tuple[float, float, object]:
+        bar = self.rates[symbol][index]
+        bid = price_on_path(intrabar_path(bar), fraction)
+        bid, ask = self._quote(symbol, bid, self.execution.spread(bar['spread']))
+        when = bar_datetime(bar['time'] + fraction * self.bar_seconds(symbol))
+        return bid, ask, when
+
+    def set_cursor(self, symbol: str, index: int):
+        """Make rates[index] the forming bar; settle SL/TP intra-bar on the bar that just closed"""
+        self.cursors[symbol] = index
+        position = self.open_positions.get(symbol)
+        if position is None or index - 1 < position.open_index:
+            return
+        closed = index - 1
+        bar = self.rates[symbol][closed]
+        start = position.open_fraction if closed == position.open_index else 0.0
+        spread = self.execution.spread(bar['spread']) * self.symbol_info(symbol).point
+        long = position.type == self.ORDER_TYPE_BUY
+        touch = first_touch(intrabar_path(bar), start, long, position.sl, position.tp, spread)
+        if touch is None:
+            return
+        reason, price, fraction = touch
+        if reason == 'SL':  # Stop orders fill at market: slippage is adverse
+            slip = self.execution.slippage() * self.symbol_info(symbol).point
+            price = price - slip if long else price + slip
+        self._close(symbol, price, reason, bar_datetime(bar['time'] + fraction * self.bar_seconds(symbol)))
+
+    def symbol_info_tick(self, symbol):
+        index = self.cursors[symbol]
+        bar = self.rates[symbol][index]
+        bid, ask = self._quote(symbol, float(bar['open']), float(bar['spread']))
+        return SimpleNamespace(time=int(bar['time']), bid=bid, ask=ask, last=bid, time_msc=int(bar['time']) * 1000)
+
+    def order_send(self, request):
+        """Fill ``latency`` into the forming bar (capped at its close) with spread and slippage"""
+        symbol = request['symbol']
+        index = self.cursors[symbol]
+        latency = self.execution.latency()
+        fraction = min(latency / self.bar_seconds(symbol), 1.0)
+        bid, ask, when = self._bar_quote(symbol, index, fraction)
+        if 'position' in request:
+            return self._close_request(request, bid, ask, when)
+        return self._open(request, bid, ask, when, latency, open_index=index, open_fraction=fraction)
+
+    def account_info(self):
+        floating = 0.0
+        for symbol, position in self.open_positions.items():
+            tick = self.symbol_info_tick(symbol)
+            floating += self._pnl(position, tick.bid if position.type == self.ORDER_TYPE_BUY else tick.ask)
+        return SimpleNamespace(balance=self.balance, equity=self.balance + floating, profit=floating,
+                               currency='USD')
+
+
+class LivePaperBroker(PaperBroker):
+    """Real-time paper trading: real terminal data, simulated orders and positions
+
+    Market data (rates, ticks, symbol info, connection calls) goes to
+    ``terminal``; order_send sleeps the sampled latency and fills on the
+    tick current at that moment. Call ``poll()`` on every tick or cycle to
+    trigger SL/TP.
+    """
+
+    def __init__(self, terminal, balance: float = 50000.0, execution: Optional[ExecutionModel] = None,
+                 sleep: Callable[[float], None] = time.sleep, logger: Optional[logging.Logger] = None):
+        super().__init__({}, balance, execution=execution)
+        self.terminal = terminal
+        self.sleep = sleep
+        self.logger = logger or logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        if name == 'terminal':
+            raise AttributeError(name)
+        return getattr(self.terminal, name)  # Constants and data calls not simulated here
+
+    def initialize(self, *args, **kwargs):
+        return self.terminal.initialize(*args, **kwargs)
+
+    def shutdown(self):
+        return self.terminal.shutdown()
+
+    def last_error(self):
+        return self.terminal.last_error()
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        return self.terminal.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+    def symbol_info(self, symbol):
+        return self.terminal.symbol_info(symbol)
+
+    def symbol_select(self, symbol, enable=True):
+        return self.terminal.symbol_select(symbol, enable)
+
+    def symbol_info_tick(self, symbol):
+        return self.terminal.symbol_info_tick(symbol)
+
+    def _live_quote(self, symbol: str) -> Tuple[float, float, object]:
+        tick = self.terminal.symbol_info_tick(symbol)
+        if tick is None:
+            return None
+        info = self.symbol_info(symbol)
+        recorded = (tick.ask - tick.bid) / info.point
+        bid, ask = self._quote(symbol, tick.bid, self.execution.spread(recorded))
+        return bid, ask, bar_datetime(tick.time)
+
+    def order_send(self, request):
+        latency = self.execution.latency()
+        if latency > 0:
+            self.sleep(latency)
+        quote = self._live_quote(request['symbol'])
+        if quote is None:
+            return SimpleNamespace(retcode=TRADE_RETCODE_REJECT, comment='No price', order=0, deal=0,
+                                   volume=0.0, price=0.0)
+        bid, ask, when = quote
+        if 'position' in request:
+            return self._close_request(request, bid, ask, when)
+        return self._open(request, bid, ask, when, latency)
+
+    def poll(self, symbols: Optional[Iterable[str]] = None) -> List[SimpleNamespace]:
+        """Close positions whose SL/TP the current live tick has reached; returns new closed trades"""
+        closed = len(self.closed_trades)
+        for symbol in list(symbols if symbols is not None else self.open_positions):
+            position = self.open_positions.get(symbol)
+            quote = self._live_quote(symbol) if position is not None else None
+            if quote is None:
+                continue
+            bid, ask, when = quote
+            long = position.type == self.ORDER_TYPE_BUY
+            price = bid if long else ask
+            path = np.array([price, price])
+            touch = first_touch(path, 0.0, long, position.sl, position.tp, 0.0)
+            if touch is None:
+                continue
+            reason, exit_price, _ = touch
+            if reason == 'SL':
+                slip = self.execution.slippage() * self.symbol_info(symbol).point
+                exit_price = exit_price - slip if long else exit_price + slip
+            self._close(symbol, exit_price, reason, when)
+            self.logger.info(f"{symbol}: paper {reason} at {exit_price}")
+        return self.closed_trades[closed:]
+
+    def account_info(self):
+        account = self.terminal.account_info()
+        floating = 0.0
+        for symbol, position in self.open_positions.items():
+            quote = self._live_quote(symbol)
+            if quote is not None:
+                floating += self._pnl(position, quote[0] if position.type == self.ORDER_TYPE_BUY else quote[1])
+        return SimpleNamespace(balance=self.balance, equity=self.balance + floating, profit=floating,
+                               currency=getattr(account, 'currency', 'USD'),
+                               login=getattr(account, 'login', 0), trade_mode=getattr(account, 'trade_mode', 0))
+
+
+def latency_sweep(symbol: str, rates: np.ndarray, latencies_ms: Sequence[float],
+                  spread_points: DistributionSpec = None, slippage_points: DistributionSpec = 0.0,
+                  seed: int = 0, **replay_kwargs) -> Dict[float, SimpleNamespace]:
+    """Replay ``symbol`` through the live monitor once per latency; P&L per latency
+
+    Same seed for every run, so only the latency differs between runs.
+    """
+    results = {}
+    for latency in latencies_ms:
+        def factory(rates_by_symbol, balance, symbol_specs, latency=latency):
+            model = ExecutionModel(latency, spread_points, slippage_points, seed=seed)
+            return PaperBroker(rates_by_symbol, balance, symbol_specs, execution=model)
+
+        replay = LiveReplay(symbol, rates, broker_factory=factory, **replay_kwargs)
+        result = replay.run()
+        pnl = float(sum(trade.pnl for trade in result.closed_trades))
+        results[latency] = SimpleNamespace(latency_ms=latency, pnl=pnl, trades=len(result.closed_trades),
+                                           closed_trades=result.closed_trades)
+    return results
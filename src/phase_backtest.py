@@ -0,0 +1,189 @@
+"""
+Phase Backtest - Cached Portfolio Backtests of the Phase-Driven Strategies
+==========================================================================
+Backtest entry point for the whole portfolio: every registry symbol runs
+its sunrise_ogle_*.py strategy wrapped by ``phase_driven``
+(src/backtrader_phase_adapter.py) and the results go through
+``run_portfolio`` / BacktestCache (src/backtest_cache.py), so re-running
+an unchanged portfolio only re-runs the symbols whose data slice, strategy
+source or params changed.
+
+- Data file, date range and starting cash come from the strategy file's
+  module constants (DATA_FILENAME / FROMDATE / TODATE / STARTING_CASH),
+  parsed from source without importing the strategy
+- Params come from the symbol registry (strategy file + config/symbols/)
+- Per-bar equity is recorded into an EquityRecorder and trades into a
+  TradeRecordSink; both feed the cached BacktestResult
+- backtrader is only imported when a backtest actually runs
+
+Usage:
+    python src/phase_backtest.py                                # Every enabled symbol
+    python src/phase_backtest.py EURUSD GBPUSD --from 2025-01-01
+    python src/phase_backtest.py --no-cache --reports txt csv
+
+    results = backtest_portfolio(portfolio_jobs(['EURUSD']), BacktestCache())
+"""
+
+import ast
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    from src.backtest_cache import DEFAULT_CACHE_DIR, BacktestCache, BacktestResult, run_portfolio
+    from src.backtrader_phase_adapter import phase_driven
+    from src.symbol_registry import SymbolRegistry
+except ImportError:  # Loaded with src/ itself on sys.path
+    from backtest_cache import DEFAULT_CACHE_DIR, BacktestCache, BacktestResult, run_portfolio
+    from backtrader_phase_adapter import phase_driven
+    from symbol_registry import SymbolRegistry
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==========
+# BACKTEST CONFIGURATION
+# ==========
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(PROJECT_ROOT), 'data')  # Where the strategy files' __main__ reads
+DEFAULT_STARTING_CASH = 100000.0
+DEFAULT_LEVERAGE = 30.0
+DEFAULT_REPORT_FORMATS = ('csv',)
+# Strategy module constants read for a job -> strategy kwarg they set (None: job field only)
+STRATEGY_CONSTANTS = {
+    'DATA_FILENAME': None, 'FROMDATE': None, 'TODATE': None, 'STARTING_CASH': None,
+    'ENABLE_FOREX_CALC': 'use_forex_position_calc', 'FOREX_INSTRUMENT': 'forex_instrument',
+}
+
+
+def strategy_constants(path: str) -> Dict[str, Any]:
+    """Literal module-level STRATEGY_CONSTANTS of a strategy file (no import)"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        tree = ast.parse(f.read())
+    constants = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in STRATEGY_CONSTANTS):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass  # Computed value - the strategy default applies
+    return constants
+
+
+def portfolio_jobs(symbols: Optional[Iterable[str]] = None, data_dir: str = DEFAULT_DATA_DIR,
+                   fromdate: Optional[str] = None, todate: Optional[str] = None,
+                   registry: Optional[SymbolRegistry] = None,
+                   logger: Optional[logging.Logger] = None) -> Dict[str, Dict[str, Any]]:
+    """run_portfolio jobs for ``symbols`` (default: every enabled registry symbol)
+
+    Symbols without a strategy file or data file are skipped with a warning.
+    ``fromdate`` / ``todate`` (YYYY-MM-DD) override the strategy's own range.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if registry is None:
+        registry = SymbolRegistry(PROJECT_ROOT)
+        registry.load()
+    jobs = {}
+    for symbol in (symbols or registry.symbols()):
+        symbol = symbol.upper()
+        strategy_file = registry.strategy_path(symbol)
+        if not strategy_file or not os.path.exists(strategy_file):
+            logger.warning(f"{symbol}: no strategy file - skipped")
+            continue
+        constants = strategy_constants(strategy_file)
+        data_file = os.path.join(data_dir, constants.get('DATA_FILENAME', f"{symbol}_5m_5Yea.csv"))
+        if not os.path.exists(data_file):
+            logger.warning(f"{symbol}: data file not found ({data_file}) - skipped")
+            continue
+        jobs[symbol] = {
+            'data': data_file,
+            'fromdate': fromdate or constants.get('FROMDATE'),
+            'todate': todate or constants.get('TODATE'),
+            'strategy': strategy_file,
+            'params': registry.load_params(symbol, strategy_path=strategy_file),
+            'starting_cash': float(constants.get('STARTING_CASH', DEFAULT_STARTING_CASH)),
+            'strategy_kwargs': {kwarg: constants[name] for name, kwarg in STRATEGY_CONSTANTS.items()
+                                if kwarg and name in constants},
+        }
+    return jobs
+
+
+def run_phase_backtest(symbol: str, job: Dict[str, Any],
+                       report_formats: Iterable[str] = DEFAULT_REPORT_FORMATS) -> BacktestResult:
+    """One cerebro run of the symbol's phase-driven strategy (run_portfolio ``run_fn``)
+
+    Raises:
+        ImportError: backtrader or the strategy module is not available
+    """
+    import backtrader as bt
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from strategies import get_strategy_class
+
+    strategy_class = get_strategy_class(symbol)
+    if strategy_class is None:
+        raise ImportError(f"Strategy for {symbol} could not be imported")
+
+    feed_kwargs = dict(dataname=job['data'], dtformat='%Y%m%d', tmformat='%H:%M:%S',
+                       datetime=0, time=1, open=2, high=3, low=4, close=5, volume=6,
+                       timeframe=bt.TimeFrame.Minutes, compression=5)
+    if job.get('fromdate'):
+        feed_kwargs['fromdate'] = datetime.strptime(job['fromdate'], '%Y-%m-%d')
+    if job.get('todate'):
+        feed_kwargs['todate'] = datetime.strptime(job['todate'], '%Y-%m-%d')
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.GenericCSVData(**feed_kwargs))
+    cerebro.broker.setcash(job['starting_cash'])
+    cerebro.broker.setcommission(leverage=DEFAULT_LEVERAGE)
+    cerebro.addstrategy(phase_driven(strategy_class, job['params'], record_equity=True,
+                                     report_formats=report_formats),
+                        plot_result=False, **job.get('strategy_kwargs', {}))
+    strategy = cerebro.run()[0]
+    return BacktestResult.from_trade_reports(strategy.trade_sink.trade_reports(), job['starting_cash'],
+                                             equity=strategy.equity.buffer)
+
+
+def backtest_portfolio(jobs: Dict[str, Dict[str, Any]], cache: Optional[BacktestCache] = None,
+                       run_fn: Callable[[str, Dict[str, Any]], BacktestResult] = run_phase_backtest,
+                       logger: Optional[logging.Logger] = None) -> Dict[str, BacktestResult]:
+    """Backtest every job, through ``cache`` when given (unchanged symbols are file reads)"""
+    if cache is None:
+        return {symbol: run_fn(symbol, job) for symbol, job in jobs.items()}
+    return run_portfolio(jobs, run_fn, cache, logger)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cached portfolio backtest of the phase-driven strategies")
+    parser.add_argument('symbols', nargs='*', help="symbols to backtest (default: every enabled registry symbol)")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="directory holding the strategies' CSV files")
+    parser.add_argument('--from', dest='fromdate', help="override the strategies' FROMDATE (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='todate', help="override the strategies' TODATE (YYYY-MM-DD)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help="always run, store nothing")
+    parser.add_argument('--reports', nargs='+', default=list(DEFAULT_REPORT_FORMATS),
+                        help="trade report formats written to temp_reports/ (txt csv parquet)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    jobs = portfolio_jobs(args.symbols, args.data_dir, args.fromdate, args.todate)
+    if not jobs:
+        print("[X] Nothing to backtest - check --data-dir")
+        return 1
+    cache = None if args.no_cache else BacktestCache(args.cache_dir)
+    results = backtest_portfolio(jobs, cache, lambda symbol, job: run_phase_backtest(symbol, job, args.reports))
+
+    for symbol, result in results.items():
+        metrics = result.metrics
+        print(f"{symbol:8}: {metrics.get('trades', 0):4d} trades | P&L {metrics.get('net_pnl', 0.0):+12.2f} | "
+              f"Max DD {metrics.get('max_drawdown_pct', 0.0):6.2f}% | PF {metrics.get('profit_factor', 0.0):.2f}")
+    if cache is not None:
+        print(f"\nCache: {cache.hits} hit(s), {cache.misses} run(s) - {cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Phase Machine - Shared 4-Phase Entry State Machine
+==================================================
+One framework-free implementation of the Sunrise Ogle entry state machine,
+used by the live monitor (advanced_mt5_monitor_gui.py) and by backtests via
+src/backtrader_phase_adapter.py:
+
+    SCANNING -> ARMED_LONG/SHORT -> WINDOW_OPEN -> BREAKOUT -> IN_TRADE
+
+The machine mutates a ``SymbolState`` from a closed-bar snapshot (``Bar``)
+and returns ``Transition`` events. It never logs, fetches data or places
+orders - callers do that in response to the transitions, so live trading
+and backtests share every rule (and every optimization) and parity can be
+tested bar by bar.
+
+Rules (where the GUI and the sunrise_ogle_*.py copies drifted, the live
+behavior is kept unless noted):
+- Global invalidation: ARMED + opposing crossover on the bar + bar colored
+  in the opposing direction -> SCANNING
+- Pullback: consecutive candles against the armed direction; a candle in the
+  armed direction resets to SCANNING
+- Window: optional time offset (pullback count x multiplier), two-sided
+  channel around the last pullback candle; expiry / failure boundary re-arm
+- Breakout outside trading hours resets to SCANNING (as the backtests do)
+"""
+
+from typing import Any, Dict, List, Optional
+
+try:
+    from src.strategy_state import EntryState, SymbolState
+except ImportError:  # Loaded with src/ itself on sys.path
+    from strategy_state import EntryState, SymbolState
+
+# ==========
+# TRANSITIONS
+# ==========
+TRANSITION_ARMED = 'ARMED'                      # SCANNING -> ARMED_* (pullback mode)
+TRANSITION_ENTRY_SIGNAL = 'ENTRY_SIGNAL'        # Enter now (standard mode or confirmed breakout)
+TRANSITION_INVALIDATED = 'INVALIDATED'          # ARMED_* -> SCANNING (opposing crossover)
+TRANSITION_PULLBACK = 'PULLBACK'                # Pullback candle counted
+TRANSITION_PULLBACK_FAILED = 'PULLBACK_FAILED'  # Wrong-color candle -> SCANNING
+TRANSITION_WINDOW_OPEN = 'WINDOW_OPEN'          # ARMED_* -> WINDOW_OPEN
+TRANSITION_WINDOW_EXPIRED = 'WINDOW_EXPIRED'    # WINDOW_OPEN -> ARMED_* (timeout)
+TRANSITION_WINDOW_FAILURE = 'WINDOW_FAILURE'    # WINDOW_OPEN -> ARMED_* (failure boundary)
+TRANSITION_BREAKOUT = 'BREAKOUT'                # Success boundary hit, awaiting confirm_breakout()
+TRANSITION_OUTSIDE_HOURS = 'OUTSIDE_HOURS'      # Breakout outside trading hours -> SCANNING
+TRANSITION_BREAKOUT_REJECTED = 'BREAKOUT_REJECTED'  # Entry filters failed at breakout -> SCANNING
+TRANSITION_RESET = 'RESET'                      # Forced reset (e.g. SHORT armed but disabled)
+
+TRUE_STRINGS = ('true', '1', 'yes')
+
+
+def _flag(value, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    return bool(value)
+
+
+class Bar:
+    """Closed candle snapshot fed to the machine
+
+    ``bullish_cross`` is the FILTERED bullish crossover (entry filters passed),
+    ``bearish_cross`` the raw bearish crossover (used for invalidation).
+    ``utc_minutes`` is the bar time as UTC minute of day (time filter).
+    """
+
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'utc_minutes',
+                 'bullish_cross', 'bearish_cross', 'atr')
+
+    def __init__(self, time, open_: float, high: float, low: float, close: float,
+                 utc_minutes: Optional[int] = None, bullish_cross: bool = False,
+                 bearish_cross: bool = False, atr: Optional[float] = None):
+        self.time = time
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.utc_minutes = utc_minutes
+        self.bullish_cross = bullish_cross
+        self.bearish_cross = bearish_cross
+        self.atr = atr
+
+    @property
+    def is_bullish(self) -> bool:
+        return self.close > self.open
+
+    @property
+    def is_bearish(self) -> bool:
+        return self.close < self.open
+
+    def candle(self) -> Dict[str, Any]:
+        """Trigger-candle record stored on the state when arming"""
+        return {
+            'open': float(self.open), 'close': float(self.close),
+            'high': float(self.high), 'low': float(self.low),
+            'datetime': self.time,
+            'is_bullish': self.is_bullish, 'is_bearish': self.is_bearish,
+        }
+
+
+class Transition:
+    """State change produced by one machine call"""
+
+    __slots__ = ('kind', 'direction', 'time', 'info')
+
+    def __init__(self, kind: str, direction: Optional[str], time=None, **info):
+        self.kind = kind
+        self.direction = direction
+        self.time = time
+        self.info: Dict[str, Any] = info
+
+    def __eq__(self, other):
+        return (isinstance(other, Transition) and self.kind == other.kind
+                and self.direction == other.direction and self.time == other.time)
+
+    def __repr__(self):
+        return f"Transition({self.kind}, {self.direction}, {self.time})"
+
+
+class PhaseConfig:
+    """State-machine parameters parsed once from a strategy config dict
+
+    Window parameters are validated at startup by the GUI
+    (CRITICAL_PARAMS_CORE); a missing one raises ValueError when a window opens.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        get = config.get
+        self.short_enabled = _flag(get('ENABLE_SHORT_TRADES'), False)
+        self.use_pullback = {d: _flag(str(get(f'{d}_USE_PULLBACK_ENTRY', 'True')), True)
+                             for d in ('LONG', 'SHORT')}
+        self.pullback_max = {d: int(get(f'{d}_PULLBACK_MAX_CANDLES', 2)) for d in ('LONG', 'SHORT')}
+        self.window_periods = {d: _optional(get(f'{d}_ENTRY_WINDOW_PERIODS'), int) for d in ('LONG', 'SHORT')}
+        self.use_time_offset = get('USE_WINDOW_TIME_OFFSET')
+        if self.use_time_offset is not None:
+            self.use_time_offset = _flag(self.use_time_offset, False)
+        self.window_offset_multiplier = _optional(get('WINDOW_OFFSET_MULTIPLIER'), float)
+        self.price_offset_multiplier = _optional(get('WINDOW_PRICE_OFFSET_MULTIPLIER'), float)
+        # Trigger-candle check at breakout (same truthy set as the live monitor)
+        self.candle_filter = {d: get(f'{d}_USE_CANDLE_DIRECTION_FILTER', 'False') in ('True', True, 1, '1')
+                              for d in ('LONG', 'SHORT')}
+        # Breakout trading hours (UTC)
+        self.use_time_range = _flag(get('USE_TIME_RANGE_FILTER', 'True'), True)
+        self.entry_start = int(get('ENTRY_START_HOUR', 0)) * 60 + int(get('ENTRY_START_MINUTE', 0))
+        self.entry_end = int(get('ENTRY_END_HOUR', 23)) * 60 + int(get('ENTRY_END_MINUTE', 59))
+
+    def in_trading_hours(self, utc_minutes: Optional[int]) -> bool:
+        if not self.use_time_range or utc_minutes is None:
+            return True
+        if self.entry_start <= self.entry_end:
+            return self.entry_start <= utc_minutes <= self.entry_end
+        # Overnight range (e.g. 23:00-02:00)
+        return utc_minutes >= self.entry_start or utc_minutes <= self.entry_end
+
+
+def _optional(value, cast):
+    return None if value is None else cast(value)
+
+
+class PhaseMachine:
+    """Entry state machine over SymbolState records (one machine per config)
+
+    Live usage (callers drive each phase to interleave logging / MT5 calls):
+        machine.new_bar(state, bar.time)
+        machine.check_invalidation(state, bar)
+        machine.scan(state, bar, prev_bar) / confirm_pullback(...) / monitor_window(...)
+
+    Backtest / replay usage:
+        transitions = machine.step(state, bar, prev_bar, breakout_check)
+    """
+
+    def __init__(self, config):
+        self.config = config if isinstance(config, PhaseConfig) else PhaseConfig(config)
+
+    # ----- bar bookkeeping -----
+
+    @staticmethod
+    def new_bar(state: SymbolState, bar_time) -> bool:
+        """Advance the bar counter once per new closed candle"""
+        if state.last_candle_time != bar_time:
+            state.current_bar += 1
+            state.last_candle_time = bar_time
+            return True
+        return False
+
+    # ----- phase 0: global invalidation -----
+
+    @staticmethod
+    def check_invalidation(state: SymbolState, bar: Bar) -> Optional[Transition]:
+        """ARMED + opposing crossover + opposing candle color -> SCANNING"""
+        entry_state = state.entry_state
+        if entry_state == EntryState.ARMED_LONG and bar.bearish_cross and bar.is_bearish:
+            state.reset_entry()
+            return Transition(TRANSITION_INVALIDATED, 'LONG', bar.time)
+        if entry_state == EntryState.ARMED_SHORT and bar.bullish_cross and bar.is_bullish:
+            state.reset_entry()
+            return Transition(TRANSITION_INVALIDATED, 'SHORT', bar.time)
+        return None
+
+    # ----- phase 1: signal -----
+
+    def scan(self, state: SymbolState, bar: Bar, prev_bar: Optional[Bar] = None) -> Optional[Transition]:
+        """SCANNING: arm on a crossover (pullback mode) or signal immediate entry"""
+        if bar.bullish_cross:
+            direction = 'LONG'
+        elif bar.bearish_cross and self.config.short_enabled:
+            direction = 'SHORT'
+        else:
+            return None
+
+        if not self.config.use_pullback[direction]:
+            # STANDARD MODE: signal an immediate entry; the caller locks IN_TRADE via enter()
+            # once the order fills and leaves the symbol SCANNING if it fails
+            state.reset_entry()
+            return Transition(TRANSITION_ENTRY_SIGNAL, direction, bar.time, mode='standard', price=bar.close)
+
+        state.entry_state = EntryState.ARMED_LONG if direction == 'LONG' else EntryState.ARMED_SHORT
+        state.phase = 'WAITING_PULLBACK'
+        state.armed_direction = direction
+        state.pullback_candle_count = 0
+        state.signal_detection_atr = float(bar.atr) if bar.atr is not None else None
+        if prev_bar is not None:
+            # Trigger candle is the PREVIOUS closed candle (Backtrader close[-1])
+            state.signal_trigger_candle = prev_bar.candle()
+            # The arming candle itself is never counted as a pullback
+            state.last_pullback_check_candle = bar.time
+        state.candle_sequence_counter = 0
+        state.armed_at_candle_time = bar.time
+        return Transition(TRANSITION_ARMED, direction, bar.time, price=bar.close,
+                          pullback_max=self.config.pullback_max[direction])
+
+    # ----- phase 2/3: pullback and window -----
+
+    def confirm_pullback(self, state: SymbolState, bar: Bar, current_bar: int) -> Optional[Transition]:
+        """ARMED: count one closed candle; opens the window when the pullback completes"""
+        direction = state.armed_direction
+        if direction == 'SHORT' and not self.config.short_enabled:
+            state.reset_entry()
+            return Transition(TRANSITION_RESET, direction, bar.time, reason='short trades disabled')
+
+        state.candle_sequence_counter += 1
+        state.last_pullback_check_candle = bar.time
+        is_pullback = bar.is_bearish if direction == 'LONG' else bar.is_bullish
+        if not is_pullback:
+            state.reset_entry()
+            return Transition(TRANSITION_PULLBACK_FAILED, direction, bar.time)
+
+        state.pullback_candle_count += 1
+        max_candles = self.config.pullback_max[direction]
+        if state.pullback_candle_count < max_candles:
+            return Transition(TRANSITION_PULLBACK, direction, bar.time,
+                              count=state.pullback_candle_count, pullback_max=max_candles)
+
+        state.last_pullback_candle_high = float(bar.high)
+        state.last_pullback_candle_low = float(bar.low)
+        self.open_window(state, direction, current_bar)
+        return Transition(TRANSITION_WINDOW_OPEN, direction, bar.time,
+                          count=state.pullback_candle_count, pullback_max=max_candles,
+                          top=state.window_top_limit, bottom=state.window_bottom_limit,
+                          start_bar=state.window_bar_start, expiry_bar=state.window_expiry_bar)
+
+    def open_window(self, state: SymbolState, direction: str, current_bar: int):
+        """PHASE 3: two-sided breakout channel around the last pullback candle
+
+        Raises:
+            ValueError: a window parameter is missing from the config
+        """
+        config = self.config
+        window_periods = config.window_periods[direction]
+        if (config.use_time_offset is None or window_periods is None
+                or config.price_offset_multiplier is None
+                or (config.use_time_offset and config.window_offset_multiplier is None)):
+            raise ValueError(f"{direction} window parameters missing from strategy config")
+
+        window_start_bar = current_bar
+        if config.use_time_offset:
+            window_start_bar += int(state.pullback_candle_count * config.window_offset_multiplier)
+
+        price_offset = (state.last_pullback_candle_high - state.last_pullback_candle_low) * config.price_offset_multiplier
+        state.window_bar_start = window_start_bar
+        state.window_expiry_bar = window_start_bar + window_periods
+        state.window_top_limit = state.last_pullback_candle_high + price_offset
+        state.window_bottom_limit = state.last_pullback_candle_low - price_offset
+        state.entry_state = EntryState.WINDOW_OPEN
+        state.phase = 'WAITING_BREAKOUT'
+        state.window_active = True
+
+    # ----- phase 4: breakout -----
+
+    def monitor_window(self, state: SymbolState, bar: Bar, current_bar: int) -> Optional[Transition]:
+        """WINDOW_OPEN: None while pending / inside the channel, else a transition
+
+        BREAKOUT leaves the state untouched; the caller validates entry filters
+        and calls confirm_breakout().
+        """
+        direction = state.armed_direction
+        if current_bar < state.window_bar_start:
+            return None  # Window not active yet (time offset)
+
+        if current_bar > state.window_expiry_bar:
+            self._rearm(state, direction)
+            return Transition(TRANSITION_WINDOW_EXPIRED, direction, bar.time)
+
+        long = direction == 'LONG'
+        success = bar.high >= state.window_top_limit if long else bar.low <= state.window_bottom_limit
+        failure = bar.low <= state.window_bottom_limit if long else bar.high >= state.window_top_limit
+        if success:
+            if not self.config.in_trading_hours(bar.utc_minutes):
+                state.reset_entry()
+                return Transition(TRANSITION_OUTSIDE_HOURS, direction, bar.time)
+            return Transition(TRANSITION_BREAKOUT, direction, bar.time, price=bar.close)
+        if failure:
+            level = bar.low if long else bar.high
+            boundary = state.window_bottom_limit if long else state.window_top_limit
+            self._rearm(state, direction)
+            return Transition(TRANSITION_WINDOW_FAILURE, direction, bar.time, price=level, boundary=boundary)
+        return None
+
+    def confirm_breakout(self, state: SymbolState, bar: Bar, filter_rejections: int = 0,
+                         time_ok: bool = True) -> Transition:
+        """Validate a BREAKOUT: entry filters, original trigger candle, trading hours
+
+        Returns ENTRY_SIGNAL (state unchanged - call enter()/reset() after the
+        order) or BREAKOUT_REJECTED (state reset to SCANNING).
+        """
+        direction = state.armed_direction
+        reason = None
+        if filter_rejections:
+            reason = 'filters'
+        else:
+            trigger = state.signal_trigger_candle
+            if trigger and self.config.candle_filter[direction]:
+                if not (trigger['is_bullish'] if direction == 'LONG' else trigger['is_bearish']):
+                    reason = 'trigger_candle'
+        if reason is None and not time_ok:
+            reason = 'time'
+        if reason:
+            state.reset_entry()
+            return Transition(TRANSITION_BREAKOUT_REJECTED, direction, bar.time,
+                              reason=reason, rejections=filter_rejections)
+        return Transition(TRANSITION_ENTRY_SIGNAL, direction, bar.time, mode='breakout', price=bar.close)
+
+    @staticmethod
+    def enter(state: SymbolState):
+        """Lock the symbol while the position is open"""
+        state.entry_state = EntryState.IN_TRADE
+        state.phase = 'TRADE_ACTIVE'
+
+    @staticmethod
+    def _rearm(state: SymbolState, direction: str):
+        """Back to pullback search after window expiry / failure"""
+        state.entry_state = EntryState.ARMED_LONG if direction == 'LONG' else EntryState.ARMED_SHORT
+        state.armed_direction = direction
+        state.phase = 'WAITING_PULLBACK'
+        state.window_active = False
+        state.pullback_candle_count = 0
+        state.window_bar_start = None
+        state.window_expiry_bar = None
+        state.window_top_limit = None
+        state.window_bottom_limit = None
+
+    # ----- full bar step (backtests / replay) -----
+
+    def step(self, state: SymbolState, bar: Bar, prev_bar: Optional[Bar] = None,
+             breakout_check=None) -> List[Transition]:
+        """Run every phase for one closed bar
+
+        Args:
+            breakout_check: optional ``fn(state, bar) -> (filter_rejections, time_ok)``
+                called on BREAKOUT; without it breakouts are accepted as-is
+
+        Returns:
+            transitions in the order they happened (empty while IN_TRADE)
+        """
+        self.new_bar(state, bar.time)
+        if state.entry_state == EntryState.IN_TRADE:
+            return []
+
+        transitions = []
+        invalidated = self.check_invalidation(state, bar)
+        if invalidated:
+            transitions.append(invalidated)
+
+        entry_state = state.entry_state
+        if entry_state == EntryState.SCANNING:
+            transition = self.scan(state, bar, prev_bar)
+        elif entry_state in (EntryState.ARMED_LONG, EntryState.ARMED_SHORT):
+            transition = self.confirm_pullback(state, bar, state.current_bar)
+        else:
+            transition = self.monitor_window(state, bar, state.current_bar)
+            if transition is not None and transition.kind == TRANSITION_BREAKOUT:
+                transitions.append(transition)
+                rejections, time_ok = breakout_check(state, bar) if breakout_check else (0, True)
+                transition = self.confirm_breakout(state, bar, rejections, time_ok)
+        if transition is not None:
+            transitions.append(transition)
+        return transitions
@@ -0,0 +1,181 @@
+"""
+Position Sizing - Vectorized Dalio Allocation Sizing
+====================================================
+One implementation of the live sizing rule for every caller (the monitor's
+execute_trade, the sizing check scripts and scenario analysis):
+
+    allocated_capital = balance x allocation[symbol]
+    risk_amount       = allocated_capital x risk_percent
+    sl_points         = (ATR x SL multiplier) / point
+    value_per_point   = tick_value x point / tick_size        (broker spec)
+    lots              = risk_amount / (sl_points x value_per_point)
+                        -> rounded to volume_step, clamped to [volume_min, volume_max]
+
+All inputs broadcast with numpy, so one call sizes a whole candle's
+signals, or a balance x ATR scenario grid, without a Python loop:
+
+    sizer = PositionSizer(allocations, spec_fn=shared_symbol_specs().get)
+    result = sizer.size(['EURUSD', 'XAUUSD'], balance, atrs, sl_multipliers)
+    grid = sizer.scenarios('EURUSD', balances, atrs, sl_multiplier=1.5)  # balances x atrs lots
+
+Specs are read once per symbol through ``spec_fn`` (a symbol spec cache, a
+saved snapshot or ``mt5.symbol_info``) and kept as column arrays.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# ==========
+# SIZING CONFIGURATION
+# ==========
+DEFAULT_RISK_PERCENT = 0.01         # Of allocated capital (strategy RISK_PER_TRADE overrides)
+DEFAULT_ALLOCATION = 0.16           # Allocation for symbols missing from the table
+FALLBACK_VALUE_PER_POINT = 0.01     # Used when the broker reports no tick size / point
+
+
+def value_per_point(tick_value, tick_size, point):
+    """Account-currency value of one point per lot (array-friendly)"""
+    tick_value = np.asarray(tick_value, dtype=np.float64)
+    tick_size = np.asarray(tick_size, dtype=np.float64)
+    point = np.asarray(point, dtype=np.float64)
+    valid = (tick_size > 0) & (point > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = tick_value * (point / tick_size)
+    fallback = np.where(tick_value > 0, tick_value, FALLBACK_VALUE_PER_POINT)
+    return np.where(valid, scaled, fallback)
+
+
+def round_lots(raw_lots, volume_step, volume_min, volume_max):
+    """Round to the volume step, then clamp to the broker limits (NaN stays NaN)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lots = np.round(raw_lots / volume_step) * volume_step
+    return np.clip(lots, volume_min, volume_max)
+
+
+class SpecArrays:
+    """Broker specs of N symbols as aligned column arrays"""
+
+    __slots__ = ('symbols', 'point', 'value_per_point', 'volume_min', 'volume_max', 'volume_step')
+
+    def __init__(self, symbols: List[str], specs: List[object]):
+        def column(field, default=np.nan):
+            return np.array([getattr(s, field, default) if s is not None else default for s in specs],
+                            dtype=np.float64)
+
+        self.symbols = list(symbols)
+        self.point = column('point')
+        self.value_per_point = value_per_point(column('trade_tick_value'), column('trade_tick_size'), self.point)
+        self.value_per_point[np.isnan(self.point)] = np.nan  # Missing spec
+        self.volume_min = column('volume_min')
+        self.volume_max = column('volume_max')
+        self.volume_step = column('volume_step')
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def take(self, index: np.ndarray) -> 'SpecArrays':
+        """Specs re-ordered / repeated by ``index`` (one row per candidate)"""
+        taken = SpecArrays.__new__(SpecArrays)
+        taken.symbols = [self.symbols[i] for i in index]
+        for field in self.__slots__[1:]:
+            setattr(taken, field, getattr(self, field)[index])
+        return taken
+
+
+class SizingResult:
+    """Every intermediate of the sizing formula (arrays broadcast to one shape)"""
+
+    __slots__ = ('allocation', 'allocated_capital', 'risk_amount', 'sl_distance', 'sl_points',
+                 'value_per_point', 'raw_lots', 'lots', 'actual_risk')
+
+    def __init__(self, **arrays):
+        for field in self.__slots__:
+            setattr(self, field, arrays[field])
+
+    @property
+    def valid(self) -> np.ndarray:
+        """False where the spec is missing or the stop distance / point value is not positive"""
+        return np.isfinite(self.lots)
+
+    def row(self, index) -> Dict[str, float]:
+        """Scalars of one position (for logging)"""
+        return {field: float(np.broadcast_to(getattr(self, field), self.lots.shape)[index])
+                for field in self.__slots__}
+
+
+def lots_for_risk(risk_amount, stop_units, value_per_unit, volume_step, volume_min, volume_max):
+    """(raw, rounded) lots risking ``risk_amount`` over a stop of ``stop_units``
+
+    Units are whatever ``value_per_unit`` is quoted in (points here, pips in
+    the risk gate). NaN where the stop or the unit value is not positive.
+    """
+    stop_units = np.asarray(stop_units, dtype=np.float64)
+    value_per_unit = np.asarray(value_per_unit, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = np.asarray(risk_amount, dtype=np.float64) / (stop_units * value_per_unit)
+    raw = np.where((stop_units > 0) & (value_per_unit > 0), raw, np.nan)
+    return raw, round_lots(raw, volume_step, volume_min, volume_max)
+
+
+def size_positions(balance, atr, sl_multiplier, allocation, risk_percent, specs: SpecArrays) -> SizingResult:
+    """Dalio sizing for broadcastable arrays; spec columns align with the last axis"""
+    balance = np.asarray(balance, dtype=np.float64)
+    allocated = balance * np.asarray(allocation, dtype=np.float64)
+    risk = allocated * np.asarray(risk_percent, dtype=np.float64)
+    sl_distance = np.asarray(atr, dtype=np.float64) * np.asarray(sl_multiplier, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sl_points = sl_distance / specs.point
+    raw, lots = lots_for_risk(risk, sl_points, specs.value_per_point,
+                              specs.volume_step, specs.volume_min, specs.volume_max)
+    return SizingResult(allocation=np.asarray(allocation, dtype=np.float64), allocated_capital=allocated,
+                        risk_amount=risk, sl_distance=sl_distance, sl_points=sl_points,
+                        value_per_point=specs.value_per_point, raw_lots=raw, lots=lots,
+                        actual_risk=lots * sl_points * specs.value_per_point)
+
+
+class PositionSizer:
+    """Allocation table + cached broker specs -> lot sizes for arrays of symbols
+
+    Args:
+        allocations: symbol -> fraction of the portfolio (e.g. SymbolRegistry.allocations())
+        risk_percent: default risk per trade as a fraction of allocated capital
+        spec_fn: symbol -> symbol_info-like spec (SymbolSpecCache.get, snapshot, mt5.symbol_info)
+    """
+
+    def __init__(self, allocations: Dict[str, float], risk_percent: float = DEFAULT_RISK_PERCENT,
+                 spec_fn: Optional[Callable[[str], object]] = None, default_allocation: float = DEFAULT_ALLOCATION):
+        self.allocations = dict(allocations)
+        self.risk_percent = risk_percent
+        self.spec_fn = spec_fn
+        self.default_allocation = default_allocation
+
+    def allocation(self, symbols: Iterable[str]) -> np.ndarray:
+        return np.array([self.allocations.get(s, self.default_allocation) for s in symbols], dtype=np.float64)
+
+    def spec_arrays(self, symbols: List[str], specs: Optional[Dict[str, object]] = None) -> SpecArrays:
+        """Column specs aligned with ``symbols`` (each distinct symbol looked up once)"""
+        unique = list(dict.fromkeys(symbols))
+        if specs is None:
+            specs = {symbol: self.spec_fn(symbol) for symbol in unique}
+        columns = SpecArrays(unique, [specs.get(symbol) for symbol in unique])
+        if len(unique) == len(symbols):
+            return columns
+        position = {symbol: i for i, symbol in enumerate(unique)}
+        return columns.take(np.array([position[s] for s in symbols], dtype=np.intp))
+
+    def size(self, symbols: List[str], balance, atr, sl_multiplier, risk_percent=None,
+             specs: Optional[Dict[str, object]] = None) -> SizingResult:
+        """One position per symbol; balance / ATR / multipliers / risk broadcast against ``symbols``"""
+        symbols = list(symbols)
+        return size_positions(balance, atr, sl_multiplier, self.allocation(symbols),
+                              self.risk_percent if risk_percent is None else risk_percent,
+                              self.spec_arrays(symbols, specs))
+
+    def scenarios(self, symbol: str, balances, atrs, sl_multiplier, risk_percent=None) -> SizingResult:
+        """Balance x ATR grid for one symbol (result arrays shaped ``(len(balances), len(atrs))``)"""
+        return size_positions(np.asarray(balances, dtype=np.float64)[:, None],
+                              np.asarray(atrs, dtype=np.float64)[None, :], sl_multiplier,
+                              self.allocation([symbol])[0],
+                              self.risk_percent if risk_percent is None else risk_percent,
+                              self.spec_arrays([symbol]))
@@ -0,0 +1,361 @@
+"""
+Profiling Hooks - Runtime-Switchable Candle Profiling
+=====================================================
+Profiles the live monitor for the next N candle cycles without a restart.
+Profiling is requested from the GUI button, a signal (SIGUSR1; SIGBREAK on
+Windows) or a flag file dropped in the working directory:
+
+    echo 5 > profile_candles.flag                 # Next 5 candles, all symbols
+    echo "3 EURUSD,XAUUSD" > profile_candles.flag
+
+While a session runs, ``monitor_strategy_phase`` and ``execute_trade`` are
+replaced on the monitor instance by timing wrappers. Each session records:
+
+- stack samples of the threads inside those calls, taken by a background
+  sampler ('sample' mode, default). These become per-symbol collapsed
+  stacks (flamegraph.pl / speedscope input).
+- or per-symbol cProfile stats ('cprofile' mode). Profiled calls are then
+  serialized, because only one profiler can be active at a time.
+- tracemalloc snapshots around each symbol's outermost call. The top
+  allocation sites are kept per symbol. Allocations by workers running
+  concurrently land in whichever call is being diffed.
+- call counts and total / max wall time per symbol and method.
+
+After N cycles the wrappers are removed (the class methods are visible
+again, so there is no overhead while disabled). Files are written to
+logs/profiles/profile_<timestamp>/:
+
+    <SYMBOL>.collapsed  <SYMBOL>_allocations.txt  <SYMBOL>.pstats  summary.json
+
+Usage (the monitor's run_candle_cycle):
+    profiler.begin_cycle(monitor)   # Picks up requests, attaches wrappers
+    ... run the cycle ...
+    path = profiler.end_cycle()     # Output directory when a session finished
+"""
+
+import cProfile
+import collections
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# ==========
+# PROFILING CONFIGURATION
+# ==========
+DEFAULT_CANDLES = 5                                   # Cycles per session when none is given
+DEFAULT_OUTPUT_DIR = os.path.join('logs', 'profiles')
+FLAG_FILE_NAME = 'profile_candles.flag'               # Consumed (deleted) when picked up
+PROFILED_METHODS = ('monitor_strategy_phase', 'execute_trade')
+SAMPLE_INTERVAL_SECONDS = 0.005                       # Stack sampler period
+TOP_ALLOCATIONS = 30                                  # Allocation sites kept per symbol
+MODES = ('sample', 'cprofile')
+
+
+def parse_request(text: str) -> Tuple[int, Optional[Tuple[str, ...]]]:
+    """'5' / '5 EURUSD,XAUUSD' / '' -> (candles, symbols or None)"""
+    parts = text.split()
+    candles = DEFAULT_CANDLES
+    if parts and parts[0].isdigit():
+        candles = max(int(parts.pop(0)), 1)
+    symbols = tuple(s.strip().upper() for s in ','.join(parts).split(',') if s.strip())
+    return candles, symbols or None
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Background thread sampling the stacks of registered threads
+
+    Only frames below the profiled call are kept, so every stack is rooted
+    at ``monitor_strategy_phase`` / ``execute_trade``.
+    """
+
+    def __init__(self, stop_code, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.stop_code = stop_code
+        self.interval = interval
+        self.active: Dict[int, str] = {}      # thread id -> symbol
+        self.stacks: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def sample(self):
+        """Record one stack per registered thread"""
+        frames = sys._current_frames()
+        for thread_id, symbol in list(self.active.items()):
+            frame = frames.get(thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack and frame is not None:
+                self.stacks[symbol][';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+class ProfilingSession:
+    """One profiling run over ``candles`` cycles"""
+
+    def __init__(self, candles: int, symbols: Optional[Iterable[str]], mode: str, trace_allocations: bool,
+                 interval: float):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode} (expected one of {MODES})")
+        self.candles = candles
+        self.symbols = set(symbols) if symbols else None
+        self.mode = mode
+        self.trace_allocations = trace_allocations
+        self.cycles = 0
+        self.started = time.time()
+        self.timings: Dict[str, Dict[str, list]] = collections.defaultdict(dict)  # symbol -> method -> [n, total, max]
+        self.allocations: Dict[str, Dict[str, list]] = collections.defaultdict(dict)  # symbol -> site -> [bytes, blocks]
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.sampler = StackSampler(_profiled_call.__code__, interval) if mode == 'sample' else None
+        self._local = threading.local()
+        self._lock = threading.Lock()          # Timings / allocations from concurrent workers
+        self._cprofile_lock = threading.Lock()  # One active cProfile at a time
+        self._started_tracemalloc = False
+
+    def start(self):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def stop(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def wants(self, symbol) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    # ----- called from the wrappers (worker threads) -----
+
+    def enter(self, symbol: str):
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth:
+            return  # Nested (execute_trade inside monitor_strategy_phase): outer call covers it
+        self._local.snapshot = tracemalloc.take_snapshot() if self.trace_allocations else None
+        if self.sampler is not None:
+            self.sampler.active[threading.get_ident()] = symbol
+        if self.mode == 'cprofile':
+            self._cprofile_lock.acquire()
+            profile = self.profiles.get(symbol)
+            if profile is None:
+                profile = self.profiles[symbol] = cProfile.Profile()
+            profile.enable()
+
+    def exit(self, symbol: str, method: str, elapsed: float):
+        self._local.depth -= 1
+        outermost = self._local.depth == 0
+        if outermost:
+            if self.mode == 'cprofile':
+                self.profiles[symbol].disable()
+                self._cprofile_lock.release()
+            if self.sampler is not None:
+                self.sampler.active.pop(threading.get_ident(), None)
+        with self._lock:
+            timing = self.timings[symbol].setdefault(method, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] = max(timing[2], elapsed)
+        if outermost and self._local.snapshot is not None:
+            before, self._local.snapshot = self._local.snapshot, None
+            diff = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+            with self._lock:
+                sites = self.allocations[symbol]
+                for stat in diff:
+                    if stat.size_diff > 0:
+                        site = sites.setdefault(str(stat.traceback[0]), [0, 0])
+                        site[0] += stat.size_diff
+                        site[1] += max(stat.count_diff, 0)
+
+    # ----- output -----
+
+    def dump(self, output_dir: str) -> str:
+        """Write per-symbol files and summary.json; returns the session directory"""
+        stamp = datetime.fromtimestamp(self.started).strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(output_dir, f"profile_{stamp}")
+        os.makedirs(path, exist_ok=True)
+        if self.sampler is not None:
+            for symbol, stacks in self.sampler.stacks.items():
+                with open(os.path.join(path, f"{symbol}.collapsed"), 'w', encoding='utf-8') as f:
+                    for stack, count in stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+        for symbol, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(path, f"{symbol}.pstats"))
+        for symbol, sites in self.allocations.items():
+            top = sorted(sites.items(), key=lambda item: -item[1][0])[:TOP_ALLOCATIONS]
+            with open(os.path.join(path, f"{symbol}_allocations.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"# {symbol}: top {len(top)} allocation sites over {self.cycles} candles "
+                        f"(bytes still allocated after each call)\n")
+                for site, (size, count) in top:
+                    f.write(f"{size / 1024:10.1f} KB  {count:8d} blocks  {site}\n")
+        summary = {
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'seconds': round(time.time() - self.started, 3), 'candles': self.cycles, 'mode': self.mode,
+            'samples': self.sampler.samples if self.sampler is not None else None,
+            'symbols': {symbol: {method: {'calls': n, 'total_ms': round(total * 1000, 3),
+                                          'max_ms': round(worst * 1000, 3)}
+                                 for method, (n, total, worst) in methods.items()}
+                        for symbol, methods in sorted(self.timings.items())},
+        }
+        with open(os.path.join(path, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        return path
+
+
+def _profiled_call(session: ProfilingSession, method: str, fn: Callable, args, kwargs):
+    """Body of every wrapper (its frame bounds the sampled stacks)"""
+    symbol = args[0] if args else kwargs.get('symbol')
+    if not session.wants(symbol):
+        return fn(*args, **kwargs)
+    session.enter(symbol)
+    started = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        session.exit(symbol, method, time.perf_counter() - started)
+
+
+class RuntimeProfiler:
+    """Starts / stops profiling sessions on a monitor between candle cycles
+
+    Args:
+        output_dir: parent directory of the per-session output directories
+        flag_file: file polled once per cycle (deleted when picked up)
+        methods: monitor methods wrapped while a session runs
+        mode: 'sample' (collapsed stacks) or 'cprofile' (pstats per symbol)
+    """
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR, flag_file: Optional[str] = FLAG_FILE_NAME,
+                 methods: Iterable[str] = PROFILED_METHODS, mode: str = 'sample', trace_allocations: bool = True,
+                 interval: float = SAMPLE_INTERVAL_SECONDS, logger: Optional[logging.Logger] = None):
+        self.output_dir = output_dir
+        self.flag_file = flag_file
+        self.methods = tuple(methods)
+        self.mode = mode
+        self.trace_allocations = trace_allocations
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.session: Optional[ProfilingSession] = None
+        self.last_output: Optional[str] = None
+        self._pending: Optional[Tuple[int, Optional[Tuple[str, ...]]]] = None
+        self._target = None
+        self._saved: Dict[str, object] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.session is not None
+
+    def request(self, candles: int = DEFAULT_CANDLES, symbols: Optional[Iterable[str]] = None):
+        """Profile the next ``candles`` cycles (safe from signal handlers and other threads)"""
+        self._pending = (max(int(candles), 1), tuple(symbols) if symbols else None)
+
+    def install_signal_handler(self) -> Optional[int]:
+        """Request a default session on SIGUSR1 (SIGBREAK on Windows); main thread only"""
+        signum = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+        if signum is None:
+            return None
+        try:
+            signal.signal(signum, lambda *_: self.request())
+        except ValueError:  # Not the main thread
+            return None
+        return signum
+
+    def _poll_flag_file(self):
+        if not self.flag_file or not os.path.exists(self.flag_file):
+            return
+        try:
+            with open(self.flag_file, 'r') as f:
+                text = f.read()
+            os.remove(self.flag_file)
+        except OSError as e:
+            self.logger.warning(f"Profiling flag file unreadable: {e}")
+            return
+        self._pending = parse_request(text)
+
+    def begin_cycle(self, target):
+        """Start a requested session on ``target`` (one flag-file stat per cycle when idle)"""
+        if self.session is None:
+            self._poll_flag_file()
+            if self._pending is None:
+                return
+            (candles, symbols), self._pending = self._pending, None
+            self.session = ProfilingSession(candles, symbols, self.mode, self.trace_allocations, self.interval)
+            self.session.start()
+            self._attach(target)
+            self.logger.info(f"Profiling {candles} candles ({self.mode}) for "
+                             f"{', '.join(symbols) if symbols else 'all symbols'}")
+
+    def end_cycle(self) -> Optional[str]:
+        """Count a finished cycle; returns the output directory when the session completes"""
+        if self.session is None:
+            return None
+        self.session.cycles += 1
+        if self.session.cycles < self.session.candles:
+            return None
+        return self.stop()
+
+    def stop(self) -> Optional[str]:
+        """End the running session now and write its output"""
+        session, self.session = self.session, None
+        if session is None:
+            return None
+        self._detach()
+        session.stop()
+        self.last_output = session.dump(self.output_dir)
+        self.logger.info(f"Profile written: {self.last_output}")
+        return self.last_output
+
+    def _attach(self, target):
+        self._target = target
+        self._saved = {}
+        session = self.session
+        for method in self.methods:
+            fn = getattr(target, method, None)
+            if fn is None:
+                continue
+            if method in vars(target):
+                self._saved[method] = vars(target)[method]
+
+            def wrapper(*args, _method=method, _fn=fn, **kwargs):
+                return _profiled_call(session, _method, _fn, args, kwargs)
+
+            setattr(target, method, wrapper)
+
+    def _detach(self):
+        target, self._target = self._target, None
+        if target is None:
+            return
+        for method in self.methods:
+            if method in self._saved:
+                setattr(target, method, self._saved[method])
+            else:
+                vars(target).pop(method, None)
+        self._saved = {}
@@ -0,0 +1,198 @@
+"""
+Risk Gate - Batch Pre-Trade Checks on One Market Snapshot
+=========================================================
+Evaluates every candidate signal of a candle against ONE snapshot of the
+terminal instead of three MT5 round-trips per signal:
+
+    snapshot = MarketSnapshot.capture(mt5, symbols)  # 1 positions_get, 1 account_info,
+                                                     # 1 tick per symbol, cached specs
+    decisions = RiskGate().evaluate(candidates, snapshot, daily_trades)
+
+Checks per candidate (all reasons are collected, not just the first):
+
+- daily trade limit (slots are consumed by earlier accepted candidates)
+- one position per symbol (open positions + earlier accepted candidates)
+- maximum open positions across the account (optional)
+- spread in pips against the limit
+- position size from risk amount / stop distance, rounded to the volume
+  step and clamped by src/position_sizing.py (lots_for_risk), in pips of
+  contract size x pip (same formula as PositionManager.calculate_position_size)
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    from src.position_sizing import lots_for_risk
+except ImportError:  # Loaded with src/ itself on sys.path
+    from position_sizing import lots_for_risk
+
+# ==========
+# GATE CONFIGURATION
+# ==========
+DEFAULT_MAX_DAILY_TRADES = 10
+DEFAULT_MAX_SPREAD_PIPS = 3.0
+DEFAULT_MAX_POSITION_SIZE = 0.1
+
+REJECT_DAILY_LIMIT = 'daily_limit'
+REJECT_POSITION_EXISTS = 'position_exists'
+REJECT_MAX_POSITIONS = 'max_positions'
+REJECT_NO_TICK = 'no_tick'
+REJECT_NO_SPEC = 'no_symbol_info'
+REJECT_SPREAD = 'spread'
+REJECT_SIZE = 'size'
+
+
+def pip_size(symbol: str) -> float:
+    """Pip in price units as used for sizing (JPY pairs 0.01, others 0.0001)"""
+    return 0.01 if symbol.endswith('JPY') else 0.0001
+
+
+class MarketSnapshot:
+    """Ticks, open positions, account and symbol specs captured at one moment"""
+
+    __slots__ = ('ticks', 'position_counts', 'account', 'specs', 'taken_at')
+
+    def __init__(self, ticks: Dict[str, object], position_counts: Dict[str, int], account, specs: Dict[str, object],
+                 taken_at: Optional[float] = None):
+        self.ticks = ticks
+        self.position_counts = position_counts
+        self.account = account
+        self.specs = specs
+        self.taken_at = taken_at if taken_at is not None else time.time()
+
+    @property
+    def open_positions(self) -> int:
+        return sum(self.position_counts.values())
+
+    @classmethod
+    def capture(cls, terminal, symbols: Iterable[str],
+                spec_fn: Optional[Callable[[str], object]] = None) -> 'MarketSnapshot':
+        """One positions_get() + account_info() and one tick per symbol
+
+        Args:
+            terminal: MetaTrader5 module (or a compatible stub)
+            spec_fn: symbol -> symbol_info-like spec (a spec cache); default terminal.symbol_info
+        """
+        symbols = list(dict.fromkeys(symbols))
+        spec_fn = spec_fn or terminal.symbol_info
+        counts: Dict[str, int] = {}
+        for position in terminal.positions_get() or ():
+            counts[position.symbol] = counts.get(position.symbol, 0) + 1
+        return cls({symbol: terminal.symbol_info_tick(symbol) for symbol in symbols}, counts,
+                   terminal.account_info(), {symbol: spec_fn(symbol) for symbol in symbols})
+
+
+class Candidate:
+    """A signal asking to open a position"""
+
+    __slots__ = ('symbol', 'direction', 'stop_loss_pips', 'risk_amount', 'payload')
+
+    def __init__(self, symbol: str, direction: str = 'LONG', stop_loss_pips: Optional[float] = None,
+                 risk_amount: Optional[float] = None, payload=None):
+        self.symbol = symbol
+        self.direction = direction
+        self.stop_loss_pips = stop_loss_pips
+        self.risk_amount = risk_amount
+        self.payload = payload  # Original signal, handed back with the decision
+
+
+class Decision:
+    """Gate verdict for one candidate"""
+
+    __slots__ = ('candidate', 'accepted', 'reasons', 'lot_size', 'spread_pips')
+
+    def __init__(self, candidate: Candidate, reasons: List[str], lot_size: Optional[float], spread_pips: float):
+        self.candidate = candidate
+        self.accepted = not reasons
+        self.reasons = reasons
+        self.lot_size = lot_size
+        self.spread_pips = spread_pips
+
+    @property
+    def symbol(self) -> str:
+        return self.candidate.symbol
+
+    def __repr__(self):
+        verdict = 'ACCEPT' if self.accepted else 'REJECT ' + '; '.join(self.reasons)
+        return f"Decision({self.symbol}, {verdict})"
+
+
+class RiskGate:
+    """Spread, exposure, daily-limit and sizing checks for a batch of candidates"""
+
+    def __init__(self, max_daily_trades: int = DEFAULT_MAX_DAILY_TRADES,
+                 max_spread_pips: float = DEFAULT_MAX_SPREAD_PIPS,
+                 max_position_size: float = DEFAULT_MAX_POSITION_SIZE,
+                 max_open_positions: Optional[int] = None,
+                 default_risk_fraction: Optional[float] = None):
+        self.max_daily_trades = max_daily_trades
+        self.max_spread_pips = max_spread_pips
+        self.max_position_size = max_position_size
+        self.max_open_positions = max_open_positions
+        self.default_risk_fraction = default_risk_fraction  # Risk = balance * fraction when a candidate has none
+
+    def size_lots(self, symbols: List[str], risk_amounts: np.ndarray, stop_loss_pips: np.ndarray,
+                  specs: List[object]) -> np.ndarray:
+        """Lot sizes for aligned arrays (NaN where inputs are missing or invalid)"""
+        contract = np.array([getattr(s, 'trade_contract_size', np.nan) if s else np.nan for s in specs])
+        step = np.array([getattr(s, 'volume_step', np.nan) if s else np.nan for s in specs])
+        minimum = np.array([getattr(s, 'volume_min', np.nan) if s else np.nan for s in specs])
+        pip_value = contract * np.array([pip_size(symbol) for symbol in symbols])
+        _, lots = lots_for_risk(risk_amounts, stop_loss_pips, pip_value, step, minimum, self.max_position_size)
+        return lots
+
+    def evaluate(self, candidates: List[Candidate], snapshot: MarketSnapshot, daily_trades: int = 0) -> List[Decision]:
+        """Decisions in candidate order; earlier accepted candidates consume limits"""
+        count = len(candidates)
+        if count == 0:
+            return []
+        symbols = [c.symbol for c in candidates]
+        ticks = [snapshot.ticks.get(s) for s in symbols]
+        specs = [snapshot.specs.get(s) for s in symbols]
+
+        bid = np.array([t.bid if t is not None else np.nan for t in ticks], dtype=np.float64)
+        ask = np.array([t.ask if t is not None else np.nan for t in ticks], dtype=np.float64)
+        point = np.array([getattr(s, 'point', np.nan) if s else np.nan for s in specs], dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spreads = (ask - bid) / point / 10
+
+        balance = getattr(snapshot.account, 'balance', np.nan) if snapshot.account is not None else np.nan
+        risk = np.array([c.risk_amount if c.risk_amount is not None
+                         else balance * self.default_risk_fraction if self.default_risk_fraction else np.nan
+                         for c in candidates], dtype=np.float64)
+        stops = np.array([c.stop_loss_pips if c.stop_loss_pips is not None else np.nan for c in candidates],
+                         dtype=np.float64)
+        lots = self.size_lots(symbols, risk, stops, specs)
+
+        decisions = []
+        accepted_trades = 0
+        open_positions = snapshot.open_positions
+        taken = set()
+        for index, candidate in enumerate(candidates):
+            reasons = []
+            if daily_trades + accepted_trades >= self.max_daily_trades:
+                reasons.append(f"{REJECT_DAILY_LIMIT}: {daily_trades + accepted_trades}/{self.max_daily_trades}")
+            if snapshot.position_counts.get(candidate.symbol) or candidate.symbol in taken:
+                reasons.append(f"{REJECT_POSITION_EXISTS}: {candidate.symbol}")
+            if self.max_open_positions is not None and open_positions >= self.max_open_positions:
+                reasons.append(f"{REJECT_MAX_POSITIONS}: {open_positions}/{self.max_open_positions}")
+            if ticks[index] is None:
+                reasons.append(f"{REJECT_NO_TICK}: {candidate.symbol}")
+            if specs[index] is None:
+                reasons.append(f"{REJECT_NO_SPEC}: {candidate.symbol}")
+            elif ticks[index] is not None and spreads[index] > self.max_spread_pips:
+                reasons.append(f"{REJECT_SPREAD}: {spreads[index]:.1f} pips > {self.max_spread_pips}")
+            lot = None if np.isnan(lots[index]) else float(lots[index])
+            if candidate.stop_loss_pips is not None and lot is None:
+                reasons.append(f"{REJECT_SIZE}: cannot size {candidate.symbol}")
+
+            decision = Decision(candidate, reasons, lot, float(spreads[index]))
+            if decision.accepted:
+                accepted_trades += 1
+                open_positions += 1
+                taken.add(candidate.symbol)
+            decisions.append(decision)
+        return decisions
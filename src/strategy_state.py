@@ -0,0 +1,191 @@
+"""
+Strategy State - Compact Per-Symbol State Machine Record
+========================================================
+Replaces the free-form ``strategy_states[symbol]`` dict with a ``__slots__``
+record holding fixed, typed fields:
+
+- Unknown attributes raise AttributeError (no more keys that were never initialized)
+- ``entry_state`` is an explicit EntryState enum (invalid values raise ValueError)
+- ``indicators`` holds SCALAR values only; bar/EMA history lives in chart_data
+- ``to_dict()`` / ``restore()`` serialize only the persisted scalar fields
+- ``snapshot()`` is a cheap shallow copy published for lock-free GUI reads
+"""
+
+import copy
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class EntryState(str, Enum):
+    """Entry state machine states (matches sunrise_ogle_*.py)"""
+
+    SCANNING = 'SCANNING'
+    ARMED_LONG = 'ARMED_LONG'
+    ARMED_SHORT = 'ARMED_SHORT'
+    WINDOW_OPEN = 'WINDOW_OPEN'
+    IN_TRADE = 'IN_TRADE'
+
+    def __str__(self):
+        return self.value
+
+
+# Scalar fields written to the state file (same keys as the previous dict format)
+PERSISTED_FIELDS = (
+    'entry_state', 'phase', 'armed_direction', 'pullback_candle_count',
+    'window_active', 'window_bar_start', 'window_expiry_bar',
+    'window_top_limit', 'window_bottom_limit', 'current_bar', 'breakout_level',
+    'candle_sequence_counter', 'last_pullback_candle_high', 'last_pullback_candle_low',
+    'digits', 'pullback_count',
+)
+
+# Timestamp fields written as ISO strings
+DATETIME_FIELDS = (
+    'last_update', 'last_candle_time', 'last_pullback_check_candle',
+    'last_crossover_check_candle', 'armed_at_candle_time',
+)
+
+# Fields restored from the state file on startup
+RESTORED_FIELDS = (
+    'entry_state', 'phase', 'armed_direction', 'pullback_candle_count',
+    'window_active', 'window_bar_start', 'window_expiry_bar',
+    'window_top_limit', 'window_bottom_limit', 'current_bar',
+    'candle_sequence_counter', 'last_pullback_candle_high', 'last_pullback_candle_low',
+)
+RESTORED_DATETIME_FIELDS = (
+    'last_candle_time', 'last_pullback_check_candle',
+    'last_crossover_check_candle', 'armed_at_candle_time',
+)
+
+
+class SymbolState:
+    """Per-symbol strategy state (one instance per monitored symbol)"""
+
+    __slots__ = (
+        '_entry_state',
+        'phase',                        # Display phase (NORMAL / WAITING_* / IN_TRADE)
+        'armed_direction',              # 'LONG' / 'SHORT' / None
+        'pullback_candle_count',
+        'pullback_count',               # Legacy display counter
+        'signal_trigger_candle',        # {'open','high','low','close','datetime'} at arming
+        'last_pullback_candle_high',
+        'last_pullback_candle_low',
+        'window_active',
+        'window_bar_start',
+        'window_expiry_bar',
+        'window_top_limit',
+        'window_bottom_limit',
+        'current_bar',
+        'breakout_level',
+        'last_update',
+        'last_candle_time',
+        'last_pullback_check_candle',
+        'last_crossover_check_candle',
+        'armed_at_candle_time',
+        'candle_sequence_counter',
+        'signal_detection_atr',         # ATR at crossover (for ATR increment filter)
+        'last_forming_log',             # time.time() of last "waiting" log line
+        'indicators',                   # {name: scalar} from calculate_indicators
+        'crossover_data',               # {'bullish_crossover','bearish_crossover','candle_time'}
+        'digits',                       # MT5 symbol precision for display formatting
+    )
+
+    def __init__(self, digits: int = 5):
+        self._entry_state = EntryState.SCANNING
+        self.phase: str = 'NORMAL'
+        self.armed_direction: Optional[str] = None
+        self.pullback_candle_count: int = 0
+        self.pullback_count: int = 0
+        self.signal_trigger_candle: Optional[Dict[str, Any]] = None
+        self.last_pullback_candle_high: Optional[float] = None
+        self.last_pullback_candle_low: Optional[float] = None
+        self.window_active: bool = False
+        self.window_bar_start: Optional[int] = None
+        self.window_expiry_bar: Optional[int] = None
+        self.window_top_limit: Optional[float] = None
+        self.window_bottom_limit: Optional[float] = None
+        self.current_bar: int = 0
+        self.breakout_level: Optional[float] = None
+        self.last_update: datetime = datetime.now()
+        self.last_candle_time = None
+        self.last_pullback_check_candle = None
+        self.last_crossover_check_candle = None
+        self.armed_at_candle_time = None
+        self.candle_sequence_counter: int = 0
+        self.signal_detection_atr: Optional[float] = None
+        self.last_forming_log: float = 0.0
+        self.indicators: Dict[str, Any] = {}
+        self.crossover_data: Dict[str, Any] = {}
+        self.digits: int = digits
+
+    @property
+    def entry_state(self) -> EntryState:
+        return self._entry_state
+
+    @entry_state.setter
+    def entry_state(self, value):
+        self._entry_state = EntryState(value)
+
+    def reset_entry(self):
+        """Reset state machine to SCANNING (matching original strategy)"""
+        self.entry_state = EntryState.SCANNING
+        self.phase = 'NORMAL'
+        self.armed_direction = None
+        self.pullback_candle_count = 0
+        self.signal_trigger_candle = None
+        self.signal_detection_atr = None  # Feeds the ATR increment filter - never outlives its signal
+        self.last_pullback_candle_high = None
+        self.last_pullback_candle_low = None
+        self.window_active = False
+        self.window_bar_start = None
+        self.window_expiry_bar = None
+        self.window_top_limit = None
+        self.window_bottom_limit = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready persisted fields (no deep copy, no indicator arrays)"""
+        data = {}
+        for name in PERSISTED_FIELDS:
+            value = getattr(self, name)
+            data[name] = value.value if isinstance(value, EntryState) else _to_builtin(value)
+        for name in DATETIME_FIELDS:
+            value = getattr(self, name)
+            data[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+        return data
+
+    def restore(self, data: Dict[str, Any]):
+        """Restore persisted fields written by to_dict()
+
+        Raises:
+            ValueError: saved entry_state is not a valid EntryState
+        """
+        for name in RESTORED_FIELDS:
+            if name in data:
+                setattr(self, name, data[name])
+        for name in RESTORED_DATETIME_FIELDS:
+            if data.get(name):
+                try:
+                    setattr(self, name, datetime.fromisoformat(data[name]))
+                except (ValueError, TypeError):
+                    pass  # Leave as None if parse fails
+
+    def snapshot(self) -> 'SymbolState':
+        """Shallow copy for readers on other threads
+
+        Writers only rebind fields (never mutate the indicators dict in place
+        after publishing), so a published snapshot never changes under a reader.
+        """
+        return copy.copy(self)
+
+    def __repr__(self):
+        return f"SymbolState({self.entry_state.value}, bar={self.current_bar}, phase={self.phase})"
+
+
+def _to_builtin(value):
+    """Convert numpy scalars to builtin types for JSON"""
+    if hasattr(value, 'item') and not isinstance(value, (list, dict, str)):
+        try:
+            return value.item()
+        except (ValueError, TypeError):
+            return value
+    return value
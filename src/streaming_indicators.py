@@ -0,0 +1,237 @@
+"""
+Streaming Indicators - One-Bar-at-a-Time Indicator State
+========================================================
+Fixed-size state that advances by one bar per update, so signal
+generators never rebuild DataFrames or recompute full Series:
+
+- BarRing: fixed-capacity structured-array ring buffer of MT5 rate rows
+- StreamingEMA: pandas ``ewm(span=n)`` (adjust=True or False) recurrence
+- StreamingRSI: Wilder RSI (SMA seed, then (avg * (n - 1) + x) / n smoothing)
+- StreamingMACD: fast/slow EMA difference with an EMA signal line
+- RollingStats: rolling mean / sample std (pandas ``rolling(n).std()``) from
+  running sums, resynchronized every window to bound float drift
+- IndicatorSet: the SunriseSignalGenerator indicator bundle, with
+  snapshot()/restore() so the forming bar can be re-applied when it updates
+
+Values read through ``latest()`` are plain floats; indicators that are
+still warming up are omitted.
+"""
+
+import copy
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# MT5 copy_rates_* row layout (subset used by the signal generator)
+BAR_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                      ('close', '<f8'), ('tick_volume', '<u8')])
+
+
+class BarRing:
+    """Fixed-capacity ring of bars; ``ordered()`` returns them oldest first"""
+
+    __slots__ = ('_rows', '_start', '_size')
+
+    def __init__(self, capacity: int, dtype: np.dtype = BAR_DTYPE):
+        self._rows = np.zeros(max(int(capacity), 1), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._rows)
+
+    def _index(self, position: int) -> int:
+        return (self._start + position) % len(self._rows)
+
+    def append(self, row):
+        if self._size < len(self._rows):
+            self._rows[self._index(self._size)] = row
+            self._size += 1
+        else:
+            self._rows[self._start] = row  # Overwrite the oldest bar
+            self._start = (self._start + 1) % len(self._rows)
+
+    def replace_last(self, row):
+        self._rows[self._index(self._size - 1)] = row
+
+    def last(self):
+        return self._rows[self._index(self._size - 1)] if self._size else None
+
+    def ordered(self) -> np.ndarray:
+        if self._size < len(self._rows):
+            return self._rows[:self._size].copy()
+        return np.concatenate([self._rows[self._start:], self._rows[:self._start]])
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class StreamingEMA:
+    """EMA with alpha = 2 / (span + 1); adjust=True matches pandas' default weighting"""
+
+    __slots__ = ('decay', 'adjust', '_numerator', '_denominator', 'value')
+
+    def __init__(self, span: float, adjust: bool = True):
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.adjust = adjust
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self.value = None
+
+    def update(self, x: float) -> float:
+        if self.adjust:
+            self._numerator = x + self.decay * self._numerator
+            self._denominator = 1.0 + self.decay * self._denominator
+            self.value = self._numerator / self._denominator
+        elif self.value is None:
+            self.value = x
+        else:
+            self.value = x + self.decay * (self.value - x)
+        return self.value
+
+
+class StreamingRSI:
+    """Wilder RSI: simple average of the first ``period`` changes, then Wilder smoothing"""
+
+    __slots__ = ('period', '_prev', '_count', '_gain', '_loss', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev = None
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = None
+
+    def update(self, x: float) -> Optional[float]:
+        if self._prev is None:
+            self._prev = x
+            return None
+        change, self._prev = x - self._prev, x
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self._count += 1
+        if self._count <= self.period:
+            self._gain += gain / self.period
+            self._loss += loss / self.period
+            if self._count < self.period:
+                return None
+        else:
+            self._gain = (self._gain * (self.period - 1) + gain) / self.period
+            self._loss = (self._loss * (self.period - 1) + loss) / self.period
+        self.value = 100.0 if self._loss == 0 else 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+        return self.value
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram from streaming EMAs"""
+
+    __slots__ = ('fast', 'slow', 'signal', 'macd', 'histogram')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, adjust: bool = True):
+        self.fast = StreamingEMA(fast, adjust)
+        self.slow = StreamingEMA(slow, adjust)
+        self.signal = StreamingEMA(signal, adjust)
+        self.macd = None
+        self.histogram = None
+
+    def update(self, x: float):
+        self.macd = self.fast.update(x) - self.slow.update(x)
+        self.histogram = self.macd - self.signal.update(self.macd)
+
+
+class RollingStats:
+    """Rolling mean and sample standard deviation over the last ``window`` values"""
+
+    __slots__ = ('window', '_values', '_index', '_count', '_sum', '_sum_sq')
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = np.zeros(window, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, x: float):
+        old = self._values[self._index]
+        self._values[self._index] = x
+        self._index = (self._index + 1) % self.window
+        if self._count < self.window:
+            self._count += 1
+            self._sum += x
+            self._sum_sq += x * x
+        elif self._index == 0:
+            # Full window wrapped: recompute exactly to drop accumulated rounding error
+            self._sum = float(self._values.sum())
+            self._sum_sq = float(np.dot(self._values, self._values))
+        else:
+            self._sum += x - old
+            self._sum_sq += x * x - old * old
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._sum / self.window if self.ready else None
+
+    @property
+    def std(self) -> Optional[float]:
+        if not self.ready or self.window < 2:
+            return None
+        variance = (self._sum_sq - self._sum * self._sum / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class IndicatorSet:
+    """EMA 21/50/100, RSI, MACD, Bollinger bands and volume SMA advanced per bar"""
+
+    __slots__ = ('ema_21', 'ema_50', 'ema_100', 'rsi', 'macd', 'bollinger', 'volume', 'bb_std', 'bars')
+
+    def __init__(self, rsi_period: int = 14, bb_period: int = 20, bb_std: float = 2.0, volume_period: int = 20):
+        self.ema_21 = StreamingEMA(21)
+        self.ema_50 = StreamingEMA(50)
+        self.ema_100 = StreamingEMA(100)
+        self.rsi = StreamingRSI(rsi_period)
+        self.macd = StreamingMACD()
+        self.bollinger = RollingStats(bb_period)
+        self.volume = RollingStats(volume_period)
+        self.bb_std = bb_std
+        self.bars = 0
+
+    def update(self, close: float, volume: Optional[float] = None):
+        self.ema_21.update(close)
+        self.ema_50.update(close)
+        self.ema_100.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        if volume is not None:
+            self.volume.update(volume)
+        self.bars += 1
+
+    def snapshot(self) -> 'IndicatorSet':
+        return copy.deepcopy(self)
+
+    def latest(self) -> Dict[str, float]:
+        """Latest scalar per indicator (same keys as calculate_indicators)"""
+        if not self.bars:
+            return {}
+        values = {'ema_21': self.ema_21.value, 'ema_50': self.ema_50.value, 'ema_100': self.ema_100.value,
+                  'macd': self.macd.macd, 'macd_signal': self.macd.signal.value,
+                  'macd_histogram': self.macd.histogram}
+        if self.rsi.value is not None:
+            values['rsi'] = self.rsi.value
+        if self.bollinger.ready:
+            middle, spread = self.bollinger.mean, self.bollinger.std * self.bb_std
+            values.update(bb_upper=middle + spread, bb_lower=middle - spread, bb_middle=middle)
+        if self.volume.ready:
+            values['volume_sma'] = self.volume.mean
+        return values
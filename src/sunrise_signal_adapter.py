@@ -10,55 +10,46 @@ Current Phase: Strategy Signal Processing
 Next Phase: Order Management and Risk Control
 """
 
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import MetaTrader5 as mt5
 from typing import Dict, Optional, Tuple, List
 import logging
 from pathlib import Path
 import sys
-import json
+import time
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # Signal generation runs offline; only MT5DataProvider needs the terminal
+    mt5 = None
+
+try:
+    from src.streaming_indicators import BAR_DTYPE, BarRing, IndicatorSet
+    from src.mt5_rates_cache import shared_rates_cache
+    from src.mt5_terminal_guard import shared_terminal
+except ImportError:  # Loaded with src/ itself on sys.path
+    from streaming_indicators import BAR_DTYPE, BarRing, IndicatorSet
+    from mt5_rates_cache import shared_rates_cache
+    from mt5_terminal_guard import shared_terminal
+
+# Same recorder / replayer and terminal lock as the monitor and the connector
+mt5 = shared_terminal(mt5)
 
-# Add strategies directory to path
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = BASE_DIR.parent
 
-# Path to local strategies (completely independent from quant_bot_project)
+# Local strategies package (completely independent from quant_bot_project)
 LOCAL_STRATEGIES_DIR = PROJECT_ROOT / "strategies"
 
-# Add local strategies directory to Python path
-sys.path.insert(0, str(LOCAL_STRATEGIES_DIR))
-
-# Import our existing strategies from local strategies folder
-# Verify path exists before importing
 if not LOCAL_STRATEGIES_DIR.exists():
     print(f"Warning: Local strategies directory not found: {LOCAL_STRATEGIES_DIR}")
     print("Please ensure strategies are copied to the local strategies folder")
 
-# Import strategies with individual error handling using dynamic imports
-strategy_classes = {}
-strategies_to_import = [
-    ('sunrise_ogle_eurusd', 'SunriseOgle', 'EURUSD'),
-    ('sunrise_ogle_gbpusd', 'SunriseOgle', 'GBPUSD'),
-    ('sunrise_ogle_xauusd', 'SunriseOgle', 'XAUUSD'),
-    ('sunrise_ogle_audusd', 'SunriseOgle', 'AUDUSD'),
-    ('sunrise_ogle_xagusd', 'SunriseOgle', 'XAGUSD'),
-    ('sunrise_ogle_usdchf', 'SunriseOgle', 'USDCHF')
-]
-
-for module_name, class_name, symbol in strategies_to_import:
-    try:
-        module = __import__(module_name)
-        strategy_class = getattr(module, class_name)
-        strategy_classes[symbol] = strategy_class
-        print(f"✅ {symbol}: Strategy class imported successfully")
-    except ImportError as e:
-        print(f"⚠️  {symbol}: Could not import strategy from {module_name}: {e}")
-    except AttributeError as e:
-        print(f"⚠️  {symbol}: Could not find class {class_name} in {module_name}: {e}")
-    except Exception as e:
-        print(f"❌ {symbol}: Unexpected error importing strategy: {e}")
+# Lazy strategy registry: membership and parameter sets come from the strategy
+# sources; a strategy module (and backtrader) is imported only when its class is used
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from strategies import STRATEGY_CLASSES as strategy_classes, get_strategy_params
 
 class SignalType:
     """Signal types for trading operations"""
@@ -110,28 +101,79 @@ class TradingSignal:
         return f"Signal({self.symbol}, {self.signal_type}, conf={self.confidence:.2f})"
 
 class SunriseSignalGenerator:
-    """Generates trading signals from Sunrise strategy logic"""
+    """Generates trading signals from Sunrise strategy logic
+
+    Bars live in a fixed-capacity ring buffer and indicators advance one bar
+    per update. MT5 windows include the forming bar, so the indicator state
+    before the newest bar is kept and re-applied when that bar updates.
+    """
+    
+    MIN_BARS = 50  # Minimum history before indicators/signals are produced
     
-    def __init__(self, symbol: str, strategy_class, logger=None):
+    def __init__(self, symbol: str, strategy_class=None, logger=None, strategy_params: Optional[Dict] = None):
         self.symbol = symbol
-        self.strategy_class = strategy_class
+        self._strategy_class = strategy_class
+        self.strategy_params = strategy_params if strategy_params is not None else get_strategy_params(symbol)
         self.logger = logger or logging.getLogger(__name__)
         self.last_signal = None
-        self.data_buffer = []
         self.buffer_size = 100  # Keep last 100 bars for analysis
-        
+        self.bars = BarRing(self.buffer_size)
+        self.indicators = IndicatorSet()
+        self._before_last = None  # Indicator state before the newest (possibly forming) bar
+    
+    @property
+    def strategy_class(self):
+        """Backtrader class of the symbol's strategy (imported on first access)"""
+        if self._strategy_class is None:
+            self._strategy_class = strategy_classes.get(self.symbol)
+        return self._strategy_class
+    
+    @property
+    def data_buffer(self) -> np.ndarray:
+        """Buffered bars, oldest first (structured array)"""
+        return self.bars.ordered()
+    
+    def _reset(self):
+        self.bars.clear()
+        self.indicators = IndicatorSet()
+        self._before_last = None
+    
+    @staticmethod
+    def _bar_row(rate) -> tuple:
+        return tuple(rate[name] for name in BAR_DTYPE.names)
+    
     def update_data(self, rates: np.ndarray):
-        """Update market data for signal generation"""
+        """Update market data for signal generation (only bars not seen yet are processed)"""
         try:
-            # Convert MT5 rates to pandas DataFrame
-            df = pd.DataFrame(rates)
-            df['datetime'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('datetime', inplace=True)
-            
-            # Update buffer
-            self.data_buffer = df.tail(self.buffer_size).copy()
-            
-            self.logger.debug(f"Updated data buffer for {self.symbol}: {len(self.data_buffer)} bars")
+            if rates is None or len(rates) == 0:
+                return True
+            times = rates['time']
+            last = self.bars.last()
+            replace_last = False
+            
+            if last is None or times[-1] < last['time']:
+                # First update, or history rewound (e.g. reconnect to another server): reseed
+                self._reset()
+                start = 0
+            else:
+                start = int(np.searchsorted(times, last['time']))
+                if start < len(rates) and times[start] == last['time']:
+                    # Newest bar seen again (forming bar updated): rewind its indicator update
+                    self.indicators = self._before_last
+                    replace_last = True
+            
+            for index in range(start, len(rates)):
+                rate = rates[index]
+                if index == len(rates) - 1:
+                    self._before_last = self.indicators.snapshot()
+                if replace_last:
+                    self.bars.replace_last(self._bar_row(rate))
+                    replace_last = False
+                else:
+                    self.bars.append(self._bar_row(rate))
+                self.indicators.update(float(rate['close']), float(rate['tick_volume']))
+            
+            self.logger.debug(f"Updated data buffer for {self.symbol}: {len(self.bars)} bars")
             return True
             
         except Exception as e:
@@ -139,73 +181,23 @@ class SunriseSignalGenerator:
             return False
     
     def calculate_indicators(self) -> Dict:
-        """Calculate technical indicators needed for signal generation"""
-        if len(self.data_buffer) < 50:  # Need minimum data
-            return {}
-        
-        try:
-            df = self.data_buffer.copy()
-            indicators = {}
-            
-            # Calculate EMAs (matching Sunrise strategy)
-            indicators['ema_21'] = df['close'].ewm(span=21).mean()
-            indicators['ema_50'] = df['close'].ewm(span=50).mean()
-            indicators['ema_100'] = df['close'].ewm(span=100).mean()
-            
-            # Calculate RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            indicators['rsi'] = 100 - (100 / (1 + rs))
-            
-            # Calculate MACD
-            ema_12 = df['close'].ewm(span=12).mean()
-            ema_26 = df['close'].ewm(span=26).mean()
-            indicators['macd'] = ema_12 - ema_26
-            indicators['macd_signal'] = indicators['macd'].ewm(span=9).mean()
-            indicators['macd_histogram'] = indicators['macd'] - indicators['macd_signal']
-            
-            # Bollinger Bands
-            bb_period = 20
-            bb_std = 2
-            sma_20 = df['close'].rolling(window=bb_period).mean()
-            std_20 = df['close'].rolling(window=bb_period).std()
-            indicators['bb_upper'] = sma_20 + (std_20 * bb_std)
-            indicators['bb_lower'] = sma_20 - (std_20 * bb_std)
-            indicators['bb_middle'] = sma_20
-            
-            # Volume indicators (if available)
-            if 'tick_volume' in df.columns:
-                indicators['volume_sma'] = df['tick_volume'].rolling(window=20).mean()
-            
-            return indicators
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating indicators for {self.symbol}: {e}")
+        """Latest indicator values (scalars); empty until MIN_BARS bars were seen"""
+        if self.indicators.bars < self.MIN_BARS:
             return {}
+        return self.indicators.latest()
     
     def generate_signal(self) -> Optional[TradingSignal]:
         """Generate trading signal based on Sunrise strategy logic"""
         try:
-            if len(self.data_buffer) < 50:
-                return None
-            
-            # Calculate indicators
-            indicators = self.calculate_indicators()
-            if not indicators:
+            latest_indicators = self.calculate_indicators()
+            if not latest_indicators:
                 return None
             
             # Get current market data
-            current_data = self.data_buffer.iloc[-1]
+            current_bar = self.bars.last()
+            current_data = {name: current_bar[name].item() for name in BAR_DTYPE.names}
             current_price = current_data['close']
-            current_time = self.data_buffer.index[-1]
-            
-            # Get latest indicator values
-            latest_indicators = {}
-            for key, series in indicators.items():
-                if len(series) > 0:
-                    latest_indicators[key] = series.iloc[-1]
+            current_time = datetime(1970, 1, 1) + timedelta(seconds=current_data['time'])
             
             # Apply Sunrise strategy logic
             signal = self._apply_sunrise_logic(current_price, latest_indicators, current_data)
@@ -293,23 +285,40 @@ class SunriseSignalGenerator:
             self.logger.error(f"Error applying Sunrise logic for {self.symbol}: {e}")
             return None
 
+def _advance_generator(generator: SunriseSignalGenerator, rates: Optional[np.ndarray]):
+    """Update one generator (when rates given) and evaluate it; runs in executor workers
+
+    Returns the generator itself so process-pool workers can hand back the
+    advanced state (thread pools and serial runs return the same object).
+    """
+    started = time.perf_counter()
+    signal, error = None, None
+    try:
+        if rates is not None:
+            generator.update_data(rates)
+        signal = generator.generate_signal()
+    except Exception as e:
+        error = str(e)
+    return generator, signal, time.perf_counter() - started, error
+
 class MultiSymbolSignalManager:
     """Manages signal generation for multiple symbols"""
     
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(__name__)
         self.signal_generators = {}
-        # Use the dynamically imported strategy classes
+        self.last_timings = {}  # {symbol: seconds} of the latest advance_all / get_signals pass
+        # Lazy registry: one entry per strategies/sunrise_ogle_<symbol>.py
         self.symbol_strategies = strategy_classes
     
     def add_symbol(self, symbol: str):
         """Add symbol for signal generation"""
         try:
             if symbol in self.symbol_strategies:
-                strategy_class = self.symbol_strategies[symbol]
+                # Parameters only - the backtrader class is not imported here
                 self.signal_generators[symbol] = SunriseSignalGenerator(
                     symbol=symbol,
-                    strategy_class=strategy_class,
+                    strategy_params=get_strategy_params(symbol),
                     logger=self.logger
                 )
                 self.logger.info(f"Added signal generator for {symbol}")
@@ -328,20 +337,44 @@ class MultiSymbolSignalManager:
             return self.signal_generators[symbol].update_data(rates)
         return False
     
-    def get_signals(self) -> List[TradingSignal]:
-        """Generate signals for all symbols"""
-        signals = []
-        
-        for symbol, generator in self.signal_generators.items():
-            try:
-                signal = generator.generate_signal()
-                if signal:
-                    signals.append(signal)
-            except Exception as e:
-                self.logger.error(f"Error generating signal for {symbol}: {e}")
+    def advance_all(self, rates_by_symbol: Optional[Dict[str, np.ndarray]] = None,
+                    executor=None) -> List[TradingSignal]:
+        """Update and evaluate every generator in one pass
+
+        Args:
+            rates_by_symbol: {symbol: rates} fetched for this candle (symbols
+                without an entry are evaluated on their buffered bars)
+            executor: optional ThreadPoolExecutor / ProcessPoolExecutor for the
+                per-symbol work; with a process pool the advanced generators are
+                returned by the workers and replace the local ones
+
+        Returns:
+            Signals in symbol registration order (independent of completion
+            order); per-symbol seconds are kept in ``last_timings``.
+        """
+        rates_by_symbol = rates_by_symbol or {}
+        symbols = list(self.signal_generators)
+        jobs = [(self.signal_generators[s], rates_by_symbol.get(s)) for s in symbols]
+        if executor is None:
+            results = [_advance_generator(generator, rates) for generator, rates in jobs]
+        else:
+            results = list(executor.map(_advance_generator, *zip(*jobs))) if jobs else []
         
+        signals = []
+        self.last_timings = {}
+        for symbol, (generator, signal, seconds, error) in zip(symbols, results):
+            self.signal_generators[symbol] = generator
+            self.last_timings[symbol] = seconds
+            if error:
+                self.logger.error(f"Error generating signal for {symbol}: {error}")
+            elif signal:
+                signals.append(signal)
         return signals
     
+    def get_signals(self, executor=None) -> List[TradingSignal]:
+        """Generate signals for all symbols (see advance_all)"""
+        return self.advance_all(None, executor)
+    
     def get_signal(self, symbol: str) -> Optional[TradingSignal]:
         """Generate signal for specific symbol"""
         if symbol in self.signal_generators:
@@ -353,20 +386,31 @@ class MultiSymbolSignalManager:
 # =============================================================
 
 class MT5DataProvider:
-    """Provides real-time data from MT5 for signal generation"""
+    """Provides real-time data from MT5 for signal generation
+
+    Bars come from the process-wide rates cache (shared with the monitor and
+    the connector): repeated requests only fetch the newest bars and return
+    read-only views into the cached arrays.
+    """
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, rates_cache=None):
         self.logger = logger or logging.getLogger(__name__)
         self.connected = False
+        self.rates_cache = rates_cache or shared_rates_cache()
+        self._ticks = {}  # {symbol: (time_msc, tick dict)}
     
     def connect(self) -> bool:
         """Connect to MT5 for data access"""
         try:
+            if mt5 is None:
+                self.logger.error("MetaTrader5 package not installed")
+                return False
             if not mt5.initialize():
                 self.logger.error(f"MT5 initialization failed: {mt5.last_error()}")
                 return False
             
             self.connected = True
+            self.rates_cache.bind(mt5)
             self.logger.info("Connected to MT5 for data access")
             return True
             
@@ -375,12 +419,12 @@ class MT5DataProvider:
             return False
     
     def get_rates(self, symbol: str, timeframe: int, count: int = 100) -> Optional[np.ndarray]:
-        """Get historical rates for symbol"""
+        """Get historical rates for symbol (read-only view, valid until the next fetch)"""
         try:
             if not self.connected:
                 return None
             
-            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+            rates = self.rates_cache.get_rates(symbol, timeframe, count)
             if rates is None:
                 self.logger.warning(f"No rates available for {symbol}")
                 return None
@@ -391,8 +435,22 @@ class MT5DataProvider:
             self.logger.error(f"Error getting rates for {symbol}: {e}")
             return None
     
+    def get_rates_many(self, symbols: List[str], timeframe: int, count: int = 100) -> Dict[str, Optional[np.ndarray]]:
+        """Get rates for several symbols in one call (None for symbols without data)"""
+        if not self.connected:
+            return {symbol: None for symbol in symbols}
+        try:
+            return self.rates_cache.get_rates_many(symbols, timeframe, count)
+        except Exception as e:
+            self.logger.error(f"Error getting rates for {symbols}: {e}")
+            return {symbol: None for symbol in symbols}
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Rates cache hit/miss counters"""
+        return self.rates_cache.stats.to_dict()
+    
     def get_tick(self, symbol: str) -> Optional[Dict]:
-        """Get current tick for symbol"""
+        """Get current tick for symbol (same dict returned while the tick is unchanged)"""
         try:
             if not self.connected:
                 return None
@@ -401,12 +459,19 @@ class MT5DataProvider:
             if tick is None:
                 return None
             
-            return {
+            stamp = getattr(tick, 'time_msc', tick.time)
+            cached = self._ticks.get(symbol)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            
+            values = {
                 'time': tick.time,
                 'bid': tick.bid,
                 'ask': tick.ask,
                 'spread': tick.ask - tick.bid
             }
+            self._ticks[symbol] = (stamp, values)
+            return values
             
         except Exception as e:
             self.logger.error(f"Error getting tick for {symbol}: {e}")
@@ -31,22 +31,32 @@ class TradingSignal:
     def __str__(self) -> str: ...
 
 class SunriseSignalGenerator:
+    MIN_BARS: int
     def __init__(self, symbol: str, strategy_class: Any, logger: Any = None) -> None: ...
+    @property
+    def data_buffer(self) -> np.ndarray: ...
     def update_data(self, rates: np.ndarray) -> bool: ...
-    def calculate_indicators(self) -> Dict: ...
+    def calculate_indicators(self) -> Dict[str, float]: ...
     def generate_signal(self) -> Optional[TradingSignal]: ...
 
 class MultiSymbolSignalManager:
     def __init__(self, logger: Any = None) -> None: ...
     def add_symbol(self, symbol: str) -> bool: ...
+    signal_generators: Dict[str, SunriseSignalGenerator]
+    last_timings: Dict[str, float]
     def update_market_data(self, symbol: str, rates: np.ndarray) -> bool: ...
-    def get_signals(self) -> List[TradingSignal]: ...
+    def advance_all(self, rates_by_symbol: Optional[Dict[str, np.ndarray]] = None,
+                    executor: Any = None) -> List[TradingSignal]: ...
+    def get_signals(self, executor: Any = None) -> List[TradingSignal]: ...
     def get_signal(self, symbol: str) -> Optional[TradingSignal]: ...
 
 class MT5DataProvider:
-    def __init__(self, logger: Any = None) -> None: ...
+    rates_cache: Any
+    def __init__(self, logger: Any = None, rates_cache: Any = None) -> None: ...
     def connect(self) -> bool: ...
     def get_rates(self, symbol: str, timeframe: int, count: int = 100) -> Optional[np.ndarray]: ...
+    def get_rates_many(self, symbols: List[str], timeframe: int, count: int = 100) -> Dict[str, Optional[np.ndarray]]: ...
+    def cache_stats(self) -> Dict[str, int]: ...
     def get_tick(self, symbol: str) -> Optional[Dict]: ...
     def disconnect(self) -> None: ...
 
@@ -0,0 +1,403 @@
+"""
+Symbol Registry - Config-Directory Driven Symbol Universe
+=========================================================
+Replaces the hardcoded 8-asset list with one compact JSON file per symbol
+under ``config/symbols/``. Each file declares the allocation weight and
+where the strategy parameters come from:
+
+    {
+        "symbol": "EURGBP",
+        "enabled": true,
+        "order": 9,
+        "allocation": 0.08,
+        "strategy_file": "strategies/sunrise_ogle_eurgbp.py",
+        "params": {"ema_fast_length": 18, "LONG_PULLBACK_MAX_CANDLES": 2}
+    }
+
+- ``strategy_file`` (optional): backtest-validated source of truth, parsed once.
+- ``params`` (optional): inline parameters, applied on top of the strategy file.
+  A symbol can be added with ``params`` only - no 2-3k line strategy copy needed.
+
+Allocations are normalized so the enabled symbols always sum to 100%.
+
+With a ``cache_file``, params parsed from strategy files are kept on disk
+(keyed by path, mtime and size), so a restart skips the regex scan of
+unchanged files.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+# ==========
+# REGISTRY CONFIGURATION
+# ==========
+SYMBOLS_CONFIG_DIR = os.path.join('config', 'symbols')  # Relative to project root
+SYMBOL_FILE_SUFFIX = '.json'
+PARAM_CACHE_FILE_NAME = 'strategy_params_cache.json'  # Parsed strategy file params (working directory)
+PARAM_CACHE_VERSION = 1  # Bump when parse_strategy_source changes what it extracts
+
+# Strategy parameters read from strategy files / symbol data files.
+# Key: parameter name in strategy file -> Value: display description.
+# Parsed configs store BOTH keys so existing lookups by either name keep working.
+STRATEGY_PARAM_DESCRIPTIONS = {
+    # EMA Parameters - Different per asset
+    'ema_fast_length': 'Fast EMA Period',
+    'ema_medium_length': 'Medium EMA Period',
+    'ema_slow_length': 'Slow EMA Period',
+    'ema_confirm_length': 'Confirmation EMA Period',
+    'ema_filter_price_length': 'Price Filter EMA Period',
+    'ema_exit_length': 'Exit EMA Period',
+
+    # ATR Risk Management
+    'atr_length': 'ATR Period',
+    'long_atr_sl_multiplier': 'Long Stop Loss ATR Multiplier',
+    'long_atr_tp_multiplier': 'Long Take Profit ATR Multiplier',
+
+    # ATR Filters
+    'LONG_USE_ATR_FILTER': 'Use ATR Volatility Filter',
+    'LONG_ATR_MIN_THRESHOLD': 'ATR Min Threshold',
+    'LONG_ATR_MAX_THRESHOLD': 'ATR Max Threshold',
+    'LONG_USE_ATR_INCREMENT_FILTER': 'Use ATR Increment Filter',
+    'LONG_ATR_INCREMENT_MIN_THRESHOLD': 'ATR Increment Min',
+    'LONG_ATR_INCREMENT_MAX_THRESHOLD': 'ATR Increment Max',
+    'LONG_USE_ATR_DECREMENT_FILTER': 'Use ATR Decrement Filter',
+    'LONG_ATR_DECREMENT_MIN_THRESHOLD': 'ATR Decrement Min',
+    'LONG_ATR_DECREMENT_MAX_THRESHOLD': 'ATR Decrement Max',
+
+    # Entry Filters
+    'LONG_USE_EMA_ORDER_CONDITION': 'Use EMA Order Condition',
+    'LONG_USE_PRICE_FILTER_EMA': 'Use Price Filter EMA',
+    'LONG_USE_CANDLE_DIRECTION_FILTER': 'Use Candle Direction Filter',
+    'LONG_USE_ANGLE_FILTER': 'Use EMA Angle Filter',
+    'LONG_MIN_ANGLE': 'Min EMA Angle (degrees)',
+    'LONG_MAX_ANGLE': 'Max EMA Angle (degrees)',
+    'LONG_ANGLE_SCALE_FACTOR': 'Angle Scale Factor',
+    'LONG_USE_EMA_BELOW_PRICE_FILTER': 'Use EMA Below Price Filter',
+
+    # SHORT ATR Filters
+    'SHORT_USE_ATR_FILTER': 'Short Use ATR Volatility Filter',
+    'SHORT_ATR_MIN_THRESHOLD': 'Short ATR Min Threshold',
+    'SHORT_ATR_MAX_THRESHOLD': 'Short ATR Max Threshold',
+    'SHORT_USE_ATR_INCREMENT_FILTER': 'Short Use ATR Increment Filter',
+    'SHORT_ATR_INCREMENT_MIN_THRESHOLD': 'Short ATR Increment Min',
+    'SHORT_ATR_INCREMENT_MAX_THRESHOLD': 'Short ATR Increment Max',
+    'SHORT_USE_ATR_DECREMENT_FILTER': 'Short Use ATR Decrement Filter',
+    'SHORT_ATR_DECREMENT_MIN_THRESHOLD': 'Short ATR Decrement Min',
+    'SHORT_ATR_DECREMENT_MAX_THRESHOLD': 'Short ATR Decrement Max',
+
+    # SHORT Entry Filters
+    'SHORT_USE_EMA_ORDER_CONDITION': 'Short Use EMA Order Condition',
+    'SHORT_USE_PRICE_FILTER_EMA': 'Short Use Price Filter EMA',
+    'SHORT_USE_CANDLE_DIRECTION_FILTER': 'Short Use Candle Direction Filter',
+    'SHORT_USE_ANGLE_FILTER': 'Short Use EMA Angle Filter',
+    'SHORT_MIN_ANGLE': 'Short Min EMA Angle (degrees)',
+    'SHORT_MAX_ANGLE': 'Short Max EMA Angle (degrees)',
+    'SHORT_ANGLE_SCALE_FACTOR': 'Short Angle Scale Factor',
+    'SHORT_USE_EMA_ABOVE_PRICE_FILTER': 'Short Use EMA Above Price Filter',
+
+    # Pullback Entry System
+    'LONG_USE_PULLBACK_ENTRY': 'Use Pullback Entry System',
+    'LONG_PULLBACK_MAX_CANDLES': 'Max Pullback Candles',
+    'LONG_ENTRY_WINDOW_PERIODS': 'Entry Window Periods',
+    'SHORT_USE_PULLBACK_ENTRY': 'Short Use Pullback Entry System',
+    'SHORT_PULLBACK_MAX_CANDLES': 'Short Max Pullback Candles',
+    'SHORT_ENTRY_WINDOW_PERIODS': 'Short Entry Window Periods',
+
+    'WINDOW_OFFSET_MULTIPLIER': 'Window Offset Multiplier',
+    'USE_WINDOW_TIME_OFFSET': 'Use Window Time Offset',
+    'WINDOW_PRICE_OFFSET_MULTIPLIER': 'Window Price Offset',
+
+    # Time Range Filter
+    'USE_TIME_RANGE_FILTER': 'Use Time Range Filter',
+    'ENTRY_START_HOUR': 'Entry Start Hour (UTC)',
+    'ENTRY_START_MINUTE': 'Entry Start Minute',
+    'ENTRY_END_HOUR': 'Entry End Hour (UTC)',
+    'ENTRY_END_MINUTE': 'Entry End Minute',
+
+    # Trading Direction
+    'ENABLE_LONG_TRADES': 'Enable Long Trades',
+    'ENABLE_SHORT_TRADES': 'Enable Short Trades',
+
+    # Position Sizing
+    'enable_risk_sizing': 'Enable Risk Sizing',
+    'risk_percent': 'Risk Percentage per Trade',
+}
+
+
+def _read_text(file_path: str) -> str:
+    """Read a text file, falling back to latin-1 for legacy encodings"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except UnicodeDecodeError:
+        with open(file_path, 'r', encoding='latin-1') as f:
+            return f.read()
+
+
+def parse_strategy_source(content: str) -> Dict[str, str]:
+    """Extract known strategy parameters from strategy file source
+
+    Matches both ``param = value`` (module level) and ``param=value,``
+    (inside the backtrader params dict). First non-comment match wins.
+
+    Returns:
+        dict: {param_name: value_string}
+    """
+    params = {}
+    lines = content.split('\n')
+
+    for param in STRATEGY_PARAM_DESCRIPTIONS:
+        for line in lines:
+            if (f"{param} =" in line or f"{param}=" in line) and not line.strip().startswith('#'):
+                try:
+                    value_part = line.split('=')[1].split('#')[0].split(',')[0].strip()
+                    # Clean up the value (remove quotes, trailing commas)
+                    if value_part.endswith(','):
+                        value_part = value_part[:-1].strip()
+                    if value_part.startswith('"') and value_part.endswith('"'):
+                        value_part = value_part[1:-1]
+                    elif value_part.startswith("'") and value_part.endswith("'"):
+                        value_part = value_part[1:-1]
+                    params[param] = value_part
+                    break
+                except Exception:
+                    continue
+
+    return params
+
+
+def expand_param_descriptions(params: Dict[str, str]) -> Dict[str, str]:
+    """Return config dict keyed by BOTH parameter name and display description"""
+    config = {}
+    for param, value in params.items():
+        description = STRATEGY_PARAM_DESCRIPTIONS.get(param)
+        if description:
+            config[description] = value
+        config[param] = value
+    return config
+
+
+def normalize_allocations(weights: Dict[str, float]) -> Dict[str, float]:
+    """Scale allocation weights so they sum to 1.0
+
+    Non-positive weights are dropped. If nothing is left the result is empty.
+    """
+    positive = {symbol: float(weight) for symbol, weight in weights.items() if weight and float(weight) > 0}
+    total = sum(positive.values())
+    if total <= 0:
+        return {}
+    return {symbol: weight / total for symbol, weight in positive.items()}
+
+
+class SymbolEntry:
+    """One symbol declared in the registry"""
+
+    __slots__ = ('symbol', 'enabled', 'order', 'weight', 'strategy_file', 'params', 'source')
+
+    def __init__(self, symbol: str, enabled: bool = True, order: int = 0, weight: float = 0.0,
+                 strategy_file: Optional[str] = None, params: Optional[Dict] = None, source: str = ''):
+        self.symbol = symbol
+        self.enabled = enabled
+        self.order = order
+        self.weight = weight
+        self.strategy_file = strategy_file
+        self.params = params or {}
+        self.source = source
+
+    def __repr__(self):
+        return f"SymbolEntry({self.symbol}, weight={self.weight}, enabled={self.enabled})"
+
+
+class SymbolRegistry:
+    """Symbol universe loaded from ``config/symbols/*.json``
+
+    Falls back to ``default_allocations`` (symbol -> weight) with the standard
+    ``strategies/sunrise_ogle_<symbol>.py`` layout when the directory is missing,
+    so existing installs keep working unchanged.
+    """
+
+    def __init__(self, project_root: str, config_dir: Optional[str] = None,
+                 default_allocations: Optional[Dict[str, float]] = None,
+                 logger: Optional[logging.Logger] = None, cache_file: Optional[str] = None):
+        self.project_root = project_root
+        self.config_dir = config_dir or os.path.join(project_root, SYMBOLS_CONFIG_DIR)
+        self.default_allocations = dict(default_allocations or {})
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache_file = cache_file
+        self.entries: Dict[str, SymbolEntry] = {}
+        self._param_cache: Dict[str, Dict[str, str]] = {}
+        self._file_cache: Optional[Dict[str, Dict]] = None  # {abs path: {'stamp': [mtime_ns, size], 'params'}}
+        self._file_cache_dirty = False
+
+    def load(self) -> Dict[str, SymbolEntry]:
+        """(Re)load symbol entries from the config directory"""
+        self.entries = {}
+        self._param_cache = {}
+
+        if os.path.isdir(self.config_dir):
+            for file_name in sorted(os.listdir(self.config_dir)):
+                if not file_name.endswith(SYMBOL_FILE_SUFFIX):
+                    continue
+                file_path = os.path.join(self.config_dir, file_name)
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    entry = self._entry_from_data(data, file_path)
+                    self.entries[entry.symbol] = entry
+                except Exception as e:
+                    self.logger.error(f"Invalid symbol file {file_path}: {e}")
+
+        if not self.entries:
+            for order, (symbol, weight) in enumerate(self.default_allocations.items()):
+                self.entries[symbol] = SymbolEntry(
+                    symbol=symbol,
+                    order=order,
+                    weight=weight,
+                    strategy_file=self._default_strategy_file(symbol),
+                    source='defaults',
+                )
+
+        return self.entries
+
+    def _entry_from_data(self, data: Dict, file_path: str) -> SymbolEntry:
+        """Build a SymbolEntry from one parsed JSON file"""
+        symbol = str(data.get('symbol') or os.path.splitext(os.path.basename(file_path))[0]).upper()
+        params = {key: str(value) for key, value in (data.get('params') or {}).items()}
+        return SymbolEntry(
+            symbol=symbol,
+            enabled=bool(data.get('enabled', True)),
+            order=int(data.get('order', 0)),
+            weight=float(data.get('allocation', 0.0)),
+            strategy_file=data.get('strategy_file'),
+            params=params,
+            source=file_path,
+        )
+
+    def _default_strategy_file(self, symbol: str) -> str:
+        return os.path.join('strategies', f"sunrise_ogle_{symbol.lower()}.py")
+
+    def symbols(self) -> List[str]:
+        """Enabled symbols, sorted by declared order then name"""
+        if not self.entries:
+            self.load()
+        enabled = [entry for entry in self.entries.values() if entry.enabled]
+        return [entry.symbol for entry in sorted(enabled, key=lambda e: (e.order, e.symbol))]
+
+    def allocations(self) -> Dict[str, float]:
+        """Normalized allocation fraction per enabled symbol (sums to 1.0)"""
+        if not self.entries:
+            self.load()
+        return normalize_allocations({
+            entry.symbol: entry.weight for entry in self.entries.values() if entry.enabled
+        })
+
+    def strategy_path(self, symbol: str) -> Optional[str]:
+        """Absolute path to the symbol's strategy file (None if params-only)"""
+        entry = self.entries.get(symbol)
+        if entry is None or not entry.strategy_file:
+            return None
+        if os.path.isabs(entry.strategy_file):
+            return entry.strategy_file
+        return os.path.join(self.project_root, entry.strategy_file)
+
+    def load_params(self, symbol: str, strategy_path: Optional[str] = None) -> Dict[str, str]:
+        """Strategy file params overlaid with inline ``params`` for a symbol
+
+        Strategy files are parsed once per registry load and cached.
+
+        Raises:
+            FileNotFoundError: strategy file declared but missing and no inline params
+        """
+        if symbol in self._param_cache:
+            return dict(self._param_cache[symbol])
+
+        entry = self.entries.get(symbol)
+        inline_params = entry.params if entry else {}
+        strategy_path = strategy_path or self.strategy_path(symbol)
+
+        params: Dict[str, str] = {}
+        if strategy_path:
+            if os.path.exists(strategy_path):
+                params = self._parse_strategy_file(strategy_path)
+            elif not inline_params:
+                raise FileNotFoundError(f"Strategy file not found: {strategy_path}")
+
+        params.update(inline_params)
+        self._param_cache[symbol] = params
+        return dict(params)
+
+    def invalidate(self, symbol: str, reparse: bool = False):
+        """Drop cached params so the next load re-reads the strategy file
+
+        Args:
+            reparse: also forget the loaded on-disk entry of the symbol's
+                strategy file, so the next load parses it even when unchanged
+        """
+        self._param_cache.pop(symbol, None)
+        strategy_path = self.strategy_path(symbol) if reparse and self.cache_file is not None else None
+        if strategy_path:
+            if self._file_cache is None:
+                self._file_cache = self._read_file_cache()
+            self._file_cache.pop(os.path.abspath(strategy_path), None)
+
+    # ==========
+    # ON-DISK PARAM CACHE
+    # ==========
+    def _parse_strategy_file(self, strategy_path: str) -> Dict[str, str]:
+        """Params of one strategy file, from the on-disk cache while the file is unchanged"""
+        if self.cache_file is None:
+            return parse_strategy_source(_read_text(strategy_path))
+
+        if self._file_cache is None:
+            self._file_cache = self._read_file_cache()
+        key = os.path.abspath(strategy_path)
+        stat = os.stat(key)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cached = self._file_cache.get(key)
+        if cached is not None and cached.get('stamp') == stamp:
+            return dict(cached['params'])
+
+        params = parse_strategy_source(_read_text(strategy_path))
+        self._file_cache[key] = {'stamp': stamp, 'params': params}
+        self._file_cache_dirty = True
+        return dict(params)
+
+    def _read_file_cache(self) -> Dict[str, Dict]:
+        """Cached entries, or empty when missing, unreadable or written for another parser"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable param cache {self.cache_file}: {e}")
+            return {}
+        if payload.get('version') != PARAM_CACHE_VERSION or payload.get('param_names') != list(STRATEGY_PARAM_DESCRIPTIONS):
+            return {}
+        return payload.get('files', {})
+
+    def save_cache(self) -> bool:
+        """Write the on-disk param cache if a strategy file was parsed since it was read"""
+        if self.cache_file is None or not self._file_cache_dirty:
+            return False
+        payload = {
+            'version': PARAM_CACHE_VERSION,
+            'param_names': list(STRATEGY_PARAM_DESCRIPTIONS),
+            'files': self._file_cache,
+        }
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(temp_path, self.cache_file)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.logger.warning(f"Could not write param cache {self.cache_file}: {e}")
+            return False
+        self._file_cache_dirty = False
+        return True
@@ -0,0 +1,281 @@
+"""
+Symbol Spec Cache - Cached MT5 symbol_info with TTLs and Change Detection
+=========================================================================
+One cache of symbol specifications shared by the live monitor, the trading
+connector and the risk gate, instead of an ``mt5.symbol_info()`` round-trip
+at every config load, sizing step and filling-mode lookup:
+
+- Static fields (digits, point, tick size, contract size, volume limits,
+  filling mode) are re-read only after ``static_ttl`` seconds
+- Tick values of cross-currency symbols (profit currency != account
+  currency, e.g. USDJPY or EURGBP on a USD account) move with the exchange
+  rate and are re-read after the short ``tick_value_ttl``
+- Every re-read is diffed against the cached spec: tick-value moves are
+  counted, static-field changes (broker spec changes) are logged as warnings
+- ``refresh()`` on reconnect re-reads every cached symbol from the
+  (possibly different) server; when the terminal is unavailable the last
+  known spec is served
+- ``save()`` / ``load()`` persist a JSON snapshot, so sizing tests can run
+  offline against real broker specs
+
+Usage:
+    specs = shared_symbol_specs()
+    specs.bind(mt5, account_currency=mt5.account_info().currency)
+    spec = specs.get('EURUSD')               # symbol_info-like object or None
+    MarketSnapshot.capture(mt5, symbols, spec_fn=specs.get)
+    specs.save('config/symbol_specs.json')   # offline: SymbolSpecCache.from_snapshot(path)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# ==========
+# CACHE CONFIGURATION
+# ==========
+DEFAULT_STATIC_TTL = 6 * 3600.0   # Broker spec changes are rare
+DEFAULT_TICK_VALUE_TTL = 60.0     # Cross-currency tick values follow the exchange rate
+
+STATIC_FIELDS = ('digits', 'point', 'trade_tick_size', 'trade_contract_size', 'volume_min', 'volume_max',
+                 'volume_step', 'filling_mode', 'currency_base', 'currency_profit', 'currency_margin')
+TICK_VALUE_FIELDS = ('trade_tick_value', 'trade_tick_value_profit', 'trade_tick_value_loss')
+
+
+class SymbolSpec:
+    """The cached subset of MT5 SymbolInfo (attribute-compatible with it)"""
+
+    __slots__ = ('name', 'visible') + STATIC_FIELDS + TICK_VALUE_FIELDS + ('fetched_at',)
+
+    def __init__(self, name: str, fetched_at: Optional[float] = None, visible: bool = True, **fields):
+        self.name = name
+        self.visible = visible
+        for field in STATIC_FIELDS + TICK_VALUE_FIELDS:
+            setattr(self, field, fields.get(field))
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    @classmethod
+    def from_symbol_info(cls, info, name: Optional[str] = None) -> 'SymbolSpec':
+        fields = {field: getattr(info, field, None) for field in STATIC_FIELDS + TICK_VALUE_FIELDS}
+        return cls(name or getattr(info, 'name', ''), visible=bool(getattr(info, 'visible', True)), **fields)
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SymbolSpec':
+        data = dict(data)
+        return cls(data.pop('name'), fetched_at=data.pop('fetched_at', None), visible=data.pop('visible', True),
+                   **data)
+
+    def changed_fields(self, other: 'SymbolSpec', fields: Iterable[str]) -> List[str]:
+        return [field for field in fields if getattr(self, field) != getattr(other, field)]
+
+    def __repr__(self):
+        return f"SymbolSpec({self.name}, digits={self.digits}, tick_value={self.trade_tick_value})"
+
+
+class SpecStats:
+    """Counters for cache effectiveness and spec changes"""
+
+    __slots__ = ('hits', 'misses', 'refreshes', 'tick_value_changes', 'static_changes', 'stale_served')
+
+    def __init__(self):
+        self.hits = 0                # Served from the cache without a terminal call
+        self.misses = 0              # First lookup of a symbol (or after invalidation)
+        self.refreshes = 0           # Re-reads of an expired entry
+        self.tick_value_changes = 0  # Re-reads where a tick value moved
+        self.static_changes = 0      # Re-reads where a static field changed (broker spec change)
+        self.stale_served = 0        # Expired entries returned because the terminal was unavailable
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Entry:
+    __slots__ = ('spec', 'checked_at')
+
+    def __init__(self, spec: SymbolSpec, checked_at: float):
+        self.spec = spec
+        self.checked_at = checked_at
+
+
+class SymbolSpecCache:
+    """Per-symbol specs with a long static TTL and a short cross-currency tick-value TTL
+
+    Args:
+        terminal: MetaTrader5 module (or a compatible stub); None = offline, entries never expire
+        static_ttl: seconds before a same-currency symbol is re-read
+        tick_value_ttl: seconds before a cross-currency symbol is re-read
+        account_currency: deposit currency; None = looked up from account_info() on first use
+        clock: monotonic clock for expiry (tests inject a fake)
+    """
+
+    def __init__(self, terminal=None, static_ttl: float = DEFAULT_STATIC_TTL,
+                 tick_value_ttl: float = DEFAULT_TICK_VALUE_TTL, account_currency: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic, logger: Optional[logging.Logger] = None):
+        self.static_ttl = static_ttl
+        self.tick_value_ttl = tick_value_ttl
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = SpecStats()
+        self.terminal = None
+        self.account_currency = None
+        self._entries: Dict[str, _Entry] = {}
+        if terminal is not None:
+            self.bind(terminal, account_currency)
+        else:
+            self.account_currency = account_currency
+
+    def bind(self, terminal, account_currency: Optional[str] = None):
+        """Attach a terminal; a different terminal or account currency drops every entry
+
+        The first terminal (and the first known currency) keeps the entries, so
+        specs loaded from a snapshot before the terminal answered are still
+        served and re-read when they expire.
+        """
+        replaced = self.terminal is not None and terminal is not self.terminal
+        changed = (account_currency is not None and self.account_currency is not None
+                   and account_currency != self.account_currency)
+        if replaced or changed:
+            self.account_currency = None
+            self.clear()
+        self.terminal = terminal
+        if account_currency is not None:
+            self.account_currency = account_currency
+
+    def clear(self):
+        self._entries.clear()
+
+    def invalidate(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self.clear()
+        else:
+            self._entries.pop(symbol, None)
+
+    def _deposit_currency(self) -> Optional[str]:
+        if self.account_currency is None and self.terminal is not None:
+            try:
+                account = self.terminal.account_info()
+            except Exception:
+                account = None
+            self.account_currency = getattr(account, 'currency', None) if account is not None else None
+        return self.account_currency
+
+    def is_cross_currency(self, spec: SymbolSpec) -> bool:
+        """True when the tick value depends on an exchange rate (unknown currencies count as cross)"""
+        currency = self._deposit_currency()
+        return currency is None or spec.currency_profit is None or spec.currency_profit != currency
+
+    def ttl(self, spec: SymbolSpec) -> float:
+        return self.tick_value_ttl if self.is_cross_currency(spec) else self.static_ttl
+
+    def _fetch(self, symbol: str) -> Optional[SymbolSpec]:
+        try:
+            info = self.terminal.symbol_info(symbol)
+        except Exception as e:
+            self.logger.error(f"{symbol}: symbol_info failed: {e}")
+            return None
+        return SymbolSpec.from_symbol_info(info, symbol) if info is not None else None
+
+    def _detect_changes(self, old: SymbolSpec, new: SymbolSpec):
+        static = old.changed_fields(new, STATIC_FIELDS)
+        if static:
+            self.stats.static_changes += 1
+            details = ', '.join(f"{f} {getattr(old, f)} -> {getattr(new, f)}" for f in static)
+            self.logger.warning(f"{new.name}: broker symbol spec changed: {details}")
+        if old.changed_fields(new, TICK_VALUE_FIELDS):
+            self.stats.tick_value_changes += 1
+            self.logger.debug(f"{new.name}: tick value {old.trade_tick_value} -> {new.trade_tick_value}")
+
+    def get(self, symbol: str) -> Optional[SymbolSpec]:
+        """Cached spec, re-read when its TTL has expired; None if the symbol is unknown"""
+        now = self.clock()
+        entry = self._entries.get(symbol)
+        if entry is not None and (self.terminal is None or now - entry.checked_at < self.ttl(entry.spec)):
+            self.stats.hits += 1
+            return entry.spec
+        if self.terminal is None:
+            return None
+        spec = self._fetch(symbol)
+        if spec is None:
+            if entry is not None:
+                self.stats.stale_served += 1
+                return entry.spec  # Keep trading on the last known spec during a terminal hiccup
+            return None
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            self.stats.refreshes += 1
+            self._detect_changes(entry.spec, spec)
+        self._entries[symbol] = _Entry(spec, now)
+        return spec
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Optional[SymbolSpec]]:
+        return {symbol: self.get(symbol) for symbol in dict.fromkeys(symbols)}
+
+    def refresh(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Optional[SymbolSpec]]:
+        """Force a re-read (with change detection) of the given or all cached symbols"""
+        symbols = list(self._entries) if symbols is None else list(symbols)
+        for symbol in symbols:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                entry.checked_at = float('-inf')
+        return self.get_many(symbols)
+
+    def specs(self) -> Dict[str, SymbolSpec]:
+        return {symbol: entry.spec for symbol, entry in self._entries.items()}
+
+    # ==========
+    # SNAPSHOT PERSISTENCE
+    # ==========
+    def save(self, path: str):
+        """Write every cached spec to a JSON snapshot (atomic replace)"""
+        payload = {
+            'saved_at': datetime.now().isoformat(),
+            'account_currency': self._deposit_currency(),
+            'specs': {symbol: spec.to_dict() for symbol, spec in self.specs().items()},
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, path: str) -> int:
+        """Add the specs of a JSON snapshot; returns the number of symbols loaded"""
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if self.account_currency is None:
+            self.account_currency = payload.get('account_currency')
+        now = self.clock()
+        for symbol, data in payload.get('specs', {}).items():
+            self._entries[symbol] = _Entry(SymbolSpec.from_dict(data), now)
+        return len(payload.get('specs', {}))
+
+    @classmethod
+    def from_snapshot(cls, path: str, **kwargs) -> 'SymbolSpecCache':
+        """Offline cache (no terminal) serving the specs of a saved snapshot"""
+        cache = cls(**kwargs)
+        cache.load(path)
+        return cache
+
+
+_SHARED_CACHE: Optional[SymbolSpecCache] = None
+
+
+def shared_symbol_specs() -> SymbolSpecCache:
+    """Process-wide cache used by the monitor, the connector and the risk gate"""
+    global _SHARED_CACHE
+    if _SHARED_CACHE is None:
+        _SHARED_CACHE = SymbolSpecCache()
+    return _SHARED_CACHE
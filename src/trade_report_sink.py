@@ -0,0 +1,232 @@
+"""
+Trade Report Sink - Buffered Backtest Trade Records
+===================================================
+Collects typed trade rows in memory during a backtest and writes every
+report once at the end of the run, instead of writing and flushing
+multi-line text to ``temp_reports/*_trades_*.txt`` on every trade:
+
+- ``record_entry()`` / ``record_exit()`` only append to slotted TradeRecord rows
+- ``close()`` writes the human-readable report (same ENTRY / EXIT / SUMMARY
+  layout as the sunrise_ogle_*.py reports, readable by live_replay) and a
+  CSV or Parquet table of the rows
+- ``debug()`` formats lazily and costs one attribute check when verbose_debug is off
+
+Usage:
+    sink = TradeRecordSink('EURUSD', header_lines=[...], formats=('csv',))
+    sink.record_entry(dt, 'LONG', price, stop, take, atr)
+    sink.record_exit(dt, exit_price, pnl, 'TP')
+    paths = sink.close()
+"""
+
+import csv
+import io
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# ==========
+# REPORT CONFIGURATION
+# ==========
+DEFAULT_REPORT_DIR = 'temp_reports'
+DEFAULT_PIP_SIZE = 0.0001
+BAR_MINUTES = 5
+SUPPORTED_FORMATS = ('txt', 'csv', 'parquet')
+
+RECORD_FIELDS = (
+    'entry_time', 'direction', 'entry_price', 'stop_level', 'take_level', 'current_atr',
+    'atr_change', 'current_angle', 'periods_before_entry', 'pullback_state',
+    'exit_time', 'exit_price', 'pnl', 'pips', 'exit_reason', 'duration_minutes', 'duration_bars',
+)
+
+
+class TradeRecord:
+    """One trade: entry fields set at entry, exit fields filled at exit"""
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, entry_time: datetime, direction: str, entry_price: Optional[float] = None,
+                 stop_level: Optional[float] = None, take_level: Optional[float] = None,
+                 current_atr: float = 0.0, atr_change: Optional[float] = None, current_angle: float = 0.0,
+                 periods_before_entry: int = 0, pullback_state: str = 'NORMAL'):
+        self.entry_time = entry_time
+        self.direction = direction
+        self.entry_price = entry_price
+        self.stop_level = stop_level
+        self.take_level = take_level
+        self.current_atr = current_atr
+        self.atr_change = atr_change
+        self.current_angle = current_angle
+        self.periods_before_entry = periods_before_entry
+        self.pullback_state = pullback_state
+        self.exit_time = None
+        self.exit_price = None
+        self.pnl = None
+        self.pips = 0.0
+        self.exit_reason = None
+        self.duration_minutes = 0.0
+        self.duration_bars = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.exit_time is not None
+
+    def to_dict(self) -> Dict:
+        """Same keys as SunriseOgle.trade_reports entries"""
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+
+class TradeRecordSink:
+    """In-memory trade rows written to text + table files once per run
+
+    Args:
+        asset: symbol name used in file names and the report header
+        report_dir: output directory (created on close)
+        formats: any of 'txt', 'csv', 'parquet' ('parquet' needs pyarrow / fastparquet,
+            falls back to CSV when unavailable)
+        header_lines: configuration lines printed above TRADE DETAILS in the text report
+        verbose_debug: enables debug() output
+        pip_size: pip value for the pips column
+    """
+
+    def __init__(self, asset: str, report_dir: str = DEFAULT_REPORT_DIR, formats: Iterable[str] = ('txt', 'csv'),
+                 header_lines: Optional[List[str]] = None, verbose_debug: bool = False,
+                 pip_size: float = DEFAULT_PIP_SIZE, logger: Optional[logging.Logger] = None):
+        self.asset = asset
+        self.report_dir = report_dir
+        self.formats = tuple(formats)
+        unknown = set(self.formats) - set(SUPPORTED_FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported trade report formats: {sorted(unknown)}")
+        self.header_lines = list(header_lines or [])
+        self.verbose_debug = verbose_debug
+        self.pip_size = pip_size
+        self.logger = logger or logging.getLogger(__name__)
+        self.records: List[TradeRecord] = []
+        self.started = datetime.now()
+        self.closed = False
+
+    # ----- recording (hot path: no I/O) -----
+
+    def debug(self, message: str, *args):
+        """Print a %-style debug message; arguments are only formatted when verbose_debug is on"""
+        if self.verbose_debug:
+            print("DEBUG: " + (message % args if args else message))
+
+    def record_entry(self, entry_time: datetime, direction: str, entry_price: Optional[float] = None,
+                     stop_level: Optional[float] = None, take_level: Optional[float] = None,
+                     current_atr: float = 0.0, **fields) -> TradeRecord:
+        record = TradeRecord(entry_time, direction, entry_price, stop_level, take_level, current_atr, **fields)
+        self.records.append(record)
+        return record
+
+    def record_exit(self, exit_time: datetime, exit_price: float, pnl: float, exit_reason: str) -> Optional[TradeRecord]:
+        """Complete the most recent open trade; returns None when no trade is open"""
+        if not self.records or self.records[-1].closed:
+            return None
+        record = self.records[-1]
+        entry_price = record.entry_price
+        if entry_price is None and record.stop_level is not None and record.take_level is not None:
+            entry_price = (record.stop_level + record.take_level) / 2  # Strategy report estimate
+        if entry_price and exit_price:
+            move = exit_price - entry_price if record.direction == 'LONG' else entry_price - exit_price
+            record.pips = move / self.pip_size
+        record.duration_minutes = (exit_time - record.entry_time).total_seconds() / 60
+        record.duration_bars = int(record.duration_minutes / BAR_MINUTES)
+        record.exit_time, record.exit_price, record.pnl, record.exit_reason = exit_time, exit_price, pnl, exit_reason
+        return record
+
+    def trade_reports(self) -> List[Dict]:
+        """Rows as SunriseOgle.trade_reports dicts (e.g. for BacktestResult.from_trade_reports)"""
+        return [record.to_dict() for record in self.records]
+
+    # ----- end of run -----
+
+    def render_text(self) -> str:
+        out = io.StringIO()
+        write = out.write
+        write("=== SUNRISE STRATEGY TRADE REPORT ===\n")
+        write(f"Asset: {self.asset}\n")
+        write(f"Generated: {self.started.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        for line in self.header_lines:
+            write(line + "\n")
+        write("\n" + "=" * 80 + "\nTRADE DETAILS\n" + "=" * 80 + "\n\n")
+
+        for number, record in enumerate(self.records, 1):
+            write(f"ENTRY #{number}\n")
+            write(f"Time: {record.entry_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            write(f"Direction: {record.direction}\n")
+            write(f"ATR Current: {record.current_atr:.6f}\n")
+            if record.atr_change is None:
+                write("ATR Change: N/A\n")
+            else:
+                write(f"ATR Change: {record.atr_change:+.6f}\n")
+            write(f"Angle Current: {record.current_angle:.2f}°\n")
+            write(f"Bars to Entry: {record.periods_before_entry}\n")
+            if record.pullback_state != 'NORMAL':
+                write(f"Pullback State: {record.pullback_state}\n")
+            write("-" * 50 + "\n\n")
+            if record.closed:
+                write(f"EXIT #{number}\n")
+                write(f"Time: {record.exit_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                write(f"Exit Reason: {record.exit_reason}\n")
+                write(f"P&L: {record.pnl:.2f}\n")
+                if abs(record.pips) > 0.1:
+                    write(f"Pips: {record.pips:.1f}\n")
+                write(f"Duration: {record.duration_bars} bars ({record.duration_minutes:.0f} min)\n")
+                write("=" * 80 + "\n\n")
+
+        pnls = [record.pnl for record in self.records if record.closed]
+        wins = [pnl for pnl in pnls if pnl > 0]
+        losses = [pnl for pnl in pnls if pnl < 0]
+        total = len(self.records)
+        write("\n" + "=" * 80 + "\nSUMMARY\n" + "=" * 80 + "\n")
+        write(f"Total Trades: {total}\n")
+        write(f"Winning Trades: {len(wins)}\n")
+        write(f"Losing Trades: {len(losses)}\n")
+        write(f"Win Rate: {(len(wins) / total * 100) if total else 0:.2f}%\n")
+        write(f"Total P&L: {sum(pnls):.2f}\n")
+        if wins:
+            write(f"Average Win: {sum(wins) / len(wins):.2f}\n")
+        if losses:
+            write(f"Average Loss: {sum(losses) / len(losses):.2f}\n")
+        write("=" * 80 + "\n")
+        return out.getvalue()
+
+    def _write_csv(self, path: str):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(RECORD_FIELDS)
+            for record in self.records:
+                writer.writerow(['' if value is None else value
+                                 for value in (getattr(record, name) for name in RECORD_FIELDS)])
+
+    def _write_parquet(self, path: str) -> bool:
+        try:
+            import pandas as pd
+            pd.DataFrame([record.to_dict() for record in self.records],
+                         columns=list(RECORD_FIELDS)).to_parquet(path, index=False)
+            return True
+        except ImportError as e:
+            self.logger.warning(f"Parquet trade report unavailable ({e}) - writing CSV instead")
+            return False
+
+    def close(self) -> List[str]:
+        """Write all requested report files once; returns their paths"""
+        if self.closed:
+            return []
+        self.closed = True
+        os.makedirs(self.report_dir, exist_ok=True)
+        base = os.path.join(self.report_dir, f"{self.asset}_trades_{self.started.strftime('%Y%m%d_%H%M%S')}")
+        paths = []
+        if 'txt' in self.formats:
+            with open(base + '.txt', 'w', encoding='utf-8') as f:
+                f.write(self.render_text())
+            paths.append(base + '.txt')
+        parquet_written = 'parquet' in self.formats and self._write_parquet(base + '.parquet')
+        if parquet_written:
+            paths.append(base + '.parquet')
+        if 'csv' in self.formats or ('parquet' in self.formats and not parquet_written):
+            self._write_csv(base + '.csv')
+            paths.append(base + '.csv')
+        return paths
@@ -8,62 +8,193 @@ for use with the MT5 live trading system.
 These strategies are completely independent from the original quant_bot_project
 development environment and can be used for live trading without external dependencies.
 
-Available Strategies:
+Available Strategies (discovered from ``sunrise_ogle_<symbol>.py`` file names):
 - sunrise_ogle_eurusd: EUR/USD trading strategy
-- sunrise_ogle_gbpusd: GBP/USD trading strategy  
+- sunrise_ogle_gbpusd: GBP/USD trading strategy
 - sunrise_ogle_xauusd: Gold (XAU/USD) trading strategy
 - sunrise_ogle_audusd: AUD/USD trading strategy
 - sunrise_ogle_xagusd: Silver (XAG/USD) trading strategy
 - sunrise_ogle_usdchf: USD/CHF trading strategy
+- sunrise_ogle_eurjpy: EUR/JPY trading strategy
+- sunrise_ogle_usdjpy: USD/JPY trading strategy
+
+The registry is lazy: importing this package reads no strategy module and
+does not import backtrader.
+- ``STRATEGY_CLASSES[symbol]`` / ``get_strategy_class(symbol)`` import a
+  strategy module on first access (None when it cannot be imported).
+- ``get_strategy_params(symbol)`` parses the strategy's ``params`` set from
+  the source without importing it; parsed sets are cached apart from the
+  classes and re-read when the file changes.
+- ``SunriseOgleEURUSD`` style names still work and import on first access.
 """
 
-# Import all strategies for easier access
-try:
-    from .sunrise_ogle_eurusd import SunriseOgle as SunriseOgleEURUSD
-except ImportError:
-    SunriseOgleEURUSD = None
-
-try:
-    from .sunrise_ogle_gbpusd import SunriseOgle as SunriseOgleGBPUSD
-except ImportError:
-    SunriseOgleGBPUSD = None
-
-try:
-    from .sunrise_ogle_xauusd import SunriseOgle as SunriseOgleXAUUSD
-except ImportError:
-    SunriseOgleXAUUSD = None
-
-try:
-    from .sunrise_ogle_audusd import SunriseOgle as SunriseOgleAUDUSD
-except ImportError:
-    SunriseOgleAUDUSD = None
-
-try:
-    from .sunrise_ogle_xagusd import SunriseOgle as SunriseOgleXAGUSD
-except ImportError:
-    SunriseOgleXAGUSD = None
-
-try:
-    from .sunrise_ogle_usdchf import SunriseOgle as SunriseOgleUSDCHF
-except ImportError:
-    SunriseOgleUSDCHF = None
+import ast
+import importlib
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+STRATEGY_MODULE_PREFIX = 'sunrise_ogle_'
+STRATEGY_CLASS_NAME = 'SunriseOgle'  # Or SunriseOgle<SYMBOL> (sunrise_ogle_usdjpy.py)
+STRATEGIES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_modules: Optional[Dict[str, str]] = None       # symbol -> module name
+_classes: Dict[str, Any] = {}                   # symbol -> strategy class (None if the import failed)
+_params: Dict[str, tuple] = {}                  # symbol -> ((mtime_ns, size), params)
+_lock = threading.Lock()
+
+
+def discover_strategies(refresh: bool = False) -> Dict[str, str]:
+    """Strategy modules in this package by symbol: {'EURUSD': 'sunrise_ogle_eurusd', ...}"""
+    global _modules
+    if _modules is None or refresh:
+        _modules = {
+            file_name[len(STRATEGY_MODULE_PREFIX):-3].upper(): file_name[:-3]
+            for file_name in sorted(os.listdir(STRATEGIES_DIR))
+            if file_name.startswith(STRATEGY_MODULE_PREFIX) and file_name.endswith('.py')
+        }
+    return dict(_modules)
+
+
+def strategy_path(symbol: str) -> Optional[str]:
+    module_name = discover_strategies().get(symbol.upper())
+    return os.path.join(STRATEGIES_DIR, f"{module_name}.py") if module_name else None
+
+
+def get_strategy_class(symbol: str):
+    """Strategy class for a symbol, importing its module on first access
+
+    Returns None for unknown symbols and for modules that fail to import
+    (e.g. backtrader not installed); the failure is cached too.
+    """
+    symbol = symbol.upper()
+    if symbol in _classes:
+        return _classes[symbol]
+    module_name = discover_strategies().get(symbol)
+    if module_name is None:
+        return None
+    with _lock:
+        if symbol not in _classes:
+            try:
+                module = importlib.import_module(f".{module_name}", __name__)
+                _classes[symbol] = (getattr(module, STRATEGY_CLASS_NAME, None)
+                                    or getattr(module, f"{STRATEGY_CLASS_NAME}{symbol}", None))
+            except ImportError:
+                _classes[symbol] = None
+    return _classes[symbol]
+
+
+def get_strategy_params(symbol: str) -> Dict[str, Any]:
+    """``params`` of a symbol's strategy class, parsed from source (no import)
+
+    Values are literals or module-level constants they reference; computed
+    values are left out. Returns an empty dict for unknown symbols.
+    """
+    path = strategy_path(symbol)
+    if path is None:
+        return {}
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _params.get(symbol.upper())
+    if cached is None or cached[0] != stamp:
+        with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            cached = (stamp, parse_strategy_params(f.read()))
+        _params[symbol.upper()] = cached
+    return dict(cached[1])
+
+
+def parse_strategy_params(source: str, class_name: Optional[str] = None) -> Dict[str, Any]:
+    """The ``params`` of ``class_name`` (default: the first ``bt.Strategy`` subclass) in
+    strategy source, resolved against module constants"""
+    tree = ast.parse(source)
+    constants: Dict[str, Any] = {}
+    params: Dict[str, Any] = {}
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            _store(constants, node.targets[0].id, node.value, constants)
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            _store(constants, node.target.id, node.value, constants)
+        elif isinstance(node, ast.ClassDef) and (node.name == class_name
+                                                 or (class_name is None and _is_strategy(node))):
+            class_name = node.name
+            for statement in node.body:
+                if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                        and isinstance(statement.targets[0], ast.Name) and statement.targets[0].id == 'params'):
+                    for name, value in _param_items(statement.value):
+                        _store(params, name, value, constants)
+    return params
+
+
+def _is_strategy(node: ast.ClassDef) -> bool:
+    return any(getattr(base, 'attr', getattr(base, 'id', None)) == 'Strategy' for base in node.bases)
+
+
+def _param_items(node):
+    """(name, value node) pairs of ``dict(a=1)``, ``{'a': 1}`` or ``(('a', 1),)``"""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'dict':
+        return [(keyword.arg, keyword.value) for keyword in node.keywords if keyword.arg]
+    if isinstance(node, ast.Dict):
+        return [(key.value, value) for key, value in zip(node.keys, node.values)
+                if isinstance(key, ast.Constant) and isinstance(key.value, str)]
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [(item.elts[0].value, item.elts[1]) for item in node.elts
+                if isinstance(item, (ast.Tuple, ast.List)) and len(item.elts) == 2
+                and isinstance(item.elts[0], ast.Constant) and isinstance(item.elts[0].value, str)]
+    return []
+
+
+def _store(target: Dict[str, Any], name: str, node, constants: Dict[str, Any]):
+    if isinstance(node, ast.Name):
+        if node.id in constants:
+            target[name] = constants[node.id]
+        return
+    try:
+        target[name] = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        pass  # Computed value - only available from the imported class
+
+
+class LazyStrategyClasses(Mapping):
+    """symbol -> strategy class; membership and iteration never import a strategy"""
+
+    def __getitem__(self, symbol):
+        if symbol not in discover_strategies():
+            raise KeyError(symbol)
+        return get_strategy_class(symbol)
+
+    def __contains__(self, symbol):
+        return symbol in discover_strategies()
+
+    def __iter__(self):
+        return iter(discover_strategies())
+
+    def __len__(self):
+        return len(discover_strategies())
+
+    def loaded(self) -> Dict[str, Any]:
+        """Classes imported so far"""
+        return dict(_classes)
+
+    def __repr__(self):
+        return f"LazyStrategyClasses({sorted(discover_strategies())}, loaded={sorted(_classes)})"
 
-# Export all available strategies
-__all__ = [
-    'SunriseOgleEURUSD',
-    'SunriseOgleGBPUSD', 
-    'SunriseOgleXAUUSD',
-    'SunriseOgleAUDUSD',
-    'SunriseOgleXAGUSD',
-    'SunriseOgleUSDCHF'
-]
 
 # Strategy mapping for easy access
-STRATEGY_CLASSES = {
-    'EURUSD': SunriseOgleEURUSD,
-    'GBPUSD': SunriseOgleGBPUSD,
-    'XAUUSD': SunriseOgleXAUUSD,
-    'AUDUSD': SunriseOgleAUDUSD,
-    'XAGUSD': SunriseOgleXAGUSD,
-    'USDCHF': SunriseOgleUSDCHF
-}
\ No newline at end of file
+STRATEGY_CLASSES = LazyStrategyClasses()
+
+# Export all available strategies
+__all__ = ['STRATEGY_CLASSES', 'discover_strategies', 'get_strategy_class', 'get_strategy_params',
+           'parse_strategy_params'] + [f"{STRATEGY_CLASS_NAME}{symbol}" for symbol in discover_strategies()]
+
+
+def __getattr__(name: str):
+    """``SunriseOgleEURUSD`` style access (imports that strategy on first use)"""
+    if name.startswith(STRATEGY_CLASS_NAME) and name[len(STRATEGY_CLASS_NAME):] in discover_strategies():
+        return get_strategy_class(name[len(STRATEGY_CLASS_NAME):])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark Live Hot Path
+Micro-benchmarks of the per-candle monitor functions on a headless monitor
+over synthetic M5 bars (no MT5 connection required):
+
+    calculate_indicators, detect_ema_crossovers,
+    determine_strategy_phase in SCANNING / ARMED_LONG / WINDOW_OPEN / IN_TRADE,
+    the compiled entry filters (crossover and breakout masks),
+    parse_strategy_config, save_strategy_state, terminal_log
+
+Usage:
+    python testing/benchmark_hot_path.py                    # Report + compare with the baseline
+    python testing/benchmark_hot_path.py --update-baseline  # Store this run as the baseline
+    python testing/benchmark_hot_path.py -k phase -k filter --threshold 0.15
+
+Exit code 1 when any benchmark regresses by more than --threshold against
+testing/benchmark_baseline.json. Baselines are machine specific: record one
+on the machine (and Python) that runs the comparison.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.indicator_batch import IndicatorBatch
+from src.live_replay import (MONITOR_CLASS, RATES_DTYPE, ReplayMT5, TextBuffer, headless_monitor_class,
+                             load_monitor_module, patched_globals)
+from src.microbench import (DEFAULT_MIN_TIME, DEFAULT_THRESHOLD, Benchmark, compare, format_table,
+                            load_baseline, run_suite, save_baseline)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+SYMBOL = 'EURUSD'
+BARS = 450
+SEED = 15                   # Walk that arms and opens a window within the first few dozen bars
+PHASE_STATES = ('SCANNING', 'ARMED_LONG', 'WINDOW_OPEN')
+# Filters off while capturing states, so the walk reaches WINDOW_OPEN quickly
+CAPTURE_OVERRIDES = {'LONG_USE_ATR_FILTER': 'False', 'LONG_USE_ATR_INCREMENT_FILTER': 'False',
+                     'LONG_USE_ATR_DECREMENT_FILTER': 'False', 'LONG_USE_PRICE_FILTER_EMA': 'False',
+                     'LONG_USE_ANGLE_FILTER': 'False', 'USE_TIME_RANGE_FILTER': 'False'}
+
+
+def synthetic_rates(n=BARS, seed=SEED):
+    """Random-walk M5 bars starting 2024-01-01 00:00 UTC"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 3e-4, n))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 5e-5, n)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1704067200 + np.arange(n) * 300
+    rates['open'], rates['close'] = open_, close
+    rates['high'] = np.maximum(open_, close) + np.abs(rng.normal(0, 2e-4, n))
+    rates['low'] = np.minimum(open_, close) - np.abs(rng.normal(0, 2e-4, n))
+    return rates
+
+
+def closed_frame(stub, module):
+    """The monitor's view at the stub cursor: closed bars as a DataFrame"""
+    df = pd.DataFrame(stub.copy_rates_from_pos(SYMBOL, stub.TIMEFRAME_M5, 0, module.BARS_TO_FETCH))
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df.iloc[:-1].copy()
+
+
+@contextmanager
+def hot_path_fixture():
+    """Headless monitor on replayed bars with a captured state per entry state
+
+    Yields a dict of module, monitor, stub and states
+    (entry state -> (cursor, SymbolState snapshot before that bar ran)).
+    """
+    module = load_monitor_module()
+    rates = synthetic_rates()
+    stub = ReplayMT5({SYMBOL: rates})
+    logger = logging.getLogger('benchmark.monitor')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    with ExitStack() as stack:
+        stack.enter_context(patched_globals(module, mt5=stub, pd=pd, np=np))
+        monitor = headless_monitor_class(module)(logger=logger)
+        monitor.broker_utc_offset = 0
+        monitor.load_symbol_registry()
+        monitor.load_symbol_config(SYMBOL)
+        config = monitor.strategy_configs[SYMBOL]
+        monitor.strategy_configs[SYMBOL] = dict(config, **CAPTURE_OVERRIDES)
+
+        states = {}
+        for cursor in range(module.BARS_TO_FETCH, len(rates)):
+            stub.set_cursor(SYMBOL, cursor)
+            state = monitor.strategy_states[SYMBOL]
+            if state.entry_state.value in PHASE_STATES and state.entry_state.value not in states:
+                states[state.entry_state.value] = (cursor, state.snapshot())
+            if len(states) == len(PHASE_STATES):
+                break
+            monitor.monitor_strategy_phase(SYMBOL)
+        missing = set(PHASE_STATES) - set(states)
+        if missing:
+            raise RuntimeError(f"Synthetic walk never reached {sorted(missing)} - change SEED/BARS")
+
+        monitor.strategy_configs[SYMBOL] = config  # Benchmarks run the real filter configuration
+        stub.open_positions.clear()
+
+        workdir = stack.enter_context(tempfile.TemporaryDirectory())
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)  # save_strategy_state / trade logs write to the working directory
+        stack.callback(os.chdir, previous_cwd)
+        yield {'module': module, 'monitor': monitor, 'stub': stub, 'states': states}
+
+
+def build_benchmarks(fixture):
+    """Benchmark list over a hot_path_fixture()"""
+    module, monitor, stub, states = fixture['module'], fixture['monitor'], fixture['stub'], fixture['states']
+    filters = module.entry_filters
+
+    def at(entry_state, position=False):
+        """Setup: stub cursor and symbol state as captured before the bar"""
+        cursor, saved = states[entry_state]
+
+        def setup():
+            stub.cursors[SYMBOL] = cursor
+            stub.open_positions.clear()
+            if position:
+                stub.open_positions[SYMBOL] = trade
+            state = saved.snapshot()
+            if position:
+                state.entry_state = 'IN_TRADE'
+            monitor.strategy_states[SYMBOL] = state
+        return setup
+
+    cursor = states['WINDOW_OPEN'][0]
+    stub.set_cursor(SYMBOL, cursor)
+    df = closed_frame(stub, module)
+    periods = monitor.get_indicator_periods(SYMBOL)
+    batch = IndicatorBatch()
+    batch.add(SYMBOL, df['close'].values, df['high'].values, df['low'].values, periods)
+    precomputed = batch.compute()[SYMBOL]
+    indicators = monitor.calculate_indicators(df, SYMBOL)
+    atr = indicators.get('atr')
+    stub.order_send({'symbol': SYMBOL, 'type': stub.ORDER_TYPE_BUY, 'volume': 0.1,
+                     'price': float(df['close'].iloc[-1]), 'sl': 0.0, 'tp': 10.0})
+    trade = stub.open_positions.pop(SYMBOL)
+
+    frames = {}
+    for entry_state, (state_cursor, _) in states.items():
+        stub.set_cursor(SYMBOL, state_cursor)
+        frame = closed_frame(stub, module)
+        frames[entry_state] = (frame, monitor.calculate_indicators(frame, SYMBOL))
+    stub.cursors[SYMBOL] = cursor
+
+    def phase(entry_state):
+        frame, frame_indicators = frames[entry_state]
+        return lambda: monitor.determine_strategy_phase(SYMBOL, frame, frame_indicators)
+
+    base_terminal_log = getattr(module, MONITOR_CLASS).terminal_log
+    monitor.terminal_text = TextBuffer()
+    for i in range(1000):
+        monitor.terminal_text.insert('end', f"[12:00:00.000] warm line {i}\n")
+    strategy_file = monitor.get_strategy_file_path(SYMBOL)
+
+    benchmarks = [
+        Benchmark('calculate_indicators', lambda: monitor.calculate_indicators(df, SYMBOL)),
+        Benchmark('calculate_indicators[precomputed]',
+                  lambda: monitor.calculate_indicators(df, SYMBOL, precomputed=precomputed)),
+        Benchmark('detect_ema_crossovers', lambda: monitor.detect_ema_crossovers(SYMBOL, indicators, df),
+                  setup=at('SCANNING')),
+    ]
+    for entry_state in PHASE_STATES:
+        benchmarks.append(Benchmark(f'determine_strategy_phase[{entry_state}]', phase(entry_state),
+                                    setup=at(entry_state)))
+    benchmarks += [
+        Benchmark('determine_strategy_phase[IN_TRADE]', phase('SCANNING'), setup=at('SCANNING', position=True)),
+        Benchmark('entry_filters[crossover]',
+                  lambda: monitor._evaluate_entry_filters(SYMBOL, df, 'LONG', filters.CROSSOVER_FILTERS, atr=atr)),
+        Benchmark('entry_filters[breakout]',
+                  lambda: monitor._evaluate_entry_filters(SYMBOL, df, 'LONG',
+                                                          filters.BREAKOUT_FILTER_MASK | filters.FILTER_TIME,
+                                                          atr=atr)),
+        Benchmark('parse_strategy_config', lambda: monitor.parse_strategy_config(strategy_file, SYMBOL),
+                  setup=lambda: monitor.symbol_registry.invalidate(SYMBOL, reparse=True)),
+        Benchmark('save_strategy_state', monitor.save_strategy_state),
+        Benchmark('terminal_log[debug]',
+                  lambda: base_terminal_log(monitor, f"{SYMBOL}: waiting for candle close", "DEBUG")),
+        Benchmark('terminal_log[critical]',
+                  lambda: base_terminal_log(monitor, f"{SYMBOL}: LONG CROSSOVER - State: SCANNING -> ARMED_LONG",
+                                            "SUCCESS", critical=True)),
+    ]
+    return benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the live monitor hot path")
+    parser.add_argument('-k', dest='only', action='append', default=[],
+                        help="Run benchmarks whose name contains this text (repeatable)")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, help="Seconds sampled per benchmark")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed p50 / allocation growth before failing (0.25 = 25%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    baseline = load_baseline(args.baseline)
+    stored = baseline['results'] if baseline else {}
+
+    with hot_path_fixture() as fixture:
+        results = run_suite(build_benchmarks(fixture), only=args.only, min_time=args.min_time)
+    print(format_table(results, stored))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\n[OK] Baseline updated: {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"\n[i] No baseline at {args.baseline} - run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, stored, threshold=args.threshold)
+    if regressions:
+        print(f"\n[X] {len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"    {regression}")
+        return 1
+    print(f"\n[OK] No regressions above {args.threshold:.0%} (baseline {baseline.get('created')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,33 @@
 """
 Check actual broker specifications for all symbols
+Also saves them as a symbol spec snapshot for offline sizing tests
+(SymbolSpecCache.from_snapshot)
 """
+import os
+import sys
+
 import MetaTrader5 as mt5
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.symbol_spec_cache import SymbolSpecCache
+
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, 'config', 'symbol_specs_snapshot.json')
+
 if not mt5.initialize():
     print("MT5 initialization failed")
     exit()
 
 symbols = ['EURUSD', 'GBPUSD', 'XAUUSD', 'AUDUSD', 'XAGUSD', 'USDCHF']
+specs = SymbolSpecCache(mt5)
 
 print("=" * 100)
 print("BROKER SYMBOL SPECIFICATIONS")
 print("=" * 100)
 
 for symbol in symbols:
-    info = mt5.symbol_info(symbol)
+    info = specs.get(symbol)
     if info is None:
         print(f"\n❌ {symbol}: Not found")
         continue
@@ -35,5 +48,7 @@ for symbol in symbols:
     
     print(f"   Calculated Value/Point: ${value_per_point:.10f}")
 
+specs.save(SNAPSHOT_PATH)
 mt5.shutdown()
 print("\n" + "=" * 100)
+print(f"Snapshot saved: {SNAPSHOT_PATH}")
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Soak Harness - Accelerated Multi-Day Run of the Live Monitor
+============================================================
+Runs the full monitor cycle (run_candle_cycle -> candle scheduler -> worker
+pool -> indicators / phase machine / execute_trade -> save_strategy_state,
+with the real terminal_log and state publishing) against a simulated MT5
+(PaperBroker over synthetic bars). The bars swing up and down in
+impulse / pullback legs and the entry filters are relaxed
+(SOAK_CONFIG_OVERRIDES), so every symbol keeps arming, opening windows and
+trading through the run - the execution, position and trade-log paths soak
+along with the scanning ones. A virtual clock drives the run: every
+candle advances the monitor's ``datetime.now()`` / ``time.time()`` by five
+minutes, and no call sleeps. 30 trading days x 8 symbols take minutes,
+not weeks.
+
+Every ``sample_every`` candles it records:
+    - process RSS and open file handles
+    - gc-tracked object counts by type
+    - the size of every list / dict / set / deque held by the monitor
+      (chart_data, signals_history, strategy_configs, ...), the summed size
+      of container fields across symbol states, and the terminal buffer
+    - per-candle latency (p50 / p99 / max) since the previous sample
+
+After a warm-up, a metric is flagged when it grows monotonically: the
+means of the first, middle and last third of its samples strictly
+increase, and the growth exceeds both a relative and an absolute floor.
+
+Usage:
+    python testing/soak_harness.py --days 30 --report logs/soak_report.json
+    python testing/soak_harness.py --days 5 --symbols EURUSD,XAUUSD --gui   # Also drives the Tk displays
+
+Exit code 1 when any metric is flagged.
+"""
+
+import argparse
+import collections
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import (MONITOR_CLASS, RATES_DTYPE, TextBuffer, headless_monitor_class,
+                             load_monitor_module, patched_globals)
+from src.paper_broker import ExecutionModel, PaperBroker
+
+try:
+    import psutil  # Optional: RSS / handle counts on Windows
+except ImportError:
+    psutil = None
+
+# ==========
+# SOAK CONFIGURATION
+# ==========
+DEFAULT_TRADING_DAYS = 30
+BARS_PER_DAY = 288                  # M5, FX trades around the clock Monday-Friday
+BAR_SECONDS = 300
+CLOSE_DELAY_SECONDS = 3             # Virtual time past the candle close when a cycle runs
+DEFAULT_SAMPLE_EVERY = 72           # Candles between samples (6 virtual hours)
+WARMUP_FRACTION = 0.2               # Samples ignored by growth detection
+TOP_OBJECT_TYPES = 25               # Object types tracked (largest counts at the first sample)
+START_TIME = datetime(2024, 1, 8)   # A Monday
+
+# (relative, absolute) growth floors from the first to the last third of the samples
+GROWTH_FLOORS = {
+    'rss_mb': (0.05, 8.0),
+    'open_files': (0.0, 2),
+    'latency_p50_ms': (0.25, 1.0),
+    'objects': (0.05, 500),
+    'containers': (0.0, 1),
+}
+
+# Price level per symbol family (volatility scales with it)
+BASE_PRICES = (('XAU', 2000.0), ('XAG', 24.0), ('JPY', 150.0))
+
+# Synthetic price path (log returns): swings of SWING_AMPLITUDE over
+# SWING_BARS give the EMA crossovers, the LEG_PATTERN rhythm (one impulse
+# bar, two pullback bars) the pullbacks and breakouts, NOISE the rest
+SWING_BARS = 96                     # 8 hours per up-and-down swing
+SWING_AMPLITUDE = 4e-3
+LEG_PATTERN = (2.0, -1.0, -1.0)
+LEG_STEP = 5e-4
+NOISE = 5e-5
+
+# Entry filters tuned to real volatility regimes would leave synthetic bars
+# almost without trades; the soak needs every code path exercised regularly
+SOAK_CONFIG_OVERRIDES = {'LONG_USE_ATR_FILTER': 'False', 'LONG_USE_ATR_INCREMENT_FILTER': 'False',
+                         'LONG_USE_ATR_DECREMENT_FILTER': 'False', 'LONG_USE_PRICE_FILTER_EMA': 'False',
+                         'LONG_USE_ANGLE_FILTER': 'False', 'USE_TIME_RANGE_FILTER': 'False',
+                         'Use Time Range Filter': 'False'}
+
+
+# ==========
+# SIMULATED MARKET AND CLOCK
+# ==========
+
+def trading_bar_times(start: datetime, count: int, step: int = 1) -> np.ndarray:
+    """``count`` M5 bar open times from ``start`` (backwards when step is -1), skipping weekends"""
+    times = []
+    t = start
+    while len(times) < count:
+        if t.weekday() < 5:
+            times.append(int((t - datetime(1970, 1, 1)).total_seconds()))
+        t += timedelta(seconds=step * BAR_SECONDS)
+    return np.array(sorted(times), dtype=np.int64)
+
+
+def synthetic_market(symbols: Sequence[str], days: int, history_bars: int, seed: int = 7,
+                     start: datetime = START_TIME) -> Dict[str, np.ndarray]:
+    """Swinging rates per symbol: ``history_bars`` before ``start``, then ``days`` trading days"""
+    history = trading_bar_times(start - timedelta(seconds=BAR_SECONDS), history_bars, step=-1)
+    times = np.concatenate([history, trading_bar_times(start, days * BARS_PER_DAY)])
+
+    market = {}
+    for i, symbol in enumerate(symbols):
+        base = next((price for prefix, price in BASE_PRICES if prefix in symbol.upper()), 1.1)
+        rng = np.random.default_rng(seed + i)
+        n = len(times)
+        swing = SWING_AMPLITUDE * np.sin(2 * np.pi * np.arange(n) / SWING_BARS + rng.uniform(0, 2 * np.pi))
+        legs = LEG_STEP * np.cumsum(np.resize(LEG_PATTERN, n))
+        close = base * np.exp(swing + legs + np.cumsum(rng.normal(0, NOISE, n)))
+        open_ = np.r_[close[0], close[:-1]]
+        rates = np.zeros(n, dtype=RATES_DTYPE)
+        rates['time'] = times
+        rates['open'], rates['close'] = open_, close
+        rates['high'] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 1.5e-4, n)))
+        rates['low'] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 1.5e-4, n)))
+        rates['tick_volume'] = rng.integers(50, 500, n)
+        rates['spread'] = 10
+        market[symbol] = rates
+    return market
+
+
+class VirtualClock:
+    """Wall clock seen by the monitor module (``datetime.now`` / ``time.time``)"""
+
+    def __init__(self, start: datetime):
+        self.current = start
+        clock = self
+
+        class RealInstances(type):
+            def __instancecheck__(cls, obj):
+                return isinstance(obj, datetime)  # Bar times and pandas Timestamps still pass the monitor's checks
+
+        class VirtualDatetime(datetime, metaclass=RealInstances):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.current if tz is None else clock.current.replace(tzinfo=tz)
+
+        class VirtualTime:
+            def __getattr__(self, name):
+                return getattr(time, name)  # perf_counter / monotonic stay real (latency)
+
+            def time(self):
+                return (clock.current - datetime(1970, 1, 1)).total_seconds()
+
+            def sleep(self, seconds):
+                clock.current += timedelta(seconds=seconds)
+
+        self.datetime = VirtualDatetime
+        self.time = VirtualTime()
+
+    def set(self, when: datetime):
+        self.current = when
+
+
+# ==========
+# RESOURCE PROBES
+# ==========
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def open_file_count() -> Optional[int]:
+    """Open file descriptors (handles on Windows)"""
+    if psutil is not None:
+        process = psutil.Process()
+        return process.num_handles() if hasattr(process, 'num_handles') else process.num_fds()
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def object_counts() -> collections.Counter:
+    """gc-tracked objects by type name"""
+    return collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def container_sizes(monitor) -> Dict[str, int]:
+    """len() of every container attribute of the monitor and, summed, of the symbol states"""
+    sizes = {}
+    for name, value in vars(monitor).items():
+        if isinstance(value, (list, dict, set, collections.deque, TextBuffer)):
+            sizes[name] = len(value)
+    for state in getattr(monitor, 'strategy_states', {}).values():
+        for field in getattr(state, '__slots__', ()):
+            value = getattr(state, field, None)
+            if isinstance(value, (list, dict, set, collections.deque)):
+                key = f"state.{field}"
+                sizes[key] = sizes.get(key, 0) + len(value)
+    return sizes
+
+
+def detect_growth(values: Sequence[float], min_relative: float, min_absolute: float,
+                  warmup: float = WARMUP_FRACTION) -> Optional[tuple]:
+    """(first third mean, last third mean) when the series grows monotonically, else None"""
+    series = np.asarray([v for v in values[int(len(values) * warmup):] if v is not None], dtype=np.float64)
+    if len(series) < 6:
+        return None
+    first, middle, last = (float(part.mean()) for part in np.array_split(series, 3))
+    growth = last - first
+    if first < middle < last and growth >= min_absolute and growth >= min_relative * abs(first):
+        return first, last
+    return None
+
+
+# ==========
+# SOAK RUN
+# ==========
+
+class SoakSample:
+    """Measurements taken after one candle"""
+
+    __slots__ = ('candle', 'virtual_time', 'rss_mb', 'open_files', 'objects', 'containers',
+                 'latency_p50_ms', 'latency_p99_ms', 'latency_max_ms')
+
+    def __init__(self, candle: int, virtual_time: datetime, latencies: List[float],
+                 objects: Dict[str, int], containers: Dict[str, int]):
+        self.candle = candle
+        self.virtual_time = virtual_time
+        rss = rss_bytes()
+        self.rss_mb = rss / 2 ** 20 if rss is not None else None
+        self.open_files = open_file_count()
+        self.objects = objects
+        self.containers = containers
+        latency = np.asarray(latencies or [0.0]) * 1000.0
+        self.latency_p50_ms = float(np.percentile(latency, 50))
+        self.latency_p99_ms = float(np.percentile(latency, 99))
+        self.latency_max_ms = float(latency.max())
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['virtual_time'] = self.virtual_time.isoformat()
+        return data
+
+
+class SoakReport:
+    """Samples of one soak run and the metrics flagged for monotonic growth"""
+
+    def __init__(self, symbols: Sequence[str], days: int):
+        self.symbols = list(symbols)
+        self.days = days
+        self.samples: List[SoakSample] = []
+        self.flags: List[SimpleNamespace] = []   # metric, first, last
+        self.candles = 0
+        self.seconds = 0.0
+        self.trades = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.flags
+
+    def series(self, metric: str) -> List[Optional[float]]:
+        """One value per sample: 'rss_mb', 'objects.dict', 'containers.chart_data', ..."""
+        group, _, key = metric.partition('.')
+        if key:
+            return [getattr(sample, group).get(key) for sample in self.samples]
+        return [getattr(sample, group) for sample in self.samples]
+
+    def analyze(self) -> List[SimpleNamespace]:
+        self.flags = []
+        metrics = [('rss_mb', 'rss_mb'), ('open_files', 'open_files'), ('latency_p50_ms', 'latency_p50_ms')]
+        if self.samples:
+            metrics += [(f"objects.{name}", 'objects') for name in self.samples[0].objects]
+            names = sorted({name for sample in self.samples for name in sample.containers})
+            metrics += [(f"containers.{name}", 'containers') for name in names]
+        for metric, floors in metrics:
+            grown = detect_growth(self.series(metric), *GROWTH_FLOORS[floors])
+            if grown:
+                self.flags.append(SimpleNamespace(metric=metric, first=grown[0], last=grown[1]))
+        return self.flags
+
+    def summary(self) -> str:
+        lines = [f"Soak: {self.days} trading days, {len(self.symbols)} symbols, {self.candles} candles, "
+                 f"{self.trades} trades in {self.seconds:.0f}s ({self.candles / max(self.seconds, 1e-9):.1f} candles/s)"]
+        if self.samples:
+            first, last = self.samples[0], self.samples[-1]
+            lines.append(f"  RSS {first.rss_mb or 0:.0f} -> {last.rss_mb or 0:.0f} MB | files {first.open_files} -> "
+                         f"{last.open_files} | candle p50 {first.latency_p50_ms:.1f} -> {last.latency_p50_ms:.1f} ms "
+                         f"(max {max(s.latency_max_ms for s in self.samples):.0f} ms)")
+        if self.flags:
+            lines.append(f"[X] Monotonic growth in {len(self.flags)} metric(s):")
+            lines += [f"    {f.metric}: {f.first:.1f} -> {f.last:.1f}" for f in self.flags]
+        else:
+            lines.append("[OK] No monotonic growth detected")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict:
+        return {'symbols': self.symbols, 'days': self.days, 'candles': self.candles, 'seconds': self.seconds,
+                'trades': self.trades, 'flags': [vars(f) for f in self.flags],
+                'samples': [sample.to_dict() for sample in self.samples]}
+
+    def save(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def soak_monitor_class(module):
+    """Headless monitor that keeps the real terminal_log (on a TextBuffer) and state publishing"""
+    base = getattr(module, MONITOR_CLASS)
+
+    class SoakMonitor(headless_monitor_class(module)):
+        terminal_log = base.terminal_log
+        publish_state = base.publish_state
+
+        def __init__(self, logger=None):
+            super().__init__(logger=logger)
+            self.terminal_text = TextBuffer()
+
+    return SoakMonitor
+
+
+class SoakRun:
+    """Accelerated multi-day run of the monitor on a virtual clock
+
+    Args:
+        days: trading days to simulate (288 M5 candles each)
+        symbols: symbols to monitor (default: the symbol registry's enabled symbols)
+        sample_every: candles between samples
+        gui: build the real Tk monitor and refresh its displays every candle
+        on_candle: optional hook (monitor, candle index) run after every candle
+        config_overrides: values merged into every loaded strategy config
+    """
+
+    def __init__(self, days: int = DEFAULT_TRADING_DAYS, symbols: Optional[Sequence[str]] = None,
+                 sample_every: int = DEFAULT_SAMPLE_EVERY, seed: int = 7, gui: bool = False,
+                 on_candle: Optional[Callable] = None, config_overrides: Optional[Dict] = None,
+                 module=None, logger: Optional[logging.Logger] = None):
+        self.days = days
+        self.symbols = list(symbols) if symbols else None
+        self.sample_every = sample_every
+        self.seed = seed
+        self.gui = gui
+        self.on_candle = on_candle
+        self.config_overrides = SOAK_CONFIG_OVERRIDES if config_overrides is None else config_overrides
+        self.module = module
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _build_monitor(self, module, monitor_logger):
+        if not self.gui:
+            monitor = soak_monitor_class(module)(logger=monitor_logger)
+            monitor.broker_utc_offset = 0
+            symbols = monitor.load_symbol_registry()
+            for symbol in self.symbols or symbols:
+                monitor.load_symbol_config(symbol)
+            return monitor, None
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        monitor = getattr(module, MONITOR_CLASS)(root)
+        monitor.bot_startup_time = datetime.min  # Historical crossovers are never stale
+        return monitor, root
+
+    def run(self, progress_every: int = 0) -> SoakReport:
+        import pandas as pd
+
+        module = self.module or load_monitor_module()
+        symbols = self.symbols or list(module.ASSET_ALLOCATIONS)
+        market = synthetic_market(symbols, self.days, module.BARS_TO_FETCH + 1, seed=self.seed)
+        broker = PaperBroker(market, execution=ExecutionModel(latency_ms=0, spread_points=None))
+        clock = VirtualClock(START_TIME)
+        monitor_logger = logging.getLogger('soak.monitor')
+        monitor_logger.addHandler(logging.NullHandler())
+        monitor_logger.propagate = False
+        report = SoakReport(symbols, self.days)
+        first = module.BARS_TO_FETCH + 1
+        candles = len(next(iter(market.values()))) - first
+
+        with ExitStack() as stack:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory())
+            previous_cwd = os.getcwd()
+            stack.callback(os.chdir, previous_cwd)
+            stack.enter_context(patched_globals(module, mt5=broker, pd=pd, np=np, datetime=clock.datetime,
+                                                time=clock.time))
+            monitor, root = self._build_monitor(module, monitor_logger)
+            self.symbols = [s for s in symbols if s in monitor.strategy_states]
+            for symbol in self.symbols:
+                monitor.strategy_configs[symbol] = dict(monitor.strategy_configs[symbol], **self.config_overrides)
+            os.chdir(workdir)  # Strategy state file, trade logs and profiles stay out of the tree
+            stack.callback(lambda: monitor.monitor_executor and monitor.monitor_executor.shutdown(wait=True))
+
+            tracked_types = None
+            latencies = []
+            started = time.perf_counter()
+            for candle in range(candles):
+                cursor = first + candle
+                for symbol in self.symbols:
+                    broker.set_cursor(symbol, cursor)
+                bar_time = datetime(1970, 1, 1) + timedelta(seconds=int(market[self.symbols[0]]['time'][cursor]))
+                clock.set(bar_time + timedelta(seconds=CLOSE_DELAY_SECONDS))
+
+                cycle_started = time.perf_counter()
+                monitor.run_candle_cycle(self.symbols)
+                monitor.drain_terminal_queue()  # Worker lines, as process_phase_updates writes them
+                monitor.save_strategy_state()
+                if root is not None:
+                    monitor.update_strategy_displays()
+                    root.update()
+                latencies.append(time.perf_counter() - cycle_started)
+
+                if self.on_candle is not None:
+                    self.on_candle(monitor, candle)
+                if (candle + 1) % self.sample_every == 0 or candle == candles - 1:
+                    gc.collect()
+                    counts = object_counts()
+                    if tracked_types is None:
+                        tracked_types = [name for name, _ in counts.most_common(TOP_OBJECT_TYPES)]
+                    report.samples.append(SoakSample(candle + 1, clock.current, latencies,
+                                                     {name: counts.get(name, 0) for name in tracked_types},
+                                                     container_sizes(monitor)))
+                    latencies = []
+                if progress_every and (candle + 1) % progress_every == 0:
+                    self.logger.info(f"Soak: {candle + 1}/{candles} candles ({clock.current:%Y-%m-%d %H:%M} virtual)")
+
+            report.candles = candles
+            report.seconds = time.perf_counter() - started
+            report.trades = len(broker.orders)
+            if root is not None:
+                root.destroy()
+        report.analyze()
+        return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Accelerated soak test of the live monitor")
+    parser.add_argument('--days', type=int, default=DEFAULT_TRADING_DAYS, help="Trading days to simulate")
+    parser.add_argument('--symbols', help="Comma-separated symbols (default: all enabled symbols)")
+    parser.add_argument('--sample-every', type=int, default=DEFAULT_SAMPLE_EVERY, help="Candles between samples")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--gui', action='store_true', help="Run the Tk monitor (needs a display)")
+    parser.add_argument('--report', help="Write samples and flags to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    symbols = [s.strip().upper() for s in args.symbols.split(',')] if args.symbols else None
+    report = SoakRun(args.days, symbols, args.sample_every, args.seed, args.gui).run(progress_every=BARS_PER_DAY)
+    print(report.summary())
+    if args.report:
+        report.save(args.report)
+        print(f"Report written: {args.report}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
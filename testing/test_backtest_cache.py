@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Backtest Cache
+Verifies content-addressed keys, binary round trip, LRU eviction by disk
+size and per-symbol recomputation in a portfolio run (no backtrader required)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.backtest_cache import (BacktestCache, BacktestResult, cache_key, data_fingerprint,
+                                data_fingerprint_csv, run_portfolio, source_fingerprint)
+
+START = datetime(2024, 1, 2, 9, 0)
+
+
+def _result(n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    reports = [{'entry_time': START + timedelta(hours=i), 'exit_time': START + timedelta(hours=i, minutes=30),
+                'direction': 'LONG', 'exit_price': 1.1, 'pnl': float(rng.normal(10, 50))} for i in range(n)]
+    reports.append({'entry_time': START, 'direction': 'LONG'})  # Still open - skipped
+    return BacktestResult.from_trade_reports(reports, 50000.0)
+
+
+def test_round_trip_and_metrics():
+    """Stored results load back identical; metrics follow the trade list"""
+    result = _result()
+    assert result.metrics['trades'] == 20 and len(result.equity_values) == 20
+    assert abs(result.metrics['final_value'] - result.equity_values[-1]) < 1e-9
+    with tempfile.TemporaryDirectory() as folder:
+        cache = BacktestCache(folder)
+        assert cache.get('missing') is None
+        cache.put('abc', result)
+        assert cache.get('abc') == result
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_covers_data_source_and_params():
+    """Any change in data slice, strategy source or parameters changes the key"""
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'EURUSD.csv')
+        with open(csv_path, 'w') as f:
+            f.write("Date,Time,Open,High,Low,Close,Volume\n")
+            for day in ('20240101', '20240102', '20240103'):
+                f.write(f"{day},00:00:00,1.1,1.2,1.0,1.15,10\n")
+        strategy = os.path.join(folder, 'strategy.py')
+        with open(strategy, 'w') as f:
+            f.write("PARAM = 1\n")
+
+        data_hash = data_fingerprint_csv(csv_path, '2024-01-01', '2024-01-02')
+        base = cache_key(data_hash, source_fingerprint(strategy), {'a': 1, 'b': 2})
+        assert base == cache_key(data_hash, source_fingerprint(strategy), {'b': 2, 'a': 1})
+        assert base != cache_key(data_fingerprint_csv(csv_path, '2024-01-01', '2024-01-03'),
+                                 source_fingerprint(strategy), {'a': 1, 'b': 2})
+        assert base != cache_key(data_hash, source_fingerprint(strategy), {'a': 1, 'b': 3})
+        with open(strategy, 'a') as f:
+            f.write("# edited\n")
+        assert base != cache_key(data_hash, source_fingerprint(strategy), {'a': 1, 'b': 2})
+    assert data_fingerprint(np.arange(5.0)) != data_fingerprint(np.arange(6.0))
+
+
+def test_lru_eviction_by_size():
+    """Least recently used results are evicted once the disk budget is exceeded"""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = BacktestCache(folder, max_bytes=10 ** 9)
+        for index, key in enumerate(('a', 'b', 'c')):
+            cache.put(key, _result(seed=index))
+            os.utime(cache._path(key), (time.time() - 100 + index, time.time() - 100 + index))
+        cache.get('a')  # 'a' becomes most recently used
+        cache.max_bytes = cache.size() - 1
+        assert cache.evict() == 1
+        assert 'b' not in cache and 'a' in cache and 'c' in cache
+
+
+def test_portfolio_recomputes_changed_symbol_only():
+    """Re-running the portfolio after changing one symbol's params reruns only that symbol"""
+    with tempfile.TemporaryDirectory() as folder:
+        strategy = os.path.join(folder, 'strategy.py')
+        with open(strategy, 'w') as f:
+            f.write("PARAM = 1\n")
+        jobs = {symbol: {'rates': np.arange(100.0) + i, 'strategy': strategy, 'params': {'risk': 0.01}}
+                for i, symbol in enumerate(('EURUSD', 'GBPUSD', 'XAUUSD'))}
+        runs = []
+
+        def run_fn(symbol, job):
+            runs.append(symbol)
+            return _result(seed=len(runs))
+
+        cache = BacktestCache(os.path.join(folder, 'cache'))
+        first = run_portfolio(jobs, run_fn, cache)
+        jobs['GBPUSD']['params'] = {'risk': 0.02}
+        second = run_portfolio(jobs, run_fn, cache)
+        assert runs == ['EURUSD', 'GBPUSD', 'XAUUSD', 'GBPUSD']
+        assert second['EURUSD'] == first['EURUSD'] and not second['GBPUSD'] == first['GBPUSD']
+
+
+if __name__ == "__main__":
+    for test in (test_round_trip_and_metrics, test_key_covers_data_source_and_params,
+                 test_lru_eviction_by_size, test_portfolio_recomputes_changed_symbol_only):
+        test()
+        print(f"[OK] {test.__name__}")
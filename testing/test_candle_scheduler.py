@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test Candle Scheduler
+Verifies urgency ordering, cheap IN_TRADE checks and time-budget deferral
+(no MT5 connection required)
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.candle_scheduler import CandleScheduler
+
+
+class FakeClock:
+    """Monotonic clock advanced manually by the process callback"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+STATES = {
+    'EURUSD': 'SCANNING',
+    'GBPUSD': 'SCANNING',
+    'XAUUSD': 'ARMED_LONG',
+    'AUDUSD': 'IN_TRADE',
+    'USDJPY': 'WINDOW_OPEN',
+    'USDCHF': 'SCANNING',
+}
+
+
+def test_order_by_urgency():
+    """WINDOW_OPEN first, then ARMED, IN_TRADE, SCANNING in insertion order"""
+    scheduler = CandleScheduler(process_fn=lambda s: None, position_check_fn=lambda s: True)
+    assert scheduler.order(STATES) == ['USDJPY', 'XAUUSD', 'AUDUSD', 'EURUSD', 'GBPUSD', 'USDCHF']
+
+
+def test_in_trade_gets_position_check_only():
+    """Open position -> no full processing; closed position -> full processing"""
+    processed = []
+    scheduler = CandleScheduler(process_fn=processed.append, position_check_fn=lambda s: True)
+    report = scheduler.run_cycle(STATES)
+    assert 'AUDUSD' not in processed
+    assert report.position_checked == ['AUDUSD']
+    assert processed == ['USDJPY', 'XAUUSD', 'EURUSD', 'GBPUSD', 'USDCHF']
+
+    processed.clear()
+    scheduler = CandleScheduler(process_fn=processed.append, position_check_fn=lambda s: False)
+    scheduler.run_cycle(STATES)
+    assert 'AUDUSD' in processed
+
+
+def test_budget_defers_scanning_only():
+    """Slow urgent work spends the budget; SCANNING is deferred, breakouts are not"""
+    clock = FakeClock()
+    processed = []
+
+    def process(symbol):
+        processed.append(symbol)
+        clock.now += 10.0  # Every symbol takes 10 seconds
+
+    scheduler = CandleScheduler(process_fn=process, position_check_fn=lambda s: True,
+                                time_budget_seconds=15.0, clock=clock)
+    report = scheduler.run_cycle(STATES)
+    assert processed == ['USDJPY', 'XAUUSD']
+    assert report.deferred == ['EURUSD', 'GBPUSD', 'USDCHF']
+    assert report.symbol_seconds['USDJPY'] == 10.0
+
+
+def test_executor_processes_everything():
+    """Worker pool path processes all due symbols"""
+    processed = []
+    scheduler = CandleScheduler(process_fn=processed.append, position_check_fn=lambda s: False, max_workers=3)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        report = scheduler.run_cycle(STATES, executor=executor)
+    assert sorted(processed) == sorted(STATES)
+    assert sorted(report.processed) == sorted(STATES)
+    assert report.deferred == []
+
+
+def test_max_workers_bounds_in_flight():
+    """Submissions are bounded by the configured worker count, not the pool's internals"""
+    lock = threading.Lock()
+    counts = {'in_flight': 0, 'peak': 0}
+
+    def process(symbol):
+        with lock:
+            counts['in_flight'] += 1
+            counts['peak'] = max(counts['peak'], counts['in_flight'])
+        time.sleep(0.01)
+        with lock:
+            counts['in_flight'] -= 1
+
+    scheduler = CandleScheduler(process_fn=process, position_check_fn=lambda s: False, max_workers=2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        report = scheduler.run_cycle(STATES, executor=executor)
+    assert counts['peak'] == 2 and sorted(report.processed) == sorted(STATES)
+
+
+
+def test_batches_fetch_per_tier_on_workers():
+    """ARMED is fetched, prepared and processed before any SCANNING fetch; fetches run on the workers"""
+    clock = FakeClock()
+    events = []
+    fetch_threads = set()
+
+    def fetch(symbol):
+        fetch_threads.add(threading.current_thread().name)
+        events.append(('fetch', symbol))
+        return symbol.lower()
+
+    def process(symbol):
+        events.append(('process', symbol))
+        clock.now += 10.0
+
+    scheduler = CandleScheduler(process_fn=process, position_check_fn=lambda s: False,
+                                time_budget_seconds=35.0, clock=clock, max_workers=1,
+                                fetch_fn=fetch, prepare_fn=lambda fetched: events.append(('prepare', fetched)))
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='worker') as executor:
+        report = scheduler.run_cycle(STATES, executor=executor)
+
+    assert events[:4] == [('process', 'USDJPY'), ('fetch', 'XAUUSD'), ('prepare', {'XAUUSD': 'xauusd'}),
+                          ('process', 'XAUUSD')]
+    assert events[4:7] == [('fetch', 'AUDUSD'), ('prepare', {'AUDUSD': 'audusd'}), ('process', 'AUDUSD')]
+    assert fetch_threads == {'worker_0'}
+    # Budget spent after 4 symbols: the deferred symbols were never fetched
+    assert report.deferred == ['GBPUSD', 'USDCHF']
+    assert ('fetch', 'GBPUSD') not in events and ('fetch', 'USDCHF') not in events
+
+
+if __name__ == "__main__":
+    for test in (test_order_by_urgency, test_in_trade_gets_position_check_only,
+                 test_budget_defers_scanning_only, test_executor_processes_everything,
+                 test_max_workers_bounds_in_flight, test_batches_fetch_per_tier_on_workers):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test Connection Supervisor
+Verifies the CONNECTED -> DEGRADED -> RECONNECTING -> DOWN state machine,
+jittered backoff, fail-fast callers, queued retries and automatic resume
+from the background thread (no MT5 connection required)
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.connection_supervisor import (CONNECTED, DEGRADED, DOWN, RECONNECTING, ConnectionSupervisor,
+                                       ConnectionUnavailable)
+
+
+class FakeLink:
+    def __init__(self):
+        self.up = True
+        self.connects = 0
+
+    def probe(self):
+        return self.up
+
+    def connect(self):
+        self.connects += 1
+        return self.up
+
+
+def test_state_machine_and_backoff():
+    """A blip recovers without reconnecting; an outage goes DOWN but keeps retrying"""
+    link = FakeLink()
+    changes = []
+    supervisor = ConnectionSupervisor(link.connect, link.probe, probe_interval=30.0, base_backoff=2.0,
+                                      max_backoff=10.0, jitter=0.25, down_after=3, rng=random.Random(7),
+                                      on_state_change=lambda old, new, reason: changes.append(new))
+    supervisor.report_failure('IPC error')
+    assert supervisor.state == DEGRADED and supervisor.available
+    assert supervisor.step() == 30.0 and supervisor.state == CONNECTED and link.connects == 0
+
+    link.up = False
+    supervisor.step()
+    supervisor.step()
+    assert supervisor.state == RECONNECTING
+    delays = [supervisor.step() for _ in range(6)]
+    assert supervisor.state == DOWN and link.connects == 6
+    for attempt, delay in enumerate(delays, 1):
+        nominal = min(10.0, 2.0 * 2 ** (attempt - 1))
+        assert 0.75 * nominal <= delay <= 1.25 * nominal
+    assert len(set(delays[3:])) == 3  # Jitter: capped delays still differ
+
+    link.up = True
+    assert supervisor.step() == 30.0 and supervisor.state == CONNECTED and supervisor.attempts == 0
+    assert changes == [DEGRADED, CONNECTED, DEGRADED, RECONNECTING, DOWN, CONNECTED]
+
+
+def test_fail_fast_and_queued_retries():
+    """Callers fail fast while down; the re-sync finishes before CONNECTED, queued work runs after it"""
+    link = FakeLink()
+    order = []
+    supervisor = ConnectionSupervisor(link.connect, link.probe,
+                                      on_reconnected=lambda: order.append(('resync', supervisor.available)))
+    assert supervisor.run_when_connected(lambda: order.append('now'))
+
+    link.up = False
+    supervisor.report_failure()
+    supervisor.step()
+    try:
+        supervisor.check()
+        assert False, "expected ConnectionUnavailable"
+    except ConnectionUnavailable:
+        pass
+    assert not supervisor.run_when_connected(lambda: order.append('queued'))
+    supervisor.step()
+    link.up = True
+    supervisor.step()
+    assert order == ['now', ('resync', False), 'queued'] and supervisor.reconnects == 1
+
+
+def test_only_a_healthy_link_failure_wakes():
+    """report_failure wakes the supervisor on CONNECTED -> DEGRADED only, never during the backoff"""
+    link = FakeLink()
+    supervisor = ConnectionSupervisor(link.connect, link.probe)
+    link.up = False
+    supervisor.report_failure('IPC error')
+    assert supervisor._wake.is_set()
+    supervisor._wake.clear()
+    supervisor.report_failure('IPC error')
+    assert supervisor.state == DEGRADED and not supervisor._wake.is_set()
+    supervisor.step()
+    assert supervisor.state == RECONNECTING
+    supervisor.report_failure('IPC error')
+    assert not supervisor._wake.is_set()
+
+
+def test_background_thread_resumes_automatically():
+    """A reported failure wakes the thread at once; the link resumes without a restart"""
+    link = FakeLink()
+    resynced = threading.Event()
+    supervisor = ConnectionSupervisor(link.connect, link.probe, on_reconnected=resynced.set,
+                                      probe_interval=60.0, base_backoff=0.02, max_backoff=0.05)
+    supervisor.start()
+    try:
+        link.up = False
+        supervisor.report_failure('IPC error')
+        threading.Timer(0.2, lambda: setattr(link, 'up', True)).start()
+        started = time.time()
+        assert resynced.wait(2.0) and supervisor.wait_connected(1.0)
+        assert time.time() - started < 1.5 and supervisor.state == CONNECTED and link.connects >= 2
+    finally:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    for test in (test_state_machine_and_backoff, test_fail_fast_and_queued_retries,
+                 test_only_a_healthy_link_failure_wakes, test_background_thread_resumes_automatically):
+        test()
+        print(f"[OK] {test.__name__}")
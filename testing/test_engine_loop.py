@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test Engine Loop
+Verifies bar-close timing, cached market sessions, per-symbol task timeouts,
+late results of timed-out workers and thread-safe shutdown of the asyncio
+trading loop (no MT5 required)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.engine_loop import EngineLoop, SessionCache, seconds_to_next_bar_close, weekly_fx_session
+
+
+def test_bar_close_and_weekly_session():
+    """Timer targets boundary + delay; sessions flip at Saturday / Monday midnight"""
+    assert seconds_to_next_bar_close(1704067200 + 10, 300, 2.0) == 292
+    assert seconds_to_next_bar_close(1704067200 + 1, 300, 2.0) == 1
+    assert seconds_to_next_bar_close(1704067200 + 2, 300, 2.0) == 300
+
+    is_open, valid_for = weekly_fx_session(datetime(2024, 1, 5, 23, 0))  # Friday 23:00
+    assert is_open and valid_for == 3600
+    is_open, valid_for = weekly_fx_session(datetime(2024, 1, 7, 12, 0))  # Sunday noon
+    assert not is_open and valid_for == 12 * 3600
+
+
+def test_session_cache_refreshes_on_boundary():
+    """Lookups happen once per session, not once per pass"""
+    now = [0.0]
+    calls = []
+
+    def session_fn(symbol):
+        calls.append(symbol)
+        return True, 100.0
+
+    cache = SessionCache(session_fn, clock=lambda: now[0])
+    for _ in range(50):
+        assert cache.is_open('EURUSD')
+    now[0] = 101.0
+    cache.is_open('EURUSD')
+    assert calls == ['EURUSD', 'EURUSD']
+
+
+def test_cycle_runs_symbols_concurrently_with_timeouts():
+    """Slow symbols time out without blocking others and are skipped while still busy"""
+    release = threading.Event()
+    seen = []
+
+    def process(symbol):
+        seen.append(symbol)
+        if symbol == 'SLOW':
+            release.wait(5)
+
+    def session(symbol):
+        return symbol != 'CLOSED', 3600.0
+
+    engine = EngineLoop(['EURUSD', 'SLOW', 'CLOSED'], process, session_fn=session, symbol_timeout=0.2)
+
+    async def two_cycles():
+        first = await engine.run_cycle()
+        second = await engine.run_cycle()
+        release.set()
+        return first, second
+
+    first, second = asyncio.run(two_cycles())
+    assert first.processed == ['EURUSD'] and first.timed_out == ['SLOW'] and first.closed == ['CLOSED']
+    assert second.skipped_busy == ['SLOW'] and second.processed == ['EURUSD']
+    assert seen.count('SLOW') == 1
+
+
+def test_timed_out_worker_sees_its_cycle_closed():
+    """A worker finishing after its cycle ended is told so; on-time workers and outside callers are current"""
+    release = threading.Event()
+    finished = threading.Event()
+    current = {}
+
+    def process(symbol):
+        if symbol == 'SLOW':
+            release.wait(5)
+        current[symbol] = engine.in_current_cycle()
+        if symbol == 'SLOW':
+            finished.set()
+
+    engine = EngineLoop(['EURUSD', 'SLOW'], process, symbol_timeout=0.2)
+
+    async def cycle_then_late_result():
+        result = await engine.run_cycle()
+        release.set()
+        await asyncio.to_thread(finished.wait, 5)
+        return result
+
+    result = asyncio.run(cycle_then_late_result())
+    assert result.timed_out == ['SLOW']
+    assert current == {'EURUSD': True, 'SLOW': False}
+    assert engine.in_current_cycle()  # Not an engine worker
+
+
+def test_cycle_execution_runs_off_the_loop():
+    """A blocking on_cycle never holds up the next cycle; executions run in order on one thread"""
+    release = threading.Event()
+    executed = []
+
+    def on_cycle(result):
+        if result.cycle == 1:
+            release.wait(5)  # e.g. waiting for a trade confirmation
+        executed.append((result.cycle, threading.current_thread().name))
+
+    engine = EngineLoop(['EURUSD'], lambda symbol: None, on_cycle=on_cycle)
+
+    async def cycles():
+        await engine.run_cycle()
+        await engine.run_cycle()  # Not blocked by the first execution
+        ran_before_release = list(executed)
+        release.set()
+        await engine.drain(5)
+        return ran_before_release
+
+    assert asyncio.run(cycles()) == []
+    assert [cycle for cycle, _ in executed] == [1, 2]
+    assert len({name for _, name in executed}) == 1 and executed[0][1].startswith('engine-exec')
+
+
+def test_run_waits_for_bar_close_and_stops():
+    """run() fires once per bar close and stop() from another thread ends it promptly"""
+    fired = []
+    engine = EngineLoop(['EURUSD'], lambda s: fired.append(time.time()), timeframe_seconds=0.2, bar_close_delay=0.0)
+    threading.Timer(0.7, engine.stop).start()
+    started = time.time()
+    asyncio.run(engine.run())
+    assert 2 <= len(fired) <= 4 and time.time() - started < 1.5
+
+
+def test_requested_symbols_run_on_the_engine():
+    """request_symbols() from another thread runs an extra cycle for just those symbols on the workers"""
+    runs = []
+    engine = EngineLoop(['EURUSD', 'GBPUSD', 'USDJPY'], lambda s: runs.append((s, threading.current_thread())),
+                        timeframe_seconds=3600, bar_close_delay=0.0)
+    threading.Timer(0.1, engine.request_symbols, args=(['USDJPY', 'NZDUSD', 'EURUSD'],)).start()
+    threading.Timer(0.4, engine.stop).start()
+    asyncio.run(engine.run())
+    assert sorted(symbol for symbol, _ in runs) == ['EURUSD', 'USDJPY'] and engine.cycles == 1
+    assert all(thread is not threading.main_thread() for _, thread in runs)
+
+
+if __name__ == "__main__":
+    for test in (test_bar_close_and_weekly_session, test_session_cache_refreshes_on_boundary,
+                 test_cycle_runs_symbols_concurrently_with_timeouts, test_timed_out_worker_sees_its_cycle_closed,
+                 test_cycle_execution_runs_off_the_loop, test_run_waits_for_bar_close_and_stops,
+                 test_requested_symbols_run_on_the_engine):
+        test()
+        print(f"[OK] {test.__name__}")
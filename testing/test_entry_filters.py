@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Entry Filters
+Verifies the compiled filter plan: range evaluation equals bar-by-bar live
+evaluation, per-filter rejection bits and config edge cases (no MT5 connection required)
+"""
+
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.entry_filters import (FILTER_ANGLE, FILTER_ATR, FILTER_ATR_CHANGE, FILTER_CANDLE,
+                               FILTER_EMA_ORDER, FILTER_PRICE, FILTER_TIME, FilterPlan,
+                               describe_rejections, minutes_of_day)
+
+ALL_LONG = {
+    'LONG_USE_ATR_FILTER': 'True', 'LONG_ATR_MIN_THRESHOLD': '0.0002', 'LONG_ATR_MAX_THRESHOLD': '0.0009',
+    'LONG_USE_ATR_INCREMENT_FILTER': 'True', 'LONG_ATR_INCREMENT_MIN_THRESHOLD': '0.0',
+    'LONG_ATR_INCREMENT_MAX_THRESHOLD': '0.0001',
+    'LONG_USE_ANGLE_FILTER': 'True', 'LONG_MIN_ANGLE': '10', 'LONG_MAX_ANGLE': '85',
+    'LONG_USE_PRICE_FILTER_EMA': 'True', 'ema_filter_price_length': '20',
+    'LONG_USE_CANDLE_DIRECTION_FILTER': 'True', 'LONG_USE_EMA_ORDER_CONDITION': 'True',
+    'LONG_USE_EMA_BELOW_PRICE_FILTER': 'True',
+    'Use Time Range Filter': 'True', 'Entry Start Hour (UTC)': '7', 'Entry Start Minute': '0',
+    'Entry End Hour (UTC)': '17', 'Entry End Minute': '0',
+}
+
+
+def _bars(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 2e-4, n))
+    open_ = close - rng.normal(0, 1e-4, n)
+    atr = np.abs(rng.normal(5e-4, 2e-4, n))
+    times = np.datetime64('2025-01-06T00:00') + np.arange(n) * np.timedelta64(5, 'm')
+    return open_, close, atr, times
+
+
+def test_range_matches_last_bar():
+    """One range evaluation equals the live last-bar check on every prefix"""
+    open_, close, atr, times = _bars()
+    plan = FilterPlan(ALL_LONG, 'LONG')
+    periods = {'ema_fast': 5, 'ema_medium': 8, 'ema_slow': 13}
+    inputs = plan.build_inputs(open_, close, atr=atr, times=times, utc_offset_hours=2, ema_periods=periods)
+    passed, rejected = plan.evaluate(inputs)
+    assert passed.any() and (~passed).any()
+
+    for stop in range(1, len(close) + 1, 7):
+        prefix = plan.build_inputs(open_[:stop], close[:stop], atr=atr[:stop], times=times[:stop],
+                                   utc_offset_hours=2, ema_periods=periods)
+        ok, bits = plan.evaluate_last(prefix)
+        assert ok == passed[stop - 1] and bits == rejected[stop - 1], stop
+
+
+def test_atr_change_uses_signal_atr():
+    """ATR change is measured from signal detection ATR when available"""
+    plan = FilterPlan(ALL_LONG, 'LONG')
+    inputs = {'close': np.ones(3), 'atr': np.array([0.0005, 0.0005, 0.0005])}
+    assert plan.evaluate_last(inputs, FILTER_ATR | FILTER_ATR_CHANGE) == (True, 0)  # 1-bar change 0
+    inputs['signal_atr'] = 0.0003  # +0.0002 since signal > max increment
+    assert plan.evaluate_last(inputs, FILTER_ATR | FILTER_ATR_CHANGE) == (False, FILTER_ATR_CHANGE)
+    inputs['atr'] = np.array([0.0005, 0.0005, 0.0012])
+    _, bits = plan.evaluate_last(inputs, FILTER_ATR)
+    assert describe_rejections(bits) == ['ATR']
+
+
+def test_time_window_overnight_and_offset():
+    """Broker time is shifted to UTC; overnight windows wrap around midnight"""
+    config = {'Use Time Range Filter': 'True', 'Entry Start Hour (UTC)': '22', 'Entry Start Minute': '0',
+              'Entry End Hour (UTC)': '2', 'Entry End Minute': '0'}
+    plan = FilterPlan(config, 'LONG')
+    times = np.array(['2025-01-06T23:30', '2025-01-07T04:00', '2025-01-07T05:00'], dtype='datetime64[m]')
+    inputs = {'close': np.ones(3), 'utc_minutes': minutes_of_day(times, utc_offset_hours=2)}
+    passed, rejected = plan.evaluate(inputs)
+    # UTC 21:30 (out), 02:00 (in, inclusive), 03:00 (out)
+    assert passed.tolist() == [False, True, False]
+    assert rejected.tolist() == [FILTER_TIME, 0, FILTER_TIME]
+
+
+def test_short_history_and_disabled_filters_pass():
+    """Bars without enough history pass a filter; disabled filters never reject"""
+    plan = FilterPlan(ALL_LONG, 'LONG')
+    close = np.linspace(1.2, 1.0, 30)  # Falling: price below filter EMA, bearish angle
+    inputs = plan.build_inputs(close + 0.001, close)
+    passed, rejected = plan.evaluate(inputs, filters=FILTER_PRICE | FILTER_ANGLE | FILTER_CANDLE)
+    assert not (rejected[:4] & FILTER_ANGLE).any()      # Angle needs 5 bars
+    assert not (rejected[:19] & FILTER_PRICE).any()     # Price filter needs 20 bars
+    assert (rejected[19:] & FILTER_PRICE).all()
+    assert FilterPlan({}, 'LONG').evaluate(inputs)[0].all()
+
+
+def test_invalid_threshold_blocks():
+    """Unparseable thresholds reject every bar for that filter only"""
+    plan = FilterPlan({'LONG_USE_ANGLE_FILTER': 'True', 'LONG_MIN_ANGLE': 'abc',
+                       'LONG_USE_EMA_ORDER_CONDITION': 'False'}, 'LONG')
+    passed, rejected = plan.evaluate({'close': np.ones(10)})
+    assert not passed.any()
+    assert (rejected == FILTER_ANGLE).all()
+    assert not plan.enabled & FILTER_EMA_ORDER
+
+
+if __name__ == "__main__":
+    for test in (test_range_matches_last_bar, test_atr_change_uses_signal_atr,
+                 test_time_window_overnight_and_offset, test_short_history_and_disabled_filters_pass,
+                 test_invalid_threshold_blocks):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Equity Buffer
+Verifies the preallocated equity buffers, backtrader date conversion and
+vectorized end-of-run metrics against the SunriseOgle.stop() loop formulas
+(no backtrader required)
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.backtest_cache import BacktestResult
+from src.equity_buffer import (PERIODS_PER_YEAR_M5, EquityBuffer, EquityRecorder, bt_num_to_epoch,
+                               equity_metrics)
+
+
+def _loop_metrics(values):
+    """Reference: the per-element loops of SunriseOgle.stop()"""
+    peak, max_dd = values[0], 0.0
+    for value in values:
+        peak = max(peak, value)
+        max_dd = max(max_dd, (peak - value) / peak * 100.0)
+    returns = np.array([(values[i] - values[i - 1]) / values[i - 1] for i in range(1, len(values))])
+    sharpe = (returns.mean() * PERIODS_PER_YEAR_M5) / (returns.std() * np.sqrt(PERIODS_PER_YEAR_M5))
+    return max_dd, sharpe
+
+
+def test_buffer_grows_and_keeps_order():
+    """Appends beyond the preallocated capacity keep every value and timestamp"""
+    buffer = EquityBuffer(capacity=4)
+    for i in range(10):
+        buffer.append(50000.0 + i, 1704067200 + 300 * i)
+    assert len(buffer) == 10 and buffer.capacity >= 10
+    assert buffer.values.dtype == np.float64 and buffer.times.dtype == np.int64
+    assert buffer.values.tolist() == [50000.0 + i for i in range(10)]
+    assert buffer.times[-1] == 1704067200 + 2700
+
+
+def test_vectorized_metrics_match_loops():
+    """Drawdown and Sharpe equal the strategy's loop implementation"""
+    values = list(50000.0 + np.cumsum(np.random.default_rng(3).normal(0, 25, 2000)))
+    metrics = equity_metrics(values, gross_profit=300.0, gross_loss=200.0)
+    max_dd, sharpe = _loop_metrics(values)
+    assert abs(metrics['max_drawdown_pct'] - max_dd) < 1e-9
+    assert abs(metrics['sharpe_ratio'] - sharpe) < 1e-9
+    assert metrics['profit_factor'] == 1.5
+    assert equity_metrics([50000.0] * 5)['sharpe_ratio'] == 0.0  # Too short for Sharpe
+
+
+def test_recorder_reads_backtrader_lines():
+    """Recorder converts backtrader date numbers to epoch seconds without datetimes"""
+    moment = datetime(2024, 1, 2, 9, 35)
+    bt_num = moment.toordinal() + (9 * 60 + 35) / 1440.0
+    assert bt_num_to_epoch(bt_num) == int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+    strategy = type('Strategy', (), {})()
+    strategy.broker = type('Broker', (), {'get_value': lambda self: 51000.0})()
+    strategy.data = type('Data', (), {'datetime': [bt_num], 'buflen': lambda self: 100})()
+    recorder = EquityRecorder(strategy)
+    recorder.next()
+    assert recorder.buffer.capacity == 100 and recorder.buffer.values[0] == 51000.0
+
+    result = BacktestResult.from_trade_reports([], 51000.0, equity=recorder.buffer)
+    assert result.equity_times[0] == np.datetime64(moment, 's')
+
+
+if __name__ == "__main__":
+    for test in (test_buffer_grows_and_keeps_order, test_vectorized_metrics_match_loops,
+                 test_recorder_reads_backtrader_lines):
+        test()
+        print(f"[OK] {test.__name__}")
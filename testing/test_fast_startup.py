@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Fast Startup
+Verifies that importing the monitor loads neither matplotlib nor the
+backtrader signal adapter, and that symbol specs are prefetched in parallel,
+applied to symbols loaded offline, and restored from the snapshot on the
+next start (no MT5 connection required)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import RATES_DTYPE, ReplayMT5, headless_monitor_class, load_monitor_module, patched_globals
+from src.symbol_spec_cache import SymbolSpecCache
+
+DEFERRED_MODULES = ('matplotlib', 'backtrader', 'sunrise_signal_adapter', 'strategies.sunrise_ogle_eurusd')
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {PROJECT_ROOT!r})
+from src.live_replay import load_monitor_module
+module = load_monitor_module()
+print(json.dumps({{'seconds': time.perf_counter() - started,
+                  'loaded': [name for name in {DEFERRED_MODULES!r} if name in sys.modules],
+                  'adapter': module.sunrise_signal_adapter is not None, 'figure': module.Figure is not None}}))
+"""
+
+
+def _rates(n=200):
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1704067200 + np.arange(n) * 300
+    rates['open'] = rates['high'] = rates['low'] = rates['close'] = 1.1
+    return rates
+
+
+def test_import_defers_charts_and_signal_adapter():
+    """A cold import of the monitor module leaves matplotlib, backtrader and the strategies unloaded"""
+    output = subprocess.run([sys.executable, '-c', PROBE], capture_output=True, text=True, check=True,
+                            cwd=tempfile.gettempdir()).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    assert probe['loaded'] == [] and not probe['adapter'] and not probe['figure']
+    print(f"    monitor module cold import: {probe['seconds'] * 1000:.0f} ms")
+
+
+def test_spec_prefetch_digits_and_snapshot():
+    """Offline-loaded symbols get the terminal's digits after the parallel prefetch; the snapshot restores them"""
+    module = load_monitor_module()
+    stub = ReplayMT5({'EURUSD': _rates(), 'XAUUSD': _rates(), 'USDJPY': _rates()})
+    workdir = tempfile.mkdtemp()
+    previous_cwd = os.getcwd()
+    with patched_globals(module, mt5=stub, pd=pd, np=np):
+        monitor = headless_monitor_class(module)()
+        monitor.symbol_specs = SymbolSpecCache()
+        for symbol in stub.rates:
+            monitor.load_symbol_config(symbol)
+            monitor.strategy_states[symbol].digits = 5  # As loaded before the terminal answered
+        monitor.symbol_specs.clear()
+
+        monitor.prefetch_symbol_specs(list(stub.rates))
+        assert set(monitor.symbol_specs.specs()) == set(stub.rates)
+        monitor.apply_symbol_digits()
+        digits = {symbol: state.digits for symbol, state in monitor.strategy_states.items()}
+        assert digits == {'EURUSD': 5, 'XAUUSD': 2, 'USDJPY': 3}
+
+        try:
+            os.chdir(workdir)
+            monitor.save_symbol_spec_snapshot()
+            restarted = headless_monitor_class(module)()
+            restarted.symbol_specs = SymbolSpecCache()
+            restarted.load_symbol_spec_snapshot()
+        finally:
+            os.chdir(previous_cwd)
+        assert restarted.symbol_specs.get('XAUUSD').digits == 2  # No terminal bound: served from the snapshot
+
+
+def test_snapshot_digits_survive_first_config_load():
+    """load_symbol_config binds the terminal without wiping the snapshot it was seeded from"""
+    module = load_monitor_module()
+    live = SymbolSpecCache(ReplayMT5({'XAUUSD': _rates(), 'USDJPY': _rates()}))
+    live.get_many(['XAUUSD', 'USDJPY'])
+    path = os.path.join(tempfile.mkdtemp(), 'specs.json')
+    live.save(path)
+
+    connecting = SimpleNamespace(symbol_info=lambda symbol: None, account_info=lambda: None)  # Not answering yet
+    with patched_globals(module, mt5=connecting, pd=pd, np=np):
+        monitor = headless_monitor_class(module)()
+        monitor.symbol_specs = SymbolSpecCache.from_snapshot(path)
+        for symbol in ('XAUUSD', 'USDJPY'):
+            monitor.load_symbol_config(symbol)
+    assert monitor.symbol_specs.terminal is connecting
+    assert {symbol: monitor.strategy_states[symbol].digits for symbol in ('XAUUSD', 'USDJPY')} == {'XAUUSD': 2, 'USDJPY': 3}
+
+    monitor.symbol_specs.bind(ReplayMT5({}))  # A different terminal still drops the old entries
+    assert monitor.symbol_specs.specs() == {}
+
+
+if __name__ == "__main__":
+    for test in (test_import_defers_charts_and_signal_adapter, test_spec_prefetch_digits_and_snapshot,
+                 test_snapshot_digits_survive_first_config_load):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Indicator Batch
+Verifies the vectorized multi-symbol EMA/ATR batch matches the per-symbol
+pandas calculation used by calculate_indicators (no MT5 connection required)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.indicator_batch import IndicatorBatch, ema_matrix
+
+
+def _random_bars(rng, n, start=1.1):
+    close = start + np.cumsum(rng.normal(0, 1e-3, n))
+    high = close + np.abs(rng.normal(0, 5e-4, n))
+    low = close - np.abs(rng.normal(0, 5e-4, n))
+    return close, high, low
+
+
+def _pandas_reference(close, high, low, periods):
+    df = pd.DataFrame({'close': close, 'high': high, 'low': low})
+    ref = {name: df['close'].ewm(span=period, adjust=False).mean().iloc[-1]
+           for name, period in periods.items() if name != 'atr'}
+    ranges = pd.concat([df['high'] - df['low'],
+                        np.abs(df['high'] - df['close'].shift()),
+                        np.abs(df['low'] - df['close'].shift())], axis=1)
+    ref['atr'] = np.max(ranges, axis=1).rolling(periods['atr']).mean().iloc[-1]
+    return ref
+
+
+def test_batch_matches_pandas():
+    """Mixed lengths and periods (incl. shared periods) match pandas to 1e-12"""
+    rng = np.random.default_rng(7)
+    batch = IndicatorBatch()
+    expected = {}
+    for index, bars in enumerate([150, 150, 120, 101]):
+        close, high, low = _random_bars(rng, bars)
+        periods = {'ema_fast': 18, 'ema_medium': 18 if index == 0 else 20,
+                   'ema_slow': 24, 'ema_filter': 100, 'atr': 10 + index}
+        batch.add(f'SYM{index}', close, high, low, periods)
+        expected[f'SYM{index}'] = _pandas_reference(close, high, low, periods)
+
+    results = batch.compute()
+    for symbol, values in expected.items():
+        for name, value in values.items():
+            assert abs(results[symbol][name] - value) < 1e-12, (symbol, name)
+
+
+def test_shared_periods_share_rows():
+    """Symbols with identical (symbol, period) pairs reuse one recurrence row"""
+    batch = IndicatorBatch()
+    close = np.linspace(1.0, 2.0, 50)
+    batch.add('A', close, close, close, {'ema_fast': 10, 'ema_medium': 10})
+    rows, output_row = batch.ema_rows()
+    assert len(rows) == 1
+    assert output_row[(0, 'ema_fast')] == output_row[(0, 'ema_medium')]
+
+
+def test_adjusted_ema_matches_pandas_default():
+    """adjust=True recurrence matches pandas ewm default, leading NaN padding allowed"""
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(2, 60))
+    values[1, :7] = np.nan
+    result = ema_matrix(values, [5, 9], adjust=True)
+    for row, span in enumerate([5, 9]):
+        reference = pd.Series(values[row]).ewm(span=span).mean().values
+        assert np.allclose(reference, result[row], equal_nan=True)
+
+
+if __name__ == "__main__":
+    for test in (test_batch_matches_pandas, test_shared_periods_share_rows,
+                 test_adjusted_ema_matches_pandas_default):
+        test()
+        print(f"[OK] {test.__name__}")
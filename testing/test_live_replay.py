@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test Live Replay
+Verifies the headless replay of the live monitor: MT5 stub bar windows and
+SL/TP fills, trade-report parsing, event diffing and chunked replay stitching
+(no MT5 connection or Tk window required)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import (EVENT_ARMED, EVENT_ENTRY, RATES_DTYPE, ReplayEvent, ReplayMT5, diff_events,
+                             parse_trade_report, replay_symbols)
+
+# Filters off so synthetic random-walk bars produce ARMED / WINDOW_OPEN / ENTRY events
+NO_FILTERS = {'LONG_USE_ATR_FILTER': 'False', 'LONG_USE_ATR_INCREMENT_FILTER': 'False',
+              'LONG_USE_ATR_DECREMENT_FILTER': 'False', 'LONG_USE_PRICE_FILTER_EMA': 'False',
+              'LONG_USE_ANGLE_FILTER': 'False'}
+
+
+def _rates(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 3e-4, n))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 5e-5, n)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1704067200 + np.arange(n) * 300  # 2024-01-01 00:00, M5
+    rates['open'], rates['close'] = open_, close
+    rates['high'] = np.maximum(open_, close) + np.abs(rng.normal(0, 2e-4, n))
+    rates['low'] = np.minimum(open_, close) - np.abs(rng.normal(0, 2e-4, n))
+    return rates
+
+
+def test_mt5_stub_window_and_fills():
+    """copy_rates_from_pos ends at the forming bar; SL/TP settle on the next closed bar"""
+    rates = _rates(50)
+    stub = ReplayMT5({'EURUSD': rates})
+    stub.set_cursor('EURUSD', 20)
+    window = stub.copy_rates_from_pos('EURUSD', stub.TIMEFRAME_M5, 0, 5)
+    assert window['time'].tolist() == rates['time'][16:21].tolist()
+
+    price = float(rates['close'][19])
+    result = stub.order_send({'symbol': 'EURUSD', 'type': stub.ORDER_TYPE_BUY, 'volume': 0.1,
+                              'price': price, 'sl': price - 1.0, 'tp': price + 1e-9})
+    assert result.retcode == stub.TRADE_RETCODE_DONE and len(stub.positions_get(symbol='EURUSD')) == 1
+    stub.set_cursor('EURUSD', 21)  # Bar 20 closes above the 0-distance target
+    assert stub.positions_get(symbol='EURUSD') == ()
+    assert stub.closed_trades[0].exit_reason == 'TP'
+
+
+def test_trade_report_and_diff():
+    """Trade report entries parse; diff matches within tolerance and lists misses/extras"""
+    report = ("ENTRY #1\nTime: 2024-01-02 10:05:00\nDirection: LONG\nATR Current: 0.000500\n"
+              + "-" * 50 + "\n\nEXIT #1\nTime: 2024-01-02 12:00:00\nExit Reason: TP\n"
+              + "ENTRY #2\nTime: 2024-01-03 09:00:00\nDirection: LONG\n")
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+        f.write(report)
+    try:
+        reference = parse_trade_report(f.name)
+    finally:
+        os.unlink(f.name)
+    assert [e.time for e in reference] == [datetime(2024, 1, 2, 10, 5), datetime(2024, 1, 3, 9, 0)]
+
+    live = [ReplayEvent(EVENT_ENTRY, 'LONG', datetime(2024, 1, 2, 10, 10)),
+            ReplayEvent(EVENT_ENTRY, 'LONG', datetime(2024, 1, 4, 9, 0)),
+            ReplayEvent(EVENT_ARMED, 'LONG', datetime(2024, 1, 2, 9, 50))]
+    exact = diff_events(live, reference)
+    assert exact.kinds == (EVENT_ENTRY,) and exact.matched[EVENT_ENTRY] == 0 and not exact.ok
+    loose = diff_events(live, reference, tolerance=timedelta(minutes=5))
+    assert loose.matched[EVENT_ENTRY] == 1
+    assert loose.missing == [reference[1]] and loose.extra == [live[1]]
+
+
+def test_chunked_replay_matches_serial():
+    """Live path replay produces events; chunks stitched at a sync bar equal one serial run"""
+    job = {'symbol': 'EURUSD', 'rates': _rates(700), 'config_overrides': NO_FILTERS, 'utc_offset': 0}
+    serial = replay_symbols([job], processes=1)['EURUSD']
+    chunked = replay_symbols([job], processes=1, chunks=2, overlap_bars=200)['EURUSD']
+
+    assert any(e.kind == EVENT_ARMED for e in serial.events)
+    assert not chunked.unsynced
+    assert chunked.bars == serial.bars
+    assert diff_events(chunked.events, serial.events).ok
+
+
+
+def test_chunked_replay_with_atr_increment_filter():
+    """The ATR increment filter (signal ATR carried across bars) stays exact across a chunk boundary"""
+    overrides = dict(NO_FILTERS, LONG_USE_ATR_FILTER='True', LONG_ATR_MIN_THRESHOLD='0',
+                     LONG_ATR_MAX_THRESHOLD='1', LONG_USE_ATR_INCREMENT_FILTER='True',
+                     LONG_ATR_INCREMENT_MIN_THRESHOLD='0', LONG_ATR_INCREMENT_MAX_THRESHOLD='0.00005',
+                     LONG_USE_ATR_DECREMENT_FILTER='True', LONG_ATR_DECREMENT_MIN_THRESHOLD='-0.00005',
+                     LONG_ATR_DECREMENT_MAX_THRESHOLD='0')
+    job = {'symbol': 'EURUSD', 'rates': _rates(700), 'config_overrides': overrides, 'utc_offset': 0}
+    serial = replay_symbols([job], processes=1)['EURUSD']
+    chunked = replay_symbols([job], processes=1, chunks=2, overlap_bars=200)['EURUSD']
+
+    assert any(e.kind == EVENT_ENTRY for e in serial.events)
+    assert not chunked.unsynced
+    assert diff_events(chunked.events, serial.events).ok
+
+
+if __name__ == "__main__":
+    for test in (test_mt5_stub_window_and_fills, test_trade_report_and_diff,
+                 test_chunked_replay_matches_serial, test_chunked_replay_with_atr_increment_filter):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Micro Benchmarks
+Verifies the timing harness (untimed setup, percentiles, allocation peaks),
+baseline regression checks, and that the hot-path suite builds and runs on
+the headless monitor (no MT5 connection required)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.microbench import Benchmark, BenchResult, compare, format_table, load_baseline, measure, save_baseline
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_hot_path import build_benchmarks, hot_path_fixture
+
+
+def test_measure_excludes_setup_and_traces_allocations():
+    """Setup time is not counted; a 1 MB allocation shows up in the peak"""
+    slow_setup = measure(Benchmark('noop', lambda: None, setup=lambda: time.sleep(0.001)),
+                         min_time=0.0, min_calls=20, warmup=1)
+    assert slow_setup.calls == 20 and slow_setup.p50_us < 500.0
+    assert slow_setup.p50_us <= slow_setup.p99_us and slow_setup.ops_per_sec > 2000
+
+    allocating = measure(Benchmark('alloc', lambda: bytearray(1 << 20)), min_time=0.0, min_calls=5)
+    assert allocating.alloc_kb >= 1000.0 and slow_setup.alloc_kb < 1.0
+
+
+def test_baseline_round_trip_and_regressions():
+    """Slower p50 / bigger allocations beyond the threshold fail; noise and new benchmarks do not"""
+    path = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+    assert load_baseline(path) is None
+    save_baseline(path, [BenchResult('phase', 100, 10000.0, 100.0, 100.0, 150.0, 8.0),
+                         BenchResult('tiny', 100, 1e6, 1.0, 1.0, 2.0, 0.1)])
+    save_baseline(path, [BenchResult('log', 100, 5000.0, 200.0, 200.0, 300.0, 50.0)])  # Merged in
+    stored = load_baseline(path)['results']
+    assert set(stored) == {'phase', 'tiny', 'log'}
+
+    current = [BenchResult('phase', 100, 7000.0, 140.0, 140.0, 200.0, 8.0),     # +40% p50
+               BenchResult('tiny', 100, 5e5, 2.0, 2.0, 3.0, 0.1),               # +100%, under the noise floor
+               BenchResult('log', 100, 5000.0, 200.0, 210.0, 300.0, 90.0),      # Allocation peak +80%
+               BenchResult('fresh', 100, 10.0, 1e5, 1e5, 1e5, 1.0)]             # Not in the baseline
+    regressions = compare(current, stored, threshold=0.25)
+    assert [(r.name, r.metric) for r in regressions] == [('phase', 'p50_us'), ('log', 'alloc_kb')]
+    assert abs(regressions[0].ratio - 1.4) < 1e-9
+    assert not compare(current, stored, threshold=0.5, check_allocations=False)
+
+    table = format_table(current, stored)
+    assert '+40%' in table and 'new' in table.splitlines()[-1]
+
+
+def test_hot_path_suite_runs():
+    """Every hot-path benchmark builds on the headless monitor and produces timings"""
+    with hot_path_fixture() as fixture:
+        benchmarks = build_benchmarks(fixture)
+        results = [measure(bench, min_time=0.0, min_calls=2, warmup=1, alloc_calls=1) for bench in benchmarks]
+        workdir = os.getcwd()
+    assert os.getcwd() != workdir and not os.path.exists(workdir)  # State file written to a scratch dir
+    names = [r.name for r in results]
+    for expected in ('calculate_indicators', 'detect_ema_crossovers', 'determine_strategy_phase[SCANNING]',
+                     'determine_strategy_phase[ARMED_LONG]', 'determine_strategy_phase[WINDOW_OPEN]',
+                     'determine_strategy_phase[IN_TRADE]', 'entry_filters[breakout]', 'parse_strategy_config',
+                     'save_strategy_state', 'terminal_log[critical]'):
+        assert expected in names
+    assert all(r.p50_us > 0 and r.alloc_kb is not None for r in results)
+
+
+if __name__ == "__main__":
+    for test in (test_measure_excludes_setup_and_traces_allocations, test_baseline_round_trip_and_regressions,
+                 test_hot_path_suite_runs):
+        test()
+        print(f"[OK] {test.__name__}")
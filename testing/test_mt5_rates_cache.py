@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test MT5 Rates Cache
+Verifies delta updates against a fake terminal: forming-bar replacement,
+gaps wider than the head window, history rewinds, read-only views and
+hit/miss counters, and that the monitor, the signal adapter and the
+connector share one cache bound to one terminal (no MT5 connection required)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import RATES_DTYPE
+from src.mt5_rates_cache import RatesCache
+
+M5 = 5
+
+# Fresh interpreter with a stand-in MetaTrader5 module, so every consumer wraps a terminal
+SHARING_PROBE = f"""
+import json, sys, types
+sys.path.insert(0, {PROJECT_ROOT!r})
+terminal = types.ModuleType('MetaTrader5')
+terminal.initialize = lambda: True
+terminal.last_error = lambda: (1, 'Success')
+terminal.TIMEFRAME_M5 = 5
+sys.modules['MetaTrader5'] = terminal
+from src.live_replay import headless_monitor_class, load_monitor_module
+import src.mt5_live_trading_connector as connector
+import src.sunrise_signal_adapter as adapter
+import src.mt5_rates_cache as rates_cache
+gui = load_monitor_module()
+monitor = headless_monitor_class(gui)()
+provider = adapter.MT5DataProvider()
+connected = provider.connect()
+shared = rates_cache.shared_rates_cache()
+print(json.dumps({{
+    'module': gui.mt5_rates_cache is rates_cache,
+    'cache': monitor.rates_cache is shared and provider.rates_cache is shared
+             and connector.shared_rates_cache() is shared,
+    'terminal': gui.mt5 is connector.mt5 is adapter.mt5 and gui.mt5.unwrapped is terminal,
+    'bound': connected and shared.terminal is gui.mt5,
+}}))
+"""
+
+
+class FakeTerminal:
+    """copy_rates_from_pos over a fixed history; ``cursor`` is the forming bar"""
+
+    def __init__(self, n=2000):
+        self.rates = np.zeros(n, dtype=RATES_DTYPE)
+        self.rates['time'] = 1704067200 + 300 * np.arange(n)
+        self.rates['close'] = 1.1 + np.arange(n) * 1e-5
+        self.cursor = 500
+        self.requested = []
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        self.requested.append(count)
+        end = self.cursor + 1
+        return self.rates[max(end - count, 0):end].copy()
+
+    def expected(self, count):
+        return self.rates[self.cursor + 1 - count:self.cursor + 1]
+
+
+def test_delta_updates_match_full_fetch():
+    """Each new bar transfers only the head window; results equal a full fetch"""
+    terminal = FakeTerminal()
+    cache = RatesCache(terminal)
+    assert np.array_equal(cache.get_rates('EURUSD', M5, 151), terminal.expected(151))
+    for _ in range(400):  # Crosses the buffer capacity, forcing compaction
+        terminal.cursor += 1
+        assert np.array_equal(cache.get_rates('EURUSD', M5, 151), terminal.expected(151))
+    assert cache.stats.misses == 1 and cache.stats.hits == 400
+    assert max(terminal.requested[1:]) == 3
+
+    smaller = cache.get_rates('EURUSD', M5, 101)  # Served from the same cached series
+    assert np.array_equal(smaller, terminal.expected(101)) and cache.stats.misses == 1
+
+
+def test_forming_bar_replaced_and_views_read_only():
+    """A revised forming bar overwrites the cached one; views cannot modify the cache"""
+    terminal = FakeTerminal()
+    cache = RatesCache(terminal)
+    cache.get_rates('EURUSD', M5, 50)
+    terminal.rates['close'][terminal.cursor] += 0.01
+    rates = cache.get_rates('EURUSD', M5, 50)
+    assert rates['close'][-1] == terminal.rates['close'][terminal.cursor]
+    try:
+        rates['close'][0] = 0.0
+        assert False, "view should be read-only"
+    except ValueError:
+        pass
+
+
+def test_gaps_rewinds_and_bulk():
+    """Gaps widen the head window; a rewound history triggers a full refetch"""
+    terminal = FakeTerminal()
+    cache = RatesCache(terminal)
+    cache.get_rates('EURUSD', M5, 151)
+    terminal.cursor += 20  # Missed 20 bars (e.g. after a reconnect)
+    assert np.array_equal(cache.get_rates('EURUSD', M5, 151), terminal.expected(151))
+    assert cache.stats.misses == 1 and cache.stats.delta_fetches == 3  # 3 -> 12 -> 48 bars
+
+    terminal.cursor -= 100  # Different server / history reload
+    assert np.array_equal(cache.get_rates('EURUSD', M5, 151), terminal.expected(151))
+    assert cache.stats.misses == 2
+
+    many = cache.get_rates_many(['EURUSD', 'GBPUSD'], M5, 60)
+    assert list(many) == ['EURUSD', 'GBPUSD'] and all(len(r) == 60 for r in many.values())
+    cache.bind(FakeTerminal())
+    assert cache.get_rates('EURUSD', M5, 60) is not None and cache.stats.misses == 4
+
+
+def test_monitor_adapter_and_connector_share_one_cache():
+    """The monitor, the adapter's data provider and the connector get the same cache and terminal objects"""
+    output = subprocess.run([sys.executable, '-c', SHARING_PROBE], capture_output=True, text=True, check=True,
+                            cwd=PROJECT_ROOT).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == {'module': True, 'cache': True, 'terminal': True,
+                                                            'bound': True}
+
+
+if __name__ == "__main__":
+    for test in (test_delta_updates_match_full_fetch, test_forming_bar_replaced_and_views_read_only,
+                 test_gaps_rewinds_and_bulk, test_monitor_adapter_and_connector_share_one_cache):
+        test()
+        print(f"[OK] {test.__name__}")
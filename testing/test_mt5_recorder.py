@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test MT5 Recorder
+Verifies that a recorded session replays the same results (namedtuples,
+rates arrays, errors, constants) deterministically and offline, and that the
+rates cache runs unchanged on top of the replayer (no MT5 connection required)
+"""
+
+import collections
+import gzip
+import os
+import sys
+import tempfile
+import types
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import RATES_DTYPE
+from src.mt5_rates_cache import RatesCache
+from src.mt5_recorder import MT5Recorder, MT5Replayer, ReplayMismatch, terminal_from_env
+
+Tick = collections.namedtuple('Tick', 'time bid ask')
+TradePosition = collections.namedtuple('TradePosition', 'ticket symbol type volume price_open')
+
+
+def fake_terminal():
+    """Module-like terminal: constants, struct results, rates and an IPC failure"""
+    bars = np.zeros(200, dtype=RATES_DTYPE)
+    bars['time'] = 1704067200 + 300 * np.arange(200)
+    bars['close'] = 1.1 + 0.0001 * np.arange(200)
+    state = {'ticks': 0}
+
+    def symbol_info_tick(symbol):
+        state['ticks'] += 1
+        return Tick(1704067200 + state['ticks'], 1.1 + state['ticks'] * 1e-5, 1.1002 + state['ticks'] * 1e-5)
+
+    def copy_rates_from_pos(symbol, timeframe, start, count):
+        return bars[len(bars) - start - count:len(bars) - start].copy()
+
+    def order_send(request):
+        raise OSError("IPC send failed")
+
+    terminal = types.ModuleType('FakeMetaTrader5')
+    terminal.TIMEFRAME_M5 = 5
+    terminal.ORDER_TYPE_BUY = 0
+    terminal.symbol_info_tick = symbol_info_tick
+    terminal.copy_rates_from_pos = copy_rates_from_pos
+    terminal.positions_get = lambda symbol=None: (TradePosition(11386157, symbol, 0, 0.35, 1.16306),)
+    terminal.order_send = order_send
+    terminal.last_error = lambda: (-10004, 'No IPC connection')
+    return terminal
+
+
+def test_record_then_replay_offline():
+    """Same results, types and errors come back without the terminal"""
+    path = os.path.join(tempfile.mkdtemp(), 'logs', 'session.mt5rec')
+    live = MT5Recorder(fake_terminal(), path)
+    ticks = [live.symbol_info_tick('EURUSD') for _ in range(3)]
+    rates = live.copy_rates_from_pos('EURUSD', live.TIMEFRAME_M5, 0, 50)
+    positions = live.positions_get(symbol='EURUSD')
+    try:
+        live.order_send({'action': 1, 'symbol': 'EURUSD', 'type': live.ORDER_TYPE_BUY})
+        assert False, "expected OSError"
+    except OSError:
+        pass
+    assert live.last_error() == (-10004, 'No IPC connection')
+    live.close()
+
+    replay = MT5Replayer(path)
+    assert replay.TIMEFRAME_M5 == 5 and replay.remaining == 7
+    assert [replay.symbol_info_tick('EURUSD') for _ in range(3)] == ticks
+    replayed = replay.copy_rates_from_pos('EURUSD', 5, 0, 50)
+    assert replayed.dtype == rates.dtype and np.array_equal(replayed, rates)
+    position = replay.positions_get(symbol='EURUSD')[0]
+    assert position.ticket == 11386157 and position._asdict() == positions[0]._asdict()
+    try:
+        replay.order_send({'action': 1, 'symbol': 'EURUSD', 'type': 0})
+        assert False, "expected the recorded OSError"
+    except OSError as e:
+        assert 'IPC send failed' in str(e)
+    assert replay.last_error() == (-10004, 'No IPC connection')
+    assert replay.remaining == 0 and replay.stats['exact'] == 7
+    profile = replay.profile()
+    assert profile['symbol_info_tick']['calls'] == 3 and profile['order_send']['errors'] == 1
+
+
+def test_matching_fallbacks_and_strict_mode():
+    """Responses match by arguments only; exhausted calls repeat or raise when strict"""
+    path = os.path.join(tempfile.mkdtemp(), 'session.mt5rec')
+    with MT5Recorder(fake_terminal(), path) as live:
+        first = live.symbol_info_tick('EURUSD')
+        second = live.symbol_info_tick('GBPUSD')
+
+    replay = MT5Replayer(path)
+    assert replay.symbol_info_tick('GBPUSD') == second       # Exact arguments, out of order
+    assert replay.symbol_info_tick('USDJPY') is None         # Never answered with another symbol's tick
+    assert replay.symbol_info_tick('EURUSD') == first
+    assert replay.symbol_info_tick('GBPUSD') == second       # Exhausted: last response to these arguments
+    assert replay.account_info() is None
+    assert replay.stats == {'exact': 2, 'repeated': 1, 'missing': 2}
+
+    strict = MT5Replayer(path, strict=True)
+    strict.symbol_info_tick('EURUSD')
+    strict.symbol_info_tick('GBPUSD')
+    for call in (lambda: strict.symbol_info_tick('EURUSD'), lambda: strict.account_info()):
+        try:
+            call()
+            assert False, "expected a strict replay failure"
+        except (ReplayMismatch, AttributeError):
+            pass
+
+
+def test_unpicklable_result_leaves_the_session_readable():
+    """A result that cannot be pickled leaves no partial frame behind; later frames still load"""
+    terminal = fake_terminal()
+    terminal.terminal_info = lambda: [np.zeros(100000), types.SimpleNamespace(connected=True, callback=lambda: None)]
+    path = os.path.join(tempfile.mkdtemp(), 'session.mt5rec')
+    with MT5Recorder(terminal, path) as live:
+        live.symbol_info_tick('EURUSD')
+        assert live.terminal_info()[1].connected
+        tick = live.symbol_info_tick('GBPUSD')
+    with gzip.open(path, 'rb') as fh:
+        assert len(fh.read()) < 100000  # No partial frame of the 800 kB array
+    replay = MT5Replayer(path)
+    assert len(replay.recorded) == 2 and live.calls == 2 and replay.symbol_info_tick('GBPUSD') == tick
+
+
+def test_rates_cache_over_replay_and_truncated_session():
+    """The rates cache runs unchanged on a replayed session; a crashed file still loads"""
+    path = os.path.join(tempfile.mkdtemp(), 'session.mt5rec')
+    with MT5Recorder(fake_terminal(), path) as live:
+        cache = RatesCache(live)
+        recorded = [cache.get_rates('EURUSD', live.TIMEFRAME_M5, 120).copy() for _ in range(3)]
+
+    replay = terminal_from_env(None, environ={'MT5_REPLAY': path})
+    assert isinstance(replay, MT5Replayer)
+    cache = RatesCache(replay)
+    for expected in recorded:
+        assert np.array_equal(cache.get_rates('EURUSD', replay.TIMEFRAME_M5, 120), expected)
+    assert replay.stats['exact'] == len(replay.recorded) and replay.remaining == 0
+
+    with gzip.open(path, 'rb') as fh:
+        raw = fh.read()
+    with gzip.open(path, 'wb') as fh:
+        fh.write(raw[:-20])  # Cut the last frame short
+    assert len(MT5Replayer(path).recorded) == len(replay.recorded) - 1
+
+
+if __name__ == "__main__":
+    for test in (test_record_then_replay_offline, test_matching_fallbacks_and_strict_mode,
+                 test_unpicklable_result_leaves_the_session_readable,
+                 test_rates_cache_over_replay_and_truncated_session):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test MT5 Terminal Guard
+Verifies that wrapped terminal calls never overlap across threads, constants
+pass through, and that monitor workers queue terminal lines for the Tk thread
+instead of writing the widget (no MT5 connection required)
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import MONITOR_CLASS, TextBuffer, headless_monitor_class, load_monitor_module
+from src.mt5_terminal_guard import SerializedTerminal, serialized
+
+
+class OverlapProbe:
+    """Terminal stub that records the peak number of calls in flight"""
+    TIMEFRAME_M5 = 5
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def symbol_info_tick(self, symbol):
+        with self._count_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.002)
+        with self._count_lock:
+            self.in_flight -= 1
+        return symbol
+
+
+def test_calls_never_overlap():
+    """Eight threads hammering the terminal see one call in flight; constants and results pass through"""
+    probe = OverlapProbe()
+    mt5 = serialized(probe)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(mt5.symbol_info_tick, [f"S{i}" for i in range(64)]))
+    assert probe.peak == 1 and results == [f"S{i}" for i in range(64)]
+    assert mt5.TIMEFRAME_M5 == 5 and mt5.unwrapped is probe
+    assert serialized(mt5) is mt5 and serialized(None) is None and isinstance(mt5, SerializedTerminal)
+
+
+def test_worker_terminal_lines_wait_for_tk_thread():
+    """terminal_log from a worker queues the line; drain_terminal_queue writes it on the owning thread"""
+    module = load_monitor_module()
+    monitor = headless_monitor_class(module)()
+    monitor.terminal_text = TextBuffer()
+    terminal_log = getattr(module, MONITOR_CLASS).terminal_log
+
+    worker = threading.Thread(target=terminal_log, args=(monitor, "EURUSD: BREAKOUT detected", "SUCCESS", True))
+    worker.start()
+    worker.join()
+    assert len(monitor.terminal_text) == 1 and monitor.terminal_queue.qsize() == 1
+
+    terminal_log(monitor, "EURUSD: ERROR on the Tk thread", "ERROR", True)
+    assert len(monitor.terminal_text) == 2
+    monitor.drain_terminal_queue()
+    assert len(monitor.terminal_text) == 3 and monitor.terminal_queue.empty()
+
+
+if __name__ == "__main__":
+    for test in (test_calls_never_overlap, test_worker_terminal_lines_wait_for_tk_thread):
+        test()
+        print(f"[OK] {test.__name__}")
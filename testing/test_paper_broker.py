@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Paper Broker
+Verifies latency-shifted fills with spread and slippage, intra-bar SL/TP
+ordering and gap fills, the real-time variant over a fake terminal, and a
+latency sweep through the live monitor (no MT5 connection required)
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import RATES_DTYPE
+from src.paper_broker import ExecutionModel, LivePaperBroker, PaperBroker, latency_sweep
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from test_live_replay import NO_FILTERS, _rates
+
+#         open     high     low      close    (spread 10 points on every bar)
+BARS = [(1.1000, 1.1005, 1.0995, 1.1000),
+        (1.1000, 1.1030, 1.0990, 1.1020),   # Up bar: O-L-H-C
+        (1.1020, 1.1060, 1.0950, 1.0960),   # Down bar: O-H-L-C (high first)
+        (1.0960, 1.0965, 1.0940, 1.0945),
+        (1.1000, 1.1010, 1.0995, 1.1005)]   # Gaps up through a short's stop
+
+
+def _bars():
+    rates = np.zeros(len(BARS), dtype=RATES_DTYPE)
+    rates['time'] = 1704067200 + 300 * np.arange(len(BARS))
+    rates['open'], rates['high'], rates['low'], rates['close'] = np.array(BARS).T
+    rates['spread'] = 10
+    return rates
+
+
+def test_latency_fill_and_intrabar_exits():
+    """Fill a third into the bar at ask + slippage; TP before SL on a high-first bar; stop gaps slip"""
+    broker = PaperBroker({'EURUSD': _bars()}, execution=ExecutionModel(latency_ms=100000, slippage_points=2))
+    broker.set_cursor('EURUSD', 1)
+    result = broker.order_send({'symbol': 'EURUSD', 'type': broker.ORDER_TYPE_BUY, 'volume': 1.0,
+                                'price': 1.1000, 'sl': 1.0980, 'tp': 1.1050})
+    assert result.retcode == broker.TRADE_RETCODE_DONE and abs(result.price - 1.09912) < 1e-9  # Low + spread + 2 points
+
+    broker.set_cursor('EURUSD', 2)  # Rest of bar 1 after the fill touches neither level
+    assert len(broker.positions_get(symbol='EURUSD')) == 1
+    broker.set_cursor('EURUSD', 3)  # Bar 2 reaches the high (TP) before the low (SL)
+    trade = broker.closed_trades[0]
+    assert trade.exit_reason == 'TP' and abs(trade.exit_price - 1.1050) < 1e-12
+    assert abs(trade.pnl - 588.0) < 1e-6
+
+    broker.execution = ExecutionModel(latency_ms=0, slippage_points=2)
+    broker.order_send({'symbol': 'EURUSD', 'type': broker.ORDER_TYPE_SELL, 'volume': 1.0,
+                       'price': 1.0960, 'sl': 1.0990, 'tp': 1.0900})
+    broker.set_cursor('EURUSD', 4)
+    broker.set_cursor('EURUSD', 5)  # Bar 4 opens above the stop: filled at the gap ask + slippage
+    trade = broker.closed_trades[1]
+    assert trade.exit_reason == 'SL' and abs(trade.exit_price - 1.10012) < 1e-9
+    assert broker.account_info().balance == 50000.0 + sum(t.pnl for t in broker.closed_trades)
+
+
+def test_live_paper_broker_waits_and_polls():
+    """Real-time mode sleeps the latency, fills on the live tick and closes on poll()"""
+    tick = SimpleNamespace(time=1704067200, bid=1.1000, ask=1.1002)
+    terminal = SimpleNamespace(
+        symbol_info_tick=lambda symbol: tick,
+        symbol_info=lambda symbol: SimpleNamespace(point=0.00001, digits=5, trade_tick_size=0.00001,
+                                                   trade_tick_value=1.0, trade_contract_size=100000),
+        account_info=lambda: SimpleNamespace(currency='USD', login=1, trade_mode=0),
+        copy_rates_from_pos=lambda *args: 'rates')
+    slept = []
+    broker = LivePaperBroker(terminal, execution=ExecutionModel(latency_ms=250), sleep=slept.append)
+    assert broker.copy_rates_from_pos('EURUSD', 5, 0, 10) == 'rates'
+
+    result = broker.order_send({'symbol': 'EURUSD', 'type': broker.ORDER_TYPE_BUY, 'volume': 0.5,
+                                'price': 1.1000, 'sl': 1.0990, 'tp': 1.1100})
+    assert slept == [0.25] and abs(result.price - 1.1002) < 1e-12
+    assert broker.poll() == []
+    tick.bid, tick.ask = 1.0989, 1.0991
+    closed = broker.poll()
+    assert [t.exit_reason for t in closed] == ['SL'] and broker.positions_get() == ()
+    assert abs(closed[0].pnl - (1.0989 - 1.1002) / 0.00001 * 0.5) < 1e-6
+
+
+def test_latency_sweep_through_live_monitor():
+    """Same signals at every latency; fills (and so P&L) move with execution speed"""
+    overrides = dict(NO_FILTERS, USE_TIME_RANGE_FILTER='False', LONG_USE_PULLBACK_ENTRY='False')
+    sweep = latency_sweep('EURUSD', _rates(700, seed=3), [0, 100000], config_overrides=overrides, utc_offset=0)
+    fast, slow = sweep[0], sweep[100000]
+    assert fast.trades == slow.trades > 0
+    assert [t.entry_price for t in fast.closed_trades] != [t.entry_price for t in slow.closed_trades]
+    assert fast.pnl != slow.pnl
+
+
+if __name__ == "__main__":
+    for test in (test_latency_fill_and_intrabar_exits, test_live_paper_broker_waits_and_polls,
+                 test_latency_sweep_through_live_monitor):
+        test()
+        print(f"[OK] {test.__name__}")
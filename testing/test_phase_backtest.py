@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Phase Backtest
+Verifies the portfolio backtest entry point: jobs built from the strategy
+files' constants and the registry params, and backtests routed through the
+BacktestCache so unchanged symbols are not re-run (the real cerebro run is
+skipped when backtrader is not installed)
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.backtest_cache import BacktestCache, BacktestResult
+from src.phase_backtest import backtest_portfolio, portfolio_jobs, strategy_constants
+from src.symbol_registry import SymbolRegistry
+from strategies import strategy_path
+
+CSV_HEADER = "Date,Time,Open,High,Low,Close,Volume\n"
+
+
+def _write_csv(path, days):
+    with open(path, 'w') as f:
+        f.write(CSV_HEADER)
+        for day in days:
+            f.write(f"{day},00:00:00,1.1,1.1,1.1,1.1,0\n")
+
+
+def test_jobs_from_strategy_constants():
+    """Data file, range, cash and forex kwargs come from the strategy file; missing data is skipped"""
+    constants = strategy_constants(strategy_path('EURUSD'))
+    assert constants['DATA_FILENAME'] == 'EURUSD_5m_5Yea.csv' and constants['STARTING_CASH'] == 100000.0
+
+    registry = SymbolRegistry(PROJECT_ROOT)
+    registry.load()
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_csv(os.path.join(data_dir, 'EURUSD_5m_5Yea.csv'), ['20250102'])
+        jobs = portfolio_jobs(['eurusd', 'GBPUSD'], data_dir=data_dir, fromdate='2025-01-01', registry=registry)
+    assert list(jobs) == ['EURUSD']
+    job = jobs['EURUSD']
+    assert job['fromdate'] == '2025-01-01' and job['todate'] == constants['TODATE']
+    assert job['strategy'] == registry.strategy_path('EURUSD') and job['starting_cash'] == 100000.0
+    assert job['params'] == registry.load_params('EURUSD')
+    assert job['strategy_kwargs'] == {'use_forex_position_calc': True, 'forex_instrument': 'EURUSD'}
+
+
+def test_portfolio_reruns_only_changed_symbols():
+    """A second portfolio run is served from the cache until a symbol's data slice changes"""
+    runs = []
+
+    def run_fn(symbol, job):
+        runs.append(symbol)
+        return BacktestResult.from_trade_reports([], job['starting_cash'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = {}
+        for symbol in ('EURUSD', 'GBPUSD'):
+            data = os.path.join(tmp, f"{symbol}.csv")
+            _write_csv(data, ['20250102', '20250103'])
+            jobs[symbol] = {'data': data, 'fromdate': '2025-01-01', 'todate': '2025-01-31',
+                            'strategy': strategy_path(symbol), 'params': {}, 'starting_cash': 1000.0}
+        cache = BacktestCache(os.path.join(tmp, 'cache'))
+
+        first = backtest_portfolio(jobs, cache, run_fn)
+        assert backtest_portfolio(jobs, cache, run_fn) == first and runs == ['EURUSD', 'GBPUSD']
+        _write_csv(jobs['GBPUSD']['data'], ['20250102', '20250106'])
+        backtest_portfolio(jobs, cache, run_fn)
+        assert runs == ['EURUSD', 'GBPUSD', 'GBPUSD'] and cache.hits == 3
+
+        backtest_portfolio(jobs, None, run_fn)  # No cache: always runs
+        assert runs[3:] == ['EURUSD', 'GBPUSD']
+
+
+def test_phase_backtest_under_backtrader():
+    """A real run builds the cached result from the equity recorder and the trade sink"""
+    import pytest
+    pytest.importorskip('backtrader')
+    from src.phase_backtest import run_phase_backtest
+
+    close = 1.10 + 0.004 * np.sin(np.arange(3000) / 40.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, 'EURUSD_5m_5Yea.csv')
+        with open(data, 'w') as f:
+            f.write(CSV_HEADER)
+            for i, price in enumerate(close):
+                minutes = 5 * i
+                day, minute = 2 + minutes // 1440, minutes % 1440
+                f.write(f"202501{day:02d},{minute // 60:02d}:{minute % 60:02d}:00,"
+                        f"{price:.5f},{price + 0.0002:.5f},{price - 0.0002:.5f},{price:.5f},100\n")
+        registry = SymbolRegistry(PROJECT_ROOT)
+        registry.load()
+        job = {'data': data, 'fromdate': None, 'todate': None, 'starting_cash': 100000.0,
+               'params': registry.load_params('EURUSD'), 'strategy_kwargs': {'forex_instrument': 'EURUSD'}}
+        previous_cwd = os.getcwd()
+        os.chdir(tmp)  # Trade reports go to temp_reports/ in the working directory
+        try:
+            result = run_phase_backtest('EURUSD', job)
+        finally:
+            os.chdir(previous_cwd)
+    assert len(result.equity_values) > 0 and result.metrics['trades'] == len(result.trades)
+
+
+if __name__ == "__main__":
+    for test in (test_jobs_from_strategy_constants, test_portfolio_reruns_only_changed_symbols,
+                 test_phase_backtest_under_backtrader):
+        test()
+        print(f"[OK] {test.__name__}")
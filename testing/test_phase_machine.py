@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Test Phase Machine
+Verifies the shared 4-phase entry state machine (arming, pullback, window,
+breakout, invalidation) and the backtrader adapter driving it from
+line-like objects and from a phase-driven strategy (no MT5 required; the
+real backtrader run is skipped when backtrader is not installed)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.backtrader_phase_adapter import BacktraderPhaseAdapter, phase_driven
+from src.live_replay import EVENT_ARMED, EVENT_ENTRY, EVENT_WINDOW_OPEN, read_events_csv
+from src.phase_machine import (TRANSITION_ARMED, TRANSITION_BREAKOUT, TRANSITION_BREAKOUT_REJECTED,
+                               TRANSITION_ENTRY_SIGNAL, TRANSITION_INVALIDATED, TRANSITION_OUTSIDE_HOURS,
+                               TRANSITION_PULLBACK, TRANSITION_PULLBACK_FAILED, TRANSITION_WINDOW_EXPIRED,
+                               TRANSITION_WINDOW_FAILURE, TRANSITION_WINDOW_OPEN, Bar, PhaseMachine)
+from src.strategy_state import EntryState, SymbolState
+
+CONFIG = {
+    'ENABLE_SHORT_TRADES': 'True',
+    'LONG_USE_PULLBACK_ENTRY': 'True', 'LONG_PULLBACK_MAX_CANDLES': '2', 'LONG_ENTRY_WINDOW_PERIODS': '3',
+    'SHORT_USE_PULLBACK_ENTRY': 'True', 'SHORT_PULLBACK_MAX_CANDLES': '1', 'SHORT_ENTRY_WINDOW_PERIODS': '3',
+    'USE_WINDOW_TIME_OFFSET': 'False', 'WINDOW_OFFSET_MULTIPLIER': '1.0',
+    'WINDOW_PRICE_OFFSET_MULTIPLIER': '0.5',
+    'USE_TIME_RANGE_FILTER': 'True', 'ENTRY_START_HOUR': '7', 'ENTRY_END_HOUR': '17',
+    'ENTRY_START_MINUTE': '0', 'ENTRY_END_MINUTE': '0',
+}
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+def _bar(index, open_, close, high=None, low=None, bull=False, bear=False, hour=None):
+    time = START + timedelta(minutes=5 * index)
+    minutes = (hour if hour is not None else time.hour) * 60 + time.minute
+    return Bar(time, open_, high if high is not None else max(open_, close) + 0.0001,
+               low if low is not None else min(open_, close) - 0.0001, close, minutes, bull, bear, atr=0.0005)
+
+
+def _armed_long(machine, state):
+    """Arm LONG on bar 1, two bearish pullbacks on bars 2-3 -> window open"""
+    machine.step(state, _bar(0, 1.1000, 1.1010))
+    kinds = [t.kind for t in machine.step(state, _bar(1, 1.1010, 1.1020, bull=True), _bar(0, 1.1000, 1.1010))]
+    kinds += [t.kind for t in machine.step(state, _bar(2, 1.1020, 1.1015))]
+    kinds += [t.kind for t in machine.step(state, _bar(3, 1.1015, 1.1010, high=1.1016, low=1.1008))]
+    return kinds
+
+
+def test_arm_pullback_window():
+    """Crossover arms, pullback candles are counted, window limits wrap the last pullback candle"""
+    machine, state = PhaseMachine(CONFIG), SymbolState()
+    assert _armed_long(machine, state) == [TRANSITION_ARMED, TRANSITION_PULLBACK, TRANSITION_WINDOW_OPEN]
+    assert state.entry_state == EntryState.WINDOW_OPEN
+    assert state.signal_trigger_candle['is_bullish']
+    assert abs(state.window_top_limit - (1.1016 + 0.0004)) < 1e-12
+    assert abs(state.window_bottom_limit - (1.1008 - 0.0004)) < 1e-12
+    assert state.window_expiry_bar == state.window_bar_start + 3
+
+    transitions = machine.step(state, _bar(4, 1.1012, 1.1025, high=1.1030))
+    assert [t.kind for t in transitions] == [TRANSITION_BREAKOUT, TRANSITION_ENTRY_SIGNAL]
+    assert transitions[-1].info['mode'] == 'breakout'
+    machine.enter(state)
+    assert machine.step(state, _bar(5, 1.1, 1.2, bear=True)) == []  # Locked while IN_TRADE
+
+
+def test_invalidation_and_wrong_color():
+    """Opposing crossover with opposing candle resets; wrong-color pullback resets"""
+    machine, state = PhaseMachine(CONFIG), SymbolState()
+    machine.step(state, _bar(1, 1.1010, 1.1020, bull=True), _bar(0, 1.1000, 1.1010))
+    transitions = machine.step(state, _bar(2, 1.1020, 1.1010, bear=True))
+    # Invalidated, then the same bar re-scans and arms SHORT
+    assert [t.kind for t in transitions] == [TRANSITION_INVALIDATED, TRANSITION_ARMED]
+    assert transitions[1].direction == 'SHORT'
+
+    state = SymbolState()
+    machine.step(state, _bar(1, 1.1010, 1.1020, bull=True), _bar(0, 1.1000, 1.1010))
+    transitions = machine.step(state, _bar(2, 1.1020, 1.1030))
+    assert [t.kind for t in transitions] == [TRANSITION_PULLBACK_FAILED]
+    assert state.entry_state == EntryState.SCANNING
+
+
+def test_window_expiry_failure_and_hours():
+    """Expiry and failure boundary re-arm; breakout outside hours resets to SCANNING"""
+    machine = PhaseMachine(CONFIG)
+    state = SymbolState()
+    _armed_long(machine, state)
+    transitions = machine.step(state, _bar(4, 1.1010, 1.1009, low=1.1000))
+    assert [t.kind for t in transitions] == [TRANSITION_WINDOW_FAILURE]
+    assert state.entry_state == EntryState.ARMED_LONG and state.pullback_candle_count == 0
+
+    state = SymbolState()
+    _armed_long(machine, state)
+    for index in range(4, 8):
+        transitions = machine.step(state, _bar(index, 1.1011, 1.1012))
+    assert [t.kind for t in transitions] == [TRANSITION_WINDOW_EXPIRED]
+
+    state = SymbolState()
+    _armed_long(machine, state)
+    transitions = machine.step(state, _bar(4, 1.1012, 1.1025, high=1.1030, hour=20))
+    assert [t.kind for t in transitions] == [TRANSITION_OUTSIDE_HOURS]
+    assert state.entry_state == EntryState.SCANNING
+
+
+def test_breakout_rejections_and_standard_mode():
+    """Filter / trigger-candle rejections reset; standard mode signals on the crossover"""
+    machine = PhaseMachine(dict(CONFIG, LONG_USE_CANDLE_DIRECTION_FILTER='True'))
+    state = SymbolState()
+    _armed_long(machine, state)
+    state.signal_trigger_candle['is_bullish'] = False
+    transition = machine.confirm_breakout(state, _bar(4, 1.1012, 1.1025))
+    assert transition.kind == TRANSITION_BREAKOUT_REJECTED and transition.info['reason'] == 'trigger_candle'
+    assert state.entry_state == EntryState.SCANNING
+
+    state = SymbolState()
+    _armed_long(machine, state)
+    rejected = machine.step(state, _bar(4, 1.1012, 1.1025, high=1.1030), breakout_check=lambda s, b: (4, True))
+    assert rejected[-1].info['reason'] == 'filters'
+
+    standard = PhaseMachine(dict(CONFIG, LONG_USE_PULLBACK_ENTRY='False'))
+    state = SymbolState()
+    transitions = standard.step(state, _bar(1, 1.1010, 1.1020, bull=True))
+    assert [t.kind for t in transitions] == [TRANSITION_ENTRY_SIGNAL]
+    assert transitions[0].info['mode'] == 'standard' and state.entry_state == EntryState.SCANNING
+
+
+def test_standard_entry_locks_in_trade():
+    """A filled standard entry stays IN_TRADE (no duplicate entries); a failed one keeps scanning"""
+    machine = PhaseMachine(dict(CONFIG, LONG_USE_PULLBACK_ENTRY='False'))
+    filled, failed = SymbolState(), SymbolState()
+    for state in (filled, failed):
+        assert [t.kind for t in machine.step(state, _bar(1, 1.1010, 1.1020, bull=True))] == [TRANSITION_ENTRY_SIGNAL]
+    machine.enter(filled)
+    assert filled.entry_state == EntryState.IN_TRADE and filled.phase == 'TRADE_ACTIVE'
+    assert machine.step(filled, _bar(2, 1.1020, 1.1030, bull=True)) == []
+    assert filled.entry_state == EntryState.IN_TRADE
+
+    assert failed.entry_state == EntryState.SCANNING
+    assert [t.kind for t in machine.step(failed, _bar(2, 1.1020, 1.1030, bull=True))] == [TRANSITION_ENTRY_SIGNAL]
+
+
+class _Line:
+    """Backtrader-style line: [0] current bar, [-1] previous bar"""
+
+    def __init__(self, values):
+        self.values, self.index = values, 0
+
+    def __getitem__(self, ago):
+        return self.values[self.index + ago]
+
+
+class _DateTimeLine(_Line):
+    def datetime(self, ago=0):
+        return self[ago]
+
+
+class _BtDateTimeLine(_Line):
+    """Backtrader datetime line: [ago] is the date number, datetime(ago) the datetime"""
+
+    def __getitem__(self, ago):
+        value = super().__getitem__(ago)
+        return value.toordinal() + (value.hour * 3600 + value.minute * 60) / 86400.0
+
+    def datetime(self, ago=0):
+        return super().__getitem__(ago)
+
+
+class _Strategy:
+    datetime_line = _DateTimeLine
+
+    def __init__(self, bars, emas):
+        self.data = type('Data', (), {})()
+        for position, name in enumerate(('open', 'high', 'low', 'close')):
+            setattr(self.data, name, _Line([bar[position] for bar in bars]))
+        self.data.datetime = self.datetime_line([START + timedelta(minutes=5 * i) for i in range(len(bars))])
+        self.lines = [getattr(self.data, n) for n in ('open', 'high', 'low', 'close', 'datetime')]
+        for name, values in emas.items():
+            setattr(self, name, _Line(values))
+            self.lines.append(getattr(self, name))
+        self.position = None
+
+    def advance(self, index):
+        for line in self.lines:
+            line.index = index
+
+    def __len__(self):
+        return self.lines[0].index + 1
+
+
+def test_backtrader_adapter_matches_machine():
+    """Adapter detects the crossover from strategy lines and walks the same phases"""
+    bars = [(1.1000, 1.1011, 1.0999, 1.1010), (1.1010, 1.1021, 1.1009, 1.1020),
+            (1.1020, 1.1021, 1.1014, 1.1015), (1.1015, 1.1016, 1.1008, 1.1010),
+            (1.1012, 1.1030, 1.1011, 1.1025)]
+    emas = {'ema_confirm': [1.0, 2.0, 2.0, 2.0, 2.0], 'ema_fast': [1.5] * 5, 'ema_medium': [3.0] * 5,
+            'ema_slow': [3.0] * 5, 'ema_filter_price': [1.0] * 5, 'atr': [0.0005] * 5}
+    strategy = _Strategy(bars, emas)
+    adapter = BacktraderPhaseAdapter(strategy, CONFIG)
+    kinds = []
+    for index in range(len(bars)):
+        strategy.advance(index)
+        kinds += [t.kind for t in adapter.next()]
+    assert kinds == [TRANSITION_ARMED, TRANSITION_PULLBACK, TRANSITION_WINDOW_OPEN,
+                     TRANSITION_BREAKOUT, TRANSITION_ENTRY_SIGNAL]
+    assert [t.kind for t in adapter.transitions] == kinds
+
+    adapter.entered()
+    assert adapter.state.entry_state == EntryState.IN_TRADE
+    adapter.next()  # No position -> trade closed, back to scanning
+    assert adapter.state.entry_state == EntryState.SCANNING
+
+
+class _Sunrise(_Strategy):
+    """Stands in for a SunriseOgle class: own next() / stop()"""
+    own_bars = 0
+
+    def next(self):
+        self.own_bars += 1
+
+    def stop(self):
+        pass
+
+
+def test_phase_driven_strategy_records_events():
+    """Wrapper runs the strategy's own next(), drives the machine and writes the events CSV"""
+    bars = [(1.1000, 1.1011, 1.0999, 1.1010), (1.1010, 1.1021, 1.1009, 1.1020),
+            (1.1020, 1.1021, 1.1014, 1.1015), (1.1015, 1.1016, 1.1008, 1.1010),
+            (1.1012, 1.1030, 1.1011, 1.1025), (1.1025, 1.1030, 1.1020, 1.1028)]
+    emas = {'ema_confirm': [1.0, 2.0, 2.0, 2.0, 2.0, 2.0], 'ema_fast': [1.5] * 6, 'ema_medium': [3.0] * 6,
+            'ema_slow': [3.0] * 6, 'ema_filter_price': [1.0] * 6, 'atr': [0.0005] * 6}
+    events_path = os.path.join(tempfile.mkdtemp(), 'events.csv')
+    strategy_class = phase_driven(_Sunrise, CONFIG, events_path=events_path)
+    assert strategy_class.__name__ == 'PhaseDriven_Sunrise'
+
+    strategy = strategy_class(bars, emas)
+    for index in range(5):
+        strategy.advance(index)
+        strategy.next()
+    assert strategy.own_bars == 5 and strategy.phase.state.entry_state == EntryState.IN_TRADE
+    strategy.advance(5)
+    strategy.next()  # The strategy holds no position: released
+    assert strategy.phase.state.entry_state == EntryState.SCANNING
+
+    strategy.stop()
+    assert [event.kind for event in read_events_csv(events_path)] == [EVENT_ARMED, EVENT_WINDOW_OPEN, EVENT_ENTRY]
+
+
+class _Broker:
+    def __init__(self):
+        self.value = 100000.0
+
+    def get_value(self):
+        return self.value
+
+
+class _BrokerSunrise(_Sunrise):
+    """Stand-in strategy with a broker and backtrader date numbers on the datetime line"""
+    datetime_line = _BtDateTimeLine
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.broker = _Broker()
+
+    def next(self):
+        super().next()
+        self.broker.value += 10.0
+
+
+def test_phase_driven_records_equity():
+    """record_equity keeps the broker value and epoch time of every bar in an EquityRecorder"""
+    bars = [(1.1000, 1.1011, 1.0999, 1.1010)] * 4
+    emas = {name: [1.0] * 4 for name in ('ema_confirm', 'ema_fast', 'ema_medium', 'ema_slow',
+                                         'ema_filter_price', 'atr')}
+    assert phase_driven(_BrokerSunrise, CONFIG)(bars, emas).equity is None
+
+    strategy = phase_driven(_BrokerSunrise, CONFIG, record_equity=True)(bars, emas)
+    for index in range(4):
+        strategy.advance(index)
+        strategy.next()
+    buffer = strategy.equity.buffer
+    assert buffer.values.tolist() == [100010.0, 100020.0, 100030.0, 100040.0]
+    epoch = int((START - datetime(1970, 1, 1)).total_seconds())
+    assert buffer.times.tolist() == [epoch + 300 * i for i in range(4)]
+    assert strategy.equity.metrics()['final_value'] == 100040.0
+
+
+class _ReportingSunrise(_Sunrise):
+    """Stand-in strategy with SunriseOgle's trade report hooks (per-trade file writes)"""
+    p = type('Params', (), {'forex_pip_value': 0.0001})()
+    _data_filename = 'EURUSD_5m_5Yea.csv'
+    stop_level, take_level = 1.0990, 1.1030
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._init_trade_reporting()
+
+    def _init_trade_reporting(self):
+        raise AssertionError("strategy report file opened")
+
+    def _record_trade_entry(self, *args):
+        raise AssertionError("strategy report written on entry")
+
+    def _record_trade_exit(self, *args):
+        raise AssertionError("strategy report written on exit")
+
+    def stop(self):
+        self._close_trade_reporting()
+
+
+def test_phase_driven_buffers_trade_reports():
+    """report_formats routes the strategy's report hooks into a TradeRecordSink written once at stop()"""
+    report_dir = tempfile.mkdtemp()
+    emas = {name: [1.0] for name in ('ema_confirm', 'ema_fast', 'ema_medium', 'ema_slow', 'ema_filter_price', 'atr')}
+    strategy = phase_driven(_ReportingSunrise, CONFIG, report_formats=('txt', 'csv'),
+                            report_dir=report_dir)([(1.1000, 1.1011, 1.0999, 1.1010)], emas)
+    strategy._record_trade_entry('LONG', START, 1.1010, 1000, 0.0005)
+    strategy._record_trade_exit(START + timedelta(minutes=30), 1.1030, 20.0, 'TAKE_PROFIT')
+    assert os.listdir(report_dir) == []
+
+    strategy.stop()
+    files = sorted(os.listdir(report_dir))
+    assert [name.rsplit('.', 1)[1] for name in files] == ['csv', 'txt'] and files[0].startswith('EURUSD_trades_')
+    report = strategy.trade_sink.trade_reports()[0]
+    assert report['stop_level'] == 1.0990 and report['exit_reason'] == 'TAKE_PROFIT'
+    assert abs(report['pips'] - 20.0) < 1e-6 and report['duration_bars'] == 6
+
+
+def test_phase_driven_backtest_under_backtrader():
+    """A real cerebro run of the phase-driven EURUSD strategy writes a readable events CSV"""
+    import numpy as np
+    import pandas as pd
+    import pytest
+    bt = pytest.importorskip('backtrader')
+    from src.symbol_registry import parse_strategy_source
+    from strategies import get_strategy_class, strategy_path
+
+    close = 1.10 + 0.004 * np.sin(np.arange(3000) / 40.0)
+    frame = pd.DataFrame({'open': np.r_[close[0], close[:-1]], 'close': close, 'volume': 100.0},
+                         index=pd.date_range(START, periods=len(close), freq='5min'))
+    frame['high'] = frame[['open', 'close']].max(axis=1) + 0.0002
+    frame['low'] = frame[['open', 'close']].min(axis=1) - 0.0002
+    with open(strategy_path('EURUSD'), 'r', encoding='utf-8', errors='replace') as f:
+        config = parse_strategy_source(f.read())
+    events_path = os.path.join(tempfile.mkdtemp(), 'events.csv')
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=frame))
+    cerebro.addstrategy(phase_driven(get_strategy_class('EURUSD'), config, events_path=events_path,
+                                     record_equity=True, report_formats=('csv',), report_dir=tempfile.mkdtemp()))
+    strategy = cerebro.run()[0]
+    assert len(strategy.phase.transitions) > 0 and 0 < len(strategy.equity.buffer) <= len(frame)
+    assert strategy.trade_sink.closed and strategy.trade_report_file is None
+    assert {event.kind for event in read_events_csv(events_path)} <= {EVENT_ARMED, EVENT_WINDOW_OPEN, EVENT_ENTRY}
+
+
+if __name__ == "__main__":
+    for test in (test_arm_pullback_window, test_invalidation_and_wrong_color,
+                 test_window_expiry_failure_and_hours, test_breakout_rejections_and_standard_mode,
+                 test_standard_entry_locks_in_trade,
+                 test_backtrader_adapter_matches_machine, test_phase_driven_strategy_records_events,
+                 test_phase_driven_records_equity, test_phase_driven_buffers_trade_reports,
+                 test_phase_driven_backtest_under_backtrader):
+        test()
+        print(f"[OK] {test.__name__}")
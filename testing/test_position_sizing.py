@@ -4,10 +4,21 @@ TEST POSITION SIZING - Verify Dalio Allocation System
 Portfolio: $50,000
 Risk: 0.5% per trade
 Testing EURUSD entry with ATR-based SL/TP
+Allocations from config/symbols/, lot size from src/position_sizing.py
+(the same engine execute_trade uses)
 """
 
+import os
+import sys
+
 import MetaTrader5 as mt5
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.position_sizing import PositionSizer
+from src.symbol_registry import SymbolRegistry
+
 # Initialize MT5
 if not mt5.initialize():
     print("MT5 initialization failed")
@@ -16,14 +27,7 @@ if not mt5.initialize():
 # ═══════════════════════════════════════════════════════════════════
 # DALIO ALLOCATION SYSTEM
 # ═══════════════════════════════════════════════════════════════════
-ASSET_ALLOCATIONS = {
-    'USDCHF': 0.20,   # 20% - Deflation hedge
-    'XAUUSD': 0.18,   # 18% - Inflation hedge
-    'GBPUSD': 0.16,   # 16% - Standard forex
-    'EURUSD': 0.16,   # 16% - Standard forex
-    'XAGUSD': 0.15,   # 15% - Commodity metal
-    'AUDUSD': 0.15,   # 15% - Commodity currency
-}
+ASSET_ALLOCATIONS = SymbolRegistry(PROJECT_ROOT).allocations()
 
 DEFAULT_RISK_PERCENT = 0.005  # 0.5% risk per trade (of allocated capital)
 
@@ -111,23 +115,18 @@ tick_size = symbol_info.trade_tick_size
 contract_size = symbol_info.trade_contract_size
 digits = symbol_info.digits
 
-# Calculate value per point from MT5 symbol info
-if tick_size > 0 and point > 0:
-    value_per_point = tick_value * (point / tick_size)
-else:
-    value_per_point = tick_value if tick_value > 0 else 0.01
-
-# Calculate SL distance in points
-sl_distance_in_points = sl_distance / point
-
-# Calculate lot size
-if value_per_point > 0 and sl_distance_in_points > 0:
-    lot_size = risk_amount / (sl_distance_in_points * value_per_point)
-else:
+sizer = PositionSizer(ASSET_ALLOCATIONS, risk_percent=risk_percent)
+sizing = sizer.size([symbol], portfolio_balance, atr, ATR_SL_MULTIPLIER, specs={symbol: symbol_info})
+if not sizing.valid[0]:
     print("ERROR: Invalid calculation values!")
     mt5.shutdown()
     exit()
 
+row = sizing.row(0)
+value_per_point = row['value_per_point']
+sl_distance_in_points = row['sl_points']
+lot_size = row['raw_lots']
+
 print("📐 STEP 3: LOT SIZE CALCULATION")
 print(f"   Contract Size: {contract_size:,.0f}")
 print(f"   Point: {point:.5f}")
@@ -146,11 +145,8 @@ lot_min = symbol_info.volume_min
 lot_max = symbol_info.volume_max
 lot_step = symbol_info.volume_step
 
-# Round to step
-lot_size = round(lot_size / lot_step) * lot_step
-
-# Clamp to limits
-lot_size = max(lot_min, min(lot_max, lot_size))
+# Rounded to step and clamped to limits by the sizing engine
+lot_size = row['lots']
 
 print(f"   Volume Limits: min={lot_min}, max={lot_max}, step={lot_step}")
 print(f"   FINAL LOT SIZE: {lot_size:.2f} lots")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Position Sizing Engine
+Verifies the vectorized Dalio sizing against the scalar execute_trade
+formula, missing specs, repeated symbols and a 10k-scenario grid
+(no MT5 connection required)
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.position_sizing import PositionSizer
+
+SPECS = {
+    'EURUSD': SimpleNamespace(point=0.00001, trade_tick_size=0.00001, trade_tick_value=1.0,
+                              volume_min=0.01, volume_max=100.0, volume_step=0.01),
+    'USDJPY': SimpleNamespace(point=0.001, trade_tick_size=0.001, trade_tick_value=0.667,
+                              volume_min=0.01, volume_max=100.0, volume_step=0.01),
+    'XAUUSD': SimpleNamespace(point=0.01, trade_tick_size=0.05, trade_tick_value=5.0,
+                              volume_min=0.01, volume_max=50.0, volume_step=0.01),
+}
+ALLOCATIONS = {'EURUSD': 0.12, 'USDJPY': 0.12, 'XAUUSD': 0.15}
+
+
+def scalar_lots(symbol, balance, atr, sl_multiplier, risk_percent):
+    """Reference: the per-trade formula execute_trade used before the engine"""
+    info = SPECS[symbol]
+    risk_amount = balance * ALLOCATIONS[symbol] * risk_percent
+    if info.trade_tick_size > 0 and info.point > 0:
+        value_per_point = info.trade_tick_value * (info.point / info.trade_tick_size)
+    else:
+        value_per_point = info.trade_tick_value if info.trade_tick_value > 0 else 0.01
+    lot_size = risk_amount / ((atr * sl_multiplier / info.point) * value_per_point)
+    lot_size = round(lot_size / info.volume_step) * info.volume_step
+    return max(info.volume_min, min(lot_size, info.volume_max))
+
+
+def test_matches_scalar_formula():
+    """One vectorized call equals the scalar formula for every symbol"""
+    sizer = PositionSizer(ALLOCATIONS, risk_percent=0.01, spec_fn=SPECS.get)
+    symbols = ['EURUSD', 'USDJPY', 'XAUUSD', 'EURUSD']
+    atrs = np.array([0.00042, 0.065, 3.2, 0.00001])
+    multipliers = np.array([1.5, 2.0, 1.5, 4.5])
+    result = sizer.size(symbols, 50000.0, atrs, multipliers)
+    for i, symbol in enumerate(symbols):
+        assert abs(result.lots[i] - scalar_lots(symbol, 50000.0, atrs[i], multipliers[i], 0.01)) < 1e-9
+    row = result.row(2)
+    assert abs(row['risk_amount'] - 75.0) < 1e-9 and abs(row['value_per_point'] - 1.0) < 1e-12
+
+
+def test_missing_spec_and_invalid_stop():
+    """Unknown symbols and non-positive stops give NaN lots, never a default size"""
+    sizer = PositionSizer(ALLOCATIONS, spec_fn=SPECS.get)
+    result = sizer.size(['EURUSD', 'NOPE', 'USDJPY'], 50000.0, np.array([0.0005, 0.1, 0.0]), 1.5)
+    assert result.valid.tolist() == [True, False, False]
+    assert result.allocation[1] == sizer.default_allocation
+
+
+def test_scenario_grid_is_fast():
+    """10k balance x ATR scenarios per symbol in milliseconds, matching the scalar formula"""
+    sizer = PositionSizer(ALLOCATIONS, risk_percent=0.005, spec_fn=SPECS.get)
+    balances = np.linspace(5000.0, 500000.0, 100)
+    atrs = np.linspace(0.0001, 0.003, 100)
+    started = time.perf_counter()
+    grid = sizer.scenarios('EURUSD', balances, atrs, sl_multiplier=1.5)
+    elapsed = time.perf_counter() - started
+    assert grid.lots.shape == (100, 100) and elapsed < 0.05
+    for b, a in ((0, 0), (37, 81), (99, 99)):
+        assert abs(grid.lots[b, a] - scalar_lots('EURUSD', balances[b], atrs[a], 1.5, 0.005)) < 1e-9
+
+
+if __name__ == "__main__":
+    for test in (test_matches_scalar_formula, test_missing_spec_and_invalid_stop, test_scenario_grid_is_fast):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test Profiling Hooks
+Verifies flag-file / signal / direct requests, per-symbol collapsed stacks,
+allocation tops, cProfile output from concurrent workers, and that no
+wrapper remains on the monitor once a session ends (no MT5 connection required)
+"""
+
+import json
+import os
+import pstats
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.profiling_hooks import RuntimeProfiler, parse_request
+
+
+def crunch(seconds):
+    """Busy loop that allocates, so both the sampler and tracemalloc see it"""
+    kept = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        kept.append([0.0] * 64)
+    return kept
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.kept = []
+
+    def monitor_strategy_phase(self, symbol):
+        self.kept.append(crunch(0.03))
+        self.execute_trade(symbol, 'LONG', 1.1, {})
+
+    def execute_trade(self, symbol, direction, price, config):
+        return True
+
+
+def test_flag_file_session_and_zero_overhead_when_idle():
+    """A flag file starts an N-candle session for the listed symbols; the class methods come back after"""
+    workdir = tempfile.mkdtemp()
+    flag = os.path.join(workdir, 'profile_candles.flag')
+    profiler = RuntimeProfiler(output_dir=os.path.join(workdir, 'profiles'), flag_file=flag)
+    monitor = FakeMonitor()
+    profiler.begin_cycle(monitor)
+    assert not profiler.active and 'monitor_strategy_phase' not in vars(monitor)
+
+    with open(flag, 'w') as f:
+        f.write("2 EURUSD")
+    outputs = []
+    for _ in range(3):
+        profiler.begin_cycle(monitor)
+        monitor.monitor_strategy_phase('EURUSD')
+        monitor.monitor_strategy_phase('GBPUSD')
+        outputs.append(profiler.end_cycle())
+    assert not os.path.exists(flag) and outputs[0] is None and outputs[2] is None
+    assert not profiler.active and vars(monitor).keys() == {'kept'}
+    assert monitor.monitor_strategy_phase.__func__ is FakeMonitor.monitor_strategy_phase
+
+    path = outputs[1]
+    assert sorted(os.listdir(path)) == ['EURUSD.collapsed', 'EURUSD_allocations.txt', 'summary.json']
+    with open(os.path.join(path, 'EURUSD.collapsed')) as f:
+        stacks = f.read().splitlines()
+    assert stacks and all(line.startswith('monitor_strategy_phase (') for line in stacks)
+    assert any(';crunch (' in line for line in stacks)
+    with open(os.path.join(path, 'EURUSD_allocations.txt')) as f:
+        assert 'test_profiling_hooks.py' in f.read()
+    with open(os.path.join(path, 'summary.json')) as f:
+        summary = json.load(f)
+    assert summary['candles'] == 2 and list(summary['symbols']) == ['EURUSD']
+    assert summary['symbols']['EURUSD']['monitor_strategy_phase']['calls'] == 2
+    assert summary['symbols']['EURUSD']['execute_trade']['calls'] == 2
+
+
+def test_cprofile_mode_with_concurrent_workers():
+    """cProfile sessions serialize worker calls and write one loadable pstats file per symbol"""
+    workdir = tempfile.mkdtemp()
+    profiler = RuntimeProfiler(output_dir=workdir, flag_file=None, mode='cprofile', trace_allocations=False)
+    monitor = FakeMonitor()
+    profiler.request(candles=1)
+    profiler.begin_cycle(monitor)
+    workers = [threading.Thread(target=monitor.monitor_strategy_phase, args=(symbol,))
+               for symbol in ('EURUSD', 'XAUUSD', 'USDJPY')]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    path = profiler.end_cycle()
+    for symbol in ('EURUSD', 'XAUUSD', 'USDJPY'):
+        stats = pstats.Stats(os.path.join(path, f"{symbol}.pstats"))
+        assert any(func[2] == 'crunch' for func in stats.stats)
+
+
+def test_signal_and_request_parsing():
+    """SIGUSR1 requests a default session; flag text parses to candles and symbols"""
+    assert parse_request("") == (5, None)
+    assert parse_request("3 eurusd, XAUUSD\n") == (3, ('EURUSD', 'XAUUSD'))
+    if not hasattr(signal, 'SIGUSR1'):
+        return
+    profiler = RuntimeProfiler(output_dir=tempfile.mkdtemp(), flag_file=None, trace_allocations=False)
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert profiler.install_signal_handler() == signal.SIGUSR1
+        os.kill(os.getpid(), signal.SIGUSR1)
+        monitor = FakeMonitor()
+        profiler.begin_cycle(monitor)
+        assert profiler.active and profiler.session.candles == 5
+        profiler.stop()
+        assert 'monitor_strategy_phase' not in vars(monitor)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+
+if __name__ == "__main__":
+    for test in (test_flag_file_session_and_zero_overhead_when_idle, test_cprofile_mode_with_concurrent_workers,
+                 test_signal_and_request_parsing):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Risk Gate
+Verifies that a batch of candidate signals is checked against one market
+snapshot (call counts) with spread, exposure, daily-limit and sizing rules
+(no MT5 connection required)
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.risk_gate import (REJECT_DAILY_LIMIT, REJECT_POSITION_EXISTS, REJECT_SPREAD, Candidate, MarketSnapshot,
+                           RiskGate)
+
+SPECS = {
+    'EURUSD': SimpleNamespace(point=0.00001, trade_contract_size=100000, volume_step=0.01, volume_min=0.01),
+    'USDJPY': SimpleNamespace(point=0.001, trade_contract_size=100000, volume_step=0.01, volume_min=0.01),
+    'GBPUSD': SimpleNamespace(point=0.00001, trade_contract_size=100000, volume_step=0.01, volume_min=0.01),
+    'XAUUSD': SimpleNamespace(point=0.01, trade_contract_size=100, volume_step=0.01, volume_min=0.01),
+}
+TICKS = {'EURUSD': (1.10000, 1.10010), 'USDJPY': (150.000, 150.020), 'GBPUSD': (1.27000, 1.27100),
+         'XAUUSD': (2000.00, 2000.20)}
+
+
+class FakeTerminal:
+    def __init__(self):
+        self.calls = []
+
+    def positions_get(self, **kwargs):
+        self.calls.append('positions_get')
+        return [SimpleNamespace(symbol='XAUUSD')]
+
+    def account_info(self):
+        self.calls.append('account_info')
+        return SimpleNamespace(balance=50000.0)
+
+    def symbol_info_tick(self, symbol):
+        self.calls.append('tick')
+        bid, ask = TICKS[symbol]
+        return SimpleNamespace(bid=bid, ask=ask)
+
+    def symbol_info(self, symbol):
+        self.calls.append('symbol_info')
+        return SPECS[symbol]
+
+
+def test_one_snapshot_for_all_candidates():
+    """N candidates cost one positions/account call and one tick per symbol"""
+    terminal = FakeTerminal()
+    snapshot = MarketSnapshot.capture(terminal, ['EURUSD', 'USDJPY', 'GBPUSD', 'EURUSD'],
+                                      spec_fn=SPECS.get)
+    assert terminal.calls.count('positions_get') == 1 and terminal.calls.count('account_info') == 1
+    assert terminal.calls.count('tick') == 3 and 'symbol_info' not in terminal.calls
+    assert snapshot.position_counts == {'XAUUSD': 1}
+
+
+def test_spread_exposure_and_daily_limit():
+    """Reasons are collected per candidate; accepted candidates consume limits"""
+    snapshot = MarketSnapshot.capture(FakeTerminal(), list(TICKS), spec_fn=SPECS.get)
+    gate = RiskGate(max_daily_trades=2, max_spread_pips=3.0, max_position_size=1.0)
+    decisions = gate.evaluate([Candidate('EURUSD'), Candidate('EURUSD'), Candidate('GBPUSD'),
+                               Candidate('USDJPY'), Candidate('XAUUSD')], snapshot, daily_trades=0)
+    assert decisions[0].accepted and abs(decisions[0].spread_pips - 1.0) < 1e-9
+    assert decisions[1].reasons[0].startswith(REJECT_POSITION_EXISTS)
+    assert decisions[2].reasons[0].startswith(REJECT_SPREAD)  # 10 pips
+    assert decisions[3].accepted  # 2 pips, second daily slot
+    assert [r.split(':')[0] for r in decisions[4].reasons][:2] == [REJECT_DAILY_LIMIT, REJECT_POSITION_EXISTS]
+
+
+def test_batch_sizing_matches_scalar_formula():
+    """Lots = risk / (SL pips x pip value), clamped, rounded to the step, floored at volume_min"""
+    snapshot = MarketSnapshot.capture(FakeTerminal(), ['EURUSD', 'USDJPY'], spec_fn=SPECS.get)
+    gate = RiskGate(max_position_size=5.0, default_risk_fraction=0.01)
+    eur, jpy, tiny = gate.evaluate([Candidate('EURUSD', stop_loss_pips=20.0),
+                                    Candidate('USDJPY', stop_loss_pips=25.0, risk_amount=300.0),
+                                    Candidate('EURUSD', stop_loss_pips=1e6)], snapshot)
+    assert abs(eur.lot_size - 2.5) < 1e-9   # 1% of 50k / (20 pips x 10 per pip)
+    assert abs(jpy.lot_size - 0.01) < 1e-9  # 300 / (25 x 1000) = 0.012 -> step 0.01
+    assert abs(tiny.lot_size - 0.01) < 1e-9 and tiny.reasons[0].startswith(REJECT_POSITION_EXISTS)
+    assert abs(RiskGate(max_position_size=0.1).evaluate([Candidate('EURUSD', stop_loss_pips=20.0, risk_amount=500.0)],
+                                                         snapshot)[0].lot_size - 0.1) < 1e-9
+
+
+if __name__ == "__main__":
+    for test in (test_one_snapshot_for_all_candidates, test_spread_exposure_and_daily_limit,
+                 test_batch_sizing_matches_scalar_formula):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test Soak Harness
+Verifies monotonic-growth detection, the weekday virtual market and clock,
+and that a short accelerated soak of the monitor trades, samples every
+metric and flags an injected leak (no MT5 connection required)
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from soak_harness import BARS_PER_DAY, START_TIME, SoakRun, VirtualClock, detect_growth, synthetic_market
+
+
+def test_detect_growth():
+    """Steady growth is flagged; plateaus, noise and growth under the floors are not"""
+    assert detect_growth(list(range(100, 130)), 0.05, 5) == (109.5, 125.5)   # Thirds after a 6-sample warm-up
+    plateau = [100 + min(i, 5) for i in range(30)]
+    noisy = [100 + (7 if i % 2 else -7) for i in range(30)]
+    assert detect_growth(plateau, 0.0, 1) is None
+    assert detect_growth(noisy, 0.0, 1) is None
+    assert detect_growth(list(range(100, 130)), 0.5, 5) is None     # Under the relative floor
+    assert detect_growth([None, 1, 2], 0.0, 0) is None               # Too few samples
+
+
+def test_virtual_market_and_clock():
+    """Soak bars start on the configured Monday and skip weekends; the monitor clock follows the harness"""
+    times = pd.to_datetime(synthetic_market(['EURUSD'], 6, 100)['EURUSD']['time'], unit='s')
+    assert times[100] == START_TIME and len(times) == 100 + 6 * BARS_PER_DAY
+    assert (times.dayofweek < 5).all() and times.is_monotonic_increasing
+
+    clock = VirtualClock(datetime(2024, 1, 8, 12))
+    clock.time.sleep(90)
+    assert clock.datetime.now() == datetime(2024, 1, 8, 12, 1, 30)
+    assert clock.time.time() == (datetime(2024, 1, 8, 12, 1, 30) - datetime(1970, 1, 1)).total_seconds()
+    assert isinstance(pd.Timestamp('2024-01-08'), clock.datetime)
+
+
+def test_short_soak_flags_injected_leak():
+    """One trading day on two symbols: trades happen, metrics are sampled and a growing signals list is flagged"""
+    def leak(monitor, candle):
+        monitor.signals_history.extend({'candle': candle, 'copy': list(range(20))} for _ in range(3))
+
+    report = SoakRun(days=1, symbols=['EURUSD', 'XAUUSD'], sample_every=24, on_candle=leak).run()
+    assert report.candles == BARS_PER_DAY and len(report.samples) == BARS_PER_DAY // 24
+    assert report.trades >= 2  # The execution path soaks too, not just scanning
+    assert report.samples[-1].virtual_time.date() == START_TIME.date()
+    assert report.samples[-1].virtual_time > report.samples[0].virtual_time
+    sample = report.samples[-1]
+    assert sample.latency_p50_ms > 0 and sample.objects and sample.containers['chart_data'] == 2
+    assert sample.containers['terminal_text'] > 0
+
+    flagged = {flag.metric for flag in report.flags}
+    assert not report.ok and 'containers.signals_history' in flagged
+    assert 'containers.chart_data' not in flagged and 'containers.terminal_text' not in flagged
+
+
+if __name__ == "__main__":
+    for test in (test_detect_growth, test_virtual_market_and_clock, test_short_soak_flags_injected_leak):
+        test()
+        print(f"[OK] {test.__name__}")
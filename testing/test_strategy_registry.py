@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Strategy Registry
+Verifies that the strategies package discovers every sunrise_ogle_*.py
+without importing it, parses parameter sets from source (matching the
+monitor's config parser), and imports a strategy class only on first access
+(no MT5 connection or backtrader required)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.symbol_registry import parse_strategy_source
+from strategies import STRATEGY_CLASSES, get_strategy_params, parse_strategy_params, strategy_path
+
+PROBE = f"""
+import json, sys
+sys.path.insert(0, {PROJECT_ROOT!r})
+import strategies
+symbols = sorted(strategies.STRATEGY_CLASSES)
+params = strategies.get_strategy_params('USDJPY')
+before = sorted(m for m in sys.modules if m.startswith('strategies.') or m == 'backtrader')
+strategies.STRATEGY_CLASSES.get('EURUSD')
+after = sorted(m for m in sys.modules if m.startswith('strategies.'))
+print(json.dumps({{'symbols': symbols, 'has_params': bool(params), 'before': before, 'after': after,
+                  'loaded': sorted(strategies.STRATEGY_CLASSES.loaded())}}))
+"""
+
+
+def test_discovery_and_first_access_import():
+    """All strategy files are listed (EURJPY / USDJPY included); only an accessed class is imported"""
+    output = subprocess.run([sys.executable, '-c', PROBE], capture_output=True, text=True, check=True).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    assert probe['symbols'] == ['AUDUSD', 'EURJPY', 'EURUSD', 'GBPUSD', 'USDCHF', 'USDJPY', 'XAGUSD', 'XAUUSD']
+    assert probe['has_params'] and probe['before'] == []
+    assert probe['loaded'] == ['EURUSD'] and set(probe['after']) <= {'strategies.sunrise_ogle_eurusd'}
+    assert 'NZDUSD' not in STRATEGY_CLASSES and STRATEGY_CLASSES.get('NZDUSD') is None
+
+
+def test_params_match_config_parser():
+    """Parsed params resolve module constants and agree with the monitor's text parser"""
+    eurusd = get_strategy_params('EURUSD')
+    assert eurusd['ema_fast_length'] == 18 and eurusd['long_atr_decrement_min_threshold'] == -0.000025
+    assert get_strategy_params('USDJPY')['ema_fast_length'] == 14  # Class named SunriseOgleUSDJPY
+    for symbol in STRATEGY_CLASSES:
+        with open(strategy_path(symbol), 'r', encoding='utf-8', errors='replace') as f:
+            text_params = parse_strategy_source(f.read())
+        params = get_strategy_params(symbol)
+        for name, value in text_params.items():
+            if name.islower():
+                assert str(params[name]) == value or float(params[name]) == float(value), (symbol, name)
+
+
+def test_parse_strategy_params_formats():
+    """dict(...), dict literal and tuple-of-pairs params; computed values are skipped"""
+    source = "\n".join([
+        "import backtrader as bt",
+        "LIMIT = 3",
+        "class Helper(bt.Observer):",
+        "    params = dict(ignored=1)",
+        "class MyStrategy(bt.Strategy):",
+        "    params = dict(period=LIMIT, flag=True, scaled=LIMIT * 2, name='x')",
+    ])
+    assert parse_strategy_params(source) == {'period': 3, 'flag': True, 'name': 'x'}
+    assert parse_strategy_params(source.replace("dict(period=LIMIT, flag=True, scaled=LIMIT * 2, name='x')",
+                                                "(('period', LIMIT), ('slow', 30))")) == {'period': 3, 'slow': 30}
+    assert parse_strategy_params("class S(bt.Strategy):\n    params = {'a': -1.5}\n") == {'a': -1.5}
+
+
+if __name__ == "__main__":
+    for test in (test_discovery_and_first_access_import, test_params_match_config_parser,
+                 test_parse_strategy_params_formats):
+        test()
+        print(f"[OK] {test.__name__}")
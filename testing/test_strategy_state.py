@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test Strategy State
+Verifies the slotted SymbolState record: typo safety, enum validation,
+persistence round-trip and snapshot isolation (no MT5 connection required)
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.strategy_state import EntryState, SymbolState
+
+
+def test_unknown_field_rejected():
+    """Assigning a field that does not exist raises instead of silently adding a key"""
+    state = SymbolState()
+    try:
+        state.pullback_candle_cout = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("typo field was accepted")
+
+
+def test_entry_state_enum():
+    """String assignment is normalized to EntryState and compares equal to the string"""
+    state = SymbolState()
+    state.entry_state = 'WINDOW_OPEN'
+    assert state.entry_state is EntryState.WINDOW_OPEN
+    assert state.entry_state == 'WINDOW_OPEN'
+    assert f"{state.entry_state}" == 'WINDOW_OPEN'
+    try:
+        state.entry_state = 'ARMED'
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid entry_state was accepted")
+
+
+def test_persistence_round_trip():
+    """to_dict() is JSON serializable and restore() brings back the state machine"""
+    state = SymbolState(digits=3)
+    state.entry_state = EntryState.ARMED_LONG
+    state.armed_direction = 'LONG'
+    state.pullback_candle_count = 2
+    state.last_candle_time = datetime(2025, 11, 14, 10, 35)
+    state.indicators = {'atr': 0.12, 'current_price': 150.123}
+
+    data = json.loads(json.dumps(state.to_dict()))
+    assert 'indicators' not in data
+    assert data['entry_state'] == 'ARMED_LONG'
+
+    restored = SymbolState(digits=3)
+    restored.restore(data)
+    assert restored.entry_state is EntryState.ARMED_LONG
+    assert restored.pullback_candle_count == 2
+    assert restored.last_candle_time == datetime(2025, 11, 14, 10, 35)
+
+
+def test_snapshot_isolated_from_writer():
+    """Rebinding fields on the live state does not change a published snapshot"""
+    state = SymbolState()
+    snapshot = state.snapshot()
+    state.entry_state = 'IN_TRADE'
+    state.current_bar = 42
+    assert snapshot.entry_state is EntryState.SCANNING
+    assert snapshot.current_bar == 0
+
+
+def test_reset_entry():
+    """reset_entry() clears the window, pullback tracking and the signal ATR"""
+    state = SymbolState()
+    state.entry_state = 'WINDOW_OPEN'
+    state.window_active = True
+    state.window_top_limit = 1.1
+    state.signal_detection_atr = 0.0012
+    state.current_bar = 7
+    state.reset_entry()
+    assert state.entry_state is EntryState.SCANNING
+    assert state.window_active is False
+    assert state.window_top_limit is None
+    assert state.signal_detection_atr is None
+    assert state.current_bar == 7  # Bar counter survives resets
+
+
+if __name__ == "__main__":
+    for test in (test_unknown_field_rejected, test_entry_state_enum, test_persistence_round_trip,
+                 test_snapshot_isolated_from_writer, test_reset_entry):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Indicators
+Verifies the ring buffer and one-bar-at-a-time EMA / Wilder RSI / MACD /
+rolling statistics against pandas full-series calculations
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.streaming_indicators import BarRing, IndicatorSet, RollingStats, StreamingEMA, StreamingRSI
+
+CLOSES = 1.1 + np.cumsum(np.random.default_rng(7).normal(0, 3e-4, 3000))
+
+
+def test_ring_keeps_latest_bars_in_order():
+    """Ring overwrites the oldest bar and returns bars oldest first"""
+    ring = BarRing(4)
+    for t in range(10):
+        ring.append((t, 1.0, 1.0, 1.0, 1.0 + t, 5))
+    assert len(ring) == 4 and ring.ordered()['time'].tolist() == [6, 7, 8, 9]
+    ring.replace_last((9, 1.0, 1.0, 1.0, 99.0, 5))
+    assert ring.last()['close'] == 99.0
+
+
+def test_ema_and_rolling_match_pandas():
+    """Streaming EMA (both weightings) and rolling mean/std equal pandas after 3000 bars"""
+    series = pd.Series(CLOSES)
+    adjusted, recursive, stats = StreamingEMA(21), StreamingEMA(21, adjust=False), RollingStats(20)
+    for x in CLOSES:
+        adjusted.update(x)
+        recursive.update(x)
+        stats.update(x)
+    assert abs(adjusted.value - series.ewm(span=21).mean().iloc[-1]) < 1e-12
+    assert abs(recursive.value - series.ewm(span=21, adjust=False).mean().iloc[-1]) < 1e-12
+    assert abs(stats.mean - series.rolling(20).mean().iloc[-1]) < 1e-12
+    assert abs(stats.std - series.rolling(20).std().iloc[-1]) < 1e-9
+
+
+def test_wilder_rsi():
+    """RSI seeds with the simple average of 14 changes, then applies Wilder smoothing"""
+    rsi = StreamingRSI(14)
+    values = [rsi.update(x) for x in CLOSES[:200]]
+    assert values[13] is None and values[14] is not None
+
+    changes = np.diff(CLOSES[:200])
+    gain, loss = np.clip(changes, 0, None), np.clip(-changes, 0, None)
+    avg_gain, avg_loss = gain[:14].mean(), loss[:14].mean()
+    for g, l in zip(gain[14:], loss[14:]):
+        avg_gain, avg_loss = (avg_gain * 13 + g) / 14, (avg_loss * 13 + l) / 14
+    assert abs(values[-1] - (100 - 100 / (1 + avg_gain / avg_loss))) < 1e-9
+
+
+def test_snapshot_rewinds_forming_bar():
+    """Restoring a snapshot and re-applying the final close equals a clean run"""
+    clean, live = IndicatorSet(), IndicatorSet()
+    for x in CLOSES[:300]:
+        clean.update(x, 10.0)
+    for x in CLOSES[:299]:
+        live.update(x, 10.0)
+    before = live.snapshot()
+    live.update(CLOSES[299] + 0.01, 10.0)  # Forming bar, later revised
+    live = before
+    live.update(CLOSES[299], 10.0)
+    assert live.latest() == clean.latest()
+    assert set(clean.latest()) >= {'ema_21', 'rsi', 'macd_signal', 'bb_upper', 'volume_sma'}
+
+
+if __name__ == "__main__":
+    for test in (test_ring_keeps_latest_bars_in_order, test_ema_and_rolling_match_pandas, test_wilder_rsi,
+                 test_snapshot_rewinds_forming_bar):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test Symbol Registry
+Verifies config/symbols/ loading, allocation normalization and param parsing
+(no MT5 connection required)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.symbol_registry import PARAM_CACHE_VERSION, SymbolRegistry, normalize_allocations, parse_strategy_source
+
+
+def _write_symbol(config_dir, data):
+    with open(os.path.join(config_dir, f"{data['symbol']}.json"), 'w') as f:
+        json.dump(data, f)
+
+
+def test_normalize_allocations():
+    """Allocations always sum to 1.0, non-positive weights dropped"""
+    allocations = normalize_allocations({'EURUSD': 12, 'XAUUSD': 18, 'EURGBP': 0})
+    assert set(allocations) == {'EURUSD', 'XAUUSD'}
+    assert abs(sum(allocations.values()) - 1.0) < 1e-12
+    assert abs(allocations['XAUUSD'] - 0.6) < 1e-12
+
+
+def test_shipped_registry_matches_defaults():
+    """Shipped config/symbols/ reproduces the original 8-asset allocation table"""
+    registry = SymbolRegistry(PROJECT_ROOT)
+    registry.load()
+    symbols = registry.symbols()
+    assert symbols == ["EURUSD", "GBPUSD", "XAUUSD", "AUDUSD", "XAGUSD", "USDCHF", "EURJPY", "USDJPY"]
+    allocations = registry.allocations()
+    assert abs(allocations['XAUUSD'] - 0.15) < 1e-9
+    assert abs(allocations['AUDUSD'] - 0.10) < 1e-9
+
+    params = registry.load_params('EURUSD')
+    assert 'LONG_PULLBACK_MAX_CANDLES' in params
+    assert 'ema_fast_length' in params
+
+
+def test_params_only_symbol_and_renormalization():
+    """A symbol with inline params needs no strategy file and rescales the others"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = os.path.join(tmp, 'config', 'symbols')
+        os.makedirs(config_dir)
+        _write_symbol(config_dir, {'symbol': 'EURUSD', 'order': 1, 'allocation': 0.5,
+                                   'params': {'ema_fast_length': 18}})
+        _write_symbol(config_dir, {'symbol': 'EURGBP', 'order': 2, 'allocation': 0.5,
+                                   'params': {'ENABLE_LONG_TRADES': True}})
+        _write_symbol(config_dir, {'symbol': 'AUDJPY', 'enabled': False, 'allocation': 0.5})
+
+        registry = SymbolRegistry(tmp)
+        registry.load()
+
+        assert registry.symbols() == ['EURUSD', 'EURGBP']
+        assert registry.allocations() == {'EURUSD': 0.5, 'EURGBP': 0.5}
+        assert registry.load_params('EURGBP') == {'ENABLE_LONG_TRADES': 'True'}
+        assert registry.load_params('EURUSD') == {'ema_fast_length': '18'}
+
+
+def test_defaults_used_without_config_dir():
+    """Missing config/symbols/ falls back to the built-in allocation table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = SymbolRegistry(tmp, default_allocations={'EURUSD': 0.12, 'XAUUSD': 0.12})
+        registry.load()
+        assert registry.symbols() == ['EURUSD', 'XAUUSD']
+        assert registry.allocations() == {'EURUSD': 0.5, 'XAUUSD': 0.5}
+        assert registry.strategy_path('EURUSD').endswith(os.path.join('strategies', 'sunrise_ogle_eurusd.py'))
+
+
+def test_parse_strategy_source_formats():
+    """Both module-level and params-dict formats are parsed, comments skipped"""
+    content = "\n".join([
+        "# LONG_PULLBACK_MAX_CANDLES = 9",
+        "LONG_PULLBACK_MAX_CANDLES = 2  # comment",
+        "        ema_fast_length=18,",
+        "USE_TIME_RANGE_FILTER = True",
+    ])
+    params = parse_strategy_source(content)
+    assert params['LONG_PULLBACK_MAX_CANDLES'] == '2'
+    assert params['ema_fast_length'] == '18'
+    assert params['USE_TIME_RANGE_FILTER'] == 'True'
+
+
+def test_param_cache_serves_unchanged_strategy_files():
+    """Parsed params come from the cache file until the strategy file changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        strategy = os.path.join(tmp, 'strategies', 'sunrise_ogle_eurusd.py')
+        os.makedirs(os.path.dirname(strategy))
+        with open(strategy, 'w') as f:
+            f.write("ema_fast_length = 18\n")
+        cache_file = os.path.join(tmp, 'params_cache.json')
+
+        def registry():
+            loaded = SymbolRegistry(tmp, config_dir=os.path.join(tmp, 'none'), cache_file=cache_file,
+                                    default_allocations={'EURUSD': 1.0})
+            loaded.load()
+            return loaded
+
+        first = registry()
+        assert first.load_params('EURUSD') == {'ema_fast_length': '18'}
+        assert first.save_cache() and not first.save_cache()  # Nothing new to write the second time
+
+        with open(cache_file) as f:
+            payload = json.load(f)
+        assert payload['version'] == PARAM_CACHE_VERSION
+        entry = payload['files'][os.path.abspath(strategy)]
+        entry['params'] = {'ema_fast_length': 'cached'}  # Proves the second start does not re-parse
+        with open(cache_file, 'w') as f:
+            json.dump(payload, f)
+        cached = registry()
+        assert cached.load_params('EURUSD') == {'ema_fast_length': 'cached'}
+        cached.invalidate('EURUSD')
+        assert cached.load_params('EURUSD') == {'ema_fast_length': 'cached'}
+        cached.invalidate('EURUSD', reparse=True)  # Forces a real parse of the unchanged file
+        assert cached.load_params('EURUSD') == {'ema_fast_length': '18'}
+
+        time.sleep(0.01)
+        with open(strategy, 'w') as f:
+            f.write("ema_fast_length = 21\n")
+        assert registry().load_params('EURUSD') == {'ema_fast_length': '21'}
+
+
+if __name__ == "__main__":
+    for test in (test_normalize_allocations, test_shipped_registry_matches_defaults,
+                 test_params_only_symbol_and_renormalization, test_defaults_used_without_config_dir,
+                 test_parse_strategy_source_formats, test_param_cache_serves_unchanged_strategy_files):
+        test()
+        print(f"[OK] {test.__name__}")
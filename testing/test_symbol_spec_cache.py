@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test Symbol Spec Cache
+Verifies TTL expiry (long for same-currency, short for cross-currency tick
+values), change detection, refresh on reconnect, stale fallback and the
+offline JSON snapshot (no MT5 connection required)
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.risk_gate import Candidate, MarketSnapshot, RiskGate
+from src.symbol_spec_cache import SymbolSpecCache
+
+
+def make_info(name, profit, tick_value, digits=5, point=0.00001):
+    return SimpleNamespace(name=name, visible=True, digits=digits, point=point, trade_tick_size=point,
+                           trade_contract_size=100000, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+                           filling_mode=3, currency_base=name[:3], currency_profit=profit, currency_margin=name[:3],
+                           trade_tick_value=tick_value, trade_tick_value_profit=tick_value,
+                           trade_tick_value_loss=tick_value)
+
+
+class FakeTerminal:
+    def __init__(self):
+        self.infos = {'EURUSD': make_info('EURUSD', 'USD', 1.0),
+                      'USDJPY': make_info('USDJPY', 'JPY', 0.667, digits=3, point=0.001)}
+        self.calls = []
+        self.down = False
+
+    def symbol_info(self, symbol):
+        self.calls.append(symbol)
+        return None if self.down else self.infos.get(symbol)
+
+    def account_info(self):
+        return SimpleNamespace(currency='USD', balance=50000.0)
+
+
+def test_static_and_tick_value_ttls():
+    """Same-currency specs live for the static TTL; cross-currency ones for the tick-value TTL"""
+    now = [0.0]
+    terminal = FakeTerminal()
+    cache = SymbolSpecCache(terminal, static_ttl=3600, tick_value_ttl=60, clock=lambda: now[0])
+    for _ in range(10):
+        assert cache.get('EURUSD').digits == 5 and cache.get('USDJPY').digits == 3
+    assert terminal.calls == ['EURUSD', 'USDJPY'] and cache.stats.hits == 18
+
+    now[0] = 61.0
+    terminal.infos['USDJPY'] = make_info('USDJPY', 'JPY', 0.671, digits=3, point=0.001)
+    cache.get('EURUSD')
+    assert abs(cache.get('USDJPY').trade_tick_value - 0.671) < 1e-12
+    assert terminal.calls[2:] == ['USDJPY'] and cache.stats.tick_value_changes == 1
+    assert cache.stats.static_changes == 0 and cache.get('NOPE') is None
+
+
+def test_change_detection_refresh_and_stale_fallback():
+    """refresh() re-reads every cached symbol; a down terminal serves the last known spec"""
+    now = [0.0]
+    terminal = FakeTerminal()
+    cache = SymbolSpecCache(terminal, clock=lambda: now[0])
+    cache.get_many(['EURUSD', 'USDJPY'])
+    terminal.infos['EURUSD'] = make_info('EURUSD', 'USD', 1.0, digits=4, point=0.0001)
+    refreshed = cache.refresh()
+    assert refreshed['EURUSD'].digits == 4 and cache.stats.static_changes == 1 and cache.stats.refreshes == 2
+
+    terminal.down = True
+    now[0] = 1e6
+    assert cache.get('EURUSD').digits == 4 and cache.stats.stale_served == 1
+
+    cache.bind(FakeTerminal())  # Different terminal: entries dropped
+    assert cache.get('EURUSD').digits == 5
+
+
+def test_snapshot_round_trip_feeds_offline_sizing():
+    """A saved snapshot sizes positions offline exactly like the live specs"""
+    terminal = FakeTerminal()
+    live = SymbolSpecCache(terminal)
+    live.get_many(['EURUSD', 'USDJPY'])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'specs.json')
+        live.save(path)
+        offline = SymbolSpecCache.from_snapshot(path)
+    assert offline.account_currency == 'USD' and set(offline.specs()) == {'EURUSD', 'USDJPY'}
+    assert offline.get('USDJPY').to_dict() == live.get('USDJPY').to_dict()
+
+    tick_terminal = SimpleNamespace(positions_get=lambda: [], account_info=terminal.account_info,
+                                    symbol_info_tick=lambda s: SimpleNamespace(bid=1.1, ask=1.1001))
+    gate = RiskGate(max_position_size=5.0)
+    for spec_fn in (live.get, offline.get):
+        snapshot = MarketSnapshot.capture(tick_terminal, ['EURUSD'], spec_fn=spec_fn)
+        decision = gate.evaluate([Candidate('EURUSD', stop_loss_pips=20.0, risk_amount=500.0)], snapshot)[0]
+        assert abs(decision.lot_size - 2.5) < 1e-9
+
+
+if __name__ == "__main__":
+    for test in (test_static_and_tick_value_ttls, test_change_detection_refresh_and_stale_fallback,
+                 test_snapshot_round_trip_feeds_offline_sizing):
+        test()
+        print(f"[OK] {test.__name__}")
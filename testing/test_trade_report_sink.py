@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Trade Report Sink
+Verifies buffered trade rows, end-of-run text / CSV output compatible with
+the live replay report parser, and zero-output debug gating
+"""
+
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.live_replay import parse_trade_report
+from src.trade_report_sink import TradeRecordSink
+
+START = datetime(2024, 1, 2, 10, 5)
+
+
+def _sink(folder, **kwargs):
+    sink = TradeRecordSink('EURUSD', report_dir=folder, **kwargs)
+    sink.record_entry(START, 'LONG', stop_level=1.0990, take_level=1.1030, current_atr=0.0005, atr_change=0.00002)
+    sink.record_exit(START + timedelta(minutes=50), 1.1030, 120.0, 'TP')
+    sink.record_entry(START + timedelta(days=1), 'SHORT', entry_price=1.1000, current_atr=0.0004)
+    return sink
+
+
+def test_rows_buffered_until_close():
+    """Nothing touches disk before close(); exits complete the open trade"""
+    with tempfile.TemporaryDirectory() as folder:
+        sink = _sink(folder)
+        assert os.listdir(folder) == []
+        first = sink.records[0]
+        assert first.duration_bars == 10 and abs(first.pips - 20.0) < 1e-6
+        assert sink.trade_reports()[0]['exit_reason'] == 'TP'
+        assert not sink.records[1].closed
+
+
+def test_close_writes_text_and_csv():
+    """Text report parses like the strategy reports; CSV holds one row per trade"""
+    with tempfile.TemporaryDirectory() as folder:
+        sink = _sink(folder)
+        paths = sink.close()
+        assert sink.close() == []  # Idempotent
+        text_path = next(p for p in paths if p.endswith('.txt'))
+        csv_path = next(p for p in paths if p.endswith('.csv'))
+
+        events = parse_trade_report(text_path)
+        assert [(e.time, e.direction) for e in events] == [(START, 'LONG'), (START + timedelta(days=1), 'SHORT')]
+        with open(text_path, encoding='utf-8') as f:
+            assert 'Total Trades: 2' in f.read()
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2 and rows[0]['pnl'] == '120.0' and rows[1]['exit_time'] == ''
+
+
+def test_debug_gated_by_verbose_flag():
+    """debug() prints only with verbose_debug and formats lazily"""
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted while verbose_debug is off")
+
+    with tempfile.TemporaryDirectory() as folder:
+        quiet, loud = TradeRecordSink('EURUSD', folder), TradeRecordSink('EURUSD', folder, verbose_debug=True)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            quiet.debug("value %s", Exploding())
+            loud.debug("entry_atr_increment = %s", 0.5)
+        assert output.getvalue() == "DEBUG: entry_atr_increment = 0.5\n"
+
+
+if __name__ == "__main__":
+    for test in (test_rows_buffered_until_close, test_close_writes_text_and_csv, test_debug_gated_by_verbose_flag):
+        test()
+        print(f"[OK] {test.__name__}")
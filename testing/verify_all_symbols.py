@@ -3,11 +3,23 @@ FINAL VERIFICATION - Test position sizing for all symbols
 ===========================================================
 Portfolio: $50,121.28 (from your screenshot)
 Risk: 0.5% per trade (configurable)
+Allocations come from config/symbols/ (same table as the live monitor) and
+lot sizes from src/position_sizing.py (same engine as execute_trade)
 """
 
+import os
+import sys
+
 import MetaTrader5 as mt5
 import numpy as np
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.position_sizing import PositionSizer
+from src.symbol_registry import SymbolRegistry
+from src.symbol_spec_cache import SymbolSpecCache
+
 # Initialize MT5
 if not mt5.initialize():
     print("MT5 initialization failed")
@@ -16,14 +28,7 @@ if not mt5.initialize():
 # ═══════════════════════════════════════════════════════════════════
 # DALIO ALLOCATION SYSTEM
 # ═══════════════════════════════════════════════════════════════════
-ASSET_ALLOCATIONS = {
-    'USDCHF': 0.20,   # 20% - Deflation hedge
-    'XAUUSD': 0.18,   # 18% - Inflation hedge
-    'GBPUSD': 0.16,   # 16% - Standard forex
-    'EURUSD': 0.16,   # 16% - Standard forex
-    'XAGUSD': 0.15,   # 15% - Commodity metal
-    'AUDUSD': 0.15,   # 15% - Commodity currency
-}
+ASSET_ALLOCATIONS = SymbolRegistry(PROJECT_ROOT).allocations()
 
 DEFAULT_RISK_PERCENT = 0.005  # 0.5% risk per trade
 
@@ -46,80 +51,67 @@ print("=" * 100)
 print(f"\n💰 Portfolio Balance: ${portfolio_balance:,.2f}")
 print(f"⚠️  Risk per Trade: {DEFAULT_RISK_PERCENT*100:.2f}% of allocated capital\n")
 
+specs = SymbolSpecCache(mt5)
+sizer = PositionSizer(ASSET_ALLOCATIONS, risk_percent=DEFAULT_RISK_PERCENT, spec_fn=specs.get)
+
+# Collect prices and ATRs first, then size every symbol in one vectorized call
+symbols, prices, atrs = [], [], []
 for symbol in ASSET_ALLOCATIONS.keys():
-    print("\n" + "=" * 100)
-    print(f"📊 {symbol}")
-    print("=" * 100)
-    
-    # Get symbol info
-    symbol_info = mt5.symbol_info(symbol)
-    if symbol_info is None:
-        print(f"   ❌ Symbol not available")
+    if specs.get(symbol) is None:
+        print(f"\n❌ {symbol}: Symbol not available")
         continue
     
     # Get current price
     tick = mt5.symbol_info_tick(symbol)
     if tick is None:
-        print(f"   ❌ Cannot get price")
+        print(f"\n❌ {symbol}: Cannot get price")
         continue
     
-    current_price = tick.ask
-    
     # Get rates for ATR
     rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, 20)
     if rates is None or len(rates) < 11:
-        print(f"   ❌ Cannot get rates")
+        print(f"\n❌ {symbol}: Cannot get rates")
         continue
     
     # Calculate ATR
-    high = np.array([r['high'] for r in rates[-11:]])
-    low = np.array([r['low'] for r in rates[-11:]])
-    close = np.array([r['close'] for r in rates[-11:]])
+    high = rates['high'][-11:]
+    low = rates['low'][-11:]
+    close = rates['close'][-11:]
     tr = np.maximum(high - low, np.abs(high - np.roll(close, 1)))
-    atr = np.mean(tr[1:])
-    
-    # Get multipliers
-    atr_sl_mult = ATR_MULTIPLIERS[symbol]['sl']
-    atr_tp_mult = ATR_MULTIPLIERS[symbol]['tp']
-    
-    # Calculate Dalio allocation
-    allocation_percent = ASSET_ALLOCATIONS[symbol]
-    allocated_capital = portfolio_balance * allocation_percent
-    risk_amount = allocated_capital * DEFAULT_RISK_PERCENT
-    
-    # Calculate SL/TP
-    sl_distance = atr * atr_sl_mult
-    tp_distance = atr * atr_tp_mult
-    
-    # Get broker specs
-    point = symbol_info.point
-    tick_value = symbol_info.trade_tick_value
-    tick_size = symbol_info.trade_tick_size
-    
-    # Calculate value per point
-    if tick_size > 0 and point > 0:
-        value_per_point = tick_value * (point / tick_size)
-    else:
-        value_per_point = tick_value
+    symbols.append(symbol)
+    prices.append(tick.ask)
+    atrs.append(np.mean(tr[1:]))
+
+sl_multipliers = [ATR_MULTIPLIERS.get(symbol, {'sl': 1.5})['sl'] for symbol in symbols]
+sizing = sizer.size(symbols, portfolio_balance, np.array(atrs), np.array(sl_multipliers))
+
+for index, symbol in enumerate(symbols):
+    print("\n" + "=" * 100)
+    print(f"📊 {symbol}")
+    print("=" * 100)
     
-    # Calculate lot size
-    sl_distance_in_points = sl_distance / point
-    if value_per_point > 0 and sl_distance_in_points > 0:
-        lot_size_raw = risk_amount / (sl_distance_in_points * value_per_point)
-    else:
+    if not sizing.valid[index]:
         print(f"   ❌ Invalid calculation values")
         continue
     
-    # Apply limits
-    lot_min = symbol_info.volume_min
-    lot_max = symbol_info.volume_max
-    lot_step = symbol_info.volume_step
-    
-    lot_size = round(lot_size_raw / lot_step) * lot_step
-    lot_size = max(lot_min, min(lot_size, lot_max))
+    row = sizing.row(index)
+    current_price = prices[index]
+    atr = atrs[index]
+    atr_sl_mult = sl_multipliers[index]
+    atr_tp_mult = ATR_MULTIPLIERS.get(symbol, {'tp': 10.0})['tp']
+    allocation_percent = row['allocation']
+    allocated_capital = row['allocated_capital']
+    risk_amount = row['risk_amount']
+    sl_distance = row['sl_distance']
+    tp_distance = atr * atr_tp_mult
+    point = specs.get(symbol).point
+    value_per_point = row['value_per_point']
+    sl_distance_in_points = row['sl_points']
+    lot_size_raw = row['raw_lots']
+    lot_size = row['lots']
     
     # Verify risk
-    actual_risk = lot_size * sl_distance_in_points * value_per_point
+    actual_risk = row['actual_risk']
     
     # Calculate potential profit
     tp_distance_in_points = tp_distance / point